@@ -0,0 +1,4 @@
+"""Benchmarks de rendimiento de las rutas críticas (reservas, pagos, reportes y tablas).
+
+Ver benchmarks/__main__.py para la ejecución.
+"""
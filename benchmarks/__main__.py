@@ -0,0 +1,208 @@
+"""Suite de benchmarks de Viajes Aventura.
+
+Ejecución (desde la raíz del proyecto):
+    python -m benchmarks ejecutar --tamanos 1000 10000 100000 --concurrencia 1 4 8
+    python -m benchmarks ejecutar --escenarios crear_reserva_paquete procesar_pago --salida base.json
+    python -m benchmarks comparar base.json nuevo.json --umbral 0.15
+    python -m benchmarks generar --reservas 1000000 --semilla 7 --volcado datos_1m/
+    python -m benchmarks cargar datos_1m/
+
+Usa el motor de DB_BACKEND. Con SQLite y sin DB_SQLITE_RUTA se crea una base temporal en
+archivo (modo WAL) para que los hilos concurrentes puedan escribir.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import tempfile
+from datetime import datetime
+
+from src.config.db_connection import cerrar_conexion
+
+DIRECTORIO_RESULTADOS = os.path.join(os.path.dirname(__file__), "resultados")
+
+
+def _configurar_backend() -> str:
+    """Prepara una base SQLite temporal si corresponde. Retorna nombre del backend"""
+    backend = os.getenv("DB_BACKEND", "mysql").lower()
+    if backend == "sqlite" and not os.getenv("DB_SQLITE_RUTA"):
+        os.environ["DB_SQLITE_RUTA"] = os.path.join(tempfile.mkdtemp(prefix="viajes_bench_"), "bench.db")
+    return backend
+
+
+def comando_ejecutar(args) -> int:
+    """Genera datos para cada tamaño y mide cada escenario por nivel de concurrencia. Retorna código de salida"""
+    backend = _configurar_backend()
+    from benchmarks.escenarios import crear_escenarios
+    from benchmarks.generador import GeneradorDatos
+    from benchmarks.medicion import MIN_MUESTRAS_P99, medir
+
+    escenarios = [e for e in crear_escenarios() if not args.escenarios or e.nombre in args.escenarios]
+    generador = GeneradorDatos(args.semilla)
+    generador.generar_usuarios(max(100, max(args.tamanos) // 20))
+    generador.generar_catalogo()
+
+    resultados = []
+    for tamano in sorted(args.tamanos):
+        print(f"Generando datos hasta {tamano} reservas...", file=sys.stderr)
+        generador.completar_reservas(tamano)
+        for escenario in escenarios:
+            operaciones = args.operaciones
+            if escenario.pesado:
+                operaciones = args.operaciones_pesadas or max(1, args.operaciones // 40)
+            for concurrencia in args.concurrencia:
+                argumentos = escenario.preparar(generador, operaciones)
+                # Las tablas y cancelaciones imprimen por consola: se descarta para no medir la terminal
+                with open(os.devnull, "w", encoding="utf-8") as nulo, contextlib.redirect_stdout(nulo):
+                    medida = medir(escenario.operacion, argumentos, concurrencia)
+                resultados.append({'escenario': escenario.nombre, 'tamano': tamano, 'concurrencia': concurrencia, **medida})
+                p99 = f"{medida['p99_ms']:.2f}ms" if 'p99_ms' in medida else f"- (<{MIN_MUESTRAS_P99} ops)"
+                print(f"  {escenario.nombre:<24} n={tamano:<9} c={concurrencia:<3} "
+                      f"{medida['throughput_ops_s']:>10.1f} ops/s  p50={medida['p50_ms']:.2f}ms  "
+                      f"p99={p99}  errores={medida['errores']}", file=sys.stderr)
+
+    salida = args.salida or os.path.join(DIRECTORIO_RESULTADOS, f"{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(salida)), exist_ok=True)
+    with open(salida, "w", encoding="utf-8") as archivo:
+        json.dump({
+            'fecha': datetime.now().isoformat(timespec="seconds"),
+            'backend': backend,
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'semilla': args.semilla,
+            'operaciones': args.operaciones,
+            'resultados': resultados,
+        }, archivo, ensure_ascii=False, indent=2)
+    print(f"Resultados guardados en {salida}", file=sys.stderr)
+    return 0
+
+
+def comando_generar(args) -> int:
+    """Genera un volumen de datos sintéticos (y opcionalmente su volcado CSV). Retorna código de salida"""
+    _configurar_backend()
+    from benchmarks.generador import ConfiguracionGenerador, GeneradorDatos
+    from benchmarks.volcado import VolcadoCSV
+
+    configuracion = ConfiguracionGenerador(
+        semilla=args.semilla, destinos=args.destinos, paquetes=args.paquetes, zipf=args.zipf,
+        tasa_cancelacion=args.tasa_cancelacion, tasa_pago=args.tasa_pago, dias_historia=args.dias_historia,
+    )
+    if args.fecha_referencia:
+        configuracion.fecha_referencia = datetime.fromisoformat(args.fecha_referencia)
+    volcado = VolcadoCSV(args.volcado) if args.volcado else None
+    generador = GeneradorDatos(configuracion, volcado)
+    try:
+        generador.generar_usuarios(args.usuarios or max(100, args.reservas // 20))
+        generador.generar_catalogo()
+        creadas = generador.completar_reservas(args.reservas)
+    finally:
+        if volcado:
+            volcado.cerrar()
+    print(json.dumps({'usuarios': len(generador.usuarios_ids), 'destinos': len(generador.destinos),
+                      'paquetes': len(generador.paquetes), 'reservas_creadas': creadas,
+                      'base': os.getenv("DB_SQLITE_RUTA") if os.getenv("DB_BACKEND") == "sqlite" else "mysql",
+                      'volcado': args.volcado}, ensure_ascii=False, indent=2))
+    return 0
+
+
+def comando_cargar(args) -> int:
+    """Recarga un volcado CSV en la base configurada. Retorna código de salida"""
+    from benchmarks.volcado import cargar_volcado
+    print(json.dumps(cargar_volcado(args.directorio), indent=2))
+    return 0
+
+
+def comparar_resultados(base: dict, nuevo: dict, umbral: float) -> list[dict]:
+    """Compara dos ejecuciones por (escenario, tamaño, concurrencia); el p99 solo si ambas lo midieron.
+    Retorna Lista de diferencias con marca de regresión (cambio_p99 None si no se compara)"""
+    indice_base = {(r['escenario'], r['tamano'], r['concurrencia']): r for r in base['resultados']}
+    comparacion = []
+    for r in nuevo['resultados']:
+        anterior = indice_base.get((r['escenario'], r['tamano'], r['concurrencia']))
+        if not anterior or not anterior['throughput_ops_s']:
+            continue
+        cambio_p99 = None
+        if anterior.get('p99_ms') and r.get('p99_ms') is not None:
+            cambio_p99 = round(r['p99_ms'] / anterior['p99_ms'] - 1, 4)
+        cambio_throughput = r['throughput_ops_s'] / anterior['throughput_ops_s'] - 1
+        comparacion.append({
+            'escenario': r['escenario'], 'tamano': r['tamano'], 'concurrencia': r['concurrencia'],
+            'cambio_p99': cambio_p99, 'cambio_throughput': round(cambio_throughput, 4),
+            'regresion': (cambio_p99 or 0) > umbral or cambio_throughput < -umbral,
+        })
+    return comparacion
+
+
+def comando_comparar(args) -> int:
+    """Imprime la comparación de dos archivos de resultados. Retorna 1 si hay regresiones"""
+    with open(args.base, encoding="utf-8") as archivo:
+        base = json.load(archivo)
+    with open(args.nuevo, encoding="utf-8") as archivo:
+        nuevo = json.load(archivo)
+    comparacion = comparar_resultados(base, nuevo, args.umbral)
+    for c in comparacion:
+        marca = "REGRESIÓN" if c['regresion'] else ""
+        p99 = f"{c['cambio_p99']:+.1%}" if c['cambio_p99'] is not None else "-"
+        print(f"{c['escenario']:<24} n={c['tamano']:<9} c={c['concurrencia']:<3} "
+              f"p99 {p99}  throughput {c['cambio_throughput']:+.1%}  {marca}")
+    return 1 if any(c['regresion'] for c in comparacion) else 0
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    """Construye el parser de argumentos. Retorna ArgumentParser"""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks de Viajes Aventura")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    ejecutar = comandos.add_parser("ejecutar", help="Generar datos y medir los escenarios")
+    ejecutar.add_argument("--tamanos", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+                          help="Cantidades de reservas a medir (se generan de menor a mayor)")
+    ejecutar.add_argument("--concurrencia", type=int, nargs="+", default=[1, 4], help="Hilos concurrentes")
+    ejecutar.add_argument("--operaciones", type=int, default=200,
+                          help="Operaciones por medición (los escenarios pesados usan 1/40)")
+    ejecutar.add_argument("--operaciones-pesadas", type=int,
+                          help="Operaciones de los escenarios pesados (el p99 solo se informa con 100 o más)")
+    ejecutar.add_argument("--escenarios", nargs="+", help="Solo estos escenarios")
+    ejecutar.add_argument("--semilla", type=int, default=42)
+    ejecutar.add_argument("--salida", help="Archivo JSON de resultados (por defecto benchmarks/resultados/<fecha>.json)")
+    ejecutar.set_defaults(funcion=comando_ejecutar)
+
+    generar = comandos.add_parser("generar", help="Generar datos sintéticos de carga (determinista por semilla)")
+    generar.add_argument("--reservas", type=int, required=True, help="Total de reservas a alcanzar")
+    generar.add_argument("--usuarios", type=int, help="Clientes a crear (por defecto reservas/20)")
+    generar.add_argument("--destinos", type=int, default=50)
+    generar.add_argument("--paquetes", type=int, default=200)
+    generar.add_argument("--zipf", type=float, default=1.1, help="Sesgo de popularidad de paquetes/destinos (0 = uniforme)")
+    generar.add_argument("--tasa-cancelacion", type=float, default=0.12)
+    generar.add_argument("--tasa-pago", type=float, default=0.70)
+    generar.add_argument("--dias-historia", type=int, default=730)
+    generar.add_argument("--fecha-referencia", help="Fecha 'actual' de los datos (ISO); por defecto hoy")
+    generar.add_argument("--semilla", type=int, default=42)
+    generar.add_argument("--volcado", help="Directorio donde escribir un CSV por tabla y cargar_mysql.sql")
+    generar.set_defaults(funcion=comando_generar)
+
+    cargar = comandos.add_parser("cargar", help="Recargar un volcado CSV generado con --volcado")
+    cargar.add_argument("directorio")
+    cargar.set_defaults(funcion=comando_cargar)
+
+    comparar = comandos.add_parser("comparar", help="Comparar dos archivos de resultados")
+    comparar.add_argument("base")
+    comparar.add_argument("nuevo")
+    comparar.add_argument("--umbral", type=float, default=0.10, help="Variación tolerada antes de marcar regresión")
+    comparar.set_defaults(funcion=comando_comparar)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Punto de entrada de los benchmarks. Retorna código de salida"""
+    args = crear_parser().parse_args(argv)
+    try:
+        return args.funcion(args)
+    finally:
+        cerrar_conexion()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Escenarios medidos: rutas críticas de reservas, pagos, reportes y tablas de consola.
+
+Cada escenario prepara sus argumentos (p. ej. reservas PENDIENTE recién creadas para pagar o
+cancelar) y define la operación que se cronometra por cada argumento.
+"""
+
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Callable
+
+from src.business.pago_service import PagoService
+from src.business.reserva_service import ReservaService
+from src.config.db_connection import ejecutar_consulta_uno
+from src.dao.paquete_dao import PaqueteDAO
+from src.dao.reserva_dao import ReservaDAO
+from src.utils.constants import METODOS_PAGO
+from src.utils.utils import mostrar_tabla_pagos, mostrar_tabla_paquetes, mostrar_tabla_reservas
+
+from benchmarks.generador import GeneradorDatos
+
+FILAS_TABLA = 100  # Filas por tabla renderizada
+DIAS_REPORTE = 30  # Ventana de cada reporte de ventas
+
+
+@dataclass
+class Escenario:
+    """Operación a medir. `pesado` indica que cada ejecución recorre tablas completas."""
+    nombre: str
+    preparar: Callable[[GeneradorDatos, int], list]  # (generador, operaciones) -> argumentos
+    operacion: Callable[[Any], Any]
+    pesado: bool = False
+
+
+def _preparar_crear_reserva(generador: GeneradorDatos, operaciones: int) -> list:
+    rnd = generador.rnd
+    return [(rnd.choice(generador.usuarios_ids), rnd.choice(generador.paquetes)[0], rnd.randint(1, 4))
+            for _ in range(operaciones)]
+
+
+def _preparar_reporte(generador: GeneradorDatos, operaciones: int) -> list:
+    argumentos = []
+    for _ in range(operaciones):
+        inicio = generador.ahora - timedelta(days=generador.rnd.randint(DIAS_REPORTE, 730))
+        argumentos.append((inicio.strftime('%Y-%m-%d'), (inicio + timedelta(days=DIAS_REPORTE)).strftime('%Y-%m-%d')))
+    return argumentos
+
+
+def _muestra_reservas(generador: GeneradorDatos) -> list:
+    """Toma FILAS_TABLA reservas existentes al azar. Retorna Lista de ReservaDTO"""
+    dao = ReservaDAO()
+    ids = generador.rnd.sample(range(1, _max_id("Reservas") + 1), FILAS_TABLA)
+    return [r for r in (dao.obtener_por_id(i) for i in ids) if r]
+
+
+def _muestra_pagos(generador: GeneradorDatos) -> list:
+    """Junta hasta FILAS_TABLA pagos del historial de clientes generados al azar (como en ver_mis_pagos).
+    Retorna Lista de dicts de PagoService.historial_cliente"""
+    servicio = PagoService()
+    pagos = []
+    for _ in range(FILAS_TABLA):  # Un cliente puede no tener pagos: se acota la cantidad de intentos
+        pagos.extend(servicio.historial_cliente(generador.rnd.choice(generador.usuarios_ids)))
+        if len(pagos) >= FILAS_TABLA:
+            break
+    return pagos[:FILAS_TABLA]
+
+
+def _max_id(tabla: str) -> int:
+    """Mayor ID de la tabla (al menos FILAS_TABLA, para poder muestrear). Retorna int"""
+    fila = ejecutar_consulta_uno(f"SELECT MAX(id) AS maximo FROM {tabla}")
+    return max(FILAS_TABLA, int(fila['maximo'] or 0)) if fila else FILAS_TABLA
+
+
+def crear_escenarios() -> list[Escenario]:
+    """Construye los escenarios con servicios compartidos entre hilos (los DAOs no guardan estado). Retorna Lista de Escenario"""
+    reservas = ReservaService()
+    pagos = PagoService()
+    return [
+        Escenario("crear_reserva_paquete", _preparar_crear_reserva,
+                  lambda a: reservas.crear_reserva_paquete(*a)),
+        Escenario("cancelar_reserva", lambda g, n: g.crear_reservas_pendientes(n),
+                  reservas.cancelar_reserva),
+        Escenario("procesar_pago", lambda g, n: [(i, g.rnd.choice(METODOS_PAGO)) for i in g.crear_reservas_pendientes(n)],
+                  lambda a: pagos.procesar_pago(*a)),
+        Escenario("listar_todas_reservas", lambda g, n: [None] * n,
+                  lambda _: reservas.listar_todas_reservas(), pesado=True),
+        Escenario("generar_reporte_ventas", _preparar_reporte,
+                  lambda a: pagos.generar_reporte_ventas(*a), pesado=True),
+        Escenario("mostrar_tabla_reservas", lambda g, n: [_muestra_reservas(g)] * n,
+                  mostrar_tabla_reservas, pesado=True),
+        Escenario("mostrar_tabla_pagos", lambda g, n: [_muestra_pagos(g)] * n,
+                  mostrar_tabla_pagos, pesado=True),
+        Escenario("mostrar_tabla_paquetes", lambda g, n: [PaqueteDAO().listar_todos()[:FILAS_TABLA]] * n,
+                  mostrar_tabla_paquetes, pesado=True),
+    ]
@@ -0,0 +1,251 @@
+"""Generador de datos sintéticos para pruebas de carga y benchmarks.
+
+Crea usuarios, catálogo (destinos, actividades, paquetes y sus relaciones) y completa la tabla de
+Reservas (con sus Pagos) hasta un volumen objetivo usando las inserciones masivas de los DAOs.
+Los datos se agregan a los existentes, por lo que sirve tanto en SQLite como en MySQL.
+
+Para que los volúmenes se parezcan a la operación real:
+    - La popularidad de paquetes y destinos sigue una distribución Zipf (pocos concentran la demanda)
+    - Las fechas de reserva siguen la estacionalidad del turismo chileno (verano, vacaciones de
+      invierno, Fiestas Patrias), el día de la semana y la hora del día
+    - Las tasas de cancelación, pago, confirmación y pagos fallidos son configurables
+
+Con la misma semilla y fecha de referencia, una base nueva recibe exactamente las mismas filas.
+"""
+
+import itertools
+import random
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+
+from src.config.db_connection import ejecutar_consulta_uno, transaccion
+from src.dao.actividad_dao import ActividadDAO
+from src.dao.catalogo_dao import CatalogoDAO
+from src.dao.destino_dao import DestinoDAO
+from src.dao.pago_dao import PagoDAO
+from src.dao.paquete_dao import PaqueteDAO
+from src.dao.reserva_dao import ReservaDAO
+from src.dao.usuario_dao import UsuarioDAO
+from src.dto.actividad_dto import ActividadDTO
+from src.dto.destino_dto import DestinoDTO
+from src.dto.pago_dto import PagoDTO
+from src.dto.paquete_dto import PaqueteDTO
+from src.dto.reserva_dto import ReservaDTO
+from src.dto.usuario_dto import UsuarioDTO
+from src.utils.constants import METODOS_PAGO
+
+from benchmarks.volcado import VolcadoCSV
+
+BLOQUE_GENERACION = 20_000  # Reservas por tanda: acota la memoria al generar millones de filas
+CUPOS_BENCHMARK = 10_000_000  # Cupos "infinitos" para que las reservas generadas no se agoten
+# Hash bcrypt de "Cliente123" (mismo de init_db.sql): generar uno por usuario tomaría horas
+PASSWORD_HASH_BENCHMARK = "$2b$12$0qZjAUYWO441vHTsJ0ivyunq0j.Z6BoWUJA24q2xW7IqsRlyDe4He"
+# Peso relativo de reservas por mes (enero=1): verano austral, vacaciones de invierno y septiembre
+ESTACIONALIDAD_MES = (1.7, 1.6, 1.0, 0.8, 0.7, 0.8, 1.4, 0.9, 1.2, 0.9, 1.0, 1.5)
+ESTACIONALIDAD_DIA_SEMANA = (1.1, 1.1, 1.1, 1.1, 1.0, 0.8, 0.8)  # Lunes a domingo
+PESO_HORA = (1, 1, 1, 1, 1, 1, 2, 3, 5, 8, 9, 9, 8, 8, 9, 9, 9, 9, 10, 11, 11, 9, 6, 3)
+
+
+@dataclass
+class ConfiguracionGenerador:
+    """Parámetros de la generación. Las tasas son proporciones entre 0 y 1."""
+    semilla: int = 42
+    destinos: int = 50
+    paquetes: int = 200
+    actividades_por_destino: int = 3
+    zipf: float = 1.1                 # Exponente de popularidad (0 = uniforme)
+    proporcion_destino: float = 0.2   # Reservas de destino individual (el resto, de paquete)
+    tasa_cancelacion: float = 0.12
+    tasa_pago: float = 0.70           # De las no canceladas, cuántas se pagaron
+    tasa_confirmacion: float = 0.60   # De las pagadas, cuántas confirmó el administrador
+    tasa_pago_fallido: float = 0.05   # Pagos rechazados antes del pago exitoso
+    dias_historia: int = 730
+    fecha_referencia: datetime = field(default_factory=lambda: datetime.combine(date.today(), time()))
+
+
+def _pesos_zipf(cantidad: int, exponente: float, rnd: random.Random) -> list[float]:
+    """Pesos acumulados Zipf con los rangos asignados al azar. Retorna Lista para random.choices(cum_weights=...)"""
+    rangos = list(range(1, cantidad + 1))
+    rnd.shuffle(rangos)
+    return list(itertools.accumulate(1 / rango ** exponente for rango in rangos))
+
+
+class GeneradorDatos:
+    """Genera datos reproducibles a partir de una configuración (o solo una semilla)."""
+
+    def __init__(self, configuracion: ConfiguracionGenerador | int | None = None, volcado: VolcadoCSV | None = None):
+        if not isinstance(configuracion, ConfiguracionGenerador):
+            configuracion = ConfiguracionGenerador(semilla=configuracion if configuracion is not None else 42)
+        self.config = configuracion
+        self.rnd = random.Random(configuracion.semilla)
+        self.volcado = volcado
+        self.prefijo = f"{configuracion.semilla:x}"[-4:]  # RUT/email únicos por semilla
+        self.ahora = configuracion.fecha_referencia
+        self.usuarios_ids: list[int] = []
+        self.paquetes: list[tuple[int, int]] = []  # (id, precio_total)
+        self.destinos: list[tuple[int, int]] = []  # (id, costo_base)
+        self._acumulado_paquetes: list[float] = []
+        self._acumulado_destinos: list[float] = []
+        self._dias, self._acumulado_dias = self._calendario_reservas()
+
+    def _calendario_reservas(self) -> tuple[list[datetime], list[float]]:
+        """Días del historial con su peso estacional acumulado. Retorna (dias, pesos_acumulados)"""
+        dias = [self.ahora - timedelta(days=d) for d in range(1, self.config.dias_historia + 1)]
+        pesos = (ESTACIONALIDAD_MES[d.month - 1] * ESTACIONALIDAD_DIA_SEMANA[d.weekday()] for d in dias)
+        return dias, list(itertools.accumulate(pesos))
+
+    def _volcar(self, tabla: str, filas) -> None:
+        if self.volcado:
+            self.volcado.escribir(tabla, filas)
+
+    def generar_usuarios(self, cantidad: int) -> list[int]:
+        """Crea usuarios CLIENTE. Retorna Lista de IDs creados"""
+        inicio = len(self.usuarios_ids)
+        usuarios = [
+            UsuarioDTO(
+                id=None,
+                rut=f"{self.prefijo}-{i}",
+                email=f"bench.{self.prefijo}.{i}@viajes-aventura.test",
+                password_hash=PASSWORD_HASH_BENCHMARK,
+                nombre=f"Cliente Benchmark {i}",
+                rol="CLIENTE",
+                fecha_registro=self.ahora - timedelta(days=self.rnd.randint(0, self.config.dias_historia)),
+            )
+            for i in range(inicio, inicio + cantidad)
+        ]
+        ids = UsuarioDAO().crear_lote(usuarios)
+        self.usuarios_ids.extend(ids)
+        self._volcar("Usuarios", ((i, u.rut, u.email, u.password_hash, u.nombre, u.rol, u.fecha_registro)
+                                  for i, u in zip(ids, usuarios)))
+        return ids
+
+    def generar_catalogo(self) -> None:
+        """Crea destinos, actividades, paquetes futuros (1 a 3 destinos cada uno) y sus relaciones"""
+        config = self.config
+        destinos = [
+            DestinoDTO(id=None, nombre=f"Destino {self.prefijo} {i}", descripcion="Destino generado para benchmark",
+                       costo_base=self.rnd.randrange(100_000, 1_500_000, 1_000),
+                       cupos_disponibles=CUPOS_BENCHMARK, politica_id=self.rnd.choice((1, 2)))
+            for i in range(config.destinos)
+        ]
+        destinos_ids = DestinoDAO().crear_lote(destinos)
+        self.destinos.extend(zip(destinos_ids, (d.costo_base for d in destinos)))
+        self._volcar("Destinos", ((i, d.nombre, d.descripcion, d.costo_base, d.cupos_disponibles, d.politica_id)
+                                  for i, d in zip(destinos_ids, destinos)))
+
+        actividades = [
+            ActividadDTO(id=None, nombre=f"Actividad {j} de {destino_id}", descripcion="Actividad generada para benchmark",
+                         duracion_horas=self.rnd.randint(1, 8), precio_base=self.rnd.randrange(10_000, 150_000, 1_000),
+                         destino_id=destino_id)
+            for destino_id in destinos_ids for j in range(config.actividades_por_destino)
+        ]
+        actividades_ids = ActividadDAO().crear_lote(actividades)
+        self._volcar("Actividades", ((i, a.nombre, a.descripcion, a.duracion_horas, a.precio_base, a.destino_id)
+                                     for i, a in zip(actividades_ids, actividades)))
+        actividades_por_destino = {}
+        for actividad_id, actividad in zip(actividades_ids, actividades):
+            actividades_por_destino.setdefault(actividad.destino_id, []).append(actividad_id)
+
+        paquetes = []
+        for i in range(config.paquetes):
+            # Inicio a 60+ días: las cancelaciones no chocan con los días de aviso de ninguna política
+            fecha_inicio = self.ahora + timedelta(days=self.rnd.randint(60, 400), hours=self.rnd.choice((8, 9, 10)))
+            paquetes.append(PaqueteDTO(
+                id=None, nombre=f"Paquete {self.prefijo} {i}", fecha_inicio=fecha_inicio,
+                fecha_fin=fecha_inicio + timedelta(days=self.rnd.randint(3, 21)),
+                precio_total=self.rnd.randrange(300_000, 4_000_000, 10_000),
+                cupos_disponibles=CUPOS_BENCHMARK, politica_id=self.rnd.choice((1, 2)),
+                descripcion="Paquete generado para benchmark",
+            ))
+        paquetes_ids = PaqueteDAO().crear_lote(paquetes)
+        self.paquetes.extend(zip(paquetes_ids, (p.precio_total for p in paquetes)))
+        self._volcar("Paquetes", ((i, p.nombre, p.descripcion, p.fecha_inicio, p.fecha_fin, p.precio_total,
+                                   p.cupos_disponibles, p.politica_id) for i, p in zip(paquetes_ids, paquetes)))
+
+        paquete_destinos, paquete_actividades = [], []
+        for paquete_id in paquetes_ids:
+            recorrido = self.rnd.sample(destinos_ids, min(len(destinos_ids), self.rnd.randint(1, 3)))
+            for orden, destino_id in enumerate(recorrido, start=1):
+                paquete_destinos.append((paquete_id, destino_id, orden))
+                disponibles = actividades_por_destino.get(destino_id, [])
+                paquete_actividades.extend((paquete_id, a) for a in self.rnd.sample(disponibles, min(len(disponibles), 2)))
+        CatalogoDAO().upsert_paquete_destinos(paquete_destinos)
+        CatalogoDAO().insertar_paquete_actividades(paquete_actividades)
+        self._volcar("Paquete_Destino", paquete_destinos)
+        self._volcar("Paquete_Actividad", paquete_actividades)
+
+        self._acumulado_paquetes = _pesos_zipf(len(self.paquetes), config.zipf, self.rnd)
+        self._acumulado_destinos = _pesos_zipf(len(self.destinos), config.zipf, self.rnd)
+
+    def _fecha_reserva(self) -> datetime:
+        """Fecha de reserva estacional dentro del historial. Retorna datetime"""
+        dia = self.rnd.choices(self._dias, cum_weights=self._acumulado_dias)[0]
+        hora = self.rnd.choices(range(24), weights=PESO_HORA)[0]
+        return dia + timedelta(hours=hora, minutes=self.rnd.randrange(60), seconds=self.rnd.randrange(60))
+
+    def _estado_reserva(self) -> tuple[str, bool]:
+        """Sortea el estado según las tasas configuradas. Retorna (estado, tuvo_pago)"""
+        config = self.config
+        if self.rnd.random() < config.tasa_cancelacion:
+            return "CANCELADA", self.rnd.random() < config.tasa_pago  # Algunas se cancelan después de pagar
+        if self.rnd.random() >= config.tasa_pago:
+            return "PENDIENTE", False
+        return ("CONFIRMADA" if self.rnd.random() < config.tasa_confirmacion else "PAGADA"), True
+
+    def _reserva_aleatoria(self, estado: str, fecha_reserva: datetime) -> ReservaDTO:
+        """Arma una reserva de paquete o de destino (respeta el CHECK paquete XOR destino). Retorna ReservaDTO"""
+        personas = self.rnd.choices((1, 2, 3, 4, 5, 6), weights=(25, 40, 12, 15, 4, 4))[0]
+        usuario_id = self.rnd.choice(self.usuarios_ids)
+        if self.rnd.random() >= self.config.proporcion_destino:
+            paquete_id, precio = self.rnd.choices(self.paquetes, cum_weights=self._acumulado_paquetes)[0]
+            return ReservaDTO(None, fecha_reserva, estado, precio * personas, personas, usuario_id, paquete_id=paquete_id)
+        destino_id, costo = self.rnd.choices(self.destinos, cum_weights=self._acumulado_destinos)[0]
+        return ReservaDTO(None, fecha_reserva, estado, costo * personas, personas, usuario_id, destino_id=destino_id)
+
+    def _pagos_reserva(self, reserva_id: int, reserva: ReservaDTO) -> list[PagoDTO]:
+        """Pagos de una reserva pagada: eventualmente uno FALLIDO y luego el COMPLETADO. Retorna Lista de PagoDTO"""
+        pagos = []
+        fecha_pago = min(self.ahora, reserva.fecha_reserva + timedelta(minutes=self.rnd.randint(5, 72 * 60)))
+        if self.rnd.random() < self.config.tasa_pago_fallido:
+            fecha_fallido = max(reserva.fecha_reserva, fecha_pago - timedelta(minutes=self.rnd.randint(1, 60)))
+            pagos.append(PagoDTO(None, reserva.monto_total, fecha_fallido, self.rnd.choice(METODOS_PAGO), reserva_id, "FALLIDO"))
+        pagos.append(PagoDTO(None, reserva.monto_total, fecha_pago, self.rnd.choice(METODOS_PAGO), reserva_id, "COMPLETADO"))
+        return pagos
+
+    def completar_reservas(self, total_objetivo: int) -> int:
+        """Agrega reservas históricas (y sus pagos) hasta total_objetivo. Retorna Reservas creadas"""
+        faltantes = max(0, total_objetivo - contar_reservas())
+        creadas = 0
+        while creadas < faltantes:
+            tanda = min(BLOQUE_GENERACION, faltantes - creadas)
+            reservas, pagadas = [], []
+            for _ in range(tanda):
+                estado, tuvo_pago = self._estado_reserva()
+                reservas.append(self._reserva_aleatoria(estado, self._fecha_reserva()))
+                pagadas.append(tuvo_pago)
+            with transaccion():
+                ids = ReservaDAO().crear_lote(reservas)
+                pagos = [pago for reserva_id, reserva, pagada in zip(ids, reservas, pagadas) if pagada
+                         for pago in self._pagos_reserva(reserva_id, reserva)]
+                pagos_ids = PagoDAO().crear_lote(pagos)
+            self._volcar("Reservas", ((i, r.fecha_reserva, r.estado, r.monto_total, r.numero_personas, r.usuario_id,
+                                       r.paquete_id, r.destino_id) for i, r in zip(ids, reservas)))
+            self._volcar("Pagos", ((i, p.monto, p.fecha_pago, p.metodo, p.estado, p.reserva_id) for i, p in zip(pagos_ids, pagos)))
+            creadas += tanda
+        return creadas
+
+    def crear_reservas_pendientes(self, cantidad: int) -> list[int]:
+        """Crea reservas PENDIENTE de paquetes futuros (candidatas a pago o cancelación). Retorna Lista de IDs"""
+        reservas = []
+        for _ in range(cantidad):
+            personas = self.rnd.randint(1, 4)
+            paquete_id, precio = self.rnd.choices(self.paquetes, cum_weights=self._acumulado_paquetes)[0]
+            reservas.append(ReservaDTO(None, datetime.now(), "PENDIENTE", precio * personas, personas,
+                                       self.rnd.choice(self.usuarios_ids), paquete_id=paquete_id))
+        return ReservaDAO().crear_lote(reservas)
+
+
+def contar_reservas() -> int:
+    """Cuenta las reservas existentes. Retorna Número de reservas"""
+    fila = ejecutar_consulta_uno("SELECT COUNT(*) AS total FROM Reservas")
+    return int(fila['total']) if fila else 0
@@ -0,0 +1,69 @@
+"""Medición de latencia y throughput de una operación con N hilos concurrentes."""
+
+import threading
+import time
+
+from src.config.db_connection import cerrar_conexion
+
+# Con menos muestras el p99 por rango más cercano es simplemente la mayor, así que no se informa
+MIN_MUESTRAS_P99 = 100
+
+
+def percentil(valores_ordenados: list[float], p: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada. Retorna el valor o 0.0 si está vacía"""
+    if not valores_ordenados:
+        return 0.0
+    indice = max(0, min(len(valores_ordenados) - 1, round(p / 100 * len(valores_ordenados)) - 1))
+    return valores_ordenados[indice]
+
+
+def medir(operacion, argumentos: list, concurrencia: int = 1) -> dict:
+    """Ejecuta operacion(arg) para cada argumento repartiendo el trabajo entre `concurrencia` hilos.
+    Cada hilo usa su propia conexión. Retorna dict con throughput, p50, p99 (solo con MIN_MUESTRAS_P99 o más) y errores"""
+    pendientes = iter(argumentos)
+    bloqueo = threading.Lock()
+    latencias: list[float] = []
+    errores: list[str] = []
+
+    def trabajador():
+        propias = []
+        try:
+            while True:
+                with bloqueo:
+                    argumento = next(pendientes, StopIteration)
+                if argumento is StopIteration:
+                    break
+                inicio = time.perf_counter()
+                try:
+                    operacion(argumento)
+                except Exception as e:
+                    with bloqueo:
+                        errores.append(f"{type(e).__name__}: {e}")
+                    continue
+                propias.append(time.perf_counter() - inicio)
+        finally:
+            cerrar_conexion()
+            with bloqueo:
+                latencias.extend(propias)
+
+    hilos = [threading.Thread(target=trabajador) for _ in range(concurrencia)]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    duracion = time.perf_counter() - inicio
+
+    latencias.sort()
+    medida = {
+        'operaciones': len(latencias),
+        'errores': len(errores),
+        'primer_error': errores[0] if errores else None,
+        'duracion_s': round(duracion, 4),
+        'throughput_ops_s': round(len(latencias) / duracion, 2) if duracion > 0 else 0.0,
+        'p50_ms': round(percentil(latencias, 50) * 1000, 3),
+        'max_ms': round(latencias[-1] * 1000, 3) if latencias else 0.0,
+    }
+    if len(latencias) >= MIN_MUESTRAS_P99:
+        medida['p99_ms'] = round(percentil(latencias, 99) * 1000, 3)
+    return medida
@@ -0,0 +1,94 @@
+"""Volcado a CSV de los datos generados y recarga rápida.
+
+El volcado guarda las filas con sus IDs definitivos (un CSV por tabla) y un script
+cargar_mysql.sql con LOAD DATA LOCAL INFILE. También se puede recargar con
+`python -m benchmarks cargar <directorio>`, que usa ejecutar_lote y sirve para cualquier backend.
+La base de destino debe partir del mismo estado que la de origen (init_db.sql).
+"""
+
+import csv
+import os
+from datetime import date
+
+from src.config.db_connection import ejecutar_lote, transaccion
+
+NULO_CSV = "\\N"  # Representación de NULL que entiende LOAD DATA de MySQL
+# Tablas en orden de carga (respeta las claves foráneas) y columnas de cada CSV
+TABLAS_VOLCADO = {
+    "Usuarios": ("id", "rut", "email", "password_hash", "nombre", "rol", "fecha_registro"),
+    "Destinos": ("id", "nombre", "descripcion", "costo_base", "cupos_disponibles", "politica_id"),
+    "Actividades": ("id", "nombre", "descripcion", "duracion_horas", "precio_base", "destino_id"),
+    "Paquetes": ("id", "nombre", "descripcion", "fecha_inicio", "fecha_fin", "precio_total", "cupos_disponibles", "politica_id"),
+    "Paquete_Destino": ("paquete_id", "destino_id", "orden_visita"),
+    "Paquete_Actividad": ("paquete_id", "actividad_id"),
+    "Reservas": ("id", "fecha_reserva", "estado", "monto_total", "numero_personas", "usuario_id", "paquete_id", "destino_id"),
+    "Pagos": ("id", "monto", "fecha_pago", "metodo", "estado", "reserva_id"),
+}
+SCRIPT_MYSQL = "cargar_mysql.sql"
+
+
+def _valor_csv(valor):
+    """Convierte un valor Python a su forma en el CSV. Retorna string o número"""
+    if valor is None:
+        return NULO_CSV
+    if isinstance(valor, date):
+        return valor.isoformat(" ") if hasattr(valor, "hour") else valor.isoformat()
+    return valor
+
+
+class VolcadoCSV:
+    """Escribe filas por tabla en <directorio>/<Tabla>.csv a medida que se generan."""
+
+    def __init__(self, directorio: str):
+        self.directorio = directorio
+        os.makedirs(directorio, exist_ok=True)
+        self._archivos = {}
+        self._escritores = {}
+
+    def escribir(self, tabla: str, filas) -> None:
+        """Agrega filas (tuplas en el orden de TABLAS_VOLCADO[tabla]) al CSV de la tabla"""
+        if tabla not in self._escritores:
+            archivo = open(os.path.join(self.directorio, f"{tabla}.csv"), "w", newline="", encoding="utf-8")
+            self._archivos[tabla] = archivo
+            self._escritores[tabla] = csv.writer(archivo)
+            self._escritores[tabla].writerow(TABLAS_VOLCADO[tabla])
+        self._escritores[tabla].writerows([_valor_csv(v) for v in fila] for fila in filas)
+
+    def cerrar(self) -> None:
+        """Cierra los CSV y escribe el script de carga para MySQL"""
+        for archivo in self._archivos.values():
+            archivo.close()
+        lineas = ["SET FOREIGN_KEY_CHECKS = 0;"]
+        for tabla, columnas in TABLAS_VOLCADO.items():
+            if tabla in self._archivos:
+                lineas.append(
+                    f"LOAD DATA LOCAL INFILE '{tabla}.csv' INTO TABLE {tabla} CHARACTER SET utf8mb4 "
+                    f"FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' LINES TERMINATED BY '\\r\\n' "
+                    f"IGNORE 1 LINES ({', '.join(columnas)});"
+                )
+        lineas.append("SET FOREIGN_KEY_CHECKS = 1;")
+        with open(os.path.join(self.directorio, SCRIPT_MYSQL), "w", encoding="utf-8") as script:
+            script.write("\n".join(lineas) + "\n")
+
+
+def cargar_volcado(directorio: str, chunk_size: int = 5_000) -> dict[str, int]:
+    """Inserta los CSV de un volcado (con sus IDs) en una sola transacción. Retorna dict tabla -> filas cargadas"""
+    cargadas = {}
+    with transaccion():
+        for tabla, columnas in TABLAS_VOLCADO.items():
+            ruta = os.path.join(directorio, f"{tabla}.csv")
+            if not os.path.exists(ruta):
+                continue
+            sql = f"INSERT INTO {tabla} ({', '.join(columnas)}) VALUES ({', '.join(['%s'] * len(columnas))})"
+            cargadas[tabla] = 0
+            with open(ruta, newline="", encoding="utf-8") as archivo:
+                lector = csv.reader(archivo)
+                next(lector)  # Encabezado
+                bloque = []
+                for fila in lector:
+                    bloque.append(tuple(None if v == NULO_CSV else v for v in fila))
+                    if len(bloque) == chunk_size:
+                        cargadas[tabla] += ejecutar_lote(sql, bloque, chunk_size)['filas_afectadas']
+                        bloque = []
+                cargadas[tabla] += ejecutar_lote(sql, bloque, chunk_size)['filas_afectadas']
+    return cargadas
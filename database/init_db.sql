@@ -147,7 +147,7 @@ CREATE TABLE Paquete_Actividad (
 CREATE TABLE Reservas (
     id INT AUTO_INCREMENT PRIMARY KEY,
     fecha_reserva DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-    estado ENUM('PENDIENTE', 'CONFIRMADA', 'CANCELADA', 'PAGADA') NOT NULL DEFAULT 'PENDIENTE',
+    estado ENUM('PENDIENTE', 'CONFIRMADA', 'CANCELADA', 'PAGADA', 'COMPLETADA') NOT NULL DEFAULT 'PENDIENTE',
     monto_total INT NOT NULL,
     numero_personas INT NOT NULL,
     usuario_id INT NOT NULL,
@@ -184,6 +184,39 @@ CREATE TABLE Pagos (
     INDEX idx_fecha (fecha_pago)
 ) ENGINE=InnoDB;
 
+-- ============================================
+-- Tablas históricas (archivo)
+-- Reservas COMPLETADA/CANCELADA antiguas y sus pagos, movidas fuera de las
+-- tablas activas por "python -m src.cli historico archivar". Conservan el ID
+-- original y no tienen claves foráneas (el archivo no bloquea borrados).
+-- ============================================
+CREATE TABLE Reservas_Historico (
+    id INT PRIMARY KEY,
+    fecha_reserva DATETIME NOT NULL,
+    estado ENUM('PENDIENTE', 'CONFIRMADA', 'CANCELADA', 'PAGADA', 'COMPLETADA') NOT NULL,
+    monto_total INT NOT NULL,
+    numero_personas INT NOT NULL,
+    usuario_id INT NOT NULL,
+    paquete_id INT NULL,
+    destino_id INT NULL,
+    fecha_archivado DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_usuario (usuario_id),
+    INDEX idx_estado (estado),
+    INDEX idx_fecha (fecha_reserva)
+) ENGINE=InnoDB;
+
+CREATE TABLE Pagos_Historico (
+    id INT PRIMARY KEY,
+    monto INT NOT NULL,
+    fecha_pago DATETIME NOT NULL,
+    metodo ENUM('EFECTIVO', 'TARJETA', 'TRANSFERENCIA') NOT NULL,
+    estado ENUM('PENDIENTE', 'COMPLETADO', 'FALLIDO') NOT NULL,
+    reserva_id INT NOT NULL,
+    fecha_archivado DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_reserva (reserva_id),
+    INDEX idx_fecha (fecha_pago)
+) ENGINE=InnoDB;
+
 -- ============================================
 -- Inserción de datos iniciales
 -- ============================================
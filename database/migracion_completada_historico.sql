@@ -0,0 +1,46 @@
+-- ============================================
+-- Migración para bases creadas con una versión anterior de init_db.sql
+-- (MySQL; con DB_BACKEND=sqlite el esquema se crea completo al conectar)
+--
+-- 1. Estado 'COMPLETADA' de las reservas, usado por "python -m src.cli reservas completar".
+--    Sin él, según el sql_mode, el UPDATE falla o guarda el estado truncado.
+-- 2. Tablas históricas de "python -m src.cli historico archivar".
+--
+-- Se puede ejecutar más de una vez:
+--     mysql -u admin_aventura -p < database/migracion_completada_historico.sql
+-- ============================================
+USE viajes_aventura;
+
+ALTER TABLE Reservas
+    MODIFY estado ENUM('PENDIENTE', 'CONFIRMADA', 'CANCELADA', 'PAGADA', 'COMPLETADA') NOT NULL DEFAULT 'PENDIENTE';
+
+CREATE TABLE IF NOT EXISTS Reservas_Historico (
+    id INT PRIMARY KEY,
+    fecha_reserva DATETIME NOT NULL,
+    estado ENUM('PENDIENTE', 'CONFIRMADA', 'CANCELADA', 'PAGADA', 'COMPLETADA') NOT NULL,
+    monto_total INT NOT NULL,
+    numero_personas INT NOT NULL,
+    usuario_id INT NOT NULL,
+    paquete_id INT NULL,
+    destino_id INT NULL,
+    fecha_archivado DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_usuario (usuario_id),
+    INDEX idx_estado (estado),
+    INDEX idx_fecha (fecha_reserva)
+) ENGINE=InnoDB;
+
+-- Por si la tabla histórica ya existía sin 'COMPLETADA'
+ALTER TABLE Reservas_Historico
+    MODIFY estado ENUM('PENDIENTE', 'CONFIRMADA', 'CANCELADA', 'PAGADA', 'COMPLETADA') NOT NULL;
+
+CREATE TABLE IF NOT EXISTS Pagos_Historico (
+    id INT PRIMARY KEY,
+    monto INT NOT NULL,
+    fecha_pago DATETIME NOT NULL,
+    metodo ENUM('EFECTIVO', 'TARJETA', 'TRANSFERENCIA') NOT NULL,
+    estado ENUM('PENDIENTE', 'COMPLETADO', 'FALLIDO') NOT NULL,
+    reserva_id INT NOT NULL,
+    fecha_archivado DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_reserva (reserva_id),
+    INDEX idx_fecha (fecha_pago)
+) ENGINE=InnoDB;
@@ -10,10 +10,16 @@ Integrantes: Maria Jesus Perez, Maria Isabel Rubio
 
 Ejecución:
     python main.py
+    python main.py --profile    # o VIAJES_PROFILE=1: perfil de la sesión en logs/
 """
 
+import argparse
+import os
+
 from src.config.db_connection import cerrar_conexion, obtener_conexion
 from src.ui.menu_principal import opcion_login, opcion_registro
+from src.utils.metricas import iniciar_servidor_desde_entorno
+from src.utils.perfilado import SesionPerfilada
 from src.utils import (
     MSG_ERROR_OPCION_INVALIDA,
     leer_opcion,
@@ -60,6 +66,9 @@ def main():
             pausar()
             return
         
+        servidor_metricas = iniciar_servidor_desde_entorno()
+        if servidor_metricas:
+            print(f"Métricas disponibles en http://localhost:{servidor_metricas.server_port}/metrics")
         pausar()
         
         # Loop principal del menú
@@ -102,5 +111,21 @@ def main():
             print(f"Error al cerrar las conexiones: {e}")
 
 
+def ejecutar(argv: list[str] | None = None):
+    """Lee los argumentos de línea de comandos e inicia la aplicación, perfilada si se pidió."""
+    parser = argparse.ArgumentParser(description="Sistema de Reservas - Viajes Aventura")
+    parser.add_argument("--profile", action="store_true",
+                        help="Perfilar la sesión (cProfile y tiempo de BD por acción de menú)")
+    parser.add_argument("--profile-dir", default="logs", help="Directorio del reporte de perfilado")
+    args = parser.parse_args(argv)
+
+    if not (args.profile or os.getenv("VIAJES_PROFILE") == "1"):
+        main()
+        return
+    with SesionPerfilada(args.profile_dir) as sesion:
+        main()
+    print(f"Perfil de la sesión guardado en {sesion.guardar()}")
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    ejecutar()
\ No newline at end of file
@@ -0,0 +1,12 @@
+"""API HTTP/JSON sobre los servicios de negocio (python -m src.api)."""
+
+from src.api.servidor import ServidorAPI
+
+
+def crear_servidor(host: str = "127.0.0.1", puerto: int = 8080, workers: int | None = None) -> ServidorAPI:
+    """Crea el servidor con todas las rutas registradas (puerto 0 = libre). Retorna ServidorAPI"""
+    from src.api.rutas import enrutador
+    return ServidorAPI((host, puerto), enrutador, workers)
+
+
+__all__ = ["ServidorAPI", "crear_servidor"]
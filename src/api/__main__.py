@@ -0,0 +1,52 @@
+"""Servidor de la API HTTP/JSON.
+
+Ejecución:
+    python -m src.api [--host 127.0.0.1] [--puerto 8080] [--workers N]
+
+Variables de entorno:
+    API_WORKERS         Hilos/conexiones a BD que atienden peticiones (por defecto 2 por núcleo)
+    API_SECRETO         Clave para firmar los tokens (si falta, se genera una por proceso)
+    API_TOKEN_HORAS     Vigencia de los tokens (por defecto 8)
+    API_LOG_PETICIONES  1 para registrar cada petición en stderr
+    METRICS_PORT        Puerto del endpoint /metrics de Prometheus (separado de la API; ver src.utils.metricas)
+"""
+
+import argparse
+import sys
+
+from src.api import crear_servidor
+from src.config.db_connection import cerrar_conexion
+from src.utils.metricas import iniciar_servidor_desde_entorno
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    """Construye el parser de argumentos. Retorna ArgumentParser"""
+    parser = argparse.ArgumentParser(prog="python -m src.api", description="API HTTP/JSON de Viajes Aventura")
+    parser.add_argument("--host", default="127.0.0.1", help="Interfaz donde escuchar (por defecto 127.0.0.1)")
+    parser.add_argument("--puerto", type=int, default=8080, help="Puerto TCP (por defecto 8080)")
+    parser.add_argument("--workers", type=int, help="Hilos de atención (por defecto API_WORKERS o 2 por núcleo)")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Punto de entrada del servidor. Retorna código de salida"""
+    args = crear_parser().parse_args(argv)
+    servidor = crear_servidor(args.host, args.puerto, args.workers)
+    print(f"API escuchando en http://{args.host}:{servidor.server_address[1]} ({servidor.workers} workers)")
+    servidor_metricas = iniciar_servidor_desde_entorno()
+    if servidor_metricas:
+        print(f"Métricas disponibles en http://{servidor_metricas.server_address[0]}:{servidor_metricas.server_port}/metrics")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\nDeteniendo servidor...")
+    finally:
+        servidor.server_close()
+        if servidor_metricas:
+            servidor_metricas.shutdown()
+        cerrar_conexion()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
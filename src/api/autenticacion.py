@@ -0,0 +1,52 @@
+"""Tokens de sesión de la API.
+
+Token firmado con HMAC-SHA256 sobre un payload JSON (id, rol, expiración), sin estado en el
+servidor ni dependencias externas. El secreto se toma de API_SECRETO; si no está definido se
+genera uno al iniciar el proceso (los tokens dejan de valer al reiniciar).
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import time
+
+from src.dto.usuario_dto import UsuarioDTO
+from src.utils.exceptions import AutenticacionError
+
+_SECRETO = os.getenv("API_SECRETO", "").encode("utf-8") or secrets.token_bytes(32)
+DURACION_TOKEN_S = int(os.getenv("API_TOKEN_HORAS", "8")) * 3600
+
+
+def _b64(datos: bytes) -> str:
+    return base64.urlsafe_b64encode(datos).rstrip(b"=").decode("ascii")
+
+
+def _desde_b64(texto: str) -> bytes:
+    return base64.urlsafe_b64decode(texto + "=" * (-len(texto) % 4))
+
+
+def _firmar(payload: str) -> str:
+    return _b64(hmac.new(_SECRETO, payload.encode("ascii"), hashlib.sha256).digest())
+
+
+def emitir_token(usuario: UsuarioDTO) -> str:
+    """Genera el token de sesión del usuario. Retorna string"""
+    payload = _b64(json.dumps({'id': usuario.id, 'rol': usuario.rol, 'exp': int(time.time()) + DURACION_TOKEN_S}).encode("utf-8"))
+    return f"{payload}.{_firmar(payload)}"
+
+
+def verificar_token(token: str) -> dict:
+    """Valida firma y expiración. Retorna dict con id y rol del usuario"""
+    try:
+        payload, firma = token.split(".")
+        if not hmac.compare_digest(firma, _firmar(payload)):
+            raise AutenticacionError("Token inválido")
+        datos = json.loads(_desde_b64(payload))
+    except (ValueError, UnicodeError):
+        raise AutenticacionError("Token inválido")
+    if datos['exp'] < time.time():
+        raise AutenticacionError("Token expirado")
+    return {'id': datos['id'], 'rol': datos['rol']}
@@ -0,0 +1,216 @@
+"""Endpoints de la API sobre los servicios de negocio.
+
+Cada manejador recibe una Peticion y retorna los datos a serializar (o una tupla
+(codigo_http, datos)). Los listados aceptan ?pagina=&por_pagina= y responden con el formato
+de resultado_paginado. Los clientes solo ven y operan sus propias reservas y pagos.
+"""
+
+from src.api.autenticacion import emitir_token
+from src.api.servidor import Enrutador, Peticion
+from src.business.actividad_service import ActividadService
+from src.business.auth_service import AuthService
+from src.business.busqueda_service import BusquedaService
+from src.business.destino_service import DestinoService
+from src.business.pago_service import PagoService
+from src.business.paquete_service import PaqueteService
+from src.business.reserva_service import ReservaService
+from src.business.usuario_service import UsuarioService
+from src.dto.reserva_dto import ReservaDTO
+from src.utils.constants import LIMITE_BUSQUEDA_DEFECTO, POR_PAGINA_DEFECTO, POR_PAGINA_MAXIMO
+from src.utils.exceptions import PermisoError, RecursoNoEncontradoError, ValidacionError
+
+ROL_ADMIN = 'ADMIN'
+
+enrutador = Enrutador()
+auth_service = AuthService()
+reserva_service = ReservaService()
+pago_service = PagoService()
+paquete_service = PaqueteService()
+destino_service = DestinoService()
+actividad_service = ActividadService()
+busqueda_service = BusquedaService()
+usuario_service = UsuarioService()
+
+
+def _paginacion(peticion: Peticion) -> tuple[int, int]:
+    """Lee ?pagina= y ?por_pagina=. Retorna tupla (pagina, por_pagina)"""
+    return peticion.entero("pagina", 1), peticion.entero("por_pagina", POR_PAGINA_DEFECTO)
+
+
+def _reserva_propia(peticion: Peticion, reserva_id: int) -> ReservaDTO:
+    """Obtiene la reserva verificando que pertenezca al usuario (o que sea admin). Retorna ReservaDTO"""
+    reserva = reserva_service.obtener_reserva(reserva_id)
+    if not reserva:
+        raise RecursoNoEncontradoError(f"No existe una reserva con ID {reserva_id}")
+    if not peticion.es_admin and reserva.usuario_id != peticion.usuario['id']:
+        raise PermisoError("La reserva no pertenece al usuario")
+    return reserva
+
+
+# ===== AUTENTICACIÓN =====
+
+@enrutador.ruta("GET", "/api/salud", autenticado=False)
+def salud(peticion: Peticion):
+    return {'estado': 'ok'}
+
+
+@enrutador.ruta("POST", "/api/auth/login", autenticado=False)
+def login(peticion: Peticion):
+    usuario = auth_service.login(peticion.requerido("email"), peticion.requerido("password"))
+    return {'token': emitir_token(usuario), 'usuario': usuario}
+
+
+@enrutador.ruta("POST", "/api/auth/registro", autenticado=False)
+def registro(peticion: Peticion):
+    # El rol no se acepta desde el cuerpo: los registros públicos siempre son CLIENTE
+    usuario = auth_service.registrar_usuario(
+        peticion.requerido("rut"), peticion.requerido("email"),
+        peticion.requerido("password"), peticion.requerido("nombre"))
+    return 201, {'token': emitir_token(usuario), 'usuario': usuario}
+
+
+# ===== CATÁLOGO =====
+
+@enrutador.ruta("GET", "/api/destinos", autenticado=False)
+def listar_destinos(peticion: Peticion):
+    return destino_service.listar_destinos_pagina(*_paginacion(peticion))
+
+
+@enrutador.ruta("GET", "/api/destinos/{id}", autenticado=False)
+def obtener_destino(peticion: Peticion):
+    destino = destino_service.obtener_destino(peticion.parametros['id'])
+    if not destino:
+        raise RecursoNoEncontradoError(f"No existe un destino con ID {peticion.parametros['id']}")
+    return {'destino': destino, 'actividades': actividad_service.listar_actividades_por_destino(destino.id)}
+
+
+@enrutador.ruta("GET", "/api/paquetes", autenticado=False)
+def listar_paquetes(peticion: Peticion):
+    return paquete_service.listar_paquetes_pagina(*_paginacion(peticion))
+
+
+@enrutador.ruta("GET", "/api/paquetes/disponibles", autenticado=False)
+def paquetes_en_fechas(peticion: Peticion):
+    return paquete_service.listar_paquetes_en_fechas(
+        peticion.consulta.get("desde"), peticion.consulta.get("hasta"), peticion.entero("cupos", 1))
+
+
+@enrutador.ruta("GET", "/api/paquetes/busqueda", autenticado=False)
+def buscar_paquetes(peticion: Peticion):
+    pagina, por_pagina = _paginacion(peticion)
+    return paquete_service.buscar_paquetes(
+        fecha_desde=peticion.consulta.get("desde"),
+        fecha_hasta=peticion.consulta.get("hasta"),
+        precio_min=peticion.entero("precio_min"),
+        precio_max=peticion.entero("precio_max"),
+        con_iva=peticion.consulta.get("con_iva", "").lower() in ("1", "true", "si"),
+        cupos_minimos=peticion.entero("cupos", 1),
+        destino_id=peticion.entero("destino_id"),
+        politica_id=peticion.entero("politica_id"),
+        orden=peticion.consulta.get("orden") or 'precio',
+        pagina=pagina,
+        por_pagina=por_pagina,
+    )
+
+
+@enrutador.ruta("GET", "/api/paquetes/{id}", autenticado=False)
+def obtener_paquete(peticion: Peticion):
+    paquete = paquete_service.obtener_paquete(peticion.parametros['id'])
+    if not paquete:
+        raise RecursoNoEncontradoError(f"No existe un paquete con ID {peticion.parametros['id']}")
+    return {
+        'paquete': paquete,
+        'destinos': paquete_service.obtener_destinos_paquete(paquete.id),
+        'actividades': paquete_service.obtener_actividades_paquete(paquete.id),
+    }
+
+
+@enrutador.ruta("GET", "/api/actividades", autenticado=False)
+def listar_actividades(peticion: Peticion):
+    return actividad_service.listar_actividades_pagina(*_paginacion(peticion), destino_id=peticion.entero("destino_id"))
+
+
+@enrutador.ruta("GET", "/api/busqueda", autenticado=False)
+def buscar_catalogo(peticion: Peticion):
+    tipos = tuple(t for t in peticion.consulta.get("tipo", "").split(",") if t) or None
+    limite = min(peticion.entero("limite", LIMITE_BUSQUEDA_DEFECTO), POR_PAGINA_MAXIMO)
+    return busqueda_service.buscar(peticion.consulta.get("q", ""), tipos, limite)
+
+
+# ===== RESERVAS =====
+
+@enrutador.ruta("GET", "/api/reservas")
+def listar_reservas(peticion: Peticion):
+    # Admin: todas (filtro opcional ?cliente_id=); cliente: solo las propias
+    cliente_id = peticion.entero("cliente_id") if peticion.es_admin else peticion.usuario['id']
+    return reserva_service.listar_reservas_pagina(*_paginacion(peticion), cliente_id=cliente_id,
+                                                  estado=peticion.consulta.get("estado") or None)
+
+
+@enrutador.ruta("POST", "/api/reservas")
+def crear_reserva(peticion: Peticion):
+    paquete_id, destino_id = peticion.cuerpo.get("paquete_id"), peticion.cuerpo.get("destino_id")
+    if bool(paquete_id) == bool(destino_id):
+        raise ValidacionError("Debe indicar paquete_id o destino_id (solo uno)")
+    num_personas = peticion.requerido("num_personas")
+    if not all(isinstance(v, int) for v in (paquete_id or destino_id, num_personas)):
+        raise ValidacionError("Los IDs y num_personas deben ser números enteros")
+    if paquete_id:
+        reserva_id = reserva_service.crear_reserva_paquete(peticion.usuario['id'], paquete_id, num_personas)
+    else:
+        reserva_id = reserva_service.crear_reserva_destino(peticion.usuario['id'], destino_id, num_personas)
+    return 201, reserva_service.obtener_reserva(reserva_id)
+
+
+@enrutador.ruta("GET", "/api/reservas/{id}")
+def obtener_reserva(peticion: Peticion):
+    return _reserva_propia(peticion, peticion.parametros['id'])
+
+
+@enrutador.ruta("POST", "/api/reservas/{id}/cancelar")
+def cancelar_reserva(peticion: Peticion):
+    reserva = _reserva_propia(peticion, peticion.parametros['id'])
+    return reserva_service.cancelar_reserva(reserva.id, mostrar_detalle=False)
+
+
+@enrutador.ruta("POST", "/api/reservas/{id}/confirmar", rol=ROL_ADMIN)
+def confirmar_reserva(peticion: Peticion):
+    reserva_service.confirmar_reserva(peticion.parametros['id'])
+    return reserva_service.obtener_reserva(peticion.parametros['id'])
+
+
+# ===== PAGOS =====
+
+@enrutador.ruta("POST", "/api/pagos")
+def procesar_pago(peticion: Peticion):
+    reserva = _reserva_propia(peticion, peticion.requerido("reserva_id"))
+    pago_id = pago_service.procesar_pago(reserva.id, peticion.requerido("metodo_pago"))
+    return 201, {'pago_id': pago_id, 'reserva_id': reserva.id}
+
+
+@enrutador.ruta("GET", "/api/pagos")
+def historial_pagos(peticion: Peticion):
+    reserva_id = peticion.entero("reserva_id")
+    if reserva_id is None:
+        raise ValidacionError("El parámetro 'reserva_id' es requerido")
+    reserva = _reserva_propia(peticion, reserva_id)
+    return pago_service.obtener_historial_pagos(reserva.id)
+
+
+@enrutador.ruta("GET", "/api/reportes/ventas", rol=ROL_ADMIN)
+def reporte_ventas(peticion: Peticion):
+    desde, hasta = peticion.consulta.get("desde"), peticion.consulta.get("hasta")
+    if not desde or not hasta:
+        raise ValidacionError("Los parámetros 'desde' y 'hasta' son requeridos")
+    pagina = pago_service.listar_pagos_pagina(*_paginacion(peticion), fecha_inicio=desde, fecha_fin=hasta)
+    return {
+        'fecha_inicio': desde,
+        'fecha_fin': hasta,
+        'total': pago_service.pago_dao.obtener_total_por_periodo(desde, hasta) or 0,
+        'pagos': pagina,
+    }
+
+
+@enrutador.ruta("GET", "/api/reportes/clientes", rol=ROL_ADMIN)
+def reporte_clientes(peticion: Peticion):
+    return usuario_service.reporte_clientes(peticion.consulta.get("orden") or 'gasto', *_paginacion(peticion))
@@ -0,0 +1,235 @@
+"""Servidor HTTP/JSON de la API (solo biblioteca estándar).
+
+Modelo de workers: el hilo principal acepta conexiones y las reparte a un pool fijo de hilos
+(API_WORKERS, por defecto 2 por núcleo). Cada worker conserva su conexión a la base de datos
+entre peticiones (las conexiones de db_connection son locales al hilo), así que el pool de
+workers es también el pool de conexiones. Las respuestas de 1 KB o más se comprimen con gzip
+si el cliente lo acepta.
+"""
+
+import gzip
+import json
+import os
+import re
+import time
+import traceback
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from src.api.autenticacion import verificar_token
+from src.config.db_async import PoolConexiones
+from src.dto.mapeo import a_dict
+from src.utils.exceptions import (
+    AutenticacionError,
+    PermisoError,
+    RecursoNoEncontradoError,
+    ReservaError,
+    ValidacionError,
+)
+from src.utils.metricas import duracion_peticiones_api
+from src.utils.tracing import span
+
+MIN_BYTES_GZIP = 1024
+MAX_BYTES_CUERPO = 1024 * 1024
+TIPO_JSON = "application/json; charset=utf-8"
+# Excepciones de negocio -> código HTTP (el resto es 500)
+CODIGOS_ERROR = (
+    (ValidacionError, 400),
+    (ReservaError, 400),
+    (AutenticacionError, 401),
+    (PermisoError, 403),
+    (RecursoNoEncontradoError, 404),
+)
+
+
+def a_json(valor):
+    """Convierte DTOs, fechas y Decimal a tipos JSON (omite campos de contraseña). Retorna valor serializable"""
+    if isinstance(valor, dict):
+        return {k: a_json(v) for k, v in valor.items() if "password" not in k}
+    if isinstance(valor, (list, tuple)):
+        return [a_json(v) for v in valor]
+    if isinstance(valor, date):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return int(valor) if valor == valor.to_integral_value() else float(valor)
+    if hasattr(type(valor), "__slots__"):
+        return a_json(a_dict(valor))
+    if hasattr(valor, "__dict__"):
+        return a_json(vars(valor))
+    return valor
+
+
+@dataclass
+class Peticion:
+    """Datos de una petición ya interpretada."""
+    metodo: str
+    ruta: str
+    parametros: dict = field(default_factory=dict)  # Segmentos {nombre} de la ruta
+    consulta: dict = field(default_factory=dict)    # Query string
+    cuerpo: dict = field(default_factory=dict)      # JSON del cuerpo
+    usuario: dict | None = None                      # Payload del token (id, rol)
+
+    def entero(self, nombre: str, defecto: int | None = None) -> int | None:
+        """Parámetro entero de la query string. Retorna int o el valor por defecto"""
+        valor = self.consulta.get(nombre)
+        if valor is None or valor == "":
+            return defecto
+        try:
+            return int(valor)
+        except ValueError:
+            raise ValidacionError(f"El parámetro '{nombre}' debe ser un número entero")
+
+    def requerido(self, nombre: str):
+        """Campo obligatorio del cuerpo JSON. Retorna su valor"""
+        if self.cuerpo.get(nombre) in (None, ""):
+            raise ValidacionError(f"El campo '{nombre}' es requerido")
+        return self.cuerpo[nombre]
+
+    @property
+    def es_admin(self) -> bool:
+        return bool(self.usuario) and self.usuario['rol'] == 'ADMIN'
+
+
+class Enrutador:
+    """Tabla de rutas: (método, patrón con {parametros}) -> función(peticion)."""
+
+    def __init__(self):
+        self.rutas = []
+
+    def ruta(self, metodo: str, patron: str, autenticado: bool = True, rol: str | None = None):
+        """Decorador que registra una función como manejador de la ruta"""
+        regex = re.compile("^" + re.sub(r"\{(\w+)\}", r"(?P<\1>\\d+)", patron) + "$")
+
+        def decorador(funcion):
+            self.rutas.append((metodo, regex, patron, autenticado, rol, funcion))
+            return funcion
+        return decorador
+
+    def resolver(self, metodo: str, ruta: str):
+        """Busca el manejador. Retorna tupla (patron, autenticado, rol, funcion, parametros) o None"""
+        ruta_existe = False
+        for metodo_ruta, regex, patron, autenticado, rol, funcion in self.rutas:
+            coincidencia = regex.match(ruta)
+            if coincidencia:
+                ruta_existe = True
+                if metodo_ruta == metodo:
+                    return patron, autenticado, rol, funcion, {k: int(v) for k, v in coincidencia.groupdict().items()}
+        return 405 if ruta_existe else None
+
+
+class ManejadorAPI(BaseHTTPRequestHandler):
+    """Interpreta la petición, autentica, despacha al enrutador y escribe la respuesta JSON."""
+    server_version = "ViajesAventuraAPI/1.0"
+
+    def do_GET(self):
+        self._atender("GET")
+
+    def do_POST(self):
+        self._atender("POST")
+
+    def _atender(self, metodo: str) -> None:
+        inicio = time.perf_counter()
+        partes = urlsplit(self.path)
+        patron = partes.path
+        try:
+            resuelto = self.server.enrutador.resolver(metodo, partes.path)
+            if resuelto is None:
+                raise RecursoNoEncontradoError(f"Ruta no encontrada: {partes.path}")
+            if resuelto == 405:
+                estado, datos = 405, {'error': f"Método {metodo} no permitido en {partes.path}"}
+            else:
+                patron, autenticado, rol, funcion, parametros = resuelto
+                usuario = self._autenticar(autenticado, rol)  # Antes de leer el cuerpo
+                peticion = Peticion(metodo, partes.path, parametros, dict(parse_qsl(partes.query)), self._leer_cuerpo())
+                peticion.usuario = usuario
+                with span(f"{metodo} {patron}", "api"):
+                    resultado = funcion(peticion)
+                estado, datos = resultado if isinstance(resultado, tuple) else (200, resultado)
+        except Exception as e:
+            estado = next((codigo for tipo, codigo in CODIGOS_ERROR if isinstance(e, tipo)), 500)
+            if estado == 500:
+                traceback.print_exc()
+                datos = {'error': "Error interno del servidor"}
+            else:
+                datos = {'error': str(e)}
+        self._responder(estado, json.dumps(a_json(datos), ensure_ascii=False).encode("utf-8"), TIPO_JSON)
+        duracion_peticiones_api.observar(time.perf_counter() - inicio, metodo=metodo, ruta=patron, estado=estado)
+
+    def _leer_cuerpo(self) -> dict:
+        """Lee y decodifica el cuerpo JSON. Retorna dict (vacío si no hay cuerpo)"""
+        try:
+            largo = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            raise ValidacionError("Content-Length debe ser un número entero")
+        if largo < 0:
+            raise ValidacionError("Content-Length no puede ser negativo")
+        if not largo:
+            return {}
+        if largo > MAX_BYTES_CUERPO:
+            raise ValidacionError("El cuerpo de la petición es demasiado grande")
+        try:
+            cuerpo = json.loads(self.rfile.read(largo))
+        except (ValueError, UnicodeDecodeError):
+            raise ValidacionError("El cuerpo debe ser JSON válido")
+        if not isinstance(cuerpo, dict):
+            raise ValidacionError("El cuerpo debe ser un objeto JSON")
+        return cuerpo
+
+    def _autenticar(self, autenticado: bool, rol: str | None) -> dict | None:
+        """Valida el token Bearer si la ruta lo requiere. Retorna payload del token o None"""
+        cabecera = self.headers.get("Authorization", "")
+        if not cabecera.startswith("Bearer "):
+            if autenticado:
+                raise AutenticacionError("Se requiere un token (Authorization: Bearer <token>)")
+            return None
+        usuario = verificar_token(cabecera[len("Bearer "):])
+        if rol and usuario['rol'] != rol:
+            raise PermisoError("No tiene permisos para esta operación")
+        return usuario
+
+    def _responder(self, estado: int, cuerpo: bytes, tipo: str) -> None:
+        """Escribe la respuesta, comprimida con gzip si corresponde"""
+        comprimir = len(cuerpo) >= MIN_BYTES_GZIP and "gzip" in self.headers.get("Accept-Encoding", "")
+        if comprimir:
+            cuerpo = gzip.compress(cuerpo, compresslevel=5)
+        self.send_response(estado)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.send_header("Vary", "Accept-Encoding")
+        if comprimir:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, format, *args):
+        if os.getenv("API_LOG_PETICIONES") == "1":
+            super().log_message(format, *args)
+
+
+class ServidorAPI(HTTPServer):
+    """HTTPServer que atiende cada conexión en un pool fijo de workers con conexión a BD propia."""
+
+    def __init__(self, direccion: tuple[str, int], enrutador: Enrutador, workers: int | None = None):
+        super().__init__(direccion, ManejadorAPI)
+        self.enrutador = enrutador
+        self.workers = workers or int(os.getenv("API_WORKERS", "0")) or (os.cpu_count() or 1) * 2
+        self.pool = PoolConexiones(self.workers, "api")
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._procesar_en_worker, request, client_address)
+
+    def _procesar_en_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        """Cierra el socket, espera las peticiones en curso y cierra las conexiones de los workers"""
+        super().server_close()
+        self.pool.shutdown(wait=True)
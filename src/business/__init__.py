@@ -5,20 +5,34 @@ Capa de negocio que contiene la lógica de aplicación.
 
 from .actividad_service import ActividadService
 from .auth_service import AuthService
+from .busqueda_service import BusquedaService
+from .catalogo_service import CatalogoService
 from .destino_service import DestinoService
+from .disponibilidad_service import DisponibilidadService
+from .historico_service import HistoricoService
+from .ocupacion_service import OcupacionService
 from .pago_service import PagoService
 from .paquete_service import PaqueteService
 from .politica_cancelacion_service import PoliticaCancelacionService
 from .reserva_service import ReservaService
+from .servicios_async import CatalogoServiceAsync, PagoServiceAsync, ReservaServiceAsync
 from .usuario_service import UsuarioService
 
 __all__ = [
     "ActividadService",
     "AuthService",
+    "BusquedaService",
+    "CatalogoService",
+    "CatalogoServiceAsync",
     "DestinoService",
+    "DisponibilidadService",
+    "HistoricoService",
+    "OcupacionService",
     "PagoService",
+    "PagoServiceAsync",
     "PaqueteService",
     "PoliticaCancelacionService",
     "ReservaService",
+    "ReservaServiceAsync",
     "UsuarioService",
 ]
@@ -4,17 +4,23 @@ Encapsula la lógica de negocio relacionada con actividades turísticas.
 Intermediario entre la UI y el DAO para mantener separación de capas.
 """
 
+from src.business.busqueda_service import BusquedaService
 from src.dao.actividad_dao import ActividadDAO
 from src.dto.actividad_dto import ActividadDTO
+from src.utils.constants import POR_PAGINA_DEFECTO
 from src.utils.exceptions import ValidacionError
+from src.utils.tracing import trazar_metodos
+from src.utils.utils import calcular_paginacion, resultado_paginado
 
 
+@trazar_metodos("servicio")
 class ActividadService:
     """Servicio para gestión de actividades turísticas."""
     
     def __init__(self):
         """Inicializa el servicio con su DAO."""
         self.actividad_dao = ActividadDAO()
+        self.busqueda = BusquedaService()
     
     def crear_actividad(
         self,
@@ -49,6 +55,7 @@ class ActividadService:
         
         actividad_id = self.actividad_dao.crear(actividad)
         actividad.id = actividad_id
+        self.busqueda.indexar('actividad', actividad_id, actividad.nombre, actividad.descripcion)
         return actividad
     
     def obtener_actividad(self, actividad_id: int) -> ActividadDTO | None:
@@ -62,6 +69,13 @@ class ActividadService:
         """Lista todas las actividades activas. Retorna Lista de ActividadDTO"""
         return self.actividad_dao.listar_todas()
     
+    def listar_actividades_pagina(self, pagina: int = 1, por_pagina: int = POR_PAGINA_DEFECTO,
+                                  destino_id: int | None = None) -> dict:
+        """Lista actividades activas por páginas, opcionalmente de un destino. Retorna dict de resultado_paginado"""
+        limite, desplazamiento = calcular_paginacion(pagina, por_pagina)
+        actividades = self.actividad_dao.listar_pagina(limite, desplazamiento, destino_id)
+        return resultado_paginado(actividades, self.actividad_dao.contar(destino_id), pagina, por_pagina)
+    
     def listar_todas_actividades_admin(self) -> list[dict]:
         """Lista TODAS las actividades incluyendo inactivas (para admin). Retorna Lista de dicts con info de actividades"""
         return self.actividad_dao.listar_todas_admin()
@@ -77,7 +91,11 @@ class ActividadService:
         """Reactiva una actividad desactivada. Retorna True si se reactivó correctamente"""
         if actividad_id <= 0:
             raise ValidacionError("El ID de la actividad debe ser mayor a 0")
-        return self.actividad_dao.reactivar(actividad_id)
+        reactivada = self.actividad_dao.reactivar(actividad_id)
+        actividad = self.actividad_dao.obtener_por_id(actividad_id) if reactivada else None
+        if actividad:
+            self.busqueda.indexar('actividad', actividad_id, actividad.nombre, actividad.descripcion)
+        return reactivada
     
     def actualizar_actividad(
         self,
@@ -121,6 +139,7 @@ class ActividadService:
         success = self.actividad_dao.actualizar(actividad_id, actividad)
         if not success:
             raise ValidacionError(f"No se pudo actualizar la actividad con ID {actividad_id}")
+        self.busqueda.indexar('actividad', actividad_id, actividad.nombre, actividad.descripcion)
         return actividad
     
     def eliminar_actividad(self, actividad_id: int) -> bool:
@@ -133,4 +152,7 @@ class ActividadService:
         if not actividad_existente:
             raise ValidacionError(f"No existe una actividad con ID {actividad_id}")
         
-        return self.actividad_dao.eliminar(actividad_id)
+        eliminada = self.actividad_dao.eliminar(actividad_id)
+        if eliminada:
+            self.busqueda.desindexar('actividad', actividad_id)
+        return eliminada
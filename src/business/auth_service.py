@@ -14,9 +14,12 @@ from src.utils.constants import (
     ROL_USUARIO_DEFAULT,
 )
 from src.utils.exceptions import AutenticacionError, ValidacionError
+from src.utils.metricas import duracion_bcrypt, intentos_login
+from src.utils.tracing import trazar_metodos
 from src.utils.validators import validar_email, validar_password, validar_rut
 
 
+@trazar_metodos("servicio")
 class AuthService:
     """Servicio de Autenticación.
     
@@ -28,12 +31,14 @@ class AuthService:
 
     def _hashear_password(self, password: str) -> str:
         """Hashea la contraseña usando bcrypt. Retorna hash string"""
-        hash_bytes = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+        with duracion_bcrypt.medir(operacion="hash"):
+            hash_bytes = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
         return hash_bytes.decode('utf-8')
 
     def _verificar_password(self, password: str, hash_pw: str) -> bool:
         """Verifica la contraseña. Retorna True si coincide"""
-        return bcrypt.checkpw(password.encode('utf-8'), hash_pw.encode('utf-8'))
+        with duracion_bcrypt.medir(operacion="verificar"):
+            return bcrypt.checkpw(password.encode('utf-8'), hash_pw.encode('utf-8'))
 
     def registrar_usuario(self, rut: str, email: str, password: str, nombre: str, rol: str | None = None) -> UsuarioDTO:
         """Registra un nuevo usuario tras validar rut, email y password. Retorna UsuarioDTO creado"""
@@ -66,10 +71,13 @@ class AuthService:
         try:
             usuario = self.usuario_dao.obtener_por_email(email)
         except Exception:
+            intentos_login.inc(resultado="error")
             raise AutenticacionError(MSG_ERROR_CREDENCIALES_INVALIDAS)
         
         if usuario and self._verificar_password(passw, usuario.password_hash):    
+            intentos_login.inc(resultado="exito")
             return usuario
+        intentos_login.inc(resultado="fallo")
         raise AutenticacionError(MSG_ERROR_CREDENCIALES_INVALIDAS)
 
     def cambiar_password(self, usuario_id: int, password_actual: str, password_nueva: str) -> bool:
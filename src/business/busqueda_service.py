@@ -0,0 +1,204 @@
+"""Service Layer para la búsqueda en el catálogo
+
+Índice en memoria de trigramas sobre nombre y descripción de destinos, paquetes y actividades
+activos. Los textos se normalizan sin tildes ni mayúsculas ("Paris" encuentra "París") y cada
+palabra se indexa con relleno al inicio, así que los trigramas de la consulta funcionan como
+prefijo y toleran errores de tipeo (basta con UMBRAL_SIMILITUD_BUSQUEDA de los trigramas).
+
+El índice se arma la primera vez que se busca y es compartido por todo el proceso. Los servicios
+del catálogo lo actualizan al crear, editar, eliminar o reactivar, y la importación masiva lo
+invalida. Para ver los cambios hechos por otros procesos (menú, API, CLI) se reconstruye cuando
+tiene más de SEGUNDOS_REFRESCO_INDICE segundos.
+"""
+
+import heapq
+import math
+import re
+import threading
+import time
+import unicodedata
+
+from src.dao.catalogo_dao import CatalogoDAO
+from src.utils.constants import (
+    LIMITE_BUSQUEDA_DEFECTO,
+    SEGUNDOS_REFRESCO_INDICE,
+    UMBRAL_SIMILITUD_BUSQUEDA,
+)
+from src.utils.exceptions import ValidacionError
+from src.utils.tracing import trazar_metodos
+
+TIPOS_BUSQUEDA = ('destino', 'paquete', 'actividad')
+PESO_NOMBRE = 3  # Un trigrama que coincide en el nombre vale más que uno de la descripción
+_NO_ALFANUMERICO = re.compile(r"[^0-9a-z]+")
+
+
+def normalizar_texto(texto: str | None) -> str:
+    """Minúsculas, sin tildes y solo letras/dígitos separados por un espacio. Retorna str"""
+    texto = texto or ""
+    if not texto.isascii():
+        texto = "".join(c for c in unicodedata.normalize("NFKD", texto) if not unicodedata.combining(c))
+    return _NO_ALFANUMERICO.sub(" ", texto.casefold()).strip()
+
+
+def trigramas(texto: str, prefijo: bool = False) -> set[str]:
+    """Trigramas de cada palabra de un texto ya normalizado, con dos espacios de relleno al inicio y uno al
+    final (sin el final si prefijo=True, para consultas incompletas). Retorna set de str"""
+    resultado = set()
+    for palabra in texto.split():
+        relleno = f"  {palabra}" if prefijo else f"  {palabra} "
+        resultado.update(relleno[i:i + 3] for i in range(len(relleno) - 2))
+    return resultado
+
+
+class IndiceBusqueda:
+    """Índice invertido trigrama -> documentos. Un documento es (tipo, id) con su nombre y descripción."""
+
+    def __init__(self):
+        self._bloqueo = threading.RLock()
+        self._listas: dict[str, set] = {}
+        self._documentos: dict[tuple, tuple] = {}  # clave -> (nombre, nombre_normalizado, trigramas_nombre, trigramas)
+        self.construido_en: float | None = None
+
+    def __len__(self) -> int:
+        return len(self._documentos)
+
+    def cargar(self, documentos) -> None:
+        """Reemplaza el contenido con (tipo, id, nombre, descripcion) de cada documento."""
+        # Se arma aparte y se intercambia: las búsquedas en curso no ven un índice a medio cargar
+        listas, nuevos = {}, {}
+        for tipo, id, nombre, descripcion in documentos:
+            self._registrar(listas, nuevos, (tipo, id), nombre, descripcion)
+        with self._bloqueo:
+            self._listas, self._documentos = listas, nuevos
+            self.construido_en = time.monotonic()
+
+    def agregar(self, tipo: str, id: int, nombre: str, descripcion: str | None = None) -> None:
+        """Indexa (o reindexa) un documento."""
+        with self._bloqueo:
+            self.eliminar(tipo, id)
+            self._registrar(self._listas, self._documentos, (tipo, id), nombre, descripcion)
+
+    @staticmethod
+    def _registrar(listas: dict, documentos: dict, clave: tuple, nombre: str, descripcion: str | None) -> None:
+        nombre_normalizado = normalizar_texto(nombre)
+        trigramas_nombre = frozenset(trigramas(nombre_normalizado))
+        todos = trigramas_nombre | trigramas(normalizar_texto(descripcion))
+        documentos[clave] = (nombre, nombre_normalizado, trigramas_nombre, todos)
+        for trigrama in todos:
+            lista = listas.get(trigrama)
+            if lista is None:
+                listas[trigrama] = {clave}
+            else:
+                lista.add(clave)
+
+    def eliminar(self, tipo: str, id: int) -> None:
+        """Quita un documento del índice (si estaba)."""
+        clave = (tipo, id)
+        with self._bloqueo:
+            documento = self._documentos.pop(clave, None)
+            if documento is None:
+                return
+            for trigrama in documento[3]:
+                lista = self._listas[trigrama]
+                lista.discard(clave)
+                if not lista:
+                    del self._listas[trigrama]
+
+    def buscar(self, texto: str, tipos: tuple = TIPOS_BUSQUEDA, limite: int = LIMITE_BUSQUEDA_DEFECTO) -> list[dict]:
+        """Documentos que contienen todas las palabras de la consulta (como prefijo, con tolerancia), ordenados por
+        puntaje. Retorna lista de dict con tipo, id, nombre y puntaje"""
+        consulta = normalizar_texto(texto)
+        palabras = [trigramas(palabra, prefijo=True) for palabra in consulta.split()]
+        if not palabras:
+            return []
+        with self._bloqueo:
+            # Palabra más selectiva primero: acota los candidatos que se verifican para las demás
+            palabras.sort(key=lambda t: min(len(self._listas.get(x, ())) for x in t))
+            puntajes = None
+            for consulta_palabra in palabras:
+                puntajes = self._puntuar_palabra(consulta_palabra, puntajes)
+                if not puntajes:
+                    return []
+            ordenables = []
+            for clave, puntaje in puntajes.items():
+                if clave[0] not in tipos:
+                    continue
+                nombre, nombre_normalizado = self._documentos[clave][:2]
+                if consulta in nombre_normalizado:
+                    puntaje += 1.5 if nombre_normalizado.startswith(consulta) else 1.0
+                ordenables.append((-round(puntaje, 3), nombre, clave))
+        mejores = heapq.nsmallest(limite, ordenables)
+        return [{'tipo': clave[0], 'id': clave[1], 'nombre': nombre, 'puntaje': -puntaje} for puntaje, nombre, clave in mejores]
+
+    def _puntuar_palabra(self, consulta: set, previos: dict | None) -> dict:
+        """Puntaje de una palabra en cada candidato (restringido a previos si se da). Retorna dict clave -> puntaje"""
+        necesarios = max(1, math.ceil(UMBRAL_SIMILITUD_BUSQUEDA * len(consulta)))
+        if previos is None:
+            # Un documento con `necesarios` coincidencias tiene al menos una en los len - necesarios + 1 más raros
+            raros = sorted(consulta, key=lambda t: len(self._listas.get(t, ())))[:len(consulta) - necesarios + 1]
+            candidatos = set().union(*(self._listas.get(t, ()) for t in raros))
+        else:
+            candidatos = previos
+        puntajes = {}
+        for clave in candidatos:
+            _, _, trigramas_nombre, todos = self._documentos[clave]
+            coincidencias = consulta & todos
+            if len(coincidencias) < necesarios:
+                continue
+            peso = sum(PESO_NOMBRE if t in trigramas_nombre else 1 for t in coincidencias)
+            puntajes[clave] = (previos[clave] if previos else 0) + peso / (PESO_NOMBRE * len(consulta))
+        return puntajes
+
+
+_indice = IndiceBusqueda()
+
+
+@trazar_metodos("servicio")
+class BusquedaService:
+    """Búsqueda por texto en el catálogo sobre el índice compartido del proceso."""
+
+    def __init__(self, catalogo_dao: CatalogoDAO | None = None, indice: IndiceBusqueda | None = None):
+        """Inicializa el servicio con su DAO y el índice (por defecto el compartido). Permite inyección de dependencias."""
+        self.catalogo_dao = catalogo_dao or CatalogoDAO()
+        self.indice = indice or _indice
+
+    def buscar(self, texto: str, tipos: tuple | None = None, limite: int = LIMITE_BUSQUEDA_DEFECTO) -> list[dict]:
+        """Busca en nombres y descripciones del catálogo activo. Retorna lista de dict (tipo, id, nombre, puntaje)"""
+        if not texto or not normalizar_texto(texto):
+            raise ValidacionError("El texto de búsqueda no puede estar vacío")
+        tipos = tipos or TIPOS_BUSQUEDA
+        for tipo in tipos:
+            if tipo not in TIPOS_BUSQUEDA:
+                raise ValidacionError(f"Tipo de búsqueda no válido. Debe ser uno de: {', '.join(TIPOS_BUSQUEDA)}")
+        if limite <= 0:
+            raise ValidacionError("El límite debe ser mayor a 0")
+        self._asegurar_indice()
+        return self.indice.buscar(texto, tuple(tipos), limite)
+
+    def reconstruir(self) -> int:
+        """Vuelve a cargar el índice desde la base de datos. Retorna cantidad de documentos indexados"""
+        origenes = (('destino', self.catalogo_dao.listar_destinos()),
+                    ('paquete', self.catalogo_dao.listar_paquetes()),
+                    ('actividad', self.catalogo_dao.listar_actividades()))
+        self.indice.cargar((tipo, fila['id'], fila['nombre'], fila['descripcion'])
+                           for tipo, filas in origenes for fila in filas if fila['activo'])
+        return len(self.indice)
+
+    def _asegurar_indice(self) -> None:
+        """Construye el índice si no existe o si superó SEGUNDOS_REFRESCO_INDICE."""
+        construido = self.indice.construido_en
+        if construido is None or time.monotonic() - construido > SEGUNDOS_REFRESCO_INDICE:
+            self.reconstruir()
+
+    def indexar(self, tipo: str, id: int, nombre: str, descripcion: str | None) -> None:
+        """Refleja en el índice un alta o edición (si el índice aún no se construyó no hace nada)."""
+        if self.indice.construido_en is not None:
+            self.indice.agregar(tipo, id, nombre, descripcion)
+
+    def desindexar(self, tipo: str, id: int) -> None:
+        """Refleja en el índice una baja."""
+        self.indice.eliminar(tipo, id)
+
+    def invalidar(self) -> None:
+        """Fuerza la reconstrucción en la próxima búsqueda (tras cambios masivos)."""
+        self.indice.construido_en = None
@@ -0,0 +1,303 @@
+"""Service Layer para Importación/Exportación de Catálogo
+
+Permite cargar o respaldar el catálogo completo (destinos, actividades y paquetes,
+incluyendo el orden de destinos y las actividades de cada paquete) en archivos JSON o CSV.
+
+Formatos:
+    - JSON: un archivo con las llaves "destinos", "actividades" y "paquetes".
+      Cada paquete incluye "destinos" (IDs en orden de visita) y "actividades" (IDs).
+    - CSV: un directorio con destinos.csv, actividades.csv, paquetes.csv,
+      paquete_destino.csv y paquete_actividad.csv.
+
+Todos los registros se identifican por su ID, así una misma importación puede
+crear registros nuevos y actualizar los existentes (upsert).
+"""
+
+import csv
+import json
+import os
+from datetime import datetime
+
+from src.business.busqueda_service import BusquedaService
+from src.business.disponibilidad_service import DisponibilidadService
+from src.business.ocupacion_service import OcupacionService
+from src.config.db_connection import transaccion
+from src.dao.catalogo_dao import (
+    COLUMNAS_ACTIVIDAD,
+    COLUMNAS_DESTINO,
+    COLUMNAS_PAQUETE,
+    CatalogoDAO,
+)
+from src.utils.constants import FORMATO_DATETIME_DB
+from src.utils.exceptions import ValidacionError
+from src.utils.tracing import trazar_metodos
+
+ARCHIVOS_CSV = {
+    'destinos': 'destinos.csv',
+    'actividades': 'actividades.csv',
+    'paquetes': 'paquetes.csv',
+    'paquete_destino': 'paquete_destino.csv',
+    'paquete_actividad': 'paquete_actividad.csv',
+}
+
+_CAMPOS_ENTEROS = {
+    'id', 'costo_base', 'cupos_disponibles', 'politica_id', 'activo', 'duracion_horas',
+    'precio_base', 'destino_id', 'precio_total', 'paquete_id', 'actividad_id', 'orden_visita',
+}
+_CAMPOS_FECHA = {'fecha_inicio', 'fecha_fin'}
+
+
+def _normalizar(registro: dict, columnas: tuple) -> dict:
+    """Convierte un registro leído de archivo o BD a tipos comparables. Retorna dict"""
+    normalizado = {}
+    for c in columnas:
+        valor = registro.get(c)
+        if c == 'activo' and valor in (None, ''):
+            valor = 1  # Por defecto los registros importados quedan activos
+        if c in _CAMPOS_ENTEROS:
+            if valor is None or valor == '':
+                raise ValidacionError(f"El campo '{c}' es obligatorio en el catálogo")
+            try:
+                valor = int(valor)
+            except (TypeError, ValueError):
+                raise ValidacionError(f"El campo '{c}' debe ser numérico (valor: {valor!r})")
+        elif c in _CAMPOS_FECHA:
+            if isinstance(valor, str):
+                try:
+                    valor = datetime.fromisoformat(valor.strip())
+                except ValueError:
+                    raise ValidacionError(f"Fecha inválida en '{c}': {valor!r}")
+            elif not isinstance(valor, datetime):
+                raise ValidacionError(f"El campo '{c}' es obligatorio en el catálogo")
+        elif valor is None:
+            valor = ''  # CSV no distingue NULL de vacío
+        normalizado[c] = valor
+    return normalizado
+
+
+def _serializar(valor):
+    """Convierte valores de BD a tipos aptos para JSON/CSV."""
+    if isinstance(valor, datetime):
+        return valor.strftime(FORMATO_DATETIME_DB)
+    return valor
+
+
+@trazar_metodos("servicio")
+class CatalogoService:
+    """Servicio para importar y exportar el catálogo en bloque."""
+
+    def __init__(self, catalogo_dao: CatalogoDAO | None = None):
+        """Inicializa el servicio con su DAO. Permite inyección de dependencias."""
+        self.catalogo_dao = catalogo_dao or CatalogoDAO()
+
+    def exportar(self, ruta: str) -> dict:
+        """Exporta el catálogo completo a JSON (ruta .json) o CSV (directorio). Retorna dict con cantidades exportadas"""
+        destinos = [{c: _serializar(d[c]) for c in COLUMNAS_DESTINO} for d in self.catalogo_dao.listar_destinos()]
+        actividades = [{c: _serializar(a[c]) for c in COLUMNAS_ACTIVIDAD} for a in self.catalogo_dao.listar_actividades()]
+        paquetes = [{c: _serializar(p[c]) for c in COLUMNAS_PAQUETE} for p in self.catalogo_dao.listar_paquetes()]
+        paquete_destinos = self.catalogo_dao.listar_paquete_destinos()
+        paquete_actividades = self.catalogo_dao.listar_paquete_actividades()
+
+        if ruta.lower().endswith('.json'):
+            destinos_por_paquete: dict[int, list[int]] = {}
+            for rel in paquete_destinos:  # Ya vienen ordenadas por orden_visita
+                destinos_por_paquete.setdefault(rel['paquete_id'], []).append(rel['destino_id'])
+            actividades_por_paquete: dict[int, list[int]] = {}
+            for rel in paquete_actividades:
+                actividades_por_paquete.setdefault(rel['paquete_id'], []).append(rel['actividad_id'])
+            for p in paquetes:
+                p['destinos'] = destinos_por_paquete.get(p['id'], [])
+                p['actividades'] = actividades_por_paquete.get(p['id'], [])
+
+            with open(ruta, 'w', encoding='utf-8') as archivo:
+                json.dump({'destinos': destinos, 'actividades': actividades, 'paquetes': paquetes},
+                          archivo, ensure_ascii=False, indent=2)
+        else:
+            os.makedirs(ruta, exist_ok=True)
+            self._escribir_csv(os.path.join(ruta, ARCHIVOS_CSV['destinos']), COLUMNAS_DESTINO, destinos)
+            self._escribir_csv(os.path.join(ruta, ARCHIVOS_CSV['actividades']), COLUMNAS_ACTIVIDAD, actividades)
+            self._escribir_csv(os.path.join(ruta, ARCHIVOS_CSV['paquetes']), COLUMNAS_PAQUETE, paquetes)
+            self._escribir_csv(os.path.join(ruta, ARCHIVOS_CSV['paquete_destino']),
+                               ('paquete_id', 'destino_id', 'orden_visita'), paquete_destinos)
+            self._escribir_csv(os.path.join(ruta, ARCHIVOS_CSV['paquete_actividad']),
+                               ('paquete_id', 'actividad_id'), paquete_actividades)
+
+        return {
+            'destinos': len(destinos),
+            'actividades': len(actividades),
+            'paquetes': len(paquetes),
+            'paquete_destino': len(paquete_destinos),
+            'paquete_actividad': len(paquete_actividades),
+        }
+
+    def _escribir_csv(self, ruta: str, columnas: tuple, filas: list[dict]) -> None:
+        """Escribe una lista de dicts como CSV con encabezado. Retorna None"""
+        with open(ruta, 'w', encoding='utf-8', newline='') as archivo:
+            writer = csv.DictWriter(archivo, fieldnames=columnas, extrasaction='ignore')
+            writer.writeheader()
+            for fila in filas:
+                writer.writerow({c: _serializar(fila[c]) for c in columnas})
+
+    def _leer_archivo(self, ruta: str) -> dict:
+        """Lee un catálogo JSON o CSV. Retorna dict con registros y relaciones crudas
+
+        Las relaciones solo se sincronizan para los paquetes que las declaran ('alcance_*'):
+        en JSON, los paquetes con la llave "destinos"/"actividades"; en CSV, todos los
+        paquetes de paquetes.csv y los mencionados en el archivo de relación (si existe).
+        """
+        if not os.path.exists(ruta):
+            raise ValidacionError(f"No existe el archivo o directorio '{ruta}'")
+
+        if os.path.isfile(ruta):
+            try:
+                with open(ruta, encoding='utf-8') as archivo:
+                    datos = json.load(archivo)
+            except json.JSONDecodeError as e:
+                raise ValidacionError(f"El archivo JSON no es válido: {e}")
+
+            paquetes = datos.get('paquetes', [])
+            con_destinos = [p for p in paquetes if 'destinos' in p]
+            con_actividades = [p for p in paquetes if 'actividades' in p]
+            return {
+                'destinos': datos.get('destinos', []),
+                'actividades': datos.get('actividades', []),
+                'paquetes': paquetes,
+                'paquete_destino': [
+                    {'paquete_id': p['id'], 'destino_id': d, 'orden_visita': orden}
+                    for p in con_destinos for orden, d in enumerate(p['destinos'], 1)
+                ] if con_destinos else None,
+                'paquete_actividad': [
+                    {'paquete_id': p['id'], 'actividad_id': a}
+                    for p in con_actividades for a in p['actividades']
+                ] if con_actividades else None,
+                'alcance_destinos': {int(p['id']) for p in con_destinos},
+                'alcance_actividades': {int(p['id']) for p in con_actividades},
+            }
+
+        def leer(nombre: str) -> list | None:
+            ruta_csv = os.path.join(ruta, ARCHIVOS_CSV[nombre])
+            if not os.path.exists(ruta_csv):
+                return None
+            with open(ruta_csv, encoding='utf-8', newline='') as archivo:
+                return list(csv.DictReader(archivo))
+
+        paquetes = leer('paquetes') or []
+        ids_paquetes = {int(p['id']) for p in paquetes if p.get('id')}
+        paquete_destino = leer('paquete_destino')
+        paquete_actividad = leer('paquete_actividad')
+        return {
+            'destinos': leer('destinos') or [],
+            'actividades': leer('actividades') or [],
+            'paquetes': paquetes,
+            'paquete_destino': paquete_destino,
+            'paquete_actividad': paquete_actividad,
+            'alcance_destinos': ids_paquetes | {int(r['paquete_id']) for r in paquete_destino or []},
+            'alcance_actividades': ids_paquetes | {int(r['paquete_id']) for r in paquete_actividad or []},
+        }
+
+    def _diferencias(self, nuevos: list[dict], existentes: list[dict], columnas: tuple) -> dict:
+        """Compara registros por ID. Retorna dict con 'creados', 'actualizados' (listas de dicts) y 'sin_cambios' (int)"""
+        actuales = {e['id']: _normalizar(e, columnas) for e in existentes}
+        creados, actualizados, sin_cambios = [], [], 0
+        vistos = set()
+        for registro in nuevos:
+            if registro['id'] in vistos:
+                raise ValidacionError(f"ID duplicado en el catálogo: {registro['id']}")
+            vistos.add(registro['id'])
+            actual = actuales.get(registro['id'])
+            if actual is None:
+                creados.append(registro)
+            elif actual != registro:
+                actualizados.append(registro)
+            else:
+                sin_cambios += 1
+        return {'creados': creados, 'actualizados': actualizados, 'sin_cambios': sin_cambios}
+
+    def _diferencias_relacion(self, nuevas: list[tuple], existentes: list[tuple], paquetes: set) -> dict:
+        """Compara relaciones de los paquetes importados. Retorna dict con 'creadas', 'actualizadas', 'eliminadas', 'sin_cambios'"""
+        # Llave: (paquete_id, otro_id); valor: resto de columnas (p. ej. orden_visita)
+        actuales = {r[:2]: r[2:] for r in existentes if r[0] in paquetes}
+        objetivo = {}
+        for r in nuevas:
+            if r[:2] in objetivo:
+                raise ValidacionError(f"Relación duplicada en el catálogo: {r[:2]}")
+            objetivo[r[:2]] = r[2:]
+        creadas = [k + v for k, v in objetivo.items() if k not in actuales]
+        actualizadas = [k + v for k, v in objetivo.items() if k in actuales and actuales[k] != v]
+        eliminadas = [k for k in actuales if k not in objetivo]
+        sin_cambios = len(objetivo) - len(creadas) - len(actualizadas)
+        return {'creadas': creadas, 'actualizadas': actualizadas, 'eliminadas': eliminadas, 'sin_cambios': sin_cambios}
+
+    def importar(self, ruta: str, dry_run: bool = False) -> dict:
+        """Importa un catálogo con upsert masivo en una sola transacción. Retorna dict con el resumen de diferencias
+
+        Con dry_run=True solo calcula las diferencias sin escribir en la base de datos.
+        """
+        datos = self._leer_archivo(ruta)
+
+        destinos = [_normalizar(d, COLUMNAS_DESTINO) for d in datos['destinos']]
+        actividades = [_normalizar(a, COLUMNAS_ACTIVIDAD) for a in datos['actividades']]
+        paquetes = [_normalizar(p, COLUMNAS_PAQUETE) for p in datos['paquetes']]
+        for p in paquetes:
+            if p['fecha_fin'] <= p['fecha_inicio']:
+                raise ValidacionError(f"Paquete {p['id']}: la fecha de fin debe ser posterior a la de inicio")
+
+        dif_destinos = self._diferencias(destinos, self.catalogo_dao.listar_destinos(), COLUMNAS_DESTINO)
+        dif_actividades = self._diferencias(actividades, self.catalogo_dao.listar_actividades(), COLUMNAS_ACTIVIDAD)
+        dif_paquetes = self._diferencias(paquetes, self.catalogo_dao.listar_paquetes(), COLUMNAS_PAQUETE)
+
+        dif_pd = None
+        if datos['paquete_destino'] is not None:
+            columnas = ('paquete_id', 'destino_id', 'orden_visita')
+            nuevas = [tuple(_normalizar(r, columnas).values()) for r in datos['paquete_destino']]
+            existentes = [tuple(r[c] for c in columnas) for r in self.catalogo_dao.listar_paquete_destinos()]
+            dif_pd = self._diferencias_relacion(nuevas, existentes, datos['alcance_destinos'])
+
+        dif_pa = None
+        if datos['paquete_actividad'] is not None:
+            columnas = ('paquete_id', 'actividad_id')
+            nuevas = [tuple(_normalizar(r, columnas).values()) for r in datos['paquete_actividad']]
+            existentes = [tuple(r[c] for c in columnas) for r in self.catalogo_dao.listar_paquete_actividades()]
+            dif_pa = self._diferencias_relacion(nuevas, existentes, datos['alcance_actividades'])
+
+        if not dry_run:
+            with transaccion():
+                # Orden respetando llaves foráneas: destinos -> actividades -> paquetes -> relaciones
+                self.catalogo_dao.upsert_destinos(dif_destinos['creados'] + dif_destinos['actualizados'])
+                self.catalogo_dao.upsert_actividades(dif_actividades['creados'] + dif_actividades['actualizados'])
+                self.catalogo_dao.upsert_paquetes(dif_paquetes['creados'] + dif_paquetes['actualizados'])
+                if dif_pd:
+                    self.catalogo_dao.eliminar_paquete_destinos(dif_pd['eliminadas'])
+                    self.catalogo_dao.upsert_paquete_destinos(dif_pd['creadas'] + dif_pd['actualizadas'])
+                if dif_pa:
+                    self.catalogo_dao.eliminar_paquete_actividades(dif_pa['eliminadas'])
+                    self.catalogo_dao.insertar_paquete_actividades(dif_pa['creadas'])
+            BusquedaService(self.catalogo_dao).invalidar()
+            DisponibilidadService().invalidar()
+            OcupacionService().invalidar()
+
+        def resumen(dif: dict) -> dict:
+            return {
+                'creados': [r['id'] for r in dif['creados']],
+                'actualizados': [r['id'] for r in dif['actualizados']],
+                'sin_cambios': dif['sin_cambios'],
+            }
+
+        def resumen_relacion(dif: dict | None) -> dict | None:
+            if dif is None:
+                return None
+            return {
+                'creadas': len(dif['creadas']),
+                'actualizadas': len(dif['actualizadas']),
+                'eliminadas': len(dif['eliminadas']),
+                'sin_cambios': dif['sin_cambios'],
+            }
+
+        return {
+            'dry_run': dry_run,
+            'destinos': resumen(dif_destinos),
+            'actividades': resumen(dif_actividades),
+            'paquetes': resumen(dif_paquetes),
+            'paquete_destino': resumen_relacion(dif_pd),
+            'paquete_actividad': resumen_relacion(dif_pa),
+        }
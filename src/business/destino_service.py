@@ -4,17 +4,25 @@ Encapsula la lógica de negocio relacionada con destinos.
 Intermediario entre la UI y el DAO para mantener separación de capas.
 """
 
+from src.business.busqueda_service import BusquedaService
+from src.business.ocupacion_service import OcupacionService
 from src.dao.destino_dao import DestinoDAO
 from src.dto.destino_dto import DestinoDTO
+from src.utils.constants import POR_PAGINA_DEFECTO
 from src.utils.exceptions import ValidacionError
+from src.utils.tracing import trazar_metodos
+from src.utils.utils import calcular_paginacion, resultado_paginado
 
 
+@trazar_metodos("servicio")
 class DestinoService:
     """Servicio para gestión de destinos."""
     
     def __init__(self, destino_dao: DestinoDAO | None = None):
         """Inicializa el servicio con su DAO. Permite inyección de dependencias."""
         self.destino_dao = destino_dao or DestinoDAO()
+        self.busqueda = BusquedaService()
+        self.ocupacion = OcupacionService()
     
     def crear_destino(
         self,
@@ -52,6 +60,8 @@ class DestinoService:
         
         destino_id = self.destino_dao.crear(destino)
         destino.id = destino_id
+        self.busqueda.indexar('destino', destino_id, destino.nombre, destino.descripcion)
+        self.ocupacion.invalidar()
         return destino
     
     def obtener_destino(self, destino_id: int) -> DestinoDTO | None:
@@ -65,6 +75,12 @@ class DestinoService:
         """Lista todos los destinos activos. Retorna lista de DestinoDTO"""
         return self.destino_dao.listar_todos()
     
+    def listar_destinos_pagina(self, pagina: int = 1, por_pagina: int = POR_PAGINA_DEFECTO) -> dict:
+        """Lista destinos activos por páginas. Retorna dict de resultado_paginado"""
+        limite, desplazamiento = calcular_paginacion(pagina, por_pagina)
+        destinos = self.destino_dao.listar_pagina(limite, desplazamiento)
+        return resultado_paginado(destinos, self.destino_dao.contar(), pagina, por_pagina)
+    
     def listar_todos_destinos_admin(self) -> list[dict]:
         """Lista TODOS los destinos incluyendo inactivos (para admin). Retorna lista de dicts"""
         return self.destino_dao.listar_todos_admin()
@@ -78,7 +94,12 @@ class DestinoService:
         """Reactiva un destino desactivado. Retorna True si se reactivó correctamente"""
         if destino_id <= 0:
             raise ValidacionError("El ID del destino debe ser mayor a 0")
-        return self.destino_dao.reactivar(destino_id)
+        reactivado = self.destino_dao.reactivar(destino_id)
+        destino = self.destino_dao.obtener_por_id(destino_id) if reactivado else None
+        if destino:
+            self.busqueda.indexar('destino', destino_id, destino.nombre, destino.descripcion)
+            self.ocupacion.invalidar()
+        return reactivado
     
     def actualizar_destino(
         self,
@@ -127,6 +148,8 @@ class DestinoService:
         success = self.destino_dao.actualizar(destino_id, destino)
         if not success:
             raise ValidacionError(f"No se pudo actualizar el destino con ID {destino_id}")
+        self.busqueda.indexar('destino', destino_id, destino.nombre, destino.descripcion)
+        self.ocupacion.invalidar()
         return destino
     
     def eliminar_destino(self, destino_id: int) -> bool:
@@ -139,11 +162,17 @@ class DestinoService:
         if not destino_existente:
             raise ValidacionError(f"No existe un destino con ID {destino_id}")
         
-        return self.destino_dao.eliminar(destino_id)
+        eliminado = self.destino_dao.eliminar(destino_id)
+        if eliminado:
+            self.busqueda.desindexar('destino', destino_id)
+            self.ocupacion.invalidar()
+        return eliminado
     
     def buscar_destinos_por_nombre(self, nombre: str) -> list[DestinoDTO]:
-        """Busca destinos por nombre (parcial, case-insensitive). Retorna lista de DestinoDTO"""
+        """Busca destinos por nombre o descripción (parcial, sin distinguir mayúsculas ni tildes, ordenados por
+        relevancia) en el índice de búsqueda. Retorna lista de DestinoDTO"""
         if not nombre or not nombre.strip():
             raise ValidacionError("El nombre no puede estar vacío")
         
-        return self.destino_dao.buscar_por_nombre(nombre.strip())
+        resultados = self.busqueda.buscar(nombre, tipos=('destino',))
+        return self.destino_dao.listar_por_ids([r['id'] for r in resultados])
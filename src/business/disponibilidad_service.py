@@ -0,0 +1,135 @@
+"""Service Layer para la disponibilidad de paquetes por fechas
+
+Índice en memoria de los intervalos [fecha_inicio, fecha_fin] y cupos de los paquetes activos,
+para responder "paquetes que se cruzan con [desde, hasta] con al menos N cupos" sin recorrer
+todo el catálogo. Los inicios se guardan ordenados: un paquete que se cruza con la ventana
+empieza antes de `hasta` y, como ninguno dura más que la duración máxima indexada, después de
+`desde - duración máxima`. Dos búsquedas binarias acotan ese tramo y solo se revisan los
+paquetes que empiezan en él: O(log n + k), con k los paquetes de ese tramo.
+
+Igual que el índice de búsqueda, se arma en la primera consulta y es compartido por el proceso.
+PaqueteService lo actualiza al crear, editar, eliminar o reactivar, ReservaService al tomar o
+devolver cupos, y se reconstruye cuando tiene más de SEGUNDOS_REFRESCO_INDICE segundos.
+"""
+
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta
+
+from src.dao.paquete_dao import PaqueteDAO
+from src.dto.paquete_dto import PaqueteDTO
+from src.utils.constants import MSG_ERROR_FECHA_INVALIDA, SEGUNDOS_REFRESCO_INDICE
+from src.utils.exceptions import ValidacionError
+from src.utils.tracing import trazar_metodos
+
+
+class IndiceDisponibilidad:
+    """Inicios ordenados (fecha_inicio, id) más id -> (fecha_inicio, fecha_fin, cupos) de cada paquete."""
+
+    def __init__(self):
+        self._bloqueo = threading.RLock()
+        self._inicios: list[tuple] = []
+        self._paquetes: dict[int, tuple] = {}
+        # Cota superior de las duraciones: al quitar un paquete no se recalcula (sigue siendo una cota válida)
+        self._duracion_maxima = timedelta(0)
+        self.construido_en: float | None = None
+
+    def __len__(self) -> int:
+        return len(self._paquetes)
+
+    def cargar(self, paquetes) -> None:
+        """Reemplaza el contenido con (id, fecha_inicio, fecha_fin, cupos) de cada paquete."""
+        datos = {id: (inicio, fin, cupos) for id, inicio, fin, cupos in paquetes}
+        inicios = sorted((inicio, id) for id, (inicio, _, _) in datos.items())
+        duracion = max((fin - inicio for inicio, fin, _ in datos.values()), default=timedelta(0))
+        with self._bloqueo:
+            self._inicios, self._paquetes, self._duracion_maxima = inicios, datos, duracion
+            self.construido_en = time.monotonic()
+
+    def agregar(self, id: int, inicio: datetime, fin: datetime, cupos: int) -> None:
+        """Indexa (o reindexa) un paquete."""
+        with self._bloqueo:
+            self.eliminar(id)
+            self._paquetes[id] = (inicio, fin, cupos)
+            insort(self._inicios, (inicio, id))
+            self._duracion_maxima = max(self._duracion_maxima, fin - inicio)
+
+    def eliminar(self, id: int) -> None:
+        """Quita un paquete del índice (si estaba)."""
+        with self._bloqueo:
+            datos = self._paquetes.pop(id, None)
+            if datos is not None:
+                del self._inicios[bisect_left(self._inicios, (datos[0], id))]
+
+    def ajustar_cupos(self, id: int, delta: int) -> None:
+        """Suma delta a los cupos de un paquete indexado."""
+        with self._bloqueo:
+            datos = self._paquetes.get(id)
+            if datos is not None:
+                inicio, fin, cupos = datos
+                self._paquetes[id] = (inicio, fin, max(0, cupos + delta))
+
+    def consultar(self, desde: datetime, hasta: datetime, cupos_minimos: int = 1) -> list[int]:
+        """Paquetes cuyo intervalo se cruza con [desde, hasta] y tienen al menos cupos_minimos cupos.
+        Retorna lista de IDs ordenada por fecha de inicio"""
+        with self._bloqueo:
+            primero = bisect_left(self._inicios, (desde - self._duracion_maxima,))
+            ultimo = bisect_right(self._inicios, (hasta, float('inf')))
+            resultado = []
+            for _, id in self._inicios[primero:ultimo]:
+                _, fin, cupos = self._paquetes[id]
+                if fin >= desde and cupos >= cupos_minimos:
+                    resultado.append(id)
+        return resultado
+
+
+_indice = IndiceDisponibilidad()
+
+
+@trazar_metodos("servicio")
+class DisponibilidadService:
+    """Consultas de disponibilidad por rango de fechas sobre el índice compartido del proceso."""
+
+    def __init__(self, paquete_dao: PaqueteDAO | None = None, indice: IndiceDisponibilidad | None = None):
+        """Inicializa el servicio con su DAO y el índice (por defecto el compartido). Permite inyección de dependencias."""
+        self.paquete_dao = paquete_dao or PaqueteDAO()
+        self.indice = indice or _indice
+
+    def paquetes_en_fechas(self, desde: datetime, hasta: datetime, cupos_minimos: int = 1) -> list[int]:
+        """IDs de paquetes activos que se cruzan con [desde, hasta] con al menos cupos_minimos cupos libres.
+        Retorna lista de IDs ordenada por fecha de inicio"""
+        if hasta < desde:
+            raise ValidacionError(MSG_ERROR_FECHA_INVALIDA)
+        if cupos_minimos < 1:
+            raise ValidacionError("Los cupos mínimos deben ser al menos 1")
+        self._asegurar_indice()
+        return self.indice.consultar(desde, hasta, cupos_minimos)
+
+    def reconstruir(self) -> int:
+        """Vuelve a cargar el índice desde la base de datos. Retorna cantidad de paquetes indexados"""
+        self.indice.cargar((p.id, p.fecha_inicio, p.fecha_fin, p.cupos_disponibles) for p in self.paquete_dao.listar_todos())
+        return len(self.indice)
+
+    def _asegurar_indice(self) -> None:
+        """Construye el índice si no existe o si superó SEGUNDOS_REFRESCO_INDICE."""
+        construido = self.indice.construido_en
+        if construido is None or time.monotonic() - construido > SEGUNDOS_REFRESCO_INDICE:
+            self.reconstruir()
+
+    def registrar(self, paquete: PaqueteDTO) -> None:
+        """Refleja en el índice un alta o edición (si el índice aún no se construyó no hace nada)."""
+        if self.indice.construido_en is not None:
+            self.indice.agregar(paquete.id, paquete.fecha_inicio, paquete.fecha_fin, paquete.cupos_disponibles)
+
+    def quitar(self, paquete_id: int) -> None:
+        """Refleja en el índice una baja."""
+        self.indice.eliminar(paquete_id)
+
+    def ajustar_cupos(self, paquete_id: int, delta: int) -> None:
+        """Refleja en el índice cupos tomados (delta negativo) o devueltos por una reserva."""
+        self.indice.ajustar_cupos(paquete_id, delta)
+
+    def invalidar(self) -> None:
+        """Fuerza la reconstrucción en la próxima consulta (tras cambios masivos)."""
+        self.indice.construido_en = None
@@ -0,0 +1,59 @@
+"""Service Layer para el archivo histórico
+
+Traslada las reservas finalizadas (COMPLETADA/CANCELADA) más antiguas que una fecha de corte,
+junto con sus pagos, a Reservas_Historico y Pagos_Historico. Trabaja en lotes cortos, cada uno en
+su propia transacción y con una pausa entre lotes, para no bloquear las tablas activas.
+"""
+
+import time
+from datetime import datetime, timedelta
+
+from src.business.ocupacion_service import OcupacionService
+from src.config.db_connection import transaccion
+from src.dao.historico_dao import HistoricoDAO
+from src.utils.constants import DIAS_ANTIGUEDAD_ARCHIVO, PAUSA_LOTE_ARCHIVO_S, TAMANO_LOTE_PROCESOS
+from src.utils.exceptions import ValidacionError
+from src.utils.tracing import trazar_metodos
+
+
+@trazar_metodos("servicio")
+class HistoricoService:
+    """Servicio de archivado de reservas y pagos antiguos."""
+
+    def __init__(self, historico_dao: HistoricoDAO | None = None):
+        """Inicializa el servicio con su DAO. Permite inyección de dependencias."""
+        self.historico_dao = historico_dao or HistoricoDAO()
+
+    def archivar(self, antes_de: datetime | None = None, tamano_lote: int = TAMANO_LOTE_PROCESOS,
+                 pausa_s: float = PAUSA_LOTE_ARCHIVO_S, dry_run: bool = False, max_lotes: int | None = None) -> dict:
+        """Mueve al histórico las reservas finalizadas anteriores a antes_de (por defecto hace DIAS_ANTIGUEDAD_ARCHIVO
+        días) y sus pagos. max_lotes acota la ejecución (el resto queda para la siguiente). Retorna dict con estadísticas"""
+        if tamano_lote <= 0:
+            raise ValidacionError("El tamaño de lote debe ser mayor a 0")
+        if pausa_s < 0:
+            raise ValidacionError("La pausa entre lotes no puede ser negativa")
+        antes_de = antes_de or datetime.now() - timedelta(days=DIAS_ANTIGUEDAD_ARCHIVO)
+        inicio = time.perf_counter()
+        estadisticas = {'antes_de': antes_de, 'dry_run': dry_run, 'lotes': 0, 'reservas': 0, 'pagos': 0}
+
+        if dry_run:
+            estadisticas.update(self.historico_dao.contar_archivables(antes_de))
+        else:
+            while max_lotes is None or estadisticas['lotes'] < max_lotes:
+                ids = self.historico_dao.listar_ids_archivables(antes_de, tamano_lote)
+                if not ids:
+                    break
+                if estadisticas['lotes']:
+                    time.sleep(pausa_s)
+                with transaccion():
+                    movidas = self.historico_dao.archivar_reservas(ids)
+                estadisticas['lotes'] += 1
+                estadisticas['reservas'] += movidas['reservas']
+                estadisticas['pagos'] += movidas['pagos']
+                if len(ids) < tamano_lote:
+                    break
+
+        if estadisticas['reservas']:
+            OcupacionService().invalidar()
+        estadisticas['duracion_s'] = time.perf_counter() - inicio
+        return estadisticas
@@ -0,0 +1,152 @@
+"""Service Layer para el reporte de ocupación
+
+Cupos reservados contra capacidad de cada paquete y destino activo, por estado de la reserva y
+por mes. La capacidad es lo reservado (reservas no canceladas) más los cupos que quedan libres,
+ya que reservar descuenta cupos y cancelar los devuelve.
+
+El reporte se arma con una sola consulta agrupada y queda en una caché compartida por el
+proceso. ReservaService y PagoService la actualizan al reservar, pagar, confirmar y cancelar;
+los procesos por lotes, el archivado y los cambios al catálogo la invalidan, y se vuelve a leer
+cuando tiene más de SEGUNDOS_CACHE_OCUPACION segundos.
+"""
+
+import threading
+import time
+
+from src.dao.reserva_dao import ReservaDAO
+from src.dto.reserva_dto import ReservaDTO
+from src.utils.constants import ESTADOS_RESERVA, SEGUNDOS_CACHE_OCUPACION
+from src.utils.exceptions import ValidacionError
+from src.utils.tracing import trazar_metodos
+
+TIPOS_OCUPACION = ('paquete', 'destino')
+ESTADO_SIN_CUPO = ESTADOS_RESERVA[2]  # "CANCELADA": sus cupos ya se devolvieron
+
+
+class CacheOcupacion:
+    """Acumulados por (tipo, id): nombre, cupos libres, personas por estado y personas por mes y estado."""
+
+    def __init__(self):
+        self._bloqueo = threading.RLock()
+        self._elementos: dict[tuple, dict] = {}
+        self.construido_en: float | None = None
+
+    def cargar(self, filas) -> None:
+        """Reemplaza el contenido con las filas agrupadas de ReservaDAO.resumen_ocupacion."""
+        elementos = {}
+        for fila in filas:
+            clave = (fila['tipo'], fila['id'])
+            elemento = elementos.get(clave)
+            if elemento is None:
+                elemento = elementos[clave] = {'nombre': fila['nombre'], 'cupos_disponibles': int(fila['cupos_disponibles']),
+                                               'reservas': {}, 'por_estado': {}, 'por_periodo': {}}
+            if fila['estado'] is not None:
+                self._sumar(elemento, fila['estado'], fila['periodo'], int(fila['personas']), int(fila['reservas']))
+        with self._bloqueo:
+            self._elementos = elementos
+            self.construido_en = time.monotonic()
+
+    @staticmethod
+    def _sumar(elemento: dict, estado: str, periodo: str, personas: int, reservas: int) -> None:
+        elemento['reservas'][estado] = elemento['reservas'].get(estado, 0) + reservas
+        elemento['por_estado'][estado] = elemento['por_estado'].get(estado, 0) + personas
+        mes = elemento['por_periodo'].setdefault(periodo, {})
+        mes[estado] = mes.get(estado, 0) + personas
+
+    def registrar(self, clave: tuple, estado: str, periodo: str, personas: int) -> None:
+        """Suma una reserva nueva y descuenta sus cupos."""
+        with self._bloqueo:
+            elemento = self._elementos.get(clave)
+            if elemento is not None:
+                self._sumar(elemento, estado, periodo, personas, 1)
+                elemento['cupos_disponibles'] -= personas
+
+    def mover(self, clave: tuple, periodo: str, personas: int, estado_anterior: str, estado_nuevo: str,
+              cupos_devueltos: int = 0) -> None:
+        """Pasa una reserva de un estado a otro (y suma los cupos devueltos, si los hay)."""
+        with self._bloqueo:
+            elemento = self._elementos.get(clave)
+            if elemento is not None:
+                self._sumar(elemento, estado_anterior, periodo, -personas, -1)
+                self._sumar(elemento, estado_nuevo, periodo, personas, 1)
+                elemento['cupos_disponibles'] += cupos_devueltos
+
+    def elementos(self) -> list[tuple]:
+        """Copia de los acumulados. Retorna lista de tuplas (clave, dict)"""
+        with self._bloqueo:
+            return [(clave, {**elemento, 'reservas': dict(elemento['reservas']), 'por_estado': dict(elemento['por_estado']),
+                             'por_periodo': {mes: dict(v) for mes, v in elemento['por_periodo'].items()}})
+                    for clave, elemento in self._elementos.items()]
+
+
+_cache = CacheOcupacion()
+
+
+def _clave(reserva: ReservaDTO) -> tuple:
+    """Clave (tipo, id) del paquete o destino reservado. Retorna tupla"""
+    return ('paquete', reserva.paquete_id) if reserva.paquete_id else ('destino', reserva.destino_id)
+
+
+def _periodo(reserva: ReservaDTO) -> str:
+    """Mes de la reserva como AAAA-MM (igual que la consulta agrupada). Retorna str"""
+    return str(reserva.fecha_reserva)[:7]
+
+
+@trazar_metodos("servicio")
+class OcupacionService:
+    """Reporte de ocupación (factor de carga) de paquetes y destinos sobre la caché compartida del proceso."""
+
+    def __init__(self, reserva_dao: ReservaDAO | None = None, cache: CacheOcupacion | None = None):
+        """Inicializa el servicio con su DAO y la caché (por defecto la compartida). Permite inyección de dependencias."""
+        self.reserva_dao = reserva_dao or ReservaDAO()
+        self.cache = cache or _cache
+
+    def reporte_ocupacion(self, tipo: str | None = None) -> list[dict]:
+        """Ocupación de cada paquete y destino activo (o solo del tipo dado), de mayor a menor factor de carga:
+        capacidad, ocupados, cupos libres, factor_carga (ocupados / capacidad), reservas y personas por estado y
+        personas por mes y estado. Retorna Lista de dicts"""
+        if tipo is not None and tipo not in TIPOS_OCUPACION:
+            raise ValidacionError(f"Tipo no válido. Debe ser uno de: {', '.join(TIPOS_OCUPACION)}")
+        construido = self.cache.construido_en
+        if construido is None or time.monotonic() - construido > SEGUNDOS_CACHE_OCUPACION:
+            self.reconstruir()
+
+        reporte = []
+        for (tipo_elemento, id), elemento in self.cache.elementos():
+            if tipo is not None and tipo_elemento != tipo:
+                continue
+            ocupados = sum(personas for estado, personas in elemento['por_estado'].items() if estado != ESTADO_SIN_CUPO)
+            capacidad = ocupados + elemento['cupos_disponibles']
+            reporte.append({
+                'tipo': tipo_elemento,
+                'id': id,
+                'nombre': elemento['nombre'],
+                'capacidad': capacidad,
+                'ocupados': ocupados,
+                'cupos_disponibles': elemento['cupos_disponibles'],
+                'factor_carga': round(ocupados / capacidad, 4) if capacidad else 0.0,
+                'reservas': {estado: n for estado, n in elemento['reservas'].items() if n},
+                'por_estado': {estado: n for estado, n in elemento['por_estado'].items() if n},
+                'por_periodo': {mes: {estado: n for estado, n in estados.items() if n}
+                                for mes, estados in sorted(elemento['por_periodo'].items())},
+            })
+        reporte.sort(key=lambda fila: (-fila['factor_carga'], fila['tipo'], fila['id']))
+        return reporte
+
+    def reconstruir(self) -> None:
+        """Vuelve a leer la ocupación desde la base de datos (una consulta agrupada)."""
+        self.cache.cargar(self.reserva_dao.resumen_ocupacion())
+
+    def registrar_reserva(self, reserva: ReservaDTO) -> None:
+        """Refleja una reserva nueva (si la caché aún no se construyó no hace nada)."""
+        self.cache.registrar(_clave(reserva), reserva.estado, _periodo(reserva), reserva.numero_personas)
+
+    def cambiar_estado(self, reserva: ReservaDTO, estado_nuevo: str, devolver_cupos: bool = False) -> None:
+        """Refleja el paso de la reserva (con su estado anterior) a estado_nuevo; devolver_cupos si la
+        operación devolvió sus cupos al paquete o destino."""
+        self.cache.mover(_clave(reserva), _periodo(reserva), reserva.numero_personas, reserva.estado, estado_nuevo,
+                         reserva.numero_personas if devolver_cupos else 0)
+
+    def invalidar(self) -> None:
+        """Fuerza la relectura en el próximo reporte (tras cambios masivos o del catálogo)."""
+        self.cache.construido_en = None
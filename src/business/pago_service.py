@@ -5,13 +5,22 @@ Intermediario entre la UI y el DAO para mantener separación de capas.
 Reemplaza completamente a pago_manager.py (eliminando redundancia).
 """
 
+from collections.abc import Iterator
+
+from src.business.ocupacion_service import OcupacionService
+from src.config.db_connection import lecturas_del_primario
 from src.dao.pago_dao import PagoDAO
 from src.dao.reserva_dao import ReservaDAO
+from src.dto.lotes import PagoBatch
 from src.dto.pago_dto import PagoDTO
-from src.utils.constants import METODOS_PAGO
+from src.utils.constants import ESTADOS_PAGO, METODOS_PAGO, POR_PAGINA_DEFECTO, TAMANO_LOTE_COLUMNAR, TAMANO_LOTE_PROCESOS
 from src.utils.exceptions import ValidacionError
+from src.utils.metricas import pagos_procesados
+from src.utils.tracing import trazar_metodos
+from src.utils.utils import calcular_paginacion, resultado_paginado
 
 
+@trazar_metodos("servicio")
 class PagoService:
     """Servicio para gestión de pagos."""
     
@@ -19,6 +28,7 @@ class PagoService:
         """Inicializa el servicio con sus DAOs."""
         self.pago_dao = PagoDAO()
         self.reserva_dao = ReservaDAO()
+        self.ocupacion = OcupacionService(self.reserva_dao)
     
     def procesar_pago(self, reserva_id: int, metodo_pago: str) -> int:
         """Procesa un pago completado y marca la reserva como pagada. Retorna ID del pago creado"""
@@ -29,8 +39,9 @@ class PagoService:
         if metodo_pago not in METODOS_PAGO:
             raise ValidacionError(f"Método de pago inválido. Métodos válidos: {', '.join(METODOS_PAGO)}")
         
-        # Obtener la reserva
-        reserva = self.reserva_dao.obtener_por_id(reserva_id)
+        # Obtener la reserva (del primario: una réplica atrasada permitiría registrar un segundo pago)
+        with lecturas_del_primario():
+            reserva = self.reserva_dao.obtener_por_id(reserva_id)
         if not reserva:
             raise ValidacionError("La reserva no existe")
         
@@ -45,7 +56,9 @@ class PagoService:
         pago_id = self.pago_dao.registrar_pago_completado(reserva_id, monto, metodo_pago)
         
         # Marcar la reserva como pagada
-        self.reserva_dao.marcar_como_pagada(reserva_id)
+        if self.reserva_dao.marcar_como_pagada(reserva_id):
+            self.ocupacion.cambiar_estado(reserva, "PAGADA")
+        pagos_procesados.inc(metodo=metodo_pago)
         
         return pago_id
     
@@ -63,32 +76,77 @@ class PagoService:
         
         return False
     
-    def obtener_historial_pagos(self, reserva_id: int) -> list[PagoDTO]:
-        """Retorna el historial de todos los pagos de una reserva. Retorna Lista de PagoDTO de la reserva"""
+    def obtener_historial_pagos(self, reserva_id: int, incluir_historico: bool = False) -> list[PagoDTO]:
+        """Retorna el historial de todos los pagos de una reserva (también archivados si incluir_historico). Retorna Lista de PagoDTO de la reserva"""
         if reserva_id <= 0:
             raise ValidacionError("El ID de la reserva debe ser mayor a 0")
         
-        return self.pago_dao.obtener_por_reserva(reserva_id)
+        return self.pago_dao.obtener_por_reserva(reserva_id, incluir_historico)
     
-    def generar_reporte_ventas(self, fecha_inicio: str, fecha_fin: str) -> dict:
-        """Genera un reporte de ventas con total y listado de pagos en un periodo. Retorna Diccionario con datos del reporte"""
-        if not fecha_inicio or not fecha_fin:
-            raise ValidacionError("Las fechas de inicio y fin son requeridas")
+    def historial_cliente(self, usuario_id: int, incluir_historico: bool = False) -> list[dict]:
+        """Historial de pagos de un cliente, cada uno con su reserva y el tipo y nombre de lo reservado (una sola
+        consulta). Retorna Lista de dicts (id, reserva_id, monto, metodo, estado, fecha_pago, tipo, nombre)"""
+        if usuario_id <= 0:
+            raise ValidacionError("El ID del usuario debe ser mayor a 0")
         
-        # Obtener total del periodo
-        total = self.pago_dao.obtener_total_por_periodo(fecha_inicio, fecha_fin)
-        
-        # Obtener listado de pagos
-        pagos = self.pago_dao.listar_por_fecha(fecha_inicio, fecha_fin)
+        return self.pago_dao.historial_cliente(usuario_id, incluir_historico)
+    
+    def generar_reporte_ventas(self, fecha_inicio: str, fecha_fin: str, incluir_historico: bool = False) -> dict:
+        """Genera un reporte de ventas con total, total por método y pagos de un periodo (incluir_historico suma los
+        pagos archivados). Los pagos van en un PagoBatch (iterable de PagoDTO) y los totales se calculan sobre sus
+        columnas, sin una segunda consulta. Retorna Diccionario con datos del reporte"""
+        pagos = self.lote_pagos_periodo(fecha_inicio, fecha_fin, incluir_historico)
+        completados = pagos.mascara('estado', (ESTADOS_PAGO[1],))  # Solo "COMPLETADO" suma ventas
         
         return {
             'fecha_inicio': fecha_inicio,
             'fecha_fin': fecha_fin,
-            'total': total or 0,
+            'total': pagos.suma('monto', completados),
             'cantidad_pagos': len(pagos),
+            'por_metodo': pagos.suma_por('metodo', 'monto', completados),
             'pagos': pagos
         }
     
+    def lote_pagos_periodo(self, fecha_inicio: str, fecha_fin: str, incluir_historico: bool = False,
+                           tamano_lote: int = TAMANO_LOTE_COLUMNAR) -> PagoBatch:
+        """Pagos del periodo en un lote columnar, leídos por tramos de tamano_lote. Retorna PagoBatch"""
+        if not fecha_inicio or not fecha_fin:
+            raise ValidacionError("Las fechas de inicio y fin son requeridas")
+        if tamano_lote <= 0:
+            raise ValidacionError("El tamaño de lote debe ser mayor a 0")
+        
+        pagos = PagoBatch()
+        ultimo_id = 0
+        while True:
+            tramo = self.pago_dao.lote_columnar_por_fecha(fecha_inicio, fecha_fin, ultimo_id, tamano_lote, incluir_historico)
+            pagos.extender(tramo)
+            if len(tramo) < tamano_lote:
+                return pagos
+            ultimo_id = tramo[-1].id
+    
+    def listar_pagos_pagina(self, pagina: int = 1, por_pagina: int = POR_PAGINA_DEFECTO,
+                            fecha_inicio: str | None = None, fecha_fin: str | None = None) -> dict:
+        """Lista pagos por páginas, opcionalmente de un periodo. Retorna dict de resultado_paginado"""
+        limite, desplazamiento = calcular_paginacion(pagina, por_pagina)
+        pagos = self.pago_dao.listar_pagina(limite, desplazamiento, fecha_inicio, fecha_fin)
+        return resultado_paginado(pagos, self.pago_dao.contar(fecha_inicio, fecha_fin), pagina, por_pagina)
+    
+    def iterar_pagos_periodo(self, fecha_inicio: str, fecha_fin: str, tamano_lote: int = TAMANO_LOTE_PROCESOS,
+                             incluir_historico: bool = False) -> Iterator[PagoDTO]:
+        """Recorre los pagos del periodo por lotes, sin cargarlos todos en memoria. Retorna Iterador de PagoDTO"""
+        if not fecha_inicio or not fecha_fin:
+            raise ValidacionError("Las fechas de inicio y fin son requeridas")
+        if tamano_lote <= 0:
+            raise ValidacionError("El tamaño de lote debe ser mayor a 0")
+        
+        ultimo_id = 0
+        while True:
+            lote = self.pago_dao.listar_lote_por_fecha(fecha_inicio, fecha_fin, ultimo_id, tamano_lote, incluir_historico)
+            yield from lote
+            if len(lote) < tamano_lote:
+                return
+            ultimo_id = lote[-1].id
+    
     def calcular_monto_reserva(self, reserva_id: int) -> float:
         """Calcula el monto total que debe pagarse por una reserva. Retorna Monto total de la reserva"""
         if reserva_id <= 0:
@@ -4,14 +4,38 @@ Encapsula la lógica de negocio relacionada con paquetes turísticos.
 Intermediario entre la UI y el DAO para mantener separación de capas.
 """
 
-from datetime import datetime
+from bisect import bisect_right
+from datetime import datetime, timedelta
 
+from src.business.busqueda_service import BusquedaService
+from src.business.disponibilidad_service import DisponibilidadService
+from src.business.ocupacion_service import OcupacionService
+from src.dao.destino_dao import DestinoDAO
 from src.dao.paquete_actividad_dao import PaqueteActividadDAO
 from src.dao.paquete_dao import PaqueteDAO
 from src.dto.paquete_dto import PaqueteDTO
+from src.utils.constants import (
+    FORMATO_FECHA_ISO,
+    MSG_ERROR_FECHA_INVALIDA,
+    ORDENES_BUSQUEDA_PAQUETES,
+    POR_PAGINA_DEFECTO,
+    RANGOS_PRECIO_BUSQUEDA,
+)
 from src.utils.exceptions import ValidacionError
+from src.utils.tracing import trazar_metodos
+from src.utils.utils import calcular_paginacion, calcular_precio_con_iva, resultado_paginado
+from src.utils.validators import validar_fecha
 
+# Clave de orden de cada criterio de buscar_paquetes (el ID desempata para que la paginación sea estable)
+_CLAVES_ORDEN = {
+    'precio': lambda p: (p.precio_total, p.id),
+    'precio_desc': lambda p: (-p.precio_total, p.id),
+    'fecha': lambda p: (p.fecha_inicio, p.id),
+    'cupos': lambda p: (-p.cupos_disponibles, p.id),
+}
 
+
+@trazar_metodos("servicio")
 class PaqueteService:
     """Servicio para gestión de paquetes turísticos."""
     
@@ -19,6 +43,10 @@ class PaqueteService:
         """Inicializa el servicio con su DAO. Permite inyección de dependencias."""
         self.paquete_dao = paquete_dao or PaqueteDAO()
         self.paquete_actividad_dao = PaqueteActividadDAO()
+        self.destino_dao = DestinoDAO()
+        self.disponibilidad = DisponibilidadService(self.paquete_dao)
+        self.busqueda = BusquedaService()
+        self.ocupacion = OcupacionService()
     
     def crear_paquete(
         self,
@@ -64,6 +92,9 @@ class PaqueteService:
         
         paquete_id = self.paquete_dao.crear(paquete)
         paquete.id = paquete_id
+        self.busqueda.indexar('paquete', paquete_id, paquete.nombre, paquete.descripcion)
+        self.ocupacion.invalidar()
+        self.disponibilidad.registrar(paquete)
         
         # Asociar destino al paquete si se proporcionó
         if destino_id:
@@ -82,6 +113,12 @@ class PaqueteService:
         """Lista todos los paquetes activos. Retorna Lista de PaqueteDTO"""
         return self.paquete_dao.listar_todos()
     
+    def listar_paquetes_pagina(self, pagina: int = 1, por_pagina: int = POR_PAGINA_DEFECTO) -> dict:
+        """Lista paquetes activos por páginas. Retorna dict de resultado_paginado"""
+        limite, desplazamiento = calcular_paginacion(pagina, por_pagina)
+        paquetes = self.paquete_dao.listar_pagina(limite, desplazamiento)
+        return resultado_paginado(paquetes, self.paquete_dao.contar(), pagina, por_pagina)
+    
     def listar_todos_paquetes_admin(self) -> list[dict]:
         """Lista TODOS los paquetes incluyendo inactivos (para admin). Retorna Lista de dicts con info de paquetes"""
         return self.paquete_dao.listar_todos_admin()
@@ -91,11 +128,103 @@ class PaqueteService:
         todos = self.paquete_dao.listar_todos()
         return [p for p in todos if p.cupos_disponibles > 0]
     
+    def listar_paquetes_en_fechas(self, fecha_desde: str, fecha_hasta: str, cupos_minimos: int = 1) -> list[PaqueteDTO]:
+        """Paquetes activos cuyo viaje se cruza con [fecha_desde, fecha_hasta] (AAAA-MM-DD, ambos días incluidos) y
+        tienen al menos cupos_minimos cupos, según el índice de disponibilidad. Retorna Lista de PaqueteDTO por fecha de inicio"""
+        desde, hasta = self._leer_fecha(fecha_desde), self._leer_fecha(fecha_hasta)
+        if not desde or not hasta:
+            raise ValidacionError("Debe indicar la fecha de inicio y de fin del rango")
+        ids = self.disponibilidad.paquetes_en_fechas(desde, hasta + timedelta(days=1, microseconds=-1), cupos_minimos)
+        return self.paquete_dao.listar_por_ids(ids)
+    
+    def buscar_paquetes(
+        self,
+        fecha_desde: str | None = None,
+        fecha_hasta: str | None = None,
+        precio_min: int | None = None,
+        precio_max: int | None = None,
+        con_iva: bool = False,
+        cupos_minimos: int = 1,
+        destino_id: int | None = None,
+        politica_id: int | None = None,
+        orden: str = 'precio',
+        pagina: int = 1,
+        por_pagina: int = POR_PAGINA_DEFECTO
+    ) -> dict:
+        """Búsqueda de paquetes por filtros para clientes: viaje dentro de [fecha_desde, fecha_hasta] (AAAA-MM-DD),
+        precio entre precio_min y precio_max (con IVA si con_iva), cupos libres, destino y política. Lee los
+        candidatos en una consulta y calcula en memoria los resultados y las facetas; cada faceta cuenta con los
+        demás filtros aplicados, no el propio, para mostrar cuántos quedarían al cambiarlo.
+        Retorna dict de resultado_paginado más 'facetas' (destinos, politicas, precios)"""
+        limite, desplazamiento = calcular_paginacion(pagina, por_pagina)
+        if orden not in ORDENES_BUSQUEDA_PAQUETES:
+            raise ValidacionError(f"Orden no válido. Debe ser uno de: {', '.join(ORDENES_BUSQUEDA_PAQUETES)}")
+        if cupos_minimos < 1:
+            raise ValidacionError("Los cupos mínimos deben ser al menos 1")
+        if precio_min is not None and precio_max is not None and precio_min > precio_max:
+            raise ValidacionError("El precio mínimo no puede ser mayor al precio máximo")
+        desde = self._leer_fecha(fecha_desde)
+        hasta = self._leer_fecha(fecha_hasta)
+        if desde and hasta and hasta < desde:
+            raise ValidacionError(MSG_ERROR_FECHA_INVALIDA)
+        
+        # fecha_hasta incluye todo ese día
+        filas = self.paquete_dao.listar_para_busqueda(cupos_minimos, desde, hasta + timedelta(days=1) if hasta else None)
+        precio = calcular_precio_con_iva if con_iva else int
+        
+        resultados = []
+        por_destino, por_politica, nombres_politica = {}, {}, {}
+        por_precio = [0] * (len(RANGOS_PRECIO_BUSQUEDA) + 1)
+        for paquete, nombre_politica, destinos in filas:
+            valor = precio(paquete.precio_total)
+            cumple_precio = (precio_min is None or valor >= precio_min) and (precio_max is None or valor <= precio_max)
+            cumple_destino = destino_id is None or destino_id in destinos
+            cumple_politica = politica_id is None or paquete.politica_id == politica_id
+            if cumple_precio and cumple_destino and cumple_politica:
+                resultados.append(paquete)
+            if cumple_precio and cumple_politica:
+                for id in destinos:
+                    por_destino[id] = por_destino.get(id, 0) + 1
+            if cumple_precio and cumple_destino:
+                por_politica[paquete.politica_id] = por_politica.get(paquete.politica_id, 0) + 1
+                nombres_politica[paquete.politica_id] = nombre_politica
+            if cumple_destino and cumple_politica:
+                por_precio[bisect_right(RANGOS_PRECIO_BUSQUEDA, valor)] += 1
+        
+        resultados.sort(key=_CLAVES_ORDEN[orden])
+        nombres_destino = {d.id: d.nombre for d in self.destino_dao.listar_por_ids(list(por_destino))}
+        cortes = (0, *RANGOS_PRECIO_BUSQUEDA, None)
+        facetas = {
+            'destinos': sorted(({'id': id, 'nombre': nombres_destino.get(id), 'cantidad': cantidad}
+                                for id, cantidad in por_destino.items()), key=lambda f: (-f['cantidad'], f['id'])),
+            'politicas': sorted(({'id': id, 'nombre': nombres_politica[id], 'cantidad': cantidad}
+                                 for id, cantidad in por_politica.items()), key=lambda f: f['id']),
+            'precios': [{'desde': cortes[i], 'hasta': cortes[i + 1], 'cantidad': cantidad}
+                        for i, cantidad in enumerate(por_precio)],
+        }
+        pagina_resultados = resultados[desplazamiento:desplazamiento + limite]
+        return {**resultado_paginado(pagina_resultados, len(resultados), pagina, por_pagina), 'facetas': facetas}
+    
+    @staticmethod
+    def _leer_fecha(valor: str | None) -> datetime | None:
+        """Fecha AAAA-MM-DD de un filtro (vacía = sin filtro). Retorna datetime o None"""
+        if not valor:
+            return None
+        if not validar_fecha(valor, FORMATO_FECHA_ISO):
+            raise ValidacionError(f"Fecha no válida: '{valor}'. Use el formato AAAA-MM-DD")
+        return datetime.strptime(valor, FORMATO_FECHA_ISO)
+    
     def reactivar_paquete(self, paquete_id: int) -> bool:
         """Reactiva un paquete desactivado. Retorna True si se reactivó correctamente"""
         if paquete_id <= 0:
             raise ValidacionError("El ID del paquete debe ser mayor a 0")
-        return self.paquete_dao.reactivar(paquete_id)
+        reactivado = self.paquete_dao.reactivar(paquete_id)
+        paquete = self.paquete_dao.obtener_por_id(paquete_id) if reactivado else None
+        if paquete:
+            self.busqueda.indexar('paquete', paquete_id, paquete.nombre, paquete.descripcion)
+            self.ocupacion.invalidar()
+            self.disponibilidad.registrar(paquete)
+        return reactivado
     
     def actualizar_paquete(
         self,
@@ -145,6 +274,9 @@ class PaqueteService:
         success = self.paquete_dao.actualizar(paquete_id, paquete)
         if not success:
             raise ValidacionError(f"No se pudo actualizar el paquete con ID {paquete_id}")
+        self.busqueda.indexar('paquete', paquete_id, paquete.nombre, paquete.descripcion)
+        self.ocupacion.invalidar()
+        self.disponibilidad.registrar(paquete)
         return paquete
     
     def eliminar_paquete(self, paquete_id: int) -> bool:
@@ -157,7 +289,12 @@ class PaqueteService:
         if not paquete_existente:
             raise ValidacionError(f"No existe un paquete con ID {paquete_id}")
         
-        return self.paquete_dao.eliminar(paquete_id)
+        eliminado = self.paquete_dao.eliminar(paquete_id)
+        if eliminado:
+            self.busqueda.desindexar('paquete', paquete_id)
+            self.ocupacion.invalidar()
+            self.disponibilidad.quitar(paquete_id)
+        return eliminado
     
     def obtener_actividades_paquete(self, paquete_id: int) -> list:
         """Obtiene las actividades de un paquete. Retorna Lista de actividades asociadas al paquete"""
@@ -6,8 +6,10 @@ Maneja la lógica de negocio para políticas de cancelación.
 from src.dao.politica_cancelacion_dao import PoliticaCancelacionDAO
 from src.dto.politica_cancelacion_dto import PoliticaCancelacionDTO
 from src.utils.exceptions import ValidacionError
+from src.utils.tracing import trazar_metodos
 
 
+@trazar_metodos("servicio")
 class PoliticaCancelacionService:
     """Servicio para gestión de políticas de cancelación."""
     
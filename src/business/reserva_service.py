@@ -5,19 +5,36 @@ Intermediario entre la UI y el DAO para mantener separación de capas.
 
 """
 
+import time
 from datetime import datetime, timedelta
 
+from src.business.disponibilidad_service import DisponibilidadService
+from src.business.ocupacion_service import OcupacionService
 from src.business.politicas import (
     PoliticaCancelacion,
     PoliticaEstricta,
     PoliticaFlexible,
 )
+from src.config.db_connection import lecturas_del_primario, transaccion
+from src.dao.catalogo_dao import CatalogoDAO
 from src.dao.destino_dao import DestinoDAO
 from src.dao.paquete_dao import PaqueteDAO
+from src.dao.politica_cancelacion_dao import PoliticaCancelacionDAO
 from src.dao.reserva_dao import ReservaDAO
+from src.dto.lotes import ReservaBatch, a_microsegundos
 from src.dto.reserva_dto import ReservaDTO
-from src.utils.constants import ESTADOS_RESERVA
+from src.utils.constants import (
+    DIAS_REFERENCIA_DESTINO,
+    ESTADOS_RESERVA,
+    HORAS_EXPIRACION_PENDIENTE,
+    POR_PAGINA_DEFECTO,
+    TAMANO_LOTE_COLUMNAR,
+    TAMANO_LOTE_PROCESOS,
+)
 from src.utils.exceptions import ValidacionError
+from src.utils.metricas import reservas_canceladas, reservas_completadas, reservas_creadas
+from src.utils.tracing import trazar_metodos
+from src.utils.utils import calcular_paginacion, resultado_paginado
 
 # Máquina de estados: define transiciones válidas
 # Formato: estado_actual -> [estados_permitidos]
@@ -28,8 +45,13 @@ TRANSICIONES_VALIDAS = {
     "COMPLETADA": [],                                # Estado final, no hay más transiciones
     "CANCELADA": []                                  # Estado final, no hay más transiciones
 }
+ESTADOS_CANCELABLES = tuple(estado for estado, destinos in TRANSICIONES_VALIDAS.items() if "CANCELADA" in destinos)
+ESTADOS_CON_INGRESO = ("PAGADA", "CONFIRMADA", "COMPLETADA")
+CLASES_POLITICA = {"Flexible": PoliticaFlexible, "Estricta": PoliticaEstricta}
+MICROSEGUNDOS_DIA = 86_400_000_000
 
 
+@trazar_metodos("servicio")
 class ReservaService:
     """Servicio para gestión de reservas."""
     
@@ -38,20 +60,22 @@ class ReservaService:
         self.reserva_dao = reserva_dao or ReservaDAO()
         self.paquete_dao = paquete_dao or PaqueteDAO()
         self.destino_dao = destino_dao or DestinoDAO()
+        self.disponibilidad = DisponibilidadService(self.paquete_dao)
+        self.ocupacion = OcupacionService(self.reserva_dao)
     
-    def obtener_reserva(self, reserva_id: int) -> ReservaDTO | None:
-        """Obtiene una reserva por ID. Retorna ReservaDTO o None si no existe"""
+    def obtener_reserva(self, reserva_id: int, incluir_historico: bool = False) -> ReservaDTO | None:
+        """Obtiene una reserva por ID (también archivada si incluir_historico). Retorna ReservaDTO o None si no existe"""
         if reserva_id <= 0:
             raise ValidacionError("El ID de la reserva debe ser mayor a 0")
         
-        return self.reserva_dao.obtener_por_id(reserva_id)
+        return self.reserva_dao.obtener_por_id(reserva_id, incluir_historico)
     
-    def listar_reservas_cliente(self, cliente_id: int) -> list[ReservaDTO]:
-        """Lista todas las reservas de un cliente. Retorna Lista de ReservaDTO del cliente"""
+    def listar_reservas_cliente(self, cliente_id: int, incluir_historico: bool = False) -> list[ReservaDTO]:
+        """Lista todas las reservas de un cliente (incluir_historico suma las archivadas). Retorna Lista de ReservaDTO del cliente"""
         if cliente_id <= 0:
             raise ValidacionError("El ID del cliente debe ser mayor a 0")
         
-        return self.reserva_dao.listar_por_cliente(cliente_id)
+        return self.reserva_dao.listar_por_cliente(cliente_id, incluir_historico)
     
     def listar_reservas_paquete(self, paquete_id: int) -> list[ReservaDTO]:
         """Lista todas las reservas de un paquete. Retorna Lista de ReservaDTO del paquete"""
@@ -67,10 +91,90 @@ class ReservaService:
         
         return self.reserva_dao.listar_por_destino(destino_id)
     
+    def listar_reservas_pagina(self, pagina: int = 1, por_pagina: int = POR_PAGINA_DEFECTO,
+                               cliente_id: int | None = None, estado: str | None = None) -> dict:
+        """Lista reservas por páginas, opcionalmente de un cliente y/o estado. Retorna dict de resultado_paginado"""
+        if estado is not None and estado not in ESTADOS_RESERVA:
+            raise ValidacionError(f"Estado no válido. Debe ser uno de: {', '.join(ESTADOS_RESERVA)}")
+        limite, desplazamiento = calcular_paginacion(pagina, por_pagina)
+        reservas = self.reserva_dao.listar_pagina(limite, desplazamiento, cliente_id, estado)
+        return resultado_paginado(reservas, self.reserva_dao.contar(cliente_id, estado), pagina, por_pagina)
+    
     def listar_todas_reservas(self) -> list[ReservaDTO]:
         """Lista todas las reservas del sistema. Retorna Lista de todas las ReservaDTO"""
         return self.reserva_dao.listar_todas()
     
+    def lote_reservas(self, estados: tuple | None = None, tamano_lote: int = TAMANO_LOTE_COLUMNAR) -> ReservaBatch:
+        """Reservas (opcionalmente de ciertos estados) en un lote columnar, leídas por tramos de tamano_lote.
+        Retorna ReservaBatch"""
+        if tamano_lote <= 0:
+            raise ValidacionError("El tamaño de lote debe ser mayor a 0")
+        reservas = ReservaBatch()
+        ultimo_id = 0
+        while True:
+            tramo = self.reserva_dao.lote_columnar(ultimo_id, tamano_lote, estados)
+            reservas.extender(tramo)
+            if len(tramo) < tamano_lote:
+                return reservas
+            ultimo_id = tramo[-1].id
+    
+    def estadisticas_reservas(self) -> dict:
+        """Estadísticas de administración: reservas, montos y personas por estado. Retorna dict"""
+        reservas = self.lote_reservas()
+        return {
+            'reservas': len(reservas),
+            'por_estado': reservas.contar_por('estado'),
+            'monto_por_estado': reservas.suma_por('estado', 'monto_total'),
+            'personas_por_estado': reservas.suma_por('estado', 'numero_personas'),
+            'ingresos': reservas.suma('monto_total', reservas.mascara('estado', ESTADOS_CON_INGRESO)),
+        }
+    
+    def pronosticar_reembolsos(self, fecha: datetime | None = None) -> dict:
+        """Reembolso que correspondería si todas las reservas cancelables se cancelaran en la fecha dada (por
+        defecto ahora), con las mismas reglas de calcular_reembolso. Las PENDIENTE fuera del plazo de aviso no se
+        pueden cancelar y se informan aparte. Retorna dict con totales y desglose por estado"""
+        hoy = a_microsegundos(fecha or datetime.now())
+        reservas = self.lote_reservas(ESTADOS_CANCELABLES)
+        
+        # Fecha de referencia y política de cada origen, resueltas una vez (no una consulta por reserva)
+        catalogo = CatalogoDAO()
+        politicas = {p.id: self._instanciar_politica(p.nombre, p.dias_aviso, p.porcentaje_reembolso)
+                     for p in PoliticaCancelacionDAO().listar_todas()}
+        paquetes = {p['id']: (a_microsegundos(str(p['fecha_inicio'])[:10]), politicas.get(p['politica_id']))
+                    for p in catalogo.listar_paquetes() if p['fecha_inicio']}
+        destinos = {d['id']: politicas.get(d['politica_id']) for d in catalogo.listar_destinos() if d['activo']}
+        desfase_destino = DIAS_REFERENCIA_DESTINO * MICROSEGUNDOS_DIA
+        pendiente = ESTADOS_RESERVA.index("PENDIENTE")
+        
+        reembolso_por_estado = dict.fromkeys(ESTADOS_CANCELABLES, 0)
+        no_cancelables = 0
+        columnas = (reservas.columna(n).tolist() for n in ('estado', 'monto_total', 'paquete_id', 'destino_id', 'fecha_reserva'))
+        for estado, monto, paquete_id, destino_id, fecha_reserva in zip(*columnas):
+            referencia, politica = paquetes.get(paquete_id, (None, None))
+            if not paquete_id and destino_id in destinos:
+                referencia, politica = fecha_reserva + desfase_destino, destinos[destino_id]
+            if politica is None or referencia is None:
+                reembolso = monto  # Sin política aplicable: reembolso completo
+            else:
+                dias = (referencia - hoy) // MICROSEGUNDOS_DIA
+                if dias < politica.dias_aviso and estado == pendiente:
+                    no_cancelables += 1
+                    continue
+                reembolso = politica.calcular_monto_reembolso(monto, dias)
+            reembolso_por_estado[ESTADOS_RESERVA[estado]] += reembolso
+        
+        montos = reservas.suma_por('estado', 'monto_total')
+        cantidades = reservas.contar_por('estado')
+        return {
+            'fecha': fecha or datetime.now(),
+            'reservas': len(reservas),
+            'no_cancelables': no_cancelables,
+            'monto_total': sum(montos.values()),
+            'reembolso_total': sum(reembolso_por_estado.values()),
+            'por_estado': {estado: {'reservas': cantidades[estado], 'monto': montos[estado], 'reembolso': reembolso_por_estado[estado]}
+                           for estado in ESTADOS_CANCELABLES},
+        }
+    
     def cambiar_estado_reserva(self, reserva_id: int, nuevo_estado: str) -> bool:
         """Cambia el estado de una reserva validando transiciones. Retorna True si se actualizó correctamente"""
         if reserva_id <= 0:
@@ -80,8 +184,9 @@ class ReservaService:
         if nuevo_estado not in estados_validos:
             raise ValidacionError(f"Estado no válido. Debe ser uno de: {', '.join(estados_validos)}")
         
-        # Verificar existencia
-        reserva = self.reserva_dao.obtener_por_id(reserva_id)
+        # Verificar existencia (del primario: el estado leído decide la transición)
+        with lecturas_del_primario():
+            reserva = self.reserva_dao.obtener_por_id(reserva_id)
         if not reserva:
             raise ValidacionError(f"No existe una reserva con ID {reserva_id}")
         
@@ -95,17 +200,20 @@ class ReservaService:
                 f"Transiciones válidas desde {estado_actual}: {transiciones_permitidas or 'ninguna'}"
             )
         
-        # Actualizar estado usando el DAO
+        # Actualizar estado usando el DAO (solo si nadie la cambió desde que se leyó)
         if nuevo_estado == "CONFIRMADA":
-            return self.reserva_dao.confirmar(reserva_id)
+            actualizada = self.reserva_dao.confirmar(reserva_id, estado_actual)
         elif nuevo_estado == "CANCELADA":
-            return self.reserva_dao.cancelar(reserva_id)
+            actualizada = self.reserva_dao.cancelar(reserva_id, estado_actual)
         elif nuevo_estado == "PAGADA":
-            return self.reserva_dao.marcar_como_pagada(reserva_id)
+            actualizada = self.reserva_dao.marcar_como_pagada(reserva_id, estado_actual)
         elif nuevo_estado == "COMPLETADA":
-            return self.reserva_dao.completar(reserva_id)
+            actualizada = self.reserva_dao.completar(reserva_id, estado_actual)
         else:
             raise ValidacionError(f"Cambio de estado a '{nuevo_estado}' no implementado")
+        if actualizada:
+            self.ocupacion.cambiar_estado(reserva, nuevo_estado)
+        return actualizada
       
     def crear_reserva_paquete(self, usuario_id: int, paquete_id: int, num_personas: int) -> int:
         """Crea una reserva de paquete y reduce cupos. Retorna ID de la reserva creada"""
@@ -117,8 +225,9 @@ class ReservaService:
         if num_personas <= 0:
             raise ValidacionError("El número de personas debe ser mayor a 0")
         
-        # Validar que el paquete existe
-        paquete = self.paquete_dao.obtener_por_id(paquete_id)
+        # Validar que el paquete existe (del primario: una réplica atrasada podría no tener los cupos al día)
+        with lecturas_del_primario():
+            paquete = self.paquete_dao.obtener_por_id(paquete_id)
         if not paquete:
             raise ValidacionError("El paquete no existe")
         
@@ -154,7 +263,10 @@ class ReservaService:
                         self.paquete_dao.aumentar_cupo(paquete_id)
                     raise ValidacionError("Error al reducir cupos del paquete")
                 cupos_reducidos += 1
+            self.disponibilidad.ajustar_cupos(paquete_id, -num_personas)
+            self.ocupacion.registrar_reserva(reserva)
             
+            reservas_creadas.inc(tipo="paquete")
             return reserva_id
         except Exception as e:
             raise ValidacionError(f"Error al crear reserva: {str(e)}")
@@ -169,8 +281,9 @@ class ReservaService:
         if num_personas <= 0:
             raise ValidacionError("El número de personas debe ser mayor a 0")
         
-        # Validar que el destino existe
-        destino = self.destino_dao.obtener_por_id(destino_id)
+        # Validar que el destino existe (del primario, igual que en crear_reserva_paquete)
+        with lecturas_del_primario():
+            destino = self.destino_dao.obtener_por_id(destino_id)
         if not destino:
             raise ValidacionError("El destino no existe")
         
@@ -206,63 +319,96 @@ class ReservaService:
                         self.destino_dao.aumentar_cupo(destino_id)
                     raise ValidacionError("Error al reducir cupos del destino")
                 cupos_reducidos += 1
+            self.ocupacion.registrar_reserva(reserva)
             
+            reservas_creadas.inc(tipo="destino")
             return reserva_id
         except Exception as e:
             raise ValidacionError(f"Error al crear reserva de destino: {str(e)}")
     
-    def cancelar_reserva(self, reserva_id: int) -> dict:
-        """Cancela una reserva aplicando política de cancelación. Retorna Diccionario con información del reembolso"""
+    def cancelar_reserva(self, reserva_id: int, mostrar_detalle: bool = True) -> dict:
+        """Cancela una reserva aplicando política de cancelación; mostrar_detalle imprime el resumen para la consola.
+        Retorna Diccionario con información del reembolso"""
+        reserva = self._obtener_reserva_cancelable(reserva_id)
+        
+        # Paquete o destino de la reserva (define la fecha de referencia) y su política
+        if reserva.paquete_id:
+            origen = self.paquete_dao.obtener_por_id(reserva.paquete_id)
+        elif reserva.destino_id:
+            origen = self.destino_dao.obtener_por_id(reserva.destino_id)
+        else:
+            origen = None
+        politica = self.obtener_politica_reserva(reserva)
+        
+        reembolso = self.calcular_reembolso(reserva, origen, politica)
+        
+        # Mostrar información de reembolso al cliente
+        if mostrar_detalle:
+            print(f"\n{'='*50}")
+            print("INFORMACIÓN DE CANCELACIÓN")
+            print(f"{'='*50}")
+            print(f"Estado actual de la reserva: {reserva.estado}")
+            print(f"Monto total pagado: ${int(reserva.monto_total):,}".replace(",", "."))
+            print(f"Porcentaje de reembolso: {int(reembolso['porcentaje_reembolso'])}%")
+            print(f"Monto a reembolsar: ${int(reembolso['monto_reembolso']):,}".replace(",", "."))
+            print(f"Detalle: {reembolso['mensaje']}")
+            print(f"{'='*50}\n")
+        
+        return self._aplicar_cancelacion(reserva, reembolso)
+    
+    def _obtener_reserva_cancelable(self, reserva_id: int) -> ReservaDTO:
+        """Obtiene la reserva y valida que su estado permita cancelarla. Retorna ReservaDTO"""
         if reserva_id <= 0:
             raise ValidacionError("El ID de la reserva debe ser mayor a 0")
         
-        # Obtener la reserva
-        reserva = self.reserva_dao.obtener_por_id(reserva_id)
+        with lecturas_del_primario():  # Una réplica atrasada podría mostrar como vigente una reserva ya cancelada
+            reserva = self.reserva_dao.obtener_por_id(reserva_id)
         if not reserva:
             raise ValidacionError("La reserva no existe")
         
         # Validar transición de estado usando máquina de estados
-        estado_actual = reserva.estado
-        if "CANCELADA" not in TRANSICIONES_VALIDAS.get(estado_actual, []):
+        if "CANCELADA" not in TRANSICIONES_VALIDAS.get(reserva.estado, []):
             raise ValidacionError(
-                f"No se puede cancelar una reserva en estado '{estado_actual}'. "
+                f"No se puede cancelar una reserva en estado '{reserva.estado}'. "
                 f"Solo se pueden cancelar reservas en estado: PENDIENTE, PAGADA o CONFIRMADA."
             )
-        
+        return reserva
+    
+    def obtener_politica_reserva(self, reserva: ReservaDTO) -> dict | None:
+        """Política de cancelación del paquete o destino de la reserva. Retorna dict (nombre, dias_aviso, porcentaje_reembolso) o None"""
         from src.config.db_connection import ejecutar_consulta_uno
-        politica = None
-        fecha_referencia = None
         
-        # Verificar política de cancelación para paquetes
         if reserva.paquete_id:
-            paquete = self.paquete_dao.obtener_por_id(reserva.paquete_id)
-            if paquete and paquete.fecha_inicio:
-                fecha_referencia = datetime.strptime(str(paquete.fecha_inicio)[:10], '%Y-%m-%d')
-                
-                politica_sql = """
-                    SELECT pc.nombre, pc.dias_aviso, pc.porcentaje_reembolso
-                    FROM PoliticasCancelacion pc
-                    JOIN Paquetes p ON p.politica_id = pc.id
-                    WHERE p.id = %s
-                """
-                politica = ejecutar_consulta_uno(politica_sql, (reserva.paquete_id,))
-        
-        # Verificar política de cancelación para destinos
-        elif reserva.destino_id:
-            destino = self.destino_dao.obtener_por_id(reserva.destino_id)
-            if destino:
-                fecha_referencia = reserva.fecha_reserva + timedelta(days=30) if isinstance(reserva.fecha_reserva, datetime) else datetime.strptime(str(reserva.fecha_reserva)[:10], '%Y-%m-%d') + timedelta(days=30)
-                
-                politica_sql = """
-                    SELECT pc.nombre, pc.dias_aviso, pc.porcentaje_reembolso
-                    FROM PoliticasCancelacion pc
-                    JOIN Destinos d ON d.politica_id = pc.id
-                    WHERE d.id = %s
-                """
-                politica = ejecutar_consulta_uno(politica_sql, (reserva.destino_id,))
-        
-        # Instanciar política usando polimorfismo simple
-        from src.business.politicas import PoliticaEstricta, PoliticaFlexible
+            politica_sql = """
+                SELECT pc.nombre, pc.dias_aviso, pc.porcentaje_reembolso
+                FROM PoliticasCancelacion pc
+                JOIN Paquetes p ON p.politica_id = pc.id
+                WHERE p.id = %s
+            """
+            return ejecutar_consulta_uno(politica_sql, (reserva.paquete_id,))
+        if reserva.destino_id:
+            politica_sql = """
+                SELECT pc.nombre, pc.dias_aviso, pc.porcentaje_reembolso
+                FROM PoliticasCancelacion pc
+                JOIN Destinos d ON d.politica_id = pc.id
+                WHERE d.id = %s
+            """
+            return ejecutar_consulta_uno(politica_sql, (reserva.destino_id,))
+        return None
+    
+    @staticmethod
+    def _instanciar_politica(nombre: str, dias_aviso: int, porcentaje_reembolso: float) -> PoliticaCancelacion | None:
+        """Objeto de la política si tiene reglas propias (Flexible, Estricta). Retorna PoliticaCancelacion o None"""
+        clase = CLASES_POLITICA.get(nombre)
+        return clase(nombre, dias_aviso, porcentaje_reembolso) if clase else None
+    
+    def calcular_reembolso(self, reserva: ReservaDTO, origen, politica: dict | None) -> dict:
+        """Aplica la política (origen = PaqueteDTO o DestinoDTO de la reserva). Retorna dict con monto_reembolso, porcentaje_reembolso y mensaje"""
+        fecha_referencia = None
+        if reserva.paquete_id and origen and origen.fecha_inicio:
+            fecha_referencia = datetime.strptime(str(origen.fecha_inicio)[:10], '%Y-%m-%d')
+        elif reserva.destino_id and origen:
+            fecha_referencia = reserva.fecha_reserva + timedelta(days=DIAS_REFERENCIA_DESTINO) if isinstance(reserva.fecha_reserva, datetime) else datetime.strptime(str(reserva.fecha_reserva)[:10], '%Y-%m-%d') + timedelta(days=DIAS_REFERENCIA_DESTINO)
         
         monto_reembolso = int(reserva.monto_total)
         porcentaje_reembolso = 100
@@ -274,18 +420,14 @@ class ReservaService:
             dias_aviso = politica['dias_aviso']
             porcentaje_configurado = politica['porcentaje_reembolso']
             
-            politica_obj: PoliticaCancelacion | None = None
-            if nombre_politica == "Flexible":
-                politica_obj = PoliticaFlexible(nombre_politica, dias_aviso, porcentaje_configurado)
-            elif nombre_politica == "Estricta":
-                politica_obj = PoliticaEstricta(nombre_politica, dias_aviso, porcentaje_configurado)
+            politica_obj = self._instanciar_politica(nombre_politica, dias_aviso, porcentaje_configurado)
             
             if politica_obj:
                 hoy = datetime.now()
                 dias_hasta_fecha = (fecha_referencia - hoy).days
                 
                 # Validar restricción para reservas pendientes
-                if dias_hasta_fecha < dias_aviso and estado_actual == "PENDIENTE":
+                if dias_hasta_fecha < dias_aviso and reserva.estado == "PENDIENTE":
                     tipo_reserva = "paquete" if reserva.paquete_id else "destino"
                     raise ValidacionError(
                         f"No se puede cancelar. Política '{nombre_politica}' requiere "
@@ -302,19 +444,11 @@ class ReservaService:
                 else:
                     porcentaje_reembolso = 0
         
-        # Mostrar información de reembolso al cliente
-        print(f"\n{'='*50}")
-        print("INFORMACIÓN DE CANCELACIÓN")
-        print(f"{'='*50}")
-        print(f"Estado actual de la reserva: {estado_actual}")
-        print(f"Monto total pagado: ${int(reserva.monto_total):,}".replace(",", "."))
-        print(f"Porcentaje de reembolso: {int(porcentaje_reembolso)}%")
-        print(f"Monto a reembolsar: ${int(monto_reembolso):,}".replace(",", "."))
-        print(f"Detalle: {mensaje}")
-        print(f"{'='*50}\n")
-        
-        # Cancelar la reserva
-        if not self.reserva_dao.cancelar(reserva_id):
+        return {'monto_reembolso': monto_reembolso, 'porcentaje_reembolso': porcentaje_reembolso, 'mensaje': mensaje}
+    
+    def _aplicar_cancelacion(self, reserva: ReservaDTO, reembolso: dict) -> dict:
+        """Cancela la reserva y devuelve sus cupos. Retorna Diccionario con información del reembolso"""
+        if not self._cancelar_y_devolver_cupos(reserva):
             return {
                 "cancelada": False,
                 "monto_total": int(reserva.monto_total),
@@ -322,30 +456,44 @@ class ReservaService:
                 "monto_reembolso": 0,
                 "mensaje": "Error al cancelar la reserva"
             }
+        self._reflejar_cancelacion(reserva)
         
-        # Devolver los cupos según el tipo de reserva
+        return {
+            "cancelada": True,
+            "monto_total": int(reserva.monto_total),
+            "porcentaje_reembolso": int(reembolso['porcentaje_reembolso']),
+            "monto_reembolso": int(reembolso['monto_reembolso']),
+            "mensaje": reembolso['mensaje']
+        }
+    
+    def _cancelar_y_devolver_cupos(self, reserva: ReservaDTO) -> bool:
+        """Cancela la reserva en la base de datos (si sigue en el estado leído) y devuelve sus cupos.
+        Retorna True si se canceló"""
+        if not self.reserva_dao.cancelar(reserva.id, reserva.estado):  # Ya no está en el estado leído: no se toca
+            return False
         if reserva.paquete_id:
             for _ in range(reserva.numero_personas):
                 self.paquete_dao.aumentar_cupo(reserva.paquete_id)
         elif reserva.destino_id:
             for _ in range(reserva.numero_personas):
                 self.destino_dao.aumentar_cupo(reserva.destino_id)
-        
-        return {
-            "cancelada": True,
-            "monto_total": int(reserva.monto_total),
-            "porcentaje_reembolso": int(porcentaje_reembolso),
-            "monto_reembolso": int(monto_reembolso),
-            "mensaje": mensaje
-        }
+        return True
+    
+    def _reflejar_cancelacion(self, reserva: ReservaDTO) -> None:
+        """Refleja una cancelación ya confirmada en los índices en memoria y en las métricas."""
+        if reserva.paquete_id:
+            self.disponibilidad.ajustar_cupos(reserva.paquete_id, reserva.numero_personas)
+        self.ocupacion.cambiar_estado(reserva, "CANCELADA", devolver_cupos=True)
+        reservas_canceladas.inc(estado_anterior=reserva.estado)
     
     def confirmar_reserva(self, reserva_id: int) -> bool:
         """Confirma una reserva pagada (admin aprueba después del pago). Retorna True si se confirmó correctamente"""
         if reserva_id <= 0:
             raise ValidacionError("El ID de la reserva debe ser mayor a 0")
         
-        # Verificar que la reserva existe
-        reserva = self.reserva_dao.obtener_por_id(reserva_id)
+        # Verificar que la reserva existe (del primario: el estado leído decide la confirmación)
+        with lecturas_del_primario():
+            reserva = self.reserva_dao.obtener_por_id(reserva_id)
         if not reserva:
             raise ValidacionError("La reserva no existe")
         
@@ -354,4 +502,122 @@ class ReservaService:
             raise ValidacionError(f"La reserva debe estar en estado PAGADA para confirmar. Estado actual: {reserva.estado}")
         
         # Confirmar la reserva
-        return self.reserva_dao.confirmar(reserva_id)
+        confirmada = self.reserva_dao.confirmar(reserva_id, reserva.estado)
+        if confirmada:
+            self.ocupacion.cambiar_estado(reserva, "CONFIRMADA")
+        return confirmada
+    
+    # ===== PROCESOS POR LOTES (CLI) =====
+    
+    def completar_reservas_finalizadas(self, hasta: datetime | None = None, tamano_lote: int = TAMANO_LOTE_PROCESOS,
+                                       dry_run: bool = False) -> dict:
+        """Pasa a COMPLETADA las reservas CONFIRMADA cuyo viaje terminó hasta la fecha dada (por defecto ahora):
+        paquetes por fecha_fin y destinos por fecha_reserva + DIAS_REFERENCIA_DESTINO. Actualiza por conjuntos en
+        tramos de `tamano_lote` IDs, cada tramo en su propia transacción. Retorna dict con estadísticas de la ejecución"""
+        if tamano_lote <= 0:
+            raise ValidacionError("El tamaño de lote debe ser mayor a 0")
+        hasta = hasta or datetime.now()
+        reserva_destino_hasta = hasta - timedelta(days=DIAS_REFERENCIA_DESTINO)
+        inicio = time.perf_counter()
+        estadisticas = {'hasta': hasta, 'dry_run': dry_run, 'lotes': 0, 'completadas': 0,
+                        'por_tipo': {'paquete': 0, 'destino': 0}, 'lote_mas_lento_s': 0.0}
+        
+        if dry_run:
+            estadisticas['por_tipo'] = self.reserva_dao.contar_finalizadas(hasta, reserva_destino_hasta)
+        else:
+            ultimo_id = 0
+            while True:
+                tope_id = self.reserva_dao.tope_lote_finalizadas(hasta, reserva_destino_hasta, ultimo_id, tamano_lote)
+                if tope_id is None:
+                    break
+                inicio_lote = time.perf_counter()
+                with transaccion():
+                    por_tipo = self.reserva_dao.completar_finalizadas(hasta, reserva_destino_hasta, ultimo_id, tope_id)
+                estadisticas['lote_mas_lento_s'] = max(estadisticas['lote_mas_lento_s'], time.perf_counter() - inicio_lote)
+                estadisticas['lotes'] += 1
+                for tipo, filas in por_tipo.items():
+                    estadisticas['por_tipo'][tipo] += filas
+                    reservas_completadas.inc(filas, tipo=tipo)
+                ultimo_id = tope_id
+        
+        estadisticas['completadas'] = 0 if dry_run else sum(estadisticas['por_tipo'].values())
+        if estadisticas['completadas']:
+            self.ocupacion.invalidar()  # Actualización por conjuntos: no se sabe qué reservas cambiaron
+        estadisticas['candidatas'] = sum(estadisticas['por_tipo'].values())
+        estadisticas['duracion_s'] = time.perf_counter() - inicio
+        return estadisticas
+    
+    def expirar_reservas_pendientes(self, horas: int = HORAS_EXPIRACION_PENDIENTE, tamano_lote: int = TAMANO_LOTE_PROCESOS,
+                                    dry_run: bool = False) -> dict:
+        """Cancela las reservas PENDIENTE (sin pago) creadas hace más de `horas` y devuelve sus cupos. Retorna dict de resumen"""
+        if horas < 0:
+            raise ValidacionError("Las horas de expiración no pueden ser negativas")
+        creada_antes = datetime.now() - timedelta(hours=horas)
+        
+        def listar(despues_de_id: int, limite: int) -> list[ReservaDTO]:
+            return self.reserva_dao.listar_lote_por_estado("PENDIENTE", despues_de_id, limite, creada_antes=creada_antes)
+        
+        return self._procesar_en_lotes(listar, self._cancelar_y_devolver_cupos, "CANCELADA", tamano_lote, dry_run,
+                                       reflejar=self._reflejar_cancelacion)
+    
+    def confirmar_reservas_pagadas(self, ids: list[int] | None = None, tamano_lote: int = TAMANO_LOTE_PROCESOS,
+                                   dry_run: bool = False) -> dict:
+        """Confirma en bloque las reservas PAGADA (todas o solo los IDs indicados). Retorna dict de resumen;
+        'omitidas' lista los IDs pedidos que no estaban en estado PAGADA"""
+        def listar(despues_de_id: int, limite: int) -> list[ReservaDTO]:
+            return self.reserva_dao.listar_lote_por_estado("PAGADA", despues_de_id, limite, ids=ids)
+        
+        def confirmar(reserva: ReservaDTO) -> bool:
+            return self.reserva_dao.confirmar(reserva.id, reserva.estado)
+        
+        def reflejar(reserva: ReservaDTO) -> None:
+            self.ocupacion.cambiar_estado(reserva, "CONFIRMADA")
+        
+        resumen = self._procesar_en_lotes(listar, confirmar, "CONFIRMADA", tamano_lote, dry_run, reflejar=reflejar)
+        if ids:
+            encontradas = {r['id'] for r in resumen['reservas']}
+            resumen['omitidas'] = sorted(set(ids) - encontradas)
+        return resumen
+    
+    def _procesar_en_lotes(self, listar, procesar, estado_nuevo: str, tamano_lote: int, dry_run: bool,
+                           reflejar=None) -> dict:
+        """Recorre las reservas candidatas por lotes (paginación por ID) y aplica `procesar` a cada una; cada lote
+        es una transacción. `reflejar` actualiza cachés y métricas con las procesadas, solo después del commit del
+        lote (si el lote se revierte no se toca nada). Con dry_run solo lista las candidatas. Retorna dict de resumen"""
+        if tamano_lote <= 0:
+            raise ValidacionError("El tamaño de lote debe ser mayor a 0")
+        
+        resumen = {'dry_run': dry_run, 'lotes': 0, 'candidatas': 0, 'procesadas': 0, 'fallidas': 0, 'reservas': []}
+        ultimo_id = 0
+        while True:
+            lote = listar(ultimo_id, tamano_lote)
+            if not lote:
+                break
+            ultimo_id = lote[-1].id
+            resumen['lotes'] += 1
+            resumen['candidatas'] += len(lote)
+            
+            if dry_run:
+                resumen['reservas'].extend(
+                    {'id': r.id, 'estado_anterior': r.estado, 'estado_nuevo': estado_nuevo, 'error': None} for r in lote
+                )
+            else:
+                procesadas = []
+                with transaccion():
+                    for reserva in lote:
+                        try:
+                            error = None if procesar(reserva) else "La reserva no se actualizó"
+                        except ValidacionError as e:
+                            error = str(e)
+                        if not error:
+                            procesadas.append(reserva)
+                        resumen['fallidas' if error else 'procesadas'] += 1
+                        resumen['reservas'].append(
+                            {'id': reserva.id, 'estado_anterior': reserva.estado, 'estado_nuevo': estado_nuevo, 'error': error}
+                        )
+                if reflejar:
+                    for reserva in procesadas:
+                        reflejar(reserva)
+            if len(lote) < tamano_lote:
+                break
+        return resumen
@@ -0,0 +1,148 @@
+"""Service Layer asíncrono (asyncio)
+
+Versiones async de ReservaService, PagoService y los servicios de catálogo. Reutilizan la lógica
+de negocio de los servicios síncronos y ejecutan sus accesos a datos en el pool de
+src/config/db_async.py: las lecturas independientes se lanzan juntas con asyncio.gather
+(cada una en su propia conexión) y las operaciones que escriben corren completas en un solo hilo.
+
+Uso:
+    reservas = ReservaServiceAsync()
+    resultado = await reservas.cancelar_reserva(reserva_id)
+"""
+
+import asyncio
+
+from src.business.actividad_service import ActividadService
+from src.business.catalogo_service import CatalogoService
+from src.business.destino_service import DestinoService
+from src.business.pago_service import PagoService
+from src.business.paquete_service import PaqueteService
+from src.business.reserva_service import ReservaService
+from src.config.db_async import ejecutar_en_pool
+from src.dto.pago_dto import PagoDTO
+from src.dto.reserva_dto import ReservaDTO
+
+
+async def _sin_resultado():
+    """Corrutina que retorna None (para completar un asyncio.gather)"""
+    return None
+
+
+class ReservaServiceAsync:
+    """Servicio async para gestión de reservas."""
+
+    def __init__(self, servicio: ReservaService | None = None):
+        """Inicializa sobre un ReservaService (permite inyección de dependencias)."""
+        self.servicio = servicio or ReservaService()
+
+    async def obtener_reserva(self, reserva_id: int) -> ReservaDTO | None:
+        """Obtiene una reserva por ID. Retorna ReservaDTO o None"""
+        return await ejecutar_en_pool(self.servicio.obtener_reserva, reserva_id)
+
+    async def listar_reservas_cliente(self, cliente_id: int) -> list[ReservaDTO]:
+        """Lista las reservas de un cliente. Retorna Lista de ReservaDTO"""
+        return await ejecutar_en_pool(self.servicio.listar_reservas_cliente, cliente_id)
+
+    async def crear_reserva_paquete(self, usuario_id: int, paquete_id: int, num_personas: int) -> int:
+        """Crea una reserva de paquete y reduce cupos. Retorna ID de la reserva creada"""
+        return await ejecutar_en_pool(self.servicio.crear_reserva_paquete, usuario_id, paquete_id, num_personas)
+
+    async def crear_reserva_destino(self, usuario_id: int, destino_id: int, num_personas: int) -> int:
+        """Crea una reserva de destino y reduce cupos. Retorna ID de la reserva creada"""
+        return await ejecutar_en_pool(self.servicio.crear_reserva_destino, usuario_id, destino_id, num_personas)
+
+    async def confirmar_reserva(self, reserva_id: int) -> bool:
+        """Confirma una reserva pagada. Retorna True si se confirmó"""
+        return await ejecutar_en_pool(self.servicio.confirmar_reserva, reserva_id)
+
+    async def cancelar_reserva(self, reserva_id: int) -> dict:
+        """Cancela una reserva aplicando su política; el paquete/destino y la política se buscan en paralelo.
+        A diferencia de la versión de consola, no imprime nada. Retorna Diccionario con información del reembolso"""
+        reserva = await ejecutar_en_pool(self.servicio._obtener_reserva_cancelable, reserva_id)
+        if reserva.paquete_id:
+            origen = ejecutar_en_pool(self.servicio.paquete_dao.obtener_por_id, reserva.paquete_id)
+        elif reserva.destino_id:
+            origen = ejecutar_en_pool(self.servicio.destino_dao.obtener_por_id, reserva.destino_id)
+        else:
+            origen = _sin_resultado()
+        origen, politica = await asyncio.gather(origen, ejecutar_en_pool(self.servicio.obtener_politica_reserva, reserva))
+        reembolso = self.servicio.calcular_reembolso(reserva, origen, politica)
+        return await ejecutar_en_pool(self.servicio._aplicar_cancelacion, reserva, reembolso)
+
+
+class PagoServiceAsync:
+    """Servicio async para gestión de pagos."""
+
+    def __init__(self, servicio: PagoService | None = None):
+        """Inicializa sobre un PagoService (permite inyección de dependencias)."""
+        self.servicio = servicio or PagoService()
+
+    async def procesar_pago(self, reserva_id: int, metodo_pago: str) -> int:
+        """Procesa un pago completado y marca la reserva como pagada. Retorna ID del pago creado"""
+        return await ejecutar_en_pool(self.servicio.procesar_pago, reserva_id, metodo_pago)
+
+    async def verificar_estado_pago(self, reserva_id: int) -> bool:
+        """Verifica si existe un pago completado para la reserva. Retorna True si lo hay"""
+        return await ejecutar_en_pool(self.servicio.verificar_estado_pago, reserva_id)
+
+    async def obtener_historial_pagos(self, reserva_id: int) -> list[PagoDTO]:
+        """Pagos de una reserva. Retorna Lista de PagoDTO"""
+        return await ejecutar_en_pool(self.servicio.obtener_historial_pagos, reserva_id)
+
+    async def obtener_historial_pagos_cliente(self, cliente_id: int) -> list[dict]:
+        """Pagos de todas las reservas de un cliente (una sola consulta). Retorna Lista de dicts de PagoService.historial_cliente"""
+        return await ejecutar_en_pool(self.servicio.historial_cliente, cliente_id)
+
+    async def generar_reporte_ventas(self, fecha_inicio: str, fecha_fin: str, incluir_historico: bool = False) -> dict:
+        """Reporte de ventas del periodo (ver PagoService.generar_reporte_ventas). Retorna Diccionario con datos del reporte"""
+        return await ejecutar_en_pool(self.servicio.generar_reporte_ventas, fecha_inicio, fecha_fin, incluir_historico)
+
+
+class CatalogoServiceAsync:
+    """Servicio async de consulta del catálogo (destinos, paquetes y actividades) y de su importación/exportación."""
+
+    def __init__(self, destinos: DestinoService | None = None, paquetes: PaqueteService | None = None,
+                 actividades: ActividadService | None = None, catalogo: CatalogoService | None = None):
+        """Inicializa sobre los servicios síncronos de catálogo (permite inyección de dependencias)."""
+        self.destinos = destinos or DestinoService()
+        self.paquetes = paquetes or PaqueteService()
+        self.actividades = actividades or ActividadService()
+        self.catalogo = catalogo or CatalogoService()
+
+    async def listar_disponibles(self) -> dict:
+        """Destinos, paquetes y actividades disponibles, consultados en paralelo. Retorna dict con las tres listas"""
+        destinos, paquetes, actividades = await asyncio.gather(
+            ejecutar_en_pool(self.destinos.listar_destinos_disponibles),
+            ejecutar_en_pool(self.paquetes.listar_paquetes_disponibles),
+            ejecutar_en_pool(self.actividades.listar_todas_actividades),
+        )
+        return {'destinos': destinos, 'paquetes': paquetes, 'actividades': actividades}
+
+    async def obtener_detalle_paquete(self, paquete_id: int) -> dict | None:
+        """Paquete con sus destinos y actividades, consultados en paralelo. Retorna dict o None si no existe"""
+        paquete, destinos, actividades = await asyncio.gather(
+            ejecutar_en_pool(self.paquetes.obtener_paquete, paquete_id),
+            ejecutar_en_pool(self.paquetes.obtener_destinos_paquete, paquete_id),
+            ejecutar_en_pool(self.paquetes.obtener_actividades_paquete, paquete_id),
+        )
+        if not paquete:
+            return None
+        return {'paquete': paquete, 'destinos': destinos, 'actividades': actividades}
+
+    async def obtener_detalle_destino(self, destino_id: int) -> dict | None:
+        """Destino con sus actividades, consultados en paralelo. Retorna dict o None si no existe"""
+        destino, actividades = await asyncio.gather(
+            ejecutar_en_pool(self.destinos.obtener_destino, destino_id),
+            ejecutar_en_pool(self.actividades.listar_actividades_por_destino, destino_id),
+        )
+        if not destino:
+            return None
+        return {'destino': destino, 'actividades': actividades}
+
+    async def exportar(self, ruta: str) -> dict:
+        """Exporta el catálogo completo (JSON o directorio CSV). Retorna Resumen de lo exportado"""
+        return await ejecutar_en_pool(self.catalogo.exportar, ruta)
+
+    async def importar(self, ruta: str, dry_run: bool = False) -> dict:
+        """Importa (upsert) un catálogo en una sola transacción. Retorna Resumen de diferencias"""
+        return await ejecutar_en_pool(self.catalogo.importar, ruta, dry_run)
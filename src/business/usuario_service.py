@@ -6,9 +6,13 @@ Intermediario entre la UI y el DAO para mantener separación de capas.
 
 from src.dao.usuario_dao import UsuarioDAO
 from src.dto.usuario_dto import UsuarioDTO
+from src.utils.constants import ORDENES_REPORTE_CLIENTES, POR_PAGINA_DEFECTO, ROL_USUARIO_DEFAULT
 from src.utils.exceptions import ValidacionError
+from src.utils.tracing import trazar_metodos
+from src.utils.utils import calcular_paginacion, resultado_paginado
 
 
+@trazar_metodos("servicio")
 class UsuarioService:
     """Servicio para gestión de usuarios."""
     
@@ -59,3 +63,12 @@ class UsuarioService:
     def listar_todos_usuarios(self) -> list[UsuarioDTO]:
         """Lista todos los usuarios. Retorna Lista de UsuarioDTO"""
         return self.usuario_dao.listar_todos()
+    
+    def reporte_clientes(self, orden: str = 'gasto', pagina: int = 1, por_pagina: int = POR_PAGINA_DEFECTO) -> dict:
+        """Reporte de clientes por páginas: reservas, canceladas, tasa de cancelación, gasto y última actividad,
+        ordenado en la base por el criterio dado (mayor gasto primero por defecto). Retorna dict de resultado_paginado"""
+        if orden not in ORDENES_REPORTE_CLIENTES:
+            raise ValidacionError(f"Orden no válido. Debe ser uno de: {', '.join(ORDENES_REPORTE_CLIENTES)}")
+        limite, desplazamiento = calcular_paginacion(pagina, por_pagina)
+        clientes = self.usuario_dao.reporte_clientes(orden, limite, desplazamiento)
+        return resultado_paginado(clientes, self.usuario_dao.contar_por_rol(ROL_USUARIO_DEFAULT), pagina, por_pagina)
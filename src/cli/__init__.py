@@ -0,0 +1 @@
+"""CLI de operaciones administrativas (python -m src.cli)."""
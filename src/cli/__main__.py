@@ -0,0 +1,291 @@
+"""Línea de comandos para tareas administrativas sin menú interactivo.
+
+Ejecución:
+    python -m src.cli catalogo exportar catalogo.json
+    python -m src.cli catalogo exportar catalogo_csv/
+    python -m src.cli catalogo importar catalogo.json [--dry-run]
+    python -m src.cli trazas convertir logs/trazas.jsonl trazas.json
+    python -m src.cli reservas completar [--hasta 2026-10-01] [--batch-size 500] [--dry-run]
+    python -m src.cli reservas expirar [--horas 48] [--dry-run]
+    python -m src.cli reservas confirmar [--ids 10,11,12] [--dry-run]
+    python -m src.cli reportes ventas --desde 2026-01-01 --hasta 2026-01-31 [--formato csv] [--salida ventas.csv] [--incluir-historico]
+    python -m src.cli reportes estadisticas [--salida estadisticas.json]
+    python -m src.cli reportes reembolsos [--fecha 2026-12-01] [--salida reembolsos.json]
+    python -m src.cli reportes ocupacion [--tipo paquete] [--salida ocupacion.json]
+    python -m src.cli historico archivar [--antes-de 2025-01-01] [--batch-size 500] [--pausa 0.05] [--max-lotes N] [--dry-run]
+
+Los procesos de reservas y los reportes escriben JSON (por defecto) o CSV en stdout o en --salida;
+con CSV el resumen del proceso va a stderr.
+"""
+
+import argparse
+import csv
+import json
+import sys
+from contextlib import nullcontext
+from datetime import datetime
+
+from src.business.catalogo_service import CatalogoService
+from src.business.historico_service import HistoricoService
+from src.business.ocupacion_service import TIPOS_OCUPACION, OcupacionService
+from src.business.pago_service import PagoService
+from src.business.reserva_service import ReservaService
+from src.config.db_connection import cerrar_conexion
+from src.dto.mapeo import a_dict
+from src.utils.constants import HORAS_EXPIRACION_PENDIENTE, PAUSA_LOTE_ARCHIVO_S, TAMANO_LOTE_PROCESOS
+from src.utils.tracing import convertir_a_chrome
+
+COLUMNAS_RESERVAS = ["id", "estado_anterior", "estado_nuevo", "error"]
+COLUMNAS_PAGOS = ["id", "reserva_id", "monto", "metodo", "estado", "fecha_pago"]
+
+
+def comando_catalogo_exportar(args) -> int:
+    """Exporta el catálogo completo. Retorna código de salida"""
+    resumen = CatalogoService().exportar(args.ruta)
+    print(json.dumps(resumen, ensure_ascii=False, indent=2))
+    return 0
+
+
+def comando_catalogo_importar(args) -> int:
+    """Importa un catálogo e informa las diferencias aplicadas. Retorna código de salida"""
+    resumen = CatalogoService().importar(args.ruta, dry_run=args.dry_run)
+    print(json.dumps(resumen, ensure_ascii=False, indent=2))
+    return 0
+
+
+def comando_trazas_convertir(args) -> int:
+    """Convierte un JSONL de trazas al JSON que abren chrome://tracing y Perfetto. Retorna código de salida"""
+    print(f"{convertir_a_chrome(args.origen, args.destino)} eventos escritos en {args.destino}")
+    return 0
+
+
+def _fecha(texto: str) -> datetime:
+    """Tipo de argparse para fechas YYYY-MM-DD. Retorna datetime"""
+    try:
+        return datetime.strptime(texto, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Fecha inválida '{texto}' (formato YYYY-MM-DD)")
+
+
+def _lista_ids(texto: str) -> list[int]:
+    """Tipo de argparse para listas de IDs separados por coma. Retorna lista de int"""
+    try:
+        return [int(parte) for parte in texto.split(",") if parte.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Lista de IDs inválida '{texto}' (ej: 10,11,12)")
+
+
+def _abrir_salida(args):
+    """Archivo de --salida o stdout. Retorna context manager con el archivo"""
+    if args.salida:
+        return open(args.salida, "w", encoding="utf-8", newline="")
+    return nullcontext(sys.stdout)
+
+
+def _escribir_proceso(resumen: dict, args) -> int:
+    """Escribe el resultado de un proceso de reservas en JSON o CSV. Retorna código de salida (1 si hubo fallidas)"""
+    with _abrir_salida(args) as salida:
+        if args.formato == "csv":
+            escritor = csv.DictWriter(salida, fieldnames=COLUMNAS_RESERVAS)
+            escritor.writeheader()
+            escritor.writerows(resumen["reservas"])
+            totales = {k: v for k, v in resumen.items() if k != "reservas"}
+            print(json.dumps(totales, ensure_ascii=False), file=sys.stderr)
+        else:
+            json.dump(resumen, salida, ensure_ascii=False, indent=2, default=str)
+            salida.write("\n")
+    return 1 if resumen["fallidas"] else 0
+
+
+def comando_reservas_completar(args) -> int:
+    """Completa las reservas cuyo viaje terminó y escribe las estadísticas de la ejecución. Retorna código de salida"""
+    estadisticas = ReservaService().completar_reservas_finalizadas(args.hasta, args.batch_size, args.dry_run)
+    fila = {k: v for k, v in estadisticas.items() if k != "por_tipo"}
+    fila.update({f"completadas_{tipo}" if not args.dry_run else f"candidatas_{tipo}": n for tipo, n in estadisticas["por_tipo"].items()})
+    with _abrir_salida(args) as salida:
+        if args.formato == "csv":
+            escritor = csv.DictWriter(salida, fieldnames=list(fila))
+            escritor.writeheader()
+            escritor.writerow(fila)
+        else:
+            json.dump(estadisticas, salida, ensure_ascii=False, indent=2, default=str)
+            salida.write("\n")
+    return 0
+
+
+def comando_reservas_expirar(args) -> int:
+    """Cancela las reservas pendientes vencidas. Retorna código de salida"""
+    resumen = ReservaService().expirar_reservas_pendientes(args.horas, args.batch_size, args.dry_run)
+    return _escribir_proceso(resumen, args)
+
+
+def comando_reservas_confirmar(args) -> int:
+    """Confirma en bloque las reservas pagadas. Retorna código de salida"""
+    resumen = ReservaService().confirmar_reservas_pagadas(args.ids, args.batch_size, args.dry_run)
+    return _escribir_proceso(resumen, args)
+
+
+def comando_reportes_ventas(args) -> int:
+    """Reporte de ventas del periodo: total y pagos, leídos por lotes. Retorna código de salida"""
+    servicio = PagoService()
+    desde, hasta = args.desde.strftime("%Y-%m-%d"), args.hasta.strftime("%Y-%m-%d 23:59:59")
+    pagos = servicio.iterar_pagos_periodo(desde, hasta, args.batch_size, args.incluir_historico)
+    total = servicio.pago_dao.obtener_total_por_periodo(desde, hasta, args.incluir_historico) or 0
+    with _abrir_salida(args) as salida:
+        if args.formato == "csv":
+            escritor = csv.DictWriter(salida, fieldnames=COLUMNAS_PAGOS)
+            escritor.writeheader()
+            cantidad = 0
+            for pago in pagos:
+                escritor.writerow({columna: getattr(pago, columna) for columna in COLUMNAS_PAGOS})
+                cantidad += 1
+            print(json.dumps({'fecha_inicio': desde, 'fecha_fin': hasta, 'total': total, 'cantidad_pagos': cantidad},
+                             default=str), file=sys.stderr)
+        else:
+            pagos = [a_dict(pago) for pago in pagos]
+            reporte = {'fecha_inicio': desde, 'fecha_fin': hasta, 'total': total, 'cantidad_pagos': len(pagos), 'pagos': pagos}
+            json.dump(reporte, salida, ensure_ascii=False, indent=2, default=str)
+            salida.write("\n")
+    return 0
+
+
+def _escribir_json(datos: dict | list, args) -> int:
+    """Escribe un reporte en JSON en stdout o en --salida. Retorna código de salida"""
+    with _abrir_salida(args) as salida:
+        json.dump(datos, salida, ensure_ascii=False, indent=2, default=str)
+        salida.write("\n")
+    return 0
+
+
+def comando_reportes_estadisticas(args) -> int:
+    """Reservas, montos y personas por estado (agregados sobre un lote columnar). Retorna código de salida"""
+    return _escribir_json(ReservaService().estadisticas_reservas(), args)
+
+
+def comando_reportes_reembolsos(args) -> int:
+    """Reembolso que correspondería si se cancelaran todas las reservas cancelables. Retorna código de salida"""
+    return _escribir_json(ReservaService().pronosticar_reembolsos(args.fecha), args)
+
+
+def comando_reportes_ocupacion(args) -> int:
+    """Cupos reservados contra capacidad por paquete y destino, por estado y por mes. Retorna código de salida"""
+    return _escribir_json(OcupacionService().reporte_ocupacion(args.tipo), args)
+
+
+def comando_historico_archivar(args) -> int:
+    """Mueve reservas finalizadas antiguas y sus pagos a las tablas históricas. Retorna código de salida"""
+    estadisticas = HistoricoService().archivar(args.antes_de, args.batch_size, args.pausa, args.dry_run, args.max_lotes)
+    with _abrir_salida(args) as salida:
+        if args.formato == "csv":
+            escritor = csv.DictWriter(salida, fieldnames=list(estadisticas))
+            escritor.writeheader()
+            escritor.writerow(estadisticas)
+        else:
+            json.dump(estadisticas, salida, ensure_ascii=False, indent=2, default=str)
+            salida.write("\n")
+    return 0
+
+
+def _argumentos_proceso(parser: argparse.ArgumentParser) -> None:
+    """Opciones comunes de los procesos por lotes"""
+    parser.add_argument("--batch-size", type=int, default=TAMANO_LOTE_PROCESOS,
+                        help=f"Reservas por transacción (por defecto {TAMANO_LOTE_PROCESOS})")
+    parser.add_argument("--dry-run", action="store_true", help="Solo listar las reservas afectadas, sin escribir")
+    _argumentos_salida(parser)
+
+
+def _argumentos_salida(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--formato", choices=["json", "csv"], default="json", help="Formato de salida (por defecto json)")
+    parser.add_argument("--salida", help="Archivo de salida (por defecto stdout)")
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    """Construye el parser de argumentos con todos los subcomandos. Retorna ArgumentParser"""
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="Tareas administrativas de Viajes Aventura")
+    grupos = parser.add_subparsers(dest="grupo", required=True)
+
+    catalogo = grupos.add_parser("catalogo", help="Importar/exportar el catálogo (JSON o directorio CSV)")
+    acciones = catalogo.add_subparsers(dest="accion", required=True)
+
+    exportar = acciones.add_parser("exportar", help="Exportar destinos, actividades y paquetes")
+    exportar.add_argument("ruta", help="Archivo .json o directorio para CSV")
+    exportar.set_defaults(funcion=comando_catalogo_exportar)
+
+    importar = acciones.add_parser("importar", help="Importar (upsert) un catálogo")
+    importar.add_argument("ruta", help="Archivo .json o directorio con CSV")
+    importar.add_argument("--dry-run", action="store_true", help="Solo mostrar diferencias, sin escribir")
+    importar.set_defaults(funcion=comando_catalogo_importar)
+
+    trazas = grupos.add_parser("trazas", help="Herramientas para las trazas (TRACE_MUESTREO)")
+    acciones_trazas = trazas.add_subparsers(dest="accion", required=True)
+    convertir = acciones_trazas.add_parser("convertir", help="Convertir JSONL a JSON de Chrome Trace")
+    convertir.add_argument("origen", help="Archivo JSONL (por defecto se escribe en logs/trazas.jsonl)")
+    convertir.add_argument("destino", help="Archivo JSON de salida")
+    convertir.set_defaults(funcion=comando_trazas_convertir)
+
+    reservas = grupos.add_parser("reservas", help="Procesos por lotes sobre reservas (programables con cron)")
+    acciones_reservas = reservas.add_subparsers(dest="accion", required=True)
+    completar = acciones_reservas.add_parser("completar", help="CONFIRMADA -> COMPLETADA para viajes terminados (por conjuntos)")
+    completar.add_argument("--hasta", type=_fecha, help="Fecha de corte YYYY-MM-DD (por defecto ahora)")
+    _argumentos_proceso(completar)
+    completar.set_defaults(funcion=comando_reservas_completar)
+
+    expirar = acciones_reservas.add_parser("expirar", help="Cancelar reservas PENDIENTE sin pago y devolver cupos")
+    expirar.add_argument("--horas", type=int, default=HORAS_EXPIRACION_PENDIENTE,
+                         help=f"Antigüedad mínima en horas (por defecto {HORAS_EXPIRACION_PENDIENTE})")
+    _argumentos_proceso(expirar)
+    expirar.set_defaults(funcion=comando_reservas_expirar)
+
+    confirmar = acciones_reservas.add_parser("confirmar", help="PAGADA -> CONFIRMADA en bloque")
+    confirmar.add_argument("--ids", type=_lista_ids, help="IDs separados por coma (por defecto todas las PAGADA)")
+    _argumentos_proceso(confirmar)
+    confirmar.set_defaults(funcion=comando_reservas_confirmar)
+
+    reportes = grupos.add_parser("reportes", help="Reportes sin menú interactivo")
+    acciones_reportes = reportes.add_subparsers(dest="accion", required=True)
+    ventas = acciones_reportes.add_parser("ventas", help="Total y pagos de un periodo")
+    ventas.add_argument("--desde", type=_fecha, required=True, help="Fecha inicial YYYY-MM-DD")
+    ventas.add_argument("--hasta", type=_fecha, required=True, help="Fecha final YYYY-MM-DD (incluida)")
+    ventas.add_argument("--batch-size", type=int, default=TAMANO_LOTE_PROCESOS, help="Pagos leídos por consulta")
+    ventas.add_argument("--incluir-historico", action="store_true", help="Sumar los pagos archivados (Pagos_Historico)")
+    _argumentos_salida(ventas)
+    ventas.set_defaults(funcion=comando_reportes_ventas)
+    estadisticas = acciones_reportes.add_parser("estadisticas", help="Reservas, montos y personas por estado")
+    estadisticas.add_argument("--salida", help="Archivo de salida (por defecto stdout)")
+    estadisticas.set_defaults(funcion=comando_reportes_estadisticas)
+    reembolsos = acciones_reportes.add_parser("reembolsos", help="Pronóstico de reembolsos de las reservas cancelables")
+    reembolsos.add_argument("--fecha", type=_fecha, help="Fecha de cancelación supuesta YYYY-MM-DD (por defecto ahora)")
+    reembolsos.add_argument("--salida", help="Archivo de salida (por defecto stdout)")
+    reembolsos.set_defaults(funcion=comando_reportes_reembolsos)
+    ocupacion = acciones_reportes.add_parser("ocupacion", help="Ocupación (factor de carga) de paquetes y destinos")
+    ocupacion.add_argument("--tipo", choices=TIPOS_OCUPACION, help="Solo paquetes o solo destinos")
+    ocupacion.add_argument("--salida", help="Archivo de salida (por defecto stdout)")
+    ocupacion.set_defaults(funcion=comando_reportes_ocupacion)
+
+    historico = grupos.add_parser("historico", help="Archivo de reservas y pagos antiguos")
+    acciones_historico = historico.add_subparsers(dest="accion", required=True)
+    archivar = acciones_historico.add_parser("archivar", help="Mover reservas COMPLETADA/CANCELADA antiguas y sus pagos al histórico")
+    archivar.add_argument("--antes-de", type=_fecha, help="Fecha de corte YYYY-MM-DD (por defecto hace un año)")
+    archivar.add_argument("--pausa", type=float, default=PAUSA_LOTE_ARCHIVO_S,
+                          help=f"Segundos de pausa entre lotes (por defecto {PAUSA_LOTE_ARCHIVO_S})")
+    archivar.add_argument("--max-lotes", type=int, help="Detenerse tras N lotes (el resto queda para la próxima ejecución)")
+    _argumentos_proceso(archivar)
+    archivar.set_defaults(funcion=comando_historico_archivar)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Punto de entrada de la CLI. Retorna código de salida"""
+    args = crear_parser().parse_args(argv)
+    try:
+        return args.funcion(args)
+    except Exception as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    finally:
+        cerrar_conexion()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
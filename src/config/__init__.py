@@ -1,13 +1,25 @@
 from .db_connection import (
     ejecutar_actualizacion,
     ejecutar_consulta,
+    ejecutar_consulta_tuplas,
     ejecutar_consulta_uno,
     ejecutar_insercion,
+    ejecutar_lote,
+    ids_generados,
+    lecturas_del_primario,
+    obtener_backend_activo,
+    transaccion,
 )
 
 __all__ = [
     "ejecutar_actualizacion",
     "ejecutar_consulta",
+    "ejecutar_consulta_tuplas",
     "ejecutar_consulta_uno",
-    "ejecutar_insercion"
+    "ejecutar_insercion",
+    "ejecutar_lote",
+    "ids_generados",
+    "lecturas_del_primario",
+    "obtener_backend_activo",
+    "transaccion",
 ]
\ No newline at end of file
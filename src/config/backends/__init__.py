@@ -0,0 +1,54 @@
+"""Motores de base de datos intercambiables.
+
+El motor se elige con la variable de entorno DB_BACKEND (mysql por defecto, o sqlite).
+Los drivers se importan solo al elegirse, así el backend SQLite no requiere PyMySQL.
+
+Las réplicas de lectura usan el mismo motor: DB_REPLICA_HOST (MySQL) o DB_REPLICA_SQLITE_RUTA
+(SQLite), con una o más réplicas separadas por comas. Usuario, clave, base y puerto de la réplica
+se toman de DB_REPLICA_USER, DB_REPLICA_PASSWORD, DB_REPLICA_NAME y DB_REPLICA_PORT, o del primario.
+"""
+
+import os
+import random
+
+from src.config.backends.base import Backend
+from src.utils.exceptions import BaseDatosError
+
+BACKENDS_DISPONIBLES = ("mysql", "sqlite")
+
+
+def obtener_backend(nombre: str | None = None) -> Backend:
+    """Crea el backend indicado o el de DB_BACKEND. Retorna instancia de Backend"""
+    nombre = (nombre or os.getenv("DB_BACKEND", "mysql")).strip().lower()
+    if nombre == "mysql":
+        from src.config.backends.mysql_backend import MySQLBackend
+        return MySQLBackend()
+    if nombre == "sqlite":
+        from src.config.backends.sqlite_backend import SQLiteBackend
+        return SQLiteBackend()
+    raise BaseDatosError(f"DB_BACKEND no soportado: '{nombre}' (opciones: {', '.join(BACKENDS_DISPONIBLES)})")
+
+
+def obtener_backend_replica(nombre: str | None = None) -> Backend | None:
+    """Crea el backend de una réplica de lectura (al azar si hay varias), del mismo motor que el primario.
+    Retorna instancia de Backend o None si no hay réplicas configuradas"""
+    nombre = (nombre or os.getenv("DB_BACKEND", "mysql")).strip().lower()
+    variable = "DB_REPLICA_SQLITE_RUTA" if nombre == "sqlite" else "DB_REPLICA_HOST"
+    replicas = [valor.strip() for valor in os.getenv(variable, "").split(",") if valor.strip()]
+    if not replicas:
+        return None
+    if nombre == "mysql":
+        from src.config.backends.mysql_backend import MySQLBackend
+        return MySQLBackend(host=random.choice(replicas), prefijo="DB_REPLICA_")
+    if nombre == "sqlite":
+        from src.config.backends.sqlite_backend import SQLiteBackend
+        return SQLiteBackend(ruta=random.choice(replicas))
+    raise BaseDatosError(f"DB_BACKEND no soportado: '{nombre}' (opciones: {', '.join(BACKENDS_DISPONIBLES)})")
+
+
+__all__ = [
+    "Backend",
+    "BACKENDS_DISPONIBLES",
+    "obtener_backend",
+    "obtener_backend_replica",
+]
@@ -0,0 +1,50 @@
+"""Interfaz común de los motores de base de datos.
+
+Cada backend sabe abrir su conexión, adaptar el SQL escrito por los DAOs (dialecto MySQL
+con placeholders %s) y resolver las pocas diferencias de comportamiento que usa db_connection.
+"""
+
+
+class Backend:
+    """Motor de base de datos usado por db_connection. Las subclases implementan conectar()."""
+
+    nombre = ""
+    Error: type[Exception] = Exception  # Excepción base del driver
+
+    def conectar(self):
+        """Abre una conexión nueva cuyas filas se leen como diccionarios. Retorna conexión DB-API"""
+        raise NotImplementedError
+
+    def cursor_tuplas(self, conn):
+        """Cursor cuyas filas son tuplas (para el mapeo posicional de src/dto/mapeo.py). Retorna cursor DB-API"""
+        return conn.cursor()
+
+    def traducir(self, query: str) -> str:
+        """Adapta una sentencia escrita en dialecto MySQL al motor. Retorna string SQL"""
+        return query
+
+    def verificar(self, conn) -> bool:
+        """Comprueba que la conexión siga abierta en el servidor. Retorna True si se puede usar"""
+        return True
+
+    def es_conexion_perdida(self, error: Exception) -> bool:
+        """Retorna True si el error deja la conexión inutilizable (hay que abrir otra)"""
+        return False
+
+    def es_reintentable(self, error: Exception, idempotente: bool) -> bool:
+        """Retorna True si vale la pena reintentar la sentencia. Con idempotente=False (escrituras) solo
+        si el error garantiza que la sentencia no se aplicó"""
+        return False
+
+    def iniciar_transaccion(self, conn) -> None:
+        """Abre una transacción explícita en la conexión"""
+        conn.begin()
+
+    def preparar_cursor_lote(self, cursor) -> None:
+        """Ajusta un cursor antes de usarlo en escrituras masivas"""
+
+    def rango_ids_lote(self, cursor, cantidad: int) -> tuple[int, int] | None:
+        """IDs generados por el último INSERT multi-fila del cursor. Retorna (primer_id, ultimo_id) o None"""
+        if not cursor.lastrowid:
+            return None
+        return cursor.lastrowid, cursor.lastrowid + cantidad - 1
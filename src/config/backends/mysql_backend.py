@@ -0,0 +1,80 @@
+"""Backend MySQL (PyMySQL). Motor de producción del sistema."""
+
+import os
+
+import pymysql
+
+from src.config.backends.base import Backend
+from src.utils import DB_CHARSET, DB_MAX_SENTENCIA_BYTES, DB_PORT_DEFAULT
+
+ER_LOCK_WAIT_TIMEOUT = 1205
+ER_LOCK_DEADLOCK = 1213
+CR_CONN_HOST_ERROR = 2003  # No se pudo conectar (servidor caído o en failover)
+CR_SERVER_GONE_ERROR = 2006  # "MySQL server has gone away": la conexión ya estaba cerrada al enviar
+CR_SERVER_LOST = 2013  # Conexión perdida durante la sentencia: no se sabe si se aplicó
+CR_SERVER_LOST_EXTENDED = 2055
+_CODIGOS_CONEXION_PERDIDA = {CR_SERVER_GONE_ERROR, CR_SERVER_LOST, CR_SERVER_LOST_EXTENDED}
+# Errores tras los que la sentencia seguro no se aplicó: deadlock y lock wait timeout la revierten
+_CODIGOS_SIN_EFECTO = {ER_LOCK_WAIT_TIMEOUT, ER_LOCK_DEADLOCK, CR_CONN_HOST_ERROR, CR_SERVER_GONE_ERROR}
+
+
+def _codigo_error(error: Exception) -> int | None:
+    """Código numérico de un error de PyMySQL. Retorna int o None"""
+    return error.args[0] if error.args and isinstance(error.args[0], int) else None
+
+
+class MySQLBackend(Backend):
+    """Conecta a MySQL con los datos DB_HOST, DB_PORT, DB_NAME, DB_USER y DB_PASSWORD del entorno.
+    Una réplica de lectura usa host y las variables DB_REPLICA_* (las que falten se toman del primario)."""
+
+    nombre = "mysql"
+    Error = pymysql.MySQLError
+
+    def __init__(self, host: str | None = None, prefijo: str = "DB_"):
+        def leer(variable: str, defecto: str) -> str:
+            return os.getenv(prefijo + variable) or os.getenv("DB_" + variable, defecto)
+
+        self.host = host or leer("HOST", "localhost")
+        self.name = leer("NAME", "")
+        self.user = leer("USER", "root")
+        self.passwd = leer("PASSWORD", "")
+        self.port = int(leer("PORT", str(DB_PORT_DEFAULT)))
+
+    def conectar(self):
+        """Abre una conexión PyMySQL con DictCursor. Retorna pymysql.Connection"""
+        return pymysql.connect(
+            user=self.user,
+            password=self.passwd,
+            host=self.host,
+            database=self.name,
+            port=self.port,
+            charset=DB_CHARSET,
+            cursorclass=pymysql.cursors.DictCursor
+        )
+
+    def verificar(self, conn) -> bool:
+        """Ping al servidor sin reconexión automática (db_connection abre la nueva). Retorna True si respondió"""
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except pymysql.MySQLError:
+            return False
+
+    def es_conexion_perdida(self, error: Exception) -> bool:
+        """InterfaceError es usar una conexión ya cerrada por PyMySQL"""
+        return isinstance(error, pymysql.err.InterfaceError) or _codigo_error(error) in _CODIGOS_CONEXION_PERDIDA
+
+    def es_reintentable(self, error: Exception, idempotente: bool) -> bool:
+        if isinstance(error, pymysql.err.InterfaceError) or _codigo_error(error) in _CODIGOS_SIN_EFECTO:
+            return True
+        return idempotente and _codigo_error(error) in _CODIGOS_CONEXION_PERDIDA
+
+    def cursor_tuplas(self, conn):
+        """La conexión usa DictCursor por defecto: se pide el cursor base de PyMySQL. Retorna pymysql.cursors.Cursor"""
+        return conn.cursor(pymysql.cursors.Cursor)
+
+    def preparar_cursor_lote(self, cursor) -> None:
+        """Sube max_stmt_length para que PyMySQL envíe cada bloque como UN solo INSERT multi-fila.
+        Así lastrowid es el primer ID del bloque (requiere auto_increment_increment = 1 y
+        max_allowed_packet >= DB_MAX_SENTENCIA_BYTES)"""
+        cursor.max_stmt_length = DB_MAX_SENTENCIA_BYTES
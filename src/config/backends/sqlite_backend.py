@@ -0,0 +1,171 @@
+"""Backend SQLite para ejecuciones locales, pruebas y benchmarks sin servidor MySQL.
+
+Los DAOs siguen escribiendo SQL en dialecto MySQL; este módulo lo adapta:
+    - Placeholders %s -> ? (y %% -> %)
+    - INSERT ... ON DUPLICATE KEY UPDATE c=VALUES(c) -> ON CONFLICT DO UPDATE SET c=excluded.c
+    - Esquema de database/init_db.sql: ENUM -> TEXT + CHECK, AUTO_INCREMENT -> AUTOINCREMENT,
+      INDEX en línea -> CREATE INDEX aparte, sin ENGINE/CREATE DATABASE/USER/GRANT/USE
+
+Variables de entorno:
+    DB_SQLITE_RUTA         Archivo de base de datos (por defecto ":memory:", compartida en el proceso).
+                           Para escrituras concurrentes desde varios hilos conviene un archivo (modo WAL)
+    DB_SQLITE_DATOS_DEMO   "0" para crear el esquema sin los datos de ejemplo de init_db.sql
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from datetime import date, datetime
+from functools import lru_cache
+from pathlib import Path
+
+from src.config.backends.base import Backend
+
+RUTA_ESQUEMA = Path(__file__).resolve().parents[3] / "database" / "init_db.sql"
+URI_MEMORIA = "file:viajes_aventura?mode=memory&cache=shared"
+SEGUNDOS_ESPERA_BLOQUEO = 30  # Espera máxima por el bloqueo de escritura entre conexiones
+
+_SENTENCIAS_OMITIDAS = re.compile(r"^(DROP\s+DATABASE|DROP\s+USER|CREATE\s+DATABASE|CREATE\s+USER|GRANT|FLUSH|USE)\b", re.IGNORECASE)
+_CREATE_TABLE = re.compile(r"^CREATE\s+TABLE\s+(\w+)\s*\((.*)\)[^)]*$", re.IGNORECASE | re.DOTALL)
+_INDICE = re.compile(r"^(UNIQUE\s+)?(?:INDEX|KEY)\s+(\w+)\s*\((.*)\)$", re.IGNORECASE | re.DOTALL)
+_ENUM = re.compile(r"^(\w+)\s+ENUM\s*\((.*?)\)(.*)$", re.IGNORECASE | re.DOTALL)
+_AUTO_INCREMENT = re.compile(r"\b\w*INT\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b", re.IGNORECASE)
+_DEFAULT_AHORA = re.compile(r"DEFAULT\s+CURRENT_TIMESTAMP", re.IGNORECASE)
+_ON_DUPLICATE = re.compile(r"ON\s+DUPLICATE\s+KEY\s+UPDATE\s+(.*)$", re.IGNORECASE | re.DOTALL)
+_VALUES_COLUMNA = re.compile(r"VALUES\((\w+)\)", re.IGNORECASE)
+_PLACEHOLDER = re.compile(r"%([s%])")
+
+_bloqueo_esquema = threading.Lock()
+
+# Fechas como texto ISO ("YYYY-MM-DD HH:MM:SS"), comparable con los strings que usan los DAOs
+sqlite3.register_adapter(datetime, lambda valor: valor.isoformat(" "))
+sqlite3.register_adapter(date, lambda valor: valor.isoformat())
+sqlite3.register_converter("DATETIME", lambda valor: datetime.fromisoformat(valor.decode()))
+
+
+def _fila_a_dict(cursor, fila) -> dict:
+    """row_factory equivalente a DictCursor de PyMySQL. Retorna dict columna -> valor"""
+    return {columna[0]: valor for columna, valor in zip(cursor.description, fila)}
+
+
+def _separar_elementos(cuerpo: str) -> list[str]:
+    """Divide el cuerpo de un CREATE TABLE por las comas de primer nivel. Retorna Lista de definiciones"""
+    elementos, actual, profundidad = [], [], 0
+    for caracter in cuerpo:
+        if caracter == "(":
+            profundidad += 1
+        elif caracter == ")":
+            profundidad -= 1
+        if caracter == "," and profundidad == 0:
+            elementos.append("".join(actual).strip())
+            actual = []
+        else:
+            actual.append(caracter)
+    if "".join(actual).strip():
+        elementos.append("".join(actual).strip())
+    return elementos
+
+
+def _traducir_create_table(tabla: str, cuerpo: str) -> list[str]:
+    """Traduce un CREATE TABLE de MySQL. Retorna Lista con el CREATE TABLE y sus CREATE INDEX"""
+    columnas, indices = [], []
+    for elemento in _separar_elementos(cuerpo):
+        indice = _INDICE.match(elemento)
+        if indice:
+            unico, nombre, campos = indice.groups()
+            # Los nombres de índice son globales en SQLite: se prefijan con la tabla
+            tipo = "UNIQUE INDEX" if unico else "INDEX"
+            indices.append(f"CREATE {tipo} IF NOT EXISTS {tabla}_{nombre} ON {tabla} ({campos})")
+            continue
+        elemento = _AUTO_INCREMENT.sub("INTEGER PRIMARY KEY AUTOINCREMENT", elemento)
+        elemento = _DEFAULT_AHORA.sub("DEFAULT (datetime('now', 'localtime'))", elemento)
+        enum = _ENUM.match(elemento)
+        if enum:
+            columna, valores, resto = enum.groups()
+            elemento = f"{columna} TEXT{resto} CHECK ({columna} IN ({valores}))"
+        columnas.append(elemento)
+    definicion = f"CREATE TABLE IF NOT EXISTS {tabla} (\n    " + ",\n    ".join(columnas) + "\n)"
+    return [definicion] + indices
+
+
+def traducir_esquema(script: str, con_datos: bool = True) -> list[str]:
+    """Convierte un script MySQL (init_db.sql) en sentencias SQLite. Retorna Lista de sentencias"""
+    lineas = [linea for linea in script.splitlines() if not linea.strip().startswith("--")]
+    sentencias = []
+    for sentencia in re.split(r";\s*$", "\n".join(lineas), flags=re.MULTILINE):
+        sentencia = sentencia.strip()
+        if not sentencia or _SENTENCIAS_OMITIDAS.match(sentencia):
+            continue
+        tabla = _CREATE_TABLE.match(sentencia)
+        if tabla:
+            sentencias.extend(_traducir_create_table(*tabla.groups()))
+        elif sentencia.upper().startswith("INSERT"):
+            if con_datos:
+                sentencias.append(sentencia)
+        else:
+            sentencias.append(sentencia)
+    return sentencias
+
+
+@lru_cache(maxsize=1024)
+def traducir_sql(query: str) -> str:
+    """Adapta una sentencia de los DAOs (dialecto MySQL) a SQLite. Retorna string SQL"""
+    upsert = _ON_DUPLICATE.search(query)
+    if upsert:
+        actualizaciones = _VALUES_COLUMNA.sub(r"excluded.\1", upsert.group(1))
+        query = query[:upsert.start()] + "ON CONFLICT DO UPDATE SET " + actualizaciones
+    return _PLACEHOLDER.sub(lambda m: "?" if m.group(1) == "s" else "%", query)
+
+
+class SQLiteBackend(Backend):
+    """Base SQLite en archivo o en memoria, con el esquema de init_db.sql creado al primer uso."""
+
+    nombre = "sqlite"
+    Error = sqlite3.Error
+
+    def __init__(self, ruta: str | None = None):
+        self.ruta = ruta or os.getenv("DB_SQLITE_RUTA", ":memory:")
+        self.con_datos = os.getenv("DB_SQLITE_DATOS_DEMO", "1") != "0"
+
+    def conectar(self):
+        """Abre la conexión, activa claves foráneas y crea el esquema si la base está vacía. Retorna sqlite3.Connection"""
+        destino = URI_MEMORIA if self.ruta == ":memory:" else Path(self.ruta).resolve().as_uri()
+        conn = sqlite3.connect(destino, uri=True, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False,
+                               timeout=SEGUNDOS_ESPERA_BLOQUEO)
+        conn.row_factory = _fila_a_dict
+        conn.execute("PRAGMA foreign_keys = ON")
+        if self.ruta != ":memory:":
+            conn.execute("PRAGMA journal_mode = WAL")  # Lectores no bloquean al escritor
+        with _bloqueo_esquema:
+            if not conn.execute("SELECT COUNT(*) AS total FROM sqlite_master WHERE type = 'table'").fetchone()['total']:
+                self.crear_esquema(conn)
+        return conn
+
+    def crear_esquema(self, conn) -> None:
+        """Crea tablas, índices y (opcionalmente) datos de ejemplo desde database/init_db.sql"""
+        for sentencia in traducir_esquema(RUTA_ESQUEMA.read_text(encoding="utf-8"), self.con_datos):
+            conn.execute(sentencia)
+        conn.commit()
+
+    def cursor_tuplas(self, conn):
+        """Cursor sin la row_factory de diccionarios de la conexión. Retorna sqlite3.Cursor"""
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        return cursor
+
+    def traducir(self, query: str) -> str:
+        return traducir_sql(query)
+
+    def iniciar_transaccion(self, conn) -> None:
+        """BEGIN IMMEDIATE toma el bloqueo de escritura al inicio: evita que dos transacciones que
+        leen y luego escriben fallen con SQLITE_BUSY al intentar subir de nivel su bloqueo"""
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+
+    def rango_ids_lote(self, cursor, cantidad: int) -> tuple[int, int] | None:
+        """executemany de sqlite3 no actualiza lastrowid: se usa last_insert_rowid() de la conexión"""
+        ultimo = cursor.connection.execute("SELECT last_insert_rowid() AS id").fetchone()['id']
+        if not ultimo:
+            return None
+        return ultimo - cantidad + 1, ultimo
@@ -0,0 +1,207 @@
+"""Caché de resultados de las consultas SQL.
+
+db_connection guarda el resultado de cada SELECT por su SQL normalizado y sus parámetros, en un
+LRU acotado por memoria (tamaño aproximado de las filas). Cada entrada queda etiquetada con las
+tablas que lee (FROM/JOIN) y las escrituras de ejecutar_insercion, ejecutar_actualizacion y
+ejecutar_lote descartan las entradas de las tablas que modifican, así que dentro del proceso una
+lectura repetida no vuelve a la base de datos pero tampoco devuelve datos anteriores a una
+escritura. Los cambios hechos por otros procesos se ven cuando la entrada vence.
+
+No se guardan las lecturas dentro de transaccion() (pueden ver escrituras sin confirmar), las que
+usan funciones no deterministas (NOW(), RAND()...) ni las que bloquean filas (FOR UPDATE).
+
+Variables de entorno:
+    DB_CACHE_CONSULTAS              "1" activa la caché (desactivada por defecto)
+    DB_CACHE_CONSULTAS_MB           Memoria máxima aproximada (por defecto 32 MB)
+    DB_CACHE_CONSULTAS_SEGUNDOS     Vigencia de cada entrada (por defecto 60 s)
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
+
+_RE_ESPACIOS = re.compile(r"\s+")
+_RE_LECTURA = re.compile(r"^\s*(?:SELECT|WITH)\b", re.IGNORECASE)
+_RE_TABLAS_LECTURA = re.compile(r"\b(?:FROM|JOIN)\s+`?(\w+)", re.IGNORECASE)
+_RE_TABLAS_ESCRITURA = re.compile(r"\b(?:INTO|UPDATE|FROM|JOIN|TABLE)\s+`?(\w+)", re.IGNORECASE)
+_RE_NO_CACHEABLE = re.compile(
+    r"\b(?:NOW|CURDATE|CURTIME|SYSDATE|UTC_TIMESTAMP|RAND|RANDOM|UUID|LAST_INSERT_ID)\s*\("
+    r"|\bCURRENT_(?:DATE|TIME|TIMESTAMP)\b|\bFOR\s+UPDATE\b|\bLOCK\s+IN\s+SHARE\s+MODE\b",
+    re.IGNORECASE)
+
+InfoCache = namedtuple("InfoCache", "hits misses entradas bytes")
+Lectura = namedtuple("Lectura", "clave tablas generacion")
+
+
+@lru_cache(maxsize=2048)
+def analizar_lectura(query: str) -> tuple | None:
+    """SQL normalizado (espacios colapsados) y tablas que lee un SELECT. Retorna (sql, frozenset de tablas)
+    o None si la consulta no se puede cachear"""
+    if not _RE_LECTURA.match(query) or _RE_NO_CACHEABLE.search(query):
+        return None
+    tablas = frozenset(tabla.lower() for tabla in _RE_TABLAS_LECTURA.findall(query))
+    if not tablas:
+        return None
+    return _RE_ESPACIOS.sub(" ", query).strip(), tablas
+
+
+@lru_cache(maxsize=2048)
+def tablas_escritura(query: str) -> frozenset:
+    """Tablas que puede modificar una sentencia (de más: también las que solo lee en subconsultas).
+    Retorna frozenset vacío si no se reconoce ninguna"""
+    return frozenset(tabla.lower() for tabla in _RE_TABLAS_ESCRITURA.findall(query))
+
+
+def _clave_parametros(params) -> tuple | None:
+    """Parámetros como tupla hashable. Retorna tupla o None si algún valor no es hashable"""
+    if params is None:
+        clave = ()
+    elif isinstance(params, dict):
+        clave = tuple(sorted(params.items()))
+    elif isinstance(params, (list, tuple)):
+        clave = tuple(params)
+    else:
+        clave = (params,)
+    try:
+        hash(clave)
+    except TypeError:
+        return None
+    return clave
+
+
+def _tamano(resultado) -> int:
+    """Tamaño aproximado en bytes de un resultado (contenedores y valores, sin las claves compartidas). Retorna int"""
+    filas = resultado if isinstance(resultado, list) else [resultado]
+    total = sys.getsizeof(filas)
+    for fila in filas:
+        valores = fila.values() if isinstance(fila, dict) else (fila or ())
+        total += sys.getsizeof(fila) + sum(sys.getsizeof(valor) for valor in valores)
+    return total
+
+
+def _copiar(resultado):
+    """Copia de las filas (los dicts son mutables; las tuplas y los valores no). Retorna misma estructura"""
+    if isinstance(resultado, list):
+        return [dict(fila) if isinstance(fila, dict) else fila for fila in resultado]
+    return dict(resultado) if isinstance(resultado, dict) else resultado
+
+
+class CacheResultados:
+    """LRU de resultados por (modo, SQL, parámetros), acotado por bytes, con índice tabla -> claves."""
+
+    def __init__(self, max_bytes: int, segundos: float, activa: bool = False):
+        self._bloqueo = threading.Lock()
+        self._entradas: OrderedDict = OrderedDict()  # clave -> (resultado, tablas, tamaño, vence_en)
+        self._por_tabla: dict[str, set] = {}
+        # Contadores de escrituras: una lectura que empezó antes de una escritura no se guarda al terminar
+        self._generaciones: dict[str, int] = {}
+        self._generacion_global = 0
+        self.max_bytes = max_bytes
+        self.segundos = segundos
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.activa = activa
+
+    def activar(self) -> None:
+        """Empieza a guardar resultados."""
+        self.activa = True
+
+    def desactivar(self) -> None:
+        """Deja de guardar resultados y descarta los guardados (no se invalidarían mientras está inactiva)."""
+        self.activa = False
+        self.limpiar()
+
+    def preparar(self, query: str, params, modo: str) -> Lectura | None:
+        """Clave y etiquetas de una lectura, tomando la generación de sus tablas antes de ejecutarla.
+        Retorna Lectura o None si no se puede cachear"""
+        analisis = analizar_lectura(query)
+        parametros = _clave_parametros(params)
+        if analisis is None or parametros is None:
+            return None
+        sql, tablas = analisis
+        with self._bloqueo:
+            return Lectura((modo, sql, parametros), tablas, self._generacion(tablas))
+
+    def _generacion(self, tablas: frozenset) -> tuple:
+        return (self._generacion_global, *(self._generaciones.get(tabla, 0) for tabla in sorted(tablas)))
+
+    def obtener(self, lectura: Lectura) -> tuple:
+        """Busca el resultado de una lectura. Retorna (True, copia del resultado) o (False, None)"""
+        with self._bloqueo:
+            entrada = self._entradas.get(lectura.clave)
+            if entrada is not None and entrada[3] < time.monotonic():
+                self._descartar(lectura.clave)
+                entrada = None
+            if entrada is None:
+                self.misses += 1
+                return False, None
+            self._entradas.move_to_end(lectura.clave)
+            self.hits += 1
+            resultado = entrada[0]
+        return True, _copiar(resultado)
+
+    def guardar(self, lectura: Lectura, resultado) -> None:
+        """Guarda el resultado, salvo que una escritura haya tocado sus tablas mientras se leía."""
+        tamano = _tamano(resultado)
+        if tamano > self.max_bytes:
+            return
+        copia = _copiar(resultado)
+        with self._bloqueo:
+            if self._generacion(lectura.tablas) != lectura.generacion:
+                return
+            self._descartar(lectura.clave)
+            self._entradas[lectura.clave] = (copia, lectura.tablas, tamano, time.monotonic() + self.segundos)
+            self.bytes += tamano
+            for tabla in lectura.tablas:
+                self._por_tabla.setdefault(tabla, set()).add(lectura.clave)
+            while self.bytes > self.max_bytes:
+                self._descartar(next(iter(self._entradas)))
+
+    def _descartar(self, clave: tuple) -> None:
+        entrada = self._entradas.pop(clave, None)
+        if entrada is None:
+            return
+        self.bytes -= entrada[2]
+        for tabla in entrada[1]:
+            claves = self._por_tabla.get(tabla)
+            if claves is not None:
+                claves.discard(clave)
+                if not claves:
+                    del self._por_tabla[tabla]
+
+    def invalidar(self, query: str) -> None:
+        """Descarta las lecturas de las tablas que modifica una sentencia (todas, si no se reconocen sus tablas)."""
+        tablas = tablas_escritura(query)
+        if not tablas:
+            self.limpiar()
+            return
+        with self._bloqueo:
+            for tabla in tablas:
+                self._generaciones[tabla] = self._generaciones.get(tabla, 0) + 1
+                for clave in list(self._por_tabla.get(tabla, ())):
+                    self._descartar(clave)
+
+    def limpiar(self) -> None:
+        """Descarta todas las entradas."""
+        with self._bloqueo:
+            self._generacion_global += 1
+            self._entradas.clear()
+            self._por_tabla.clear()
+            self.bytes = 0
+
+    def cache_info(self) -> InfoCache:
+        """Aciertos, fallos, entradas y bytes usados. Retorna InfoCache"""
+        with self._bloqueo:
+            return InfoCache(self.hits, self.misses, len(self._entradas), self.bytes)
+
+
+cache_resultados = CacheResultados(
+    max_bytes=int(float(os.getenv("DB_CACHE_CONSULTAS_MB", "32")) * 1024 * 1024),
+    segundos=float(os.getenv("DB_CACHE_CONSULTAS_SEGUNDOS", "60")),
+    activa=os.getenv("DB_CACHE_CONSULTAS", "0") == "1",
+)
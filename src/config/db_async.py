@@ -0,0 +1,104 @@
+"""Variante asyncio de db_connection.
+
+No hay un driver asíncrono entre las dependencias del proyecto (aiomysql/asyncmy), así que el
+"pool" asíncrono es un ThreadPoolExecutor acotado: cada hilo trabajador tiene su propia conexión
+(las conexiones de db_connection son locales al hilo) y las corrutinas esperan el resultado sin
+bloquear el event loop. Así, consultas independientes lanzadas con asyncio.gather corren en
+paralelo en conexiones distintas, y una operación completa (p. ej. un método de servicio con
+su transacción) se ejecuta entera en un solo hilo con ejecutar_en_pool.
+
+Variables de entorno:
+    DB_POOL_ASYNC_TAMANO    Hilos/conexiones del pool (por defecto 10)
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config.db_connection import (
+    cerrar_conexion,
+    ejecutar_actualizacion,
+    ejecutar_consulta,
+    ejecutar_consulta_uno,
+    ejecutar_insercion,
+)
+
+_pool: ThreadPoolExecutor | None = None
+_bloqueo_pool = threading.Lock()
+
+
+class PoolConexiones(ThreadPoolExecutor):
+    """ThreadPoolExecutor cuyos hilos mantienen su conexión entre tareas; shutdown() también las cierra."""
+
+    def __init__(self, max_workers: int, prefijo: str):
+        self._hilos_iniciados = 0
+        self._bloqueo_hilos = threading.Lock()
+        super().__init__(max_workers=max_workers, thread_name_prefix=prefijo, initializer=self._contar_hilo)
+
+    def _contar_hilo(self) -> None:
+        with self._bloqueo_hilos:
+            self._hilos_iniciados += 1
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """Cierra la conexión de cada hilo y detiene el pool"""
+        with self._bloqueo_hilos:
+            hilos, self._hilos_iniciados = self._hilos_iniciados, 0
+        if hilos:
+            # La barrera obliga a que cada hilo tome exactamente un cierre (la conexión es local al hilo)
+            barrera = threading.Barrier(hilos)
+
+            def cerrar():
+                barrera.wait(timeout=5)
+                cerrar_conexion()
+
+            for _ in range(hilos):
+                self.submit(cerrar)
+        super().shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+def _obtener_pool() -> ThreadPoolExecutor:
+    """Crea el pool al primer uso. Retorna PoolConexiones"""
+    global _pool
+    with _bloqueo_pool:
+        if _pool is None:
+            _pool = PoolConexiones(int(os.getenv("DB_POOL_ASYNC_TAMANO", "10")), "db-async")
+        return _pool
+
+
+async def ejecutar_en_pool(funcion, *args, **kwargs):
+    """Ejecuta una función síncrona (DAO, servicio) en un hilo del pool, con el contexto actual (trazas). Retorna su resultado"""
+    contexto = contextvars.copy_context()
+    llamada = functools.partial(contexto.run, funcion, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(_obtener_pool(), llamada)
+
+
+async def ejecutar_consulta_async(query: str, params=None) -> list:
+    """Ejecuta SELECT que retorna MÚLTIPLES filas. Retorna Lista de diccionarios"""
+    return await ejecutar_en_pool(ejecutar_consulta, query, params)
+
+
+async def ejecutar_consulta_uno_async(query: str, params=None) -> dict | None:
+    """Ejecuta SELECT que retorna UNA SOLA fila. Retorna Diccionario con los campos"""
+    return await ejecutar_en_pool(ejecutar_consulta_uno, query, params)
+
+
+async def ejecutar_insercion_async(query: str, params=None) -> int:
+    """Ejecuta INSERT en la base de datos. Retorna ID autogenerado del registro"""
+    return await ejecutar_en_pool(ejecutar_insercion, query, params)
+
+
+async def ejecutar_actualizacion_async(query: str, params=None) -> int:
+    """Ejecuta UPDATE o DELETE en la base de datos. Retorna Número de filas afectadas"""
+    return await ejecutar_en_pool(ejecutar_actualizacion, query, params)
+
+
+def cerrar_pool_async() -> None:
+    """Cierra la conexión de cada hilo del pool y detiene el pool (llamar al terminar el proceso)"""
+    global _pool
+    with _bloqueo_pool:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
@@ -1,47 +1,69 @@
-"""Módulo de conexión a base de datos MySQL.
+"""Módulo de conexión a base de datos.
 
-Gestiona la conexión a la base de datos MySQL usando PyMySQL.
-Proporciona funciones helper para ejecutar consultas SQL.
+Gestiona la conexión usando el motor elegido con DB_BACKEND (MySQL por defecto, o SQLite;
+ver src/config/backends). Proporciona funciones helper para ejecutar consultas SQL. Las lecturas
+pasan por la caché de resultados de src/config/cache_consultas (si DB_CACHE_CONSULTAS la activa)
+y cada escritura invalida las tablas que modifica.
+
+Una conexión inactiva por más de DB_SEGUNDOS_PING se verifica con ping antes de usarla (wait_timeout
+o un failover pudieron cerrarla) y se reabre si no responde. Los errores transitorios (conexión
+perdida, deadlock, lock wait timeout) se reintentan hasta DB_REINTENTOS veces con backoff
+exponencial y jitter: las lecturas siempre y las escrituras solo si el backend garantiza que la
+sentencia no se aplicó. Dentro de transaccion() no se reintenta: el error anula la transacción.
+
+Con réplicas de lectura configuradas (DB_REPLICA_*, ver src/config/backends) las lecturas van a
+una réplica, salvo dentro de transaccion(), en un bloque lecturas_del_primario() o durante
+DB_REPLICA_RETRASO_MAXIMO_S después de una escritura del mismo hilo (así cada sesión lee lo que
+acaba de escribir aunque la réplica vaya atrasada). Si la réplica no responde se lee del primario.
 """
 
-import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
 
-import pymysql
 from dotenv import load_dotenv
 
-from src.utils import DB_CHARSET, DB_PORT_DEFAULT
+from src.config.backends import obtener_backend, obtener_backend_replica
+from src.config.cache_consultas import cache_resultados
+from src.config.instrumentacion import hay_hooks, notificar_consulta
+from src.utils import (
+    DB_ESPERA_MAXIMA_S,
+    DB_ESPERA_REINTENTO_S,
+    DB_REINTENTOS,
+    DB_REPLICA_RETRASO_MAXIMO_S,
+    DB_SEGUNDOS_PING,
+    DB_TAMANO_LOTE,
+)
 
-_instancia_conexion = None
+# Cada hilo tiene su propia conexión y su propio estado de transacción (las conexiones
+# DB-API no son seguras para compartir entre hilos)
+_estado_hilo = threading.local()
+_RE_INSERT_VALUES = re.compile(r"^\s*INSERT\s.+\sVALUES\s*\(", re.IGNORECASE | re.DOTALL)
+_ultima_escritura = float("-inf")  # Última escritura confirmada por cualquier hilo del proceso
 load_dotenv()
 
 
 class Conexion():
-    """Gestiona la conexión a la base de datos MySQL."""
-
-    def __init__(self):
-        self.host = str(os.getenv("DB_HOST", "localhost"))
-        self.name = str(os.getenv("DB_NAME", ""))
-        self.user = str(os.getenv("DB_USER", "root"))
-        self.passwd = str(os.getenv("DB_PASSWORD", ""))
-        self.port = int(os.getenv("DB_PORT", str(DB_PORT_DEFAULT)))
+    """Gestiona la conexión a la base de datos del backend configurado."""
 
+    def __init__(self, backend=None):
+        self.backend = backend or obtener_backend()
         self.conn = None
+        self.ultimo_uso = 0.0
     
-    def _conectar(self):
+    def _conectar(self, verificar: bool = True):
+        if self.conn and verificar and time.monotonic() - self.ultimo_uso > DB_SEGUNDOS_PING:
+            if not self.backend.verificar(self.conn):
+                self._descartar()
         if not self.conn:
             try:
-                self.conn = pymysql.connect(
-                    user=self.user,
-                    password=self.passwd, 
-                    host=self.host, 
-                    database=self.name,
-                    port=self.port,
-                    charset=DB_CHARSET,
-                    cursorclass=pymysql.cursors.DictCursor
-                )
-            except pymysql.MySQLError as e:
+                self.conn = self.backend.conectar()
+            except self.backend.Error as e:
                 print(f"Error en la conexión a la base de datos: {e}")
                 raise
+        self.ultimo_uso = time.monotonic()
         return self.conn
     
     def _cerrar(self):
@@ -49,57 +71,249 @@ class Conexion():
             self.conn.close()
             self.conn = None
 
+    def _descartar(self):
+        """Suelta una conexión caída (cerrarla también puede fallar); la próxima operación abre otra"""
+        conn, self.conn = self.conn, None
+        if conn:
+            try:
+                conn.close()
+            except self.backend.Error:
+                pass
+
+
+def _transaccion_activa() -> bool:
+    """Retorna True si el hilo actual está dentro de un bloque transaccion()"""
+    return getattr(_estado_hilo, "transaccion_activa", False)
+
+
+def _registrar_escritura(query: str) -> None:
+    """Anota una escritura confirmada: descarta de la caché las lecturas de las tablas que modifica y manda
+    al primario las lecturas siguientes del hilo. Dentro de transaccion() se hace al terminar el bloque:
+    hasta el commit otros hilos siguen leyendo (y guardando) los datos anteriores"""
+    global _ultima_escritura
+    if _transaccion_activa():
+        _estado_hilo.escrituras_transaccion.add(query)
+        return
+    _estado_hilo.ultima_escritura = _ultima_escritura = time.monotonic()
+    cache_resultados.invalidar(query)
+
+
+def _usar_replica() -> bool:
+    """Retorna True si la próxima lectura del hilo puede ir a una réplica"""
+    if _transaccion_activa() or getattr(_estado_hilo, "lecturas_primario", 0):
+        return False
+    if time.monotonic() - getattr(_estado_hilo, "ultima_escritura", float("-inf")) < DB_REPLICA_RETRASO_MAXIMO_S:
+        return False  # Leer lo propio escrito: la réplica puede no tenerlo todavía
+    return _instancia_replica() is not None
+
+
+def _instancia_hilo() -> Conexion:
+    """Retorna la Conexion del hilo actual (sin abrirla)"""
+    instancia = getattr(_estado_hilo, "conexion", None)
+    if instancia is None:
+        instancia = _estado_hilo.conexion = Conexion()
+    return instancia
+
+
+def _instancia_replica() -> Conexion | None:
+    """Retorna la Conexion del hilo a una réplica de lectura (sin abrirla), o None si no hay réplicas configuradas"""
+    if not hasattr(_estado_hilo, "replica"):
+        backend = obtener_backend_replica()
+        _estado_hilo.replica = Conexion(backend) if backend else None
+    return _estado_hilo.replica
+
 
 def obtener_conexion():
-    """Obtiene la conexión a la base de datos."""
-    global _instancia_conexion
-    if _instancia_conexion is None:
-        _instancia_conexion = Conexion()
-    return _instancia_conexion._conectar()
+    """Obtiene la conexión a la base de datos del hilo actual. Fuera de transaccion() la verifica con ping si estuvo inactiva."""
+    return _instancia_hilo()._conectar(verificar=not _transaccion_activa())
+
+
+def obtener_backend_activo():
+    """Retorna el Backend de la conexión del hilo actual (la crea si no existe)"""
+    obtener_conexion()
+    return _estado_hilo.conexion.backend
 
 
 def cerrar_conexion():
-    """Cierra la conexión a la base de datos."""
-    global _instancia_conexion
-    if _instancia_conexion:
-        _instancia_conexion._cerrar()
-        _instancia_conexion = None
+    """Cierra la conexión a la base de datos del hilo actual."""
+    instancia = getattr(_estado_hilo, "conexion", None)
+    if instancia:
+        instancia._cerrar()
+        _estado_hilo.conexion = None
+    replica = getattr(_estado_hilo, "replica", None)
+    if replica:
+        replica._cerrar()
+    if hasattr(_estado_hilo, "replica"):  # La próxima lectura vuelve a leer la configuración
+        del _estado_hilo.replica
 
 
-def _ejecutar_query(query: str, params=None, fetch_mode='all'):
-    """Función privada para ejecutar queries."""
-    conn = obtener_conexion()
-    cursor = conn.cursor()
+def _espera_reintento(intento: int) -> float:
+    """Backoff exponencial con jitter completo: al azar entre 0 y DB_ESPERA_REINTENTO_S * 2^intento (con tope). Retorna segundos"""
+    return random.uniform(0, min(DB_ESPERA_MAXIMA_S, DB_ESPERA_REINTENTO_S * 2 ** intento))
+
+
+def _con_reintentos(operacion, idempotente: bool, instancia: Conexion | None = None):
+    """Ejecuta operacion(conn, backend) con la conexión del hilo (o la instancia dada). Ante un error que el backend marca como
+    reintentable descarta la conexión si se perdió, espera y reintenta (hasta DB_REINTENTOS veces).
+    Retorna el resultado de operacion"""
+    instancia = instancia or _instancia_hilo()
+    backend = instancia.backend
+    for intento in range(DB_REINTENTOS + 1):
+        try:
+            return operacion(instancia._conectar(verificar=not _transaccion_activa()), backend)
+        except backend.Error as e:
+            if _transaccion_activa():  # transaccion() hace el rollback y descarta la conexión si hace falta
+                raise
+            if backend.es_conexion_perdida(e):
+                instancia._descartar()
+            if intento == DB_REINTENTOS or not backend.es_reintentable(e, idempotente):
+                raise
+            time.sleep(_espera_reintento(intento))
+
+
+def _ejecutar_query(query: str, params=None, fetch_mode='all', tuplas: bool = False, replica: bool = False):
+    """Función privada para ejecutar queries (tuplas=True lee filas como tuplas; replica=True lee de la réplica),
+    con reintentos ante errores transitorios."""
+    def operacion(conn, backend):
+        return _ejecutar_sentencia(conn, backend, query, params, fetch_mode, tuplas)
+
+    if replica:
+        instancia = _instancia_replica()
+        try:
+            return _con_reintentos(operacion, idempotente=True, instancia=instancia)
+        except instancia.backend.Error as e:
+            if not instancia.backend.es_reintentable(e, True):
+                print(f"Error ejecutando query: {e}")
+                raise
+            print(f"Réplica de lectura no disponible, se lee del primario: {e}")
+    backend = _instancia_hilo().backend
+    try:
+        return _con_reintentos(operacion, idempotente=fetch_mode not in ('none', 'filas'))
+    except backend.Error as e:
+        print(f"Error ejecutando query: {e}")
+        raise
+
+
+def _ejecutar_sentencia(conn, backend, query: str, params, fetch_mode: str, tuplas: bool):
+    """Ejecuta una sentencia una vez en la conexión dada. Notifica latencia y filas a la instrumentación."""
+    cursor = backend.cursor_tuplas(conn) if tuplas else conn.cursor()
+    inicio = time.perf_counter()
+    filas, error = 0, None
     try:
-        cursor.execute(query, params or ())
+        cursor.execute(backend.traducir(query), params or ())
         
         if fetch_mode == 'all':  # SELECT que retorna muchas filas
-            return cursor.fetchall()
+            resultado = cursor.fetchall()
+            filas = len(resultado)
+            return resultado
         elif fetch_mode == 'one':  # SELECT que retorna una sola fila
-            return cursor.fetchone()
-        elif fetch_mode == 'none':  # INSERT, UPDATE, DELETE
-            conn.commit()
+            resultado = cursor.fetchone()
+            filas = 1 if resultado else 0
+            return resultado
+        elif fetch_mode in ('none', 'filas'):  # INSERT, UPDATE, DELETE
+            if not _transaccion_activa():  # Dentro de transaccion() el commit lo hace el bloque
+                conn.commit()
+            _registrar_escritura(query)
+            filas = max(cursor.rowcount, 0)
+            if fetch_mode == 'filas':  # sqlite3 conserva lastrowid del último INSERT tras un UPDATE
+                return cursor.rowcount
             # Si es INSERT (lastrow>0) retorna ID, si es UPDATE/DELETE (lastrow=0) retorna filas afectadas
             return cursor.lastrowid if cursor.lastrowid > 0 else cursor.rowcount 
 
-    except pymysql.MySQLError as e:
-        if fetch_mode == 'none':  # Si intentó modificar, rollback
+    except backend.Error as e:
+        error = e
+        # Si intentó modificar, rollback (no en una conexión perdida: el servidor ya descartó lo pendiente)
+        if fetch_mode in ('none', 'filas') and not _transaccion_activa() and not backend.es_conexion_perdida(e):
             conn.rollback()
-        print(f"Error ejecutando query: {e}")
         raise
     finally:
         cursor.close()
+        if hay_hooks():
+            notificar_consulta(query, params, time.perf_counter() - inicio, filas, error)
 
 
+def _consultar(query: str, params, fetch_mode: str, tuplas: bool = False):
+    """SELECT a través de la caché de resultados (un acierto no llega a la base de datos) y, si corresponde, de
+    una réplica. Fuera de la caché quedan las lecturas dentro de transaccion() o de lecturas_del_primario(), las
+    que no se pueden cachear y las leídas de una réplica poco después de una escritura (podría no tenerla aún).
+    Retorna el resultado de _ejecutar_query"""
+    replica = _usar_replica()
+    if not cache_resultados.activa or _transaccion_activa() or getattr(_estado_hilo, "lecturas_primario", 0):
+        return _ejecutar_query(query, params, fetch_mode, tuplas, replica)
+    lectura = cache_resultados.preparar(query, params, 'tuplas' if tuplas else fetch_mode)
+    if lectura is None:
+        return _ejecutar_query(query, params, fetch_mode, tuplas, replica)
+    encontrado, resultado = cache_resultados.obtener(lectura)
+    if encontrado:
+        return resultado
+    resultado = _ejecutar_query(query, params, fetch_mode, tuplas, replica)
+    if not replica or time.monotonic() - _ultima_escritura > DB_REPLICA_RETRASO_MAXIMO_S:
+        cache_resultados.guardar(lectura, resultado)
+    return resultado
+
+
+@contextmanager
+def lecturas_del_primario():
+    """Manda al primario, sin pasar por la caché de resultados, las lecturas del bloque: p. ej. validaciones
+    que deciden una escritura o datos que acaba de escribir otro proceso.
+
+    Uso:
+        with lecturas_del_primario():
+            paquete = PaqueteDAO().obtener_por_id(paquete_id)
+    """
+    _estado_hilo.lecturas_primario = getattr(_estado_hilo, "lecturas_primario", 0) + 1
+    try:
+        yield
+    finally:
+        _estado_hilo.lecturas_primario -= 1
+
+
+@contextmanager
+def transaccion():
+    """Agrupa varias escrituras en una sola transacción. Hace commit al salir del bloque o rollback si hay error.
+
+    Uso:
+        with transaccion():
+            ejecutar_insercion(...)
+            ejecutar_lote(...)
+    """
+    conn = obtener_conexion()
+    if _transaccion_activa():  # Bloque anidado: se une a la transacción externa
+        yield conn
+        return
+    instancia = _instancia_hilo()
+    _estado_hilo.transaccion_activa = True
+    _estado_hilo.escrituras_transaccion = set()
+    try:
+        instancia.backend.iniciar_transaccion(conn)
+        yield conn
+        conn.commit()
+    except Exception:
+        try:
+            conn.rollback()
+        except instancia.backend.Error:  # Conexión perdida: el servidor ya descartó la transacción
+            instancia._descartar()
+        raise
+    finally:
+        _estado_hilo.transaccion_activa = False
+        for query in _estado_hilo.escrituras_transaccion:  # Tras el commit (o rollback)
+            _registrar_escritura(query)
+        _estado_hilo.escrituras_transaccion = set()
+
 
 def ejecutar_consulta(query: str, params=None) -> list:
     """Ejecuta SELECT que retorna MÚLTIPLES filas. Retorna Lista de diccionarios"""
-    return _ejecutar_query(query, params, fetch_mode='all')  # type: ignore
+    return _consultar(query, params, fetch_mode='all')  # type: ignore
+
+
+def ejecutar_consulta_tuplas(query: str, params=None) -> list[tuple]:
+    """Ejecuta SELECT que retorna MÚLTIPLES filas como tuplas, en el orden de las columnas del SELECT. Retorna Lista de tuplas"""
+    return _consultar(query, params, fetch_mode='all', tuplas=True)  # type: ignore
 
 
 def ejecutar_consulta_uno(query: str, params=None) -> dict | None:
     """Ejecuta SELECT que retorna UNA SOLA fila. Retorna Diccionario con los campos"""
-    return _ejecutar_query(query, params, fetch_mode='one')  # type: ignore
+    return _consultar(query, params, fetch_mode='one')  # type: ignore
 
 
 def ejecutar_insercion(query: str, params=None) -> int:
@@ -109,4 +323,68 @@ def ejecutar_insercion(query: str, params=None) -> int:
 
 def ejecutar_actualizacion(query: str, params=None) -> int:
     """Ejecuta UPDATE o DELETE en la base de datos. Retorna Número de filas afectadas"""
-    return _ejecutar_query(query, params, fetch_mode='none')  # type: ignore
+    return _ejecutar_query(query, params, fetch_mode='filas')  # type: ignore
+
+
+def ejecutar_lote(query: str, filas: list, chunk_size: int = DB_TAMANO_LOTE) -> dict:
+    """Ejecuta un INSERT/UPDATE/DELETE con muchas filas de parámetros (executemany), en bloques de chunk_size.
+    Retorna dict con 'filas_afectadas' y 'rangos_ids' (lista de tuplas (primer_id, ultimo_id), solo para INSERT)
+
+    En MySQL, PyMySQL reescribe los INSERT ... VALUES (%s, ...) como un único INSERT de múltiples
+    filas por bloque (ver MySQLBackend.preparar_cursor_lote), por lo que los IDs de cada bloque son
+    consecutivos. Cada bloque se confirma en su propia transacción (y se reintenta como una escritura
+    suelta ante errores transitorios), salvo dentro de transaccion(), donde el commit lo hace el bloque externo.
+    """
+    resultado = {'filas_afectadas': 0, 'rangos_ids': []}
+    if not filas:
+        return resultado
+    genera_ids = _RE_INSERT_VALUES.match(query) is not None and "ON DUPLICATE KEY" not in query.upper()
+    backend = _instancia_hilo().backend
+    sql = backend.traducir(query)
+    try:
+        for inicio in range(0, len(filas), chunk_size):
+            bloque = filas[inicio:inicio + chunk_size]
+            filas_bloque, rango = _con_reintentos(
+                lambda conn, backend: _ejecutar_bloque(conn, backend, query, sql, bloque, genera_ids), idempotente=False)
+            resultado['filas_afectadas'] += filas_bloque
+            if rango:
+                resultado['rangos_ids'].append(rango)
+        return resultado
+    except backend.Error as e:
+        print(f"Error ejecutando lote: {e}")
+        raise
+    finally:
+        _registrar_escritura(query)  # Los bloques anteriores al error ya quedaron confirmados
+
+
+def _ejecutar_bloque(conn, backend, query: str, sql: str, bloque: list, genera_ids: bool) -> tuple:
+    """Ejecuta un bloque de ejecutar_lote con executemany y lo confirma (fuera de transaccion()).
+    Retorna (filas afectadas, rango de IDs o None)"""
+    cursor = conn.cursor()
+    backend.preparar_cursor_lote(cursor)
+    inicio_bloque = time.perf_counter()
+    try:
+        try:
+            cursor.executemany(sql, bloque)
+        except backend.Error as e:
+            if hay_hooks():
+                notificar_consulta(query, bloque, time.perf_counter() - inicio_bloque, 0, e)
+            raise
+        if hay_hooks():
+            notificar_consulta(query, bloque, time.perf_counter() - inicio_bloque, max(cursor.rowcount, 0))
+        rango = backend.rango_ids_lote(cursor, len(bloque)) if genera_ids else None
+        if not _transaccion_activa():
+            conn.commit()
+        return cursor.rowcount, rango
+    except backend.Error as e:
+        # Solo se revierte el bloque en curso; los anteriores ya quedaron confirmados
+        if not _transaccion_activa() and not backend.es_conexion_perdida(e):
+            conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def ids_generados(resultado_lote: dict) -> list[int]:
+    """Expande los rangos de IDs de un resultado de ejecutar_lote. Retorna Lista de IDs en orden de inserción"""
+    return [id for primero, ultimo in resultado_lote['rangos_ids'] for id in range(primero, ultimo + 1)]
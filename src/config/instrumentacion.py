@@ -0,0 +1,182 @@
+"""Instrumentación de las consultas SQL.
+
+db_connection notifica cada sentencia ejecutada (latencia, filas, error) a los hooks registrados.
+Por defecto se registra el registro de métricas en proceso, que agrupa por huella normalizada
+del SQL y por método DAO que la originó (sirve para detectar patrones N+1 y consultas calientes),
+y el log de consultas lentas, que escribe las que superan el umbral con sus parámetros ocultos.
+
+Variables de entorno:
+    DB_INSTRUMENTACION              "0" desactiva la instrumentación
+    DB_UMBRAL_CONSULTA_LENTA_MS     Umbral del log de consultas lentas (por defecto 200 ms)
+    DB_LOG_CONSULTAS_LENTAS         Archivo del log (por defecto logs/consultas_lentas.log)
+"""
+
+import logging
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+
+_RE_ESPACIOS = re.compile(r"\s+")
+_RE_TEXTO = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_RE_NUMERO = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_RE_LISTA = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_RE_VALUES_MULTIPLE = re.compile(r"VALUES\s*\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+", re.IGNORECASE)
+
+logger_consultas_lentas = logging.getLogger("viajes_aventura.consultas_lentas")
+
+
+@dataclass
+class EventoConsulta:
+    """Datos de una sentencia ejecutada, entregados a cada hook."""
+    sql: str
+    params: object
+    duracion_s: float
+    filas: int
+    error: Exception | None
+    llamador: str
+
+
+@lru_cache(maxsize=2048)
+def huella_sql(query: str) -> str:
+    """Normaliza una sentencia: sin literales ni espacios extra y con listas colapsadas. Retorna string"""
+    huella = _RE_ESPACIOS.sub(" ", query).strip()
+    huella = _RE_TEXTO.sub("?", huella)
+    huella = huella.replace("%s", "?")
+    huella = _RE_NUMERO.sub("?", huella)
+    huella = _RE_LISTA.sub("(...)", huella)
+    return _RE_VALUES_MULTIPLE.sub("VALUES (...)", huella)
+
+
+def redactar_parametros(params) -> object:
+    """Reemplaza cada parámetro por su tipo, para loguear sin exponer datos. Retorna estructura redactada"""
+    if params is None:
+        return "NULL"
+    if isinstance(params, dict):
+        return {clave: redactar_parametros(valor) for clave, valor in params.items()}
+    if isinstance(params, (list, tuple)):
+        if params and all(isinstance(p, (list, tuple)) for p in params):  # Filas de un lote
+            return f"<{len(params)} filas>"
+        return [redactar_parametros(p) for p in params]
+    return f"<{type(params).__name__}>"
+
+
+def metodo_llamador(profundidad_inicial: int = 2) -> str:
+    """Identifica el método DAO (o la función) que originó la consulta. Retorna 'Clase.metodo' o 'modulo.funcion'"""
+    frame = sys._getframe(profundidad_inicial)
+    respaldo = None
+    while frame is not None:
+        modulo = frame.f_globals.get("__name__", "")
+        if not modulo.startswith("src.config"):
+            instancia = frame.f_locals.get("self")
+            nombre = f"{type(instancia).__name__}.{frame.f_code.co_name}" if instancia is not None else f"{modulo}.{frame.f_code.co_name}"
+            if modulo.startswith("src.dao"):
+                return nombre
+            respaldo = respaldo or nombre
+        frame = frame.f_back
+    return respaldo or "desconocido"
+
+
+class RegistroConsultas:
+    """Métricas en proceso por huella de SQL: ejecuciones, errores, tiempos, filas y llamadores."""
+
+    def __init__(self):
+        self._bloqueo = threading.Lock()
+        self._por_huella: dict[str, dict] = {}
+
+    def __call__(self, evento: EventoConsulta) -> None:
+        huella = huella_sql(evento.sql)
+        with self._bloqueo:
+            datos = self._por_huella.get(huella)
+            if datos is None:
+                datos = self._por_huella[huella] = {
+                    'ejecuciones': 0, 'errores': 0, 'tiempo_total_s': 0.0, 'tiempo_max_s': 0.0,
+                    'filas_total': 0, 'llamadores': Counter(),
+                }
+            datos['ejecuciones'] += 1
+            datos['errores'] += evento.error is not None
+            datos['tiempo_total_s'] += evento.duracion_s
+            datos['tiempo_max_s'] = max(datos['tiempo_max_s'], evento.duracion_s)
+            datos['filas_total'] += evento.filas
+            datos['llamadores'][evento.llamador] += 1
+
+    def estadisticas(self, top: int | None = None) -> list[dict]:
+        """Consultas ordenadas por tiempo total descendente. Retorna Lista de dicts con 'huella' y sus métricas"""
+        with self._bloqueo:
+            filas = [
+                {'huella': huella, **datos, 'llamadores': dict(datos['llamadores']),
+                 'tiempo_medio_ms': round(datos['tiempo_total_s'] / datos['ejecuciones'] * 1000, 3)}
+                for huella, datos in self._por_huella.items()
+            ]
+        filas.sort(key=lambda f: f['tiempo_total_s'], reverse=True)
+        return filas[:top] if top else filas
+
+    def reiniciar(self) -> None:
+        """Borra todas las métricas acumuladas"""
+        with self._bloqueo:
+            self._por_huella.clear()
+
+
+class LogConsultasLentas:
+    """Escribe en el log las consultas que superan el umbral, con los parámetros redactados."""
+
+    def __init__(self, umbral_ms: float):
+        self.umbral_s = umbral_ms / 1000
+
+    def __call__(self, evento: EventoConsulta) -> None:
+        if evento.duracion_s < self.umbral_s:
+            return
+        _configurar_log_lentas()
+        logger_consultas_lentas.warning(
+            "%.1f ms | %s | filas=%d | %s | params=%s",
+            evento.duracion_s * 1000, evento.llamador, evento.filas, huella_sql(evento.sql),
+            redactar_parametros(evento.params),
+        )
+
+
+def _configurar_log_lentas() -> None:
+    """Agrega el FileHandler del log de consultas lentas la primera vez que se usa"""
+    if logger_consultas_lentas.handlers:
+        return
+    ruta = os.getenv("DB_LOG_CONSULTAS_LENTAS", os.path.join("logs", "consultas_lentas.log"))
+    os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+    manejador = logging.FileHandler(ruta, encoding="utf-8", delay=True)
+    manejador.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    logger_consultas_lentas.addHandler(manejador)
+    logger_consultas_lentas.propagate = False  # No ensuciar la consola del menú
+
+
+registro_consultas = RegistroConsultas()
+_hooks: list = []
+if os.getenv("DB_INSTRUMENTACION", "1") != "0":
+    _hooks.extend([registro_consultas, LogConsultasLentas(float(os.getenv("DB_UMBRAL_CONSULTA_LENTA_MS", "200")))])
+
+
+def registrar_hook(hook) -> None:
+    """Agrega una función hook(evento: EventoConsulta) que se llamará tras cada sentencia"""
+    if hook not in _hooks:
+        _hooks.append(hook)
+
+
+def quitar_hook(hook) -> None:
+    """Quita un hook registrado"""
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def hay_hooks() -> bool:
+    """Retorna True si hay algún hook registrado (si no, db_connection evita medir)"""
+    return bool(_hooks)
+
+
+def notificar_consulta(sql: str, params, duracion_s: float, filas: int, error: Exception | None = None) -> None:
+    """Entrega el evento de una sentencia a todos los hooks. Un hook que falla no afecta la consulta"""
+    evento = EventoConsulta(sql, params, duracion_s, filas, error, metodo_llamador(3))
+    for hook in list(_hooks):
+        try:
+            hook(evento)
+        except Exception as e:
+            print(f"Error en hook de instrumentación: {e}")
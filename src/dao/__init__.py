@@ -1,5 +1,7 @@
 from .actividad_dao import ActividadDAO
+from .catalogo_dao import CatalogoDAO
 from .destino_dao import DestinoDAO
+from .historico_dao import HistoricoDAO
 from .pago_dao import PagoDAO
 from .paquete_dao import PaqueteDAO
 from .politica_cancelacion_dao import PoliticaCancelacionDAO
@@ -8,7 +10,9 @@ from .usuario_dao import UsuarioDAO
 
 __all__ = [
     "ActividadDAO",
+    "CatalogoDAO",
     "DestinoDAO",
+    "HistoricoDAO",
     "PagoDAO",
     "PaqueteDAO",
     "PoliticaCancelacionDAO",
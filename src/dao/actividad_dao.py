@@ -1,12 +1,22 @@
 from src.config.db_connection import (
     ejecutar_actualizacion,
     ejecutar_consulta,
+    ejecutar_consulta_tuplas,
     ejecutar_consulta_uno,
     ejecutar_insercion,
+    ejecutar_lote,
+    ids_generados,
 )
 from src.dto.actividad_dto import ActividadDTO
+from src.dto.mapeo import campos_dto, crear_mapeador
+from src.utils.tracing import trazar_metodos
 
+_COLUMNAS_ACTIVIDAD = campos_dto(ActividadDTO)
+_SELECT_ACTIVIDAD = ", ".join(_COLUMNAS_ACTIVIDAD)
+_a_actividad = crear_mapeador(ActividadDTO, _COLUMNAS_ACTIVIDAD)
 
+
+@trazar_metodos("dao")
 class ActividadDAO():
     #Maneja todas las operaciones de base de datos relacionadas con Actividades.
     
@@ -15,24 +25,20 @@ class ActividadDAO():
         sql = "INSERT INTO Actividades (nombre, descripcion, duracion_horas, precio_base, destino_id) VALUES (%s,%s,%s,%s,%s)"
         params = (actividad_dto.nombre, actividad_dto.descripcion, actividad_dto.duracion_horas, actividad_dto.precio_base, actividad_dto.destino_id)
         return ejecutar_insercion(sql, params)
+
+    def crear_lote(self, actividades: list[ActividadDTO]) -> list[int]:
+        """Inserta muchas actividades con INSERTs multi-fila. Retorna Lista de IDs creados (mismo orden)"""
+        sql = "INSERT INTO Actividades (nombre, descripcion, duracion_horas, precio_base, destino_id) VALUES (%s,%s,%s,%s,%s)"
+        filas = [(a.nombre, a.descripcion, a.duracion_horas, a.precio_base, a.destino_id) for a in actividades]
+        return ids_generados(ejecutar_lote(sql, filas))
     
     def obtener_por_id(self, id: int) -> ActividadDTO | None: 
         """Busca actividad por ID. Retorna ActividadDTO o None si no existe"""
-        sql = "SELECT * FROM Actividades WHERE id=%s"
+        sql = f"SELECT {_SELECT_ACTIVIDAD} FROM Actividades WHERE id=%s"
         params = (id,)
-        actividad = ejecutar_consulta_uno(sql, params)
+        filas = ejecutar_consulta_tuplas(sql, params)
         
-        if not actividad:
-            return None
-        
-        return ActividadDTO(
-            id=actividad['id'],
-            nombre=actividad['nombre'],
-            descripcion=actividad['descripcion'],
-            duracion_horas=actividad['duracion_horas'],
-            precio_base=actividad['precio_base'],
-            destino_id=actividad['destino_id']
-        )
+        return _a_actividad(filas[0]) if filas else None
     
     def actualizar(self, id: int, actividad_dto: ActividadDTO) -> bool: 
         """Actualiza datos de la actividad. Retorna True si se actualizó"""
@@ -57,22 +63,23 @@ class ActividadDAO():
     
     def listar_todas(self) -> list[ActividadDTO]:
         """Retorna lista de todas las actividades activas (para clientes). Retorna Lista de ActividadDTO"""
-        sql = "SELECT * FROM Actividades WHERE activo = 1 ORDER BY id ASC"
-        actividades = ejecutar_consulta(sql)        
-        if not actividades:
-            return []
+        sql = f"SELECT {_SELECT_ACTIVIDAD} FROM Actividades WHERE activo = 1 ORDER BY id ASC"
+        actividades = ejecutar_consulta_tuplas(sql)        
+        return list(map(_a_actividad, actividades))
+    
+    def listar_pagina(self, limite: int, desplazamiento: int, destino_id: int | None = None) -> list[ActividadDTO]:
+        """Retorna una página de actividades activas (opcionalmente de un destino), por ID. Retorna Lista de ActividadDTO"""
+        where, params = (" AND destino_id=%s", (destino_id,)) if destino_id is not None else ("", ())
+        sql = f"SELECT {_SELECT_ACTIVIDAD} FROM Actividades WHERE activo = 1{where} ORDER BY id ASC LIMIT %s OFFSET %s"
+        actividades = ejecutar_consulta_tuplas(sql, params + (limite, desplazamiento))
         
-        return [
-            ActividadDTO(
-                id=a['id'],
-                nombre=a['nombre'],
-                descripcion=a['descripcion'],
-                duracion_horas=a['duracion_horas'],
-                precio_base=a['precio_base'],
-                destino_id=a['destino_id']
-            )
-            for a in actividades
-        ]
+        return list(map(_a_actividad, actividades))
+    
+    def contar(self, destino_id: int | None = None) -> int:
+        """Cuenta actividades activas con los mismos filtros de listar_pagina. Retorna int"""
+        where, params = (" AND destino_id=%s", (destino_id,)) if destino_id is not None else ("", ())
+        resultado = ejecutar_consulta_uno(f"SELECT COUNT(*) AS total FROM Actividades WHERE activo = 1{where}", params)
+        return int(resultado['total']) if resultado else 0
     
     def listar_todas_admin(self) -> list[dict]:
         """Retorna TODAS las actividades incluyendo inactivas (para admin). Retorna Lista de dicts"""
@@ -96,21 +103,8 @@ class ActividadDAO():
     
     def listar_por_destino(self, destino_id: int) -> list[ActividadDTO]: 
         """Retorna actividades activas de un destino específico. Retorna Lista de ActividadDTO"""
-        sql = "SELECT * FROM Actividades WHERE destino_id=%s AND activo = 1"
+        sql = f"SELECT {_SELECT_ACTIVIDAD} FROM Actividades WHERE destino_id=%s AND activo = 1"
         params = (destino_id,)
-        actividades = ejecutar_consulta(sql, params)
-        
-        if not actividades:
-            return []
+        actividades = ejecutar_consulta_tuplas(sql, params)
         
-        return [
-            ActividadDTO(
-                id=a['id'],
-                nombre=a['nombre'],
-                descripcion=a['descripcion'],
-                duracion_horas=a['duracion_horas'],
-                precio_base=a['precio_base'],
-                destino_id=a['destino_id']
-            )
-            for a in actividades
-        ]
\ No newline at end of file
+        return list(map(_a_actividad, actividades))
\ No newline at end of file
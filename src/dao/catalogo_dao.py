@@ -0,0 +1,87 @@
+"""DAO para operaciones masivas sobre el catálogo.
+
+Lee y escribe en bloque Destinos, Actividades, Paquetes y sus tablas de relación
+(Paquete_Destino y Paquete_Actividad). Usado por la importación/exportación de catálogos.
+"""
+
+from src.config.db_connection import ejecutar_consulta, ejecutar_lote
+from src.utils.tracing import trazar_metodos
+
+COLUMNAS_DESTINO = ('id', 'nombre', 'descripcion', 'costo_base', 'cupos_disponibles', 'politica_id', 'activo')
+COLUMNAS_ACTIVIDAD = ('id', 'nombre', 'descripcion', 'duracion_horas', 'precio_base', 'destino_id', 'activo')
+COLUMNAS_PAQUETE = ('id', 'nombre', 'descripcion', 'fecha_inicio', 'fecha_fin', 'precio_total', 'cupos_disponibles', 'politica_id', 'activo')
+
+
+def _sql_upsert(tabla: str, columnas: tuple) -> str:
+    """Arma un INSERT ... ON DUPLICATE KEY UPDATE para la tabla. Retorna string SQL"""
+    placeholders = ", ".join(["%s"] * len(columnas))
+    actualizaciones = ", ".join(f"{c}=VALUES({c})" for c in columnas if c != 'id')
+    return f"INSERT INTO {tabla} ({', '.join(columnas)}) VALUES ({placeholders}) ON DUPLICATE KEY UPDATE {actualizaciones}"
+
+
+@trazar_metodos("dao")
+class CatalogoDAO:
+    """Maneja lecturas completas y upserts masivos del catálogo."""
+
+    def listar_destinos(self) -> list[dict]:
+        """Retorna todos los destinos (activos e inactivos). Retorna Lista de dicts"""
+        sql = f"SELECT {', '.join(COLUMNAS_DESTINO)} FROM Destinos ORDER BY id ASC"
+        return ejecutar_consulta(sql) or []
+
+    def listar_actividades(self) -> list[dict]:
+        """Retorna todas las actividades (activas e inactivas). Retorna Lista de dicts"""
+        sql = f"SELECT {', '.join(COLUMNAS_ACTIVIDAD)} FROM Actividades ORDER BY id ASC"
+        return ejecutar_consulta(sql) or []
+
+    def listar_paquetes(self) -> list[dict]:
+        """Retorna todos los paquetes (activos e inactivos). Retorna Lista de dicts"""
+        sql = f"SELECT {', '.join(COLUMNAS_PAQUETE)} FROM Paquetes ORDER BY id ASC"
+        return ejecutar_consulta(sql) or []
+
+    def listar_paquete_destinos(self) -> list[dict]:
+        """Retorna todas las relaciones paquete-destino con su orden de visita. Retorna Lista de dicts"""
+        sql = "SELECT paquete_id, destino_id, orden_visita FROM Paquete_Destino ORDER BY paquete_id ASC, orden_visita ASC"
+        return ejecutar_consulta(sql) or []
+
+    def listar_paquete_actividades(self) -> list[dict]:
+        """Retorna todas las relaciones paquete-actividad. Retorna Lista de dicts"""
+        sql = "SELECT paquete_id, actividad_id FROM Paquete_Actividad ORDER BY paquete_id ASC, actividad_id ASC"
+        return ejecutar_consulta(sql) or []
+
+    def upsert_destinos(self, destinos: list[dict]) -> int:
+        """Inserta o actualiza destinos por ID. Retorna filas afectadas"""
+        filas = [tuple(d[c] for c in COLUMNAS_DESTINO) for d in destinos]
+        return ejecutar_lote(_sql_upsert("Destinos", COLUMNAS_DESTINO), filas)['filas_afectadas']
+
+    def upsert_actividades(self, actividades: list[dict]) -> int:
+        """Inserta o actualiza actividades por ID. Retorna filas afectadas"""
+        filas = [tuple(a[c] for c in COLUMNAS_ACTIVIDAD) for a in actividades]
+        return ejecutar_lote(_sql_upsert("Actividades", COLUMNAS_ACTIVIDAD), filas)['filas_afectadas']
+
+    def upsert_paquetes(self, paquetes: list[dict]) -> int:
+        """Inserta o actualiza paquetes por ID. Retorna filas afectadas"""
+        filas = [tuple(p[c] for c in COLUMNAS_PAQUETE) for p in paquetes]
+        return ejecutar_lote(_sql_upsert("Paquetes", COLUMNAS_PAQUETE), filas)['filas_afectadas']
+
+    def upsert_paquete_destinos(self, relaciones: list[tuple]) -> int:
+        """Inserta relaciones (paquete_id, destino_id, orden_visita) o actualiza su orden. Retorna filas afectadas"""
+        sql = ("INSERT INTO Paquete_Destino (paquete_id, destino_id, orden_visita) VALUES (%s, %s, %s) "
+               "ON DUPLICATE KEY UPDATE orden_visita=VALUES(orden_visita)")
+        return ejecutar_lote(sql, relaciones)['filas_afectadas']
+
+    def insertar_paquete_actividades(self, relaciones: list[tuple]) -> int:
+        """Inserta relaciones (paquete_id, actividad_id) ignorando las existentes. Retorna filas afectadas"""
+        sql = ("INSERT INTO Paquete_Actividad (paquete_id, actividad_id) VALUES (%s, %s) "
+               "ON DUPLICATE KEY UPDATE actividad_id=VALUES(actividad_id)")
+        return ejecutar_lote(sql, relaciones)['filas_afectadas']
+
+    def eliminar_paquete_destinos(self, relaciones: list[tuple]) -> int:
+        """Elimina relaciones (paquete_id, destino_id). Retorna filas afectadas"""
+        sql = "DELETE FROM Paquete_Destino WHERE paquete_id=%s AND destino_id=%s"
+        return ejecutar_lote(sql, relaciones)['filas_afectadas']
+
+    def eliminar_paquete_actividades(self, relaciones: list[tuple]) -> int:
+        """Elimina relaciones (paquete_id, actividad_id). Retorna filas afectadas"""
+        sql = "DELETE FROM Paquete_Actividad WHERE paquete_id=%s AND actividad_id=%s"
+        return ejecutar_lote(sql, relaciones)['filas_afectadas']
+
@@ -1,10 +1,19 @@
 from src.config.db_connection import (
     ejecutar_actualizacion,
     ejecutar_consulta,
+    ejecutar_consulta_tuplas,
     ejecutar_consulta_uno,
     ejecutar_insercion,
+    ejecutar_lote,
+    ids_generados,
 )
 from src.dto.destino_dto import DestinoDTO
+from src.dto.mapeo import campos_dto, crear_mapeador
+from src.utils.tracing import trazar_metodos
+
+_COLUMNAS_DESTINO = campos_dto(DestinoDTO)
+_SELECT_DESTINO = ", ".join(_COLUMNAS_DESTINO)
+_a_destino = crear_mapeador(DestinoDTO, _COLUMNAS_DESTINO)
 
 """CREATE TABLE Destinos (
     id INT AUTO_INCREMENT PRIMARY KEY,
@@ -14,6 +23,7 @@ from src.dto.destino_dto import DestinoDTO
     INDEX idx_nombre (nombre)
 ) ENGINE=InnoDB;"""
 
+@trazar_metodos("dao")
 class DestinoDAO():
     # Maneja todas las operaciones de base de datos relacionadas con Destinos.
 
@@ -22,22 +32,19 @@ class DestinoDAO():
         sql = "INSERT INTO Destinos (nombre, descripcion, costo_base, cupos_disponibles, politica_id) VALUES (%s, %s, %s, %s, %s)"
         params=(destino_dto.nombre,destino_dto.descripcion,destino_dto.costo_base,destino_dto.cupos_disponibles,destino_dto.politica_id)
         return ejecutar_insercion(sql,params)
+
+    def crear_lote(self, destinos: list[DestinoDTO]) -> list[int]:
+        """Inserta muchos destinos con INSERTs multi-fila. Retorna Lista de IDs creados (mismo orden)"""
+        sql = "INSERT INTO Destinos (nombre, descripcion, costo_base, cupos_disponibles, politica_id) VALUES (%s, %s, %s, %s, %s)"
+        filas = [(d.nombre, d.descripcion, d.costo_base, d.cupos_disponibles, d.politica_id) for d in destinos]
+        return ids_generados(ejecutar_lote(sql, filas))
         
     def obtener_por_id(self, id: int) -> DestinoDTO | None:
         """Busca destino activo por ID. Retorna DestinoDTO o None"""
-        sql = "SELECT * FROM Destinos WHERE id = %s AND activo = 1"
+        sql = f"SELECT {_SELECT_DESTINO} FROM Destinos WHERE id = %s AND activo = 1"
         params = (id,)
-        destino = ejecutar_consulta_uno(sql, params)
-        if not destino:
-            return None
-        return DestinoDTO(
-            id = destino['id'],
-            nombre = destino['nombre'],
-            descripcion= destino['descripcion'],
-            costo_base= destino['costo_base'],
-            cupos_disponibles= destino['cupos_disponibles'],
-            politica_id= destino.get('politica_id', 1)
-            )
+        filas = ejecutar_consulta_tuplas(sql, params)
+        return _a_destino(filas[0]) if filas else None
         
         ...
     def actualizar(self, id: int, destino_dto: DestinoDTO) -> bool: 
@@ -63,22 +70,21 @@ class DestinoDAO():
     
     def listar_todos(self) -> list[DestinoDTO]:
         """Retorna lista de todos los destinos activos. Retorna Lista de DestinoDTO"""
-        sql = "SELECT * FROM Destinos WHERE activo = 1 ORDER BY id ASC"
-        destinos = ejecutar_consulta(sql)        
-        if not destinos:
-            return []
+        sql = f"SELECT {_SELECT_DESTINO} FROM Destinos WHERE activo = 1 ORDER BY id ASC"
+        destinos = ejecutar_consulta_tuplas(sql)        
+        return list(map(_a_destino, destinos))
+    
+    def listar_pagina(self, limite: int, desplazamiento: int) -> list[DestinoDTO]:
+        """Retorna una página de destinos activos, por ID. Retorna Lista de DestinoDTO"""
+        sql = f"SELECT {_SELECT_DESTINO} FROM Destinos WHERE activo = 1 ORDER BY id ASC LIMIT %s OFFSET %s"
+        destinos = ejecutar_consulta_tuplas(sql, (limite, desplazamiento))
         
-        return [
-            DestinoDTO(
-                id=d['id'],
-                nombre=d['nombre'],
-                descripcion=d['descripcion'],
-                costo_base=d['costo_base'],
-                cupos_disponibles=d['cupos_disponibles'],
-                politica_id=d.get('politica_id', 1)
-            )
-            for d in destinos
-        ]
+        return list(map(_a_destino, destinos))
+    
+    def contar(self) -> int:
+        """Cuenta los destinos activos. Retorna int"""
+        resultado = ejecutar_consulta_uno("SELECT COUNT(*) AS total FROM Destinos WHERE activo = 1")
+        return int(resultado['total']) if resultado else 0
     
     def listar_todos_admin(self) -> list[dict]:
         """Retorna lista de TODOS los destinos incluyendo inactivos. Retorna Lista de dicts"""
@@ -100,26 +106,14 @@ class DestinoDAO():
             for d in destinos
         ]
     
-    def buscar_por_nombre(self, nombre: str) -> list[DestinoDTO]:
-        """Busca destinos activos por nombre (LIKE). Retorna Lista de DestinoDTO"""
-        sql = "SELECT * FROM Destinos WHERE nombre LIKE %s AND activo = 1"
-        params = (f"%{nombre}%",)
-        destinos = ejecutar_consulta(sql, params)
-        
-        if not destinos:
+    def listar_por_ids(self, ids: list[int]) -> list[DestinoDTO]:
+        """Destinos activos con esos IDs, en el mismo orden (los inexistentes se omiten). Retorna Lista de DestinoDTO"""
+        if not ids:
             return []
+        sql = f"SELECT {_SELECT_DESTINO} FROM Destinos WHERE id IN ({', '.join(['%s'] * len(ids))}) AND activo = 1"
+        por_id = {destino.id: destino for destino in map(_a_destino, ejecutar_consulta_tuplas(sql, tuple(ids)))}
         
-        return [
-            DestinoDTO(
-                id=d['id'],
-                nombre=d['nombre'],
-                descripcion=d['descripcion'],
-                costo_base=d['costo_base'],
-                cupos_disponibles=d['cupos_disponibles'],
-                politica_id=d.get('politica_id', 1)
-            )
-            for d in destinos
-        ]
+        return [por_id[id] for id in ids if id in por_id]
     
     def reducir_cupo(self, id: int) -> bool:
         """Reduce en 1 el cupo disponible del destino. Retorna True si tuvo éxito"""
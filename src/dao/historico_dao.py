@@ -0,0 +1,72 @@
+"""DAO del archivo histórico de Reservas y Pagos.
+
+Mueve reservas en estado final (COMPLETADA/CANCELADA) y sus pagos a Reservas_Historico y
+Pagos_Historico, conservando los IDs. Las lecturas de ReservaDAO y PagoDAO consultan el archivo
+con incluir_historico=True mediante consulta_con_historico (UNION ALL de ambas tablas).
+"""
+
+from datetime import datetime
+
+from src.config.db_connection import ejecutar_actualizacion, ejecutar_consulta, ejecutar_consulta_uno
+from src.utils.tracing import trazar_metodos
+
+COLUMNAS_RESERVA = ('id', 'fecha_reserva', 'estado', 'monto_total', 'numero_personas', 'usuario_id', 'paquete_id', 'destino_id')
+COLUMNAS_PAGO = ('id', 'monto', 'fecha_pago', 'metodo', 'estado', 'reserva_id')
+ESTADOS_ARCHIVABLES = ('COMPLETADA', 'CANCELADA')
+SUFIJO_HISTORICO = "_Historico"
+
+
+def consulta_con_historico(tabla: str, columnas: tuple, where: str, params: tuple,
+                           incluir_historico: bool, orden: str = "id ASC", limite: int | None = None) -> tuple[str, tuple]:
+    """Arma un SELECT sobre la tabla activa y, si se pide, también sobre su tabla histórica (UNION ALL).
+    Retorna tupla (sql, params)"""
+    lista_columnas = ", ".join(columnas)
+    sql = f"SELECT {lista_columnas} FROM {tabla} WHERE {where}"
+    if incluir_historico:
+        sql += f" UNION ALL SELECT {lista_columnas} FROM {tabla}{SUFIJO_HISTORICO} WHERE {where}"
+        params = params + params
+    sql += f" ORDER BY {orden}"
+    if limite is not None:
+        sql += " LIMIT %s"
+        params = params + (limite,)
+    return sql, params
+
+
+@trazar_metodos("dao")
+class HistoricoDAO:
+    """Maneja el traslado de reservas y pagos antiguos a las tablas históricas."""
+
+    _ARCHIVABLES = f"estado IN ({', '.join(repr(e) for e in ESTADOS_ARCHIVABLES)}) AND fecha_reserva < %s"
+
+    def listar_ids_archivables(self, antes_de: datetime, limite: int) -> list[int]:
+        """IDs de las reservas en estado final anteriores a la fecha de corte, las más antiguas primero. Retorna Lista de int"""
+        sql = f"SELECT id FROM Reservas WHERE {self._ARCHIVABLES} ORDER BY id ASC LIMIT %s"
+        return [fila['id'] for fila in ejecutar_consulta(sql, (antes_de, limite)) or []]
+
+    def contar_archivables(self, antes_de: datetime) -> dict:
+        """Cuenta reservas archivables y sus pagos. Retorna dict con 'reservas' y 'pagos'"""
+        reservas = ejecutar_consulta_uno(f"SELECT COUNT(*) AS total FROM Reservas WHERE {self._ARCHIVABLES}", (antes_de,))
+        pagos = ejecutar_consulta_uno(
+            f"SELECT COUNT(*) AS total FROM Pagos WHERE reserva_id IN (SELECT id FROM Reservas WHERE {self._ARCHIVABLES})",
+            (antes_de,))
+        return {'reservas': int(reservas['total']) if reservas else 0, 'pagos': int(pagos['total']) if pagos else 0}
+
+    def archivar_reservas(self, ids: list[int]) -> dict:
+        """Copia las reservas y sus pagos al histórico y los borra de las tablas activas (llamar dentro de transaccion()).
+        Retorna dict con filas movidas: 'reservas' y 'pagos'"""
+        if not ids:
+            return {'reservas': 0, 'pagos': 0}
+        marcadores = ", ".join(["%s"] * len(ids))
+        params = tuple(ids)
+        columnas_pago, columnas_reserva = ", ".join(COLUMNAS_PAGO), ", ".join(COLUMNAS_RESERVA)
+
+        # Pagos primero: su FK a Reservas es ON DELETE CASCADE y se perderían al borrar la reserva
+        ejecutar_actualizacion(
+            f"INSERT INTO Pagos{SUFIJO_HISTORICO} ({columnas_pago}) SELECT {columnas_pago} FROM Pagos WHERE reserva_id IN ({marcadores})",
+            params)
+        pagos = ejecutar_actualizacion(f"DELETE FROM Pagos WHERE reserva_id IN ({marcadores})", params)
+        ejecutar_actualizacion(
+            f"INSERT INTO Reservas{SUFIJO_HISTORICO} ({columnas_reserva}) SELECT {columnas_reserva} FROM Reservas WHERE id IN ({marcadores})",
+            params)
+        reservas = ejecutar_actualizacion(f"DELETE FROM Reservas WHERE id IN ({marcadores})", params)
+        return {'reservas': reservas, 'pagos': pagos}
@@ -3,13 +3,24 @@ from datetime import datetime
 from src.config.db_connection import (
     ejecutar_actualizacion,
     ejecutar_consulta,
+    ejecutar_consulta_tuplas,
     ejecutar_consulta_uno,
     ejecutar_insercion,
+    ejecutar_lote,
+    ids_generados,
 )
+from src.dao.historico_dao import COLUMNAS_PAGO, SUFIJO_HISTORICO, consulta_con_historico
+from src.dto.lotes import PagoBatch
+from src.dto.mapeo import crear_mapeador
 from src.dto.pago_dto import PagoDTO
 from src.utils.constants import ESTADOS_PAGO
+from src.utils.tracing import trazar_metodos
 
+_SELECT_PAGO = ", ".join(COLUMNAS_PAGO)
+_a_pago = crear_mapeador(PagoDTO, COLUMNAS_PAGO)
 
+
+@trazar_metodos("dao")
 class PagoDAO():
     """Maneja todas las operaciones de base de datos relacionadas con Pagos."""
     
@@ -27,63 +38,84 @@ class PagoDAO():
             pago_dto.fecha_pago
         )
         return ejecutar_insercion(sql, params)  # type: ignore
+
+    def crear_lote(self, pagos: list[PagoDTO]) -> list[int]:
+        """Inserta muchos pagos con INSERTs multi-fila. Retorna Lista de IDs creados (mismo orden)"""
+        sql = "INSERT INTO Pagos (reserva_id, monto, metodo, estado, fecha_pago) VALUES (%s, %s, %s, %s, %s)"
+        filas = [(p.reserva_id, p.monto, p.metodo, p.estado, p.fecha_pago) for p in pagos]
+        return ids_generados(ejecutar_lote(sql, filas))
     
     def obtener_por_id(self, id: int) -> PagoDTO | None:
         """Busca pago por ID. Retorna PagoDTO o None"""
-        sql = "SELECT * FROM Pagos WHERE id = %s"
-        result = ejecutar_consulta_uno(sql, (id,))  # type: ignore
+        sql = f"SELECT {_SELECT_PAGO} FROM Pagos WHERE id = %s"
+        filas = ejecutar_consulta_tuplas(sql, (id,))
         
-        if not result:
-            return None
-        
-        return PagoDTO(
-            id=result['id'],
-            reserva_id=result['reserva_id'],
-            monto=result['monto'],
-            metodo=result['metodo'],
-            estado=result['estado'],
-            fecha_pago=result['fecha_pago']
-        )
+        return _a_pago(filas[0]) if filas else None
     
-    def obtener_por_reserva(self, reserva_id: int) -> list[PagoDTO]:
-        """Retorna pagos de una reserva. Retorna Lista de PagoDTO"""
-        sql = "SELECT * FROM Pagos WHERE reserva_id = %s ORDER BY fecha_pago DESC"
-        results = ejecutar_consulta(sql, (reserva_id,))  # type: ignore
+    def obtener_por_reserva(self, reserva_id: int, incluir_historico: bool = False) -> list[PagoDTO]:
+        """Retorna pagos de una reserva (incluir_historico suma los archivados). Retorna Lista de PagoDTO"""
+        sql, params = consulta_con_historico("Pagos", COLUMNAS_PAGO, "reserva_id = %s", (reserva_id,),
+                                             incluir_historico, orden="fecha_pago DESC")
+        results = ejecutar_consulta_tuplas(sql, params)  # type: ignore
         
-        if not results:
-            return []
-        
-        return [
-            PagoDTO(
-                id=row['id'],
-                reserva_id=row['reserva_id'],
-                monto=row['monto'],
-                metodo=row['metodo'],
-                estado=row['estado'],
-                fecha_pago=row['fecha_pago']
-            )
-            for row in results
-        ]
+        return list(map(_a_pago, results))
+    
+    def historial_cliente(self, usuario_id: int, incluir_historico: bool = False) -> list[dict]:
+        """Pagos de todas las reservas de un cliente con el tipo y nombre del paquete o destino reservado, en una
+        consulta (Reservas por idx_usuario, Pagos por idx_reserva); incluir_historico suma los archivados.
+        Retorna Lista de dicts, el pago más reciente primero"""
+        por_tabla = """
+        SELECT p.id AS id, p.reserva_id, p.monto, p.metodo, p.estado, p.fecha_pago AS fecha_pago,
+               CASE WHEN r.paquete_id IS NOT NULL THEN 'Paquete' ELSE 'Destino' END AS tipo,
+               COALESCE(pq.nombre, d.nombre) AS nombre
+        FROM Reservas{sufijo} r
+        JOIN Pagos{sufijo} p ON p.reserva_id = r.id
+        LEFT JOIN Paquetes pq ON pq.id = r.paquete_id
+        LEFT JOIN Destinos d ON d.id = r.destino_id
+        WHERE r.usuario_id = %s
+        """
+        sql, params = por_tabla.format(sufijo=''), (usuario_id,)
+        if incluir_historico:
+            sql += " UNION ALL " + por_tabla.format(sufijo=SUFIJO_HISTORICO)
+            params += (usuario_id,)
+        return ejecutar_consulta(sql + " ORDER BY fecha_pago DESC, id DESC", params)
     
     def listar_todos(self) -> list[PagoDTO]:
         """Retorna todos los pagos. Retorna Lista de PagoDTO"""
-        sql = "SELECT * FROM Pagos ORDER BY id ASC"
-        results = ejecutar_consulta(sql, ())  # type: ignore
+        sql = f"SELECT {_SELECT_PAGO} FROM Pagos ORDER BY id ASC"
+        results = ejecutar_consulta_tuplas(sql, ())  # type: ignore
         
-        if not results:
-            return []
+        return list(map(_a_pago, results))
+    
+    def listar_pagina(self, limite: int, desplazamiento: int, fecha_inicio: str | None = None, fecha_fin: str | None = None) -> list[PagoDTO]:
+        """Retorna una página de pagos (opcionalmente de un rango de fechas), por ID. Retorna Lista de PagoDTO"""
+        where, params = ("WHERE fecha_pago BETWEEN %s AND %s", (fecha_inicio, fecha_fin)) if fecha_inicio and fecha_fin else ("", ())
+        sql = f"SELECT {_SELECT_PAGO} FROM Pagos {where} ORDER BY id ASC LIMIT %s OFFSET %s"
+        results = ejecutar_consulta_tuplas(sql, params + (limite, desplazamiento))  # type: ignore
         
-        return [
-            PagoDTO(
-                id=row['id'],
-                reserva_id=row['reserva_id'],
-                monto=row['monto'],
-                metodo=row['metodo'],
-                estado=row['estado'],
-                fecha_pago=row['fecha_pago']
-            )
-            for row in results
-        ]
+        return list(map(_a_pago, results))
+    
+    def contar(self, fecha_inicio: str | None = None, fecha_fin: str | None = None) -> int:
+        """Cuenta pagos con los mismos filtros de listar_pagina. Retorna int"""
+        where, params = ("WHERE fecha_pago BETWEEN %s AND %s", (fecha_inicio, fecha_fin)) if fecha_inicio and fecha_fin else ("", ())
+        result = ejecutar_consulta_uno(f"SELECT COUNT(*) AS total FROM Pagos {where}", params)  # type: ignore
+        return int(result['total']) if result else 0
+    
+    def listar_lote_por_fecha(self, fecha_inicio: str, fecha_fin: str, despues_de_id: int, limite: int,
+                              incluir_historico: bool = False) -> list[PagoDTO]:
+        """Siguiente lote de pagos del periodo por ID (paginación por clave, sin OFFSET). Retorna Lista de PagoDTO"""
+        sql, params = consulta_con_historico("Pagos", COLUMNAS_PAGO, "fecha_pago BETWEEN %s AND %s AND id > %s",
+                                             (fecha_inicio, fecha_fin, despues_de_id), incluir_historico, limite=limite)
+        results = ejecutar_consulta_tuplas(sql, params)
+        
+        return list(map(_a_pago, results))
+    
+    def lote_columnar_por_fecha(self, fecha_inicio: str, fecha_fin: str, despues_de_id: int, limite: int,
+                                incluir_historico: bool = False) -> PagoBatch:
+        """Como listar_lote_por_fecha, pero en columnas (sin un DTO por fila). Retorna PagoBatch"""
+        sql, params = consulta_con_historico("Pagos", COLUMNAS_PAGO, "fecha_pago BETWEEN %s AND %s AND id > %s",
+                                             (fecha_inicio, fecha_fin, despues_de_id), incluir_historico, limite=limite)
+        return PagoBatch.desde_filas(ejecutar_consulta_tuplas(sql, params), COLUMNAS_PAGO)
     
     def actualizar_estado(self, id: int, nuevo_estado: str) -> bool:
         """Cambia el estado del pago. Retorna True si se actualizó"""
@@ -103,39 +135,27 @@ class PagoDAO():
         )
         return self.crear(pago)
     
-    def listar_por_fecha(self, fecha_inicio: str, fecha_fin: str) -> list[PagoDTO]:
-        """Retorna pagos en rango de fechas. Retorna Lista de PagoDTO"""
-        sql = """
-            SELECT * FROM Pagos 
-            WHERE fecha_pago BETWEEN %s AND %s
-            ORDER BY id ASC
-        """
-        results = ejecutar_consulta(sql, (fecha_inicio, fecha_fin))  # type: ignore
-        
-        if not results:
-            return []
+    def listar_por_fecha(self, fecha_inicio: str, fecha_fin: str, incluir_historico: bool = False) -> list[PagoDTO]:
+        """Retorna pagos en rango de fechas (incluir_historico suma los archivados). Retorna Lista de PagoDTO"""
+        sql, params = consulta_con_historico("Pagos", COLUMNAS_PAGO, "fecha_pago BETWEEN %s AND %s",
+                                             (fecha_inicio, fecha_fin), incluir_historico)
+        results = ejecutar_consulta_tuplas(sql, params)  # type: ignore
         
-        return [
-            PagoDTO(
-                id=row['id'],
-                reserva_id=row['reserva_id'],
-                monto=row['monto'],
-                metodo=row['metodo'],
-                estado=row['estado'],
-                fecha_pago=row['fecha_pago']
-            )
-            for row in results
-        ]
+        return list(map(_a_pago, results))
     
-    def obtener_total_por_periodo(self, fecha_inicio: str, fecha_fin: str) -> float:
-        """Suma montos de pagos completados. Retorna Monto total"""
+    def obtener_total_por_periodo(self, fecha_inicio: str, fecha_fin: str, incluir_historico: bool = False) -> float:
+        """Suma montos de pagos completados (incluir_historico suma los archivados). Retorna Monto total"""
         sql = """
             SELECT SUM(monto) as total 
             FROM Pagos 
             WHERE estado = %s 
             AND fecha_pago BETWEEN %s AND %s
         """
-        result = ejecutar_consulta_uno(sql, (ESTADOS_PAGO[1], fecha_inicio, fecha_fin))  # type: ignore
+        params = (ESTADOS_PAGO[1], fecha_inicio, fecha_fin)
+        if incluir_historico:
+            sql = f"SELECT SUM(total) AS total FROM ({sql} UNION ALL {sql.replace('FROM Pagos', 'FROM Pagos_Historico')}) periodo"
+            params = params + params
+        result = ejecutar_consulta_uno(sql, params)  # type: ignore
         
         if not result or result['total'] is None:
             return 0.0
@@ -8,8 +8,10 @@ from src.config.db_connection import (
     ejecutar_consulta,
     ejecutar_insercion,
 )
+from src.utils.tracing import trazar_metodos
 
 
+@trazar_metodos("dao")
 class PaqueteActividadDAO:
     """Maneja operaciones de la tabla Paquete_Actividad."""
     
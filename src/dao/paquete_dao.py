@@ -1,12 +1,25 @@
+from datetime import datetime
+
 from src.config.db_connection import (
     ejecutar_actualizacion,
     ejecutar_consulta,
+    ejecutar_consulta_tuplas,
     ejecutar_consulta_uno,
     ejecutar_insercion,
+    ejecutar_lote,
+    ids_generados,
 )
+from src.dto.mapeo import campos_dto, crear_mapeador
 from src.dto.paquete_dto import PaqueteDTO
+from src.utils.tracing import trazar_metodos
+
+_COLUMNAS_PAQUETE = campos_dto(PaqueteDTO)
+_SELECT_PAQUETE = ", ".join("COALESCE(descripcion, '') AS descripcion" if c == 'descripcion' else c for c in _COLUMNAS_PAQUETE)
+_a_paquete = crear_mapeador(PaqueteDTO, _COLUMNAS_PAQUETE)
+_SELECT_PAQUETE_P = ", ".join("COALESCE(p.descripcion, '') AS descripcion" if c == 'descripcion' else f"p.{c}" for c in _COLUMNAS_PAQUETE)
 
 
+@trazar_metodos("dao")
 class PaqueteDAO():
     #Maneja todas las operaciones de base de datos relacionadas con Paquetes.
     
@@ -15,26 +28,20 @@ class PaqueteDAO():
         sql = "INSERT INTO Paquetes (nombre, descripcion, fecha_inicio, fecha_fin, precio_total, cupos_disponibles, politica_id) VALUES (%s,%s,%s,%s,%s,%s,%s)"
         params = (paquete_dto.nombre, paquete_dto.descripcion, paquete_dto.fecha_inicio, paquete_dto.fecha_fin, paquete_dto.precio_total, paquete_dto.cupos_disponibles, paquete_dto.politica_id)
         return ejecutar_insercion(sql, params)
+
+    def crear_lote(self, paquetes: list[PaqueteDTO]) -> list[int]:
+        """Inserta muchos paquetes con INSERTs multi-fila. Retorna Lista de IDs creados (mismo orden)"""
+        sql = "INSERT INTO Paquetes (nombre, descripcion, fecha_inicio, fecha_fin, precio_total, cupos_disponibles, politica_id) VALUES (%s,%s,%s,%s,%s,%s,%s)"
+        filas = [(p.nombre, p.descripcion, p.fecha_inicio, p.fecha_fin, p.precio_total, p.cupos_disponibles, p.politica_id) for p in paquetes]
+        return ids_generados(ejecutar_lote(sql, filas))
     
     def obtener_por_id(self, id: int) -> PaqueteDTO | None: 
         """Busca paquete por ID con JOIN a destinos y política. Retorna PaqueteDTO o None"""
-        sql = "SELECT * FROM Paquetes WHERE id=%s"
+        sql = f"SELECT {_SELECT_PAQUETE} FROM Paquetes WHERE id=%s"
         params = (id,)
-        paquete = ejecutar_consulta_uno(sql, params)
+        filas = ejecutar_consulta_tuplas(sql, params)
         
-        if not paquete:
-            return None
-        
-        return PaqueteDTO(
-            id=paquete['id'],
-            nombre=paquete['nombre'],
-            fecha_inicio=paquete['fecha_inicio'],
-            fecha_fin=paquete['fecha_fin'],
-            precio_total=paquete['precio_total'],
-            cupos_disponibles=paquete['cupos_disponibles'],
-            politica_id=paquete['politica_id'],
-            descripcion=paquete.get('descripcion') or ''
-        )
+        return _a_paquete(filas[0]) if filas else None
     
     def actualizar(self, id: int, paquete_dto: PaqueteDTO) -> bool: 
         """Actualiza datos del paquete. Retorna True si se actualizó"""
@@ -59,25 +66,31 @@ class PaqueteDAO():
     
     def listar_todos(self) -> list[PaqueteDTO]: 
         """Retorna lista de todos los paquetes activos (para clientes). Retorna Lista de PaqueteDTO"""
-        sql = "SELECT * FROM Paquetes WHERE activo = 1 ORDER BY id ASC"
-        paquetes = ejecutar_consulta(sql)
+        sql = f"SELECT {_SELECT_PAQUETE} FROM Paquetes WHERE activo = 1 ORDER BY id ASC"
+        paquetes = ejecutar_consulta_tuplas(sql)
         
-        if not paquetes:
+        return list(map(_a_paquete, paquetes))
+    
+    def listar_por_ids(self, ids: list[int]) -> list[PaqueteDTO]:
+        """Paquetes activos con esos IDs, en el mismo orden (los inexistentes se omiten). Retorna Lista de PaqueteDTO"""
+        if not ids:
             return []
+        sql = f"SELECT {_SELECT_PAQUETE} FROM Paquetes WHERE id IN ({', '.join(['%s'] * len(ids))}) AND activo = 1"
+        por_id = {paquete.id: paquete for paquete in map(_a_paquete, ejecutar_consulta_tuplas(sql, tuple(ids)))}
         
-        return [
-            PaqueteDTO(
-                id=p['id'],
-                nombre=p['nombre'],
-                fecha_inicio=p['fecha_inicio'],
-                fecha_fin=p['fecha_fin'],
-                precio_total=p['precio_total'],
-                cupos_disponibles=p['cupos_disponibles'],
-                politica_id=p['politica_id'],
-                descripcion=p.get('descripcion') or ''
-            )
-            for p in paquetes
-        ]
+        return [por_id[id] for id in ids if id in por_id]
+    
+    def listar_pagina(self, limite: int, desplazamiento: int) -> list[PaqueteDTO]:
+        """Retorna una página de paquetes activos, por ID. Retorna Lista de PaqueteDTO"""
+        sql = f"SELECT {_SELECT_PAQUETE} FROM Paquetes WHERE activo = 1 ORDER BY id ASC LIMIT %s OFFSET %s"
+        paquetes = ejecutar_consulta_tuplas(sql, (limite, desplazamiento))
+        
+        return list(map(_a_paquete, paquetes))
+    
+    def contar(self) -> int:
+        """Cuenta los paquetes activos. Retorna int"""
+        resultado = ejecutar_consulta_uno("SELECT COUNT(*) AS total FROM Paquetes WHERE activo = 1")
+        return int(resultado['total']) if resultado else 0
     
     def listar_todos_admin(self) -> list[dict]: 
         """Retorna TODOS los paquetes incluyendo inactivos (para admin). Retorna Lista de dicts"""
@@ -102,27 +115,37 @@ class PaqueteDAO():
             for p in paquetes
         ]
     
+    def listar_para_busqueda(self, cupos_minimos: int, inicio_desde: datetime | None = None,
+                             fin_antes_de: datetime | None = None) -> list[tuple]:
+        """Paquetes activos con al menos cupos_minimos cupos que empiezan desde inicio_desde y terminan antes de
+        fin_antes_de (rango sobre idx_fechas), con el nombre de su política y los IDs de sus destinos, en una sola
+        consulta. Retorna Lista de tuplas (PaqueteDTO, nombre_politica, tupla de destino_id)"""
+        condiciones, params = ["p.activo = 1", "p.cupos_disponibles >= %s"], [cupos_minimos]
+        if inicio_desde is not None:
+            condiciones.append("p.fecha_inicio >= %s")
+            params.append(inicio_desde)
+        if fin_antes_de is not None:
+            condiciones.append("p.fecha_fin < %s")
+            params.append(fin_antes_de)
+        sql = f"""
+        SELECT {_SELECT_PAQUETE_P}, pc.nombre AS politica_nombre,
+               (SELECT GROUP_CONCAT(pd.destino_id) FROM Paquete_Destino pd WHERE pd.paquete_id = p.id) AS destinos
+        FROM Paquetes p
+        JOIN PoliticasCancelacion pc ON pc.id = p.politica_id
+        WHERE {' AND '.join(condiciones)}
+        """
+        n = len(_COLUMNAS_PAQUETE)
+        return [
+            (_a_paquete(fila[:n]), fila[n], tuple(int(d) for d in str(fila[n + 1]).split(',')) if fila[n + 1] else ())
+            for fila in ejecutar_consulta_tuplas(sql, tuple(params))
+        ]
+    
     def listar_disponibles(self) -> list[PaqueteDTO]: 
         """Retorna paquetes activos con cupos > 0. Retorna Lista de PaqueteDTO"""
-        sql = "SELECT * FROM Paquetes WHERE cupos_disponibles > 0 AND activo = 1 ORDER BY id ASC"
-        paquetes = ejecutar_consulta(sql)
+        sql = f"SELECT {_SELECT_PAQUETE} FROM Paquetes WHERE cupos_disponibles > 0 AND activo = 1 ORDER BY id ASC"
+        paquetes = ejecutar_consulta_tuplas(sql)
         
-        if not paquetes:
-            return []
-        
-        return [
-            PaqueteDTO(
-                id=p['id'],
-                nombre=p['nombre'],
-                fecha_inicio=p['fecha_inicio'],
-                fecha_fin=p['fecha_fin'],
-                precio_total=p['precio_total'],
-                cupos_disponibles=p['cupos_disponibles'],
-                politica_id=p['politica_id'],
-                descripcion=p.get('descripcion') or ''
-            )
-            for p in paquetes
-        ]
+        return list(map(_a_paquete, paquetes))
     
     def reducir_cupo(self, id: int) -> bool:
         """Decrementa cupos_disponibles. Retorna True si tuvo éxito"""
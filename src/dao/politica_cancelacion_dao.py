@@ -3,48 +3,33 @@
 Maneja operaciones de base de datos para políticas de cancelación.
 """
 
-from src.config.db_connection import (
-    ejecutar_consulta,
-    ejecutar_consulta_uno,
-)
+from src.config.db_connection import ejecutar_consulta_tuplas
+from src.dto.mapeo import campos_dto, crear_mapeador
 from src.dto.politica_cancelacion_dto import PoliticaCancelacionDTO
+from src.utils.tracing import trazar_metodos
 
+_COLUMNAS_POLITICA = campos_dto(PoliticaCancelacionDTO)
+_SELECT_POLITICA = ", ".join(_COLUMNAS_POLITICA)
+_a_politica = crear_mapeador(PoliticaCancelacionDTO, _COLUMNAS_POLITICA)
 
+
+@trazar_metodos("dao")
 class PoliticaCancelacionDAO:
     """Maneja operaciones de base de datos para Políticas de Cancelación."""
     
     def obtener_por_id(self, id: int) -> PoliticaCancelacionDTO | None:
         """Obtiene una política por ID. Retorna PoliticaCancelacionDTO si se encuentra, None si no existe"""
-        sql = "SELECT * FROM PoliticasCancelacion WHERE id = %s"
-        politica = ejecutar_consulta_uno(sql, (id,))
-        
-        if not politica:
-            return None
+        sql = f"SELECT {_SELECT_POLITICA} FROM PoliticasCancelacion WHERE id = %s"
+        filas = ejecutar_consulta_tuplas(sql, (id,))
         
-        return PoliticaCancelacionDTO(
-            id=politica['id'],
-            nombre=politica['nombre'],
-            dias_aviso=politica['dias_aviso'],
-            porcentaje_reembolso=politica['porcentaje_reembolso']
-        )
+        return _a_politica(filas[0]) if filas else None
     
     def listar_todas(self) -> list[PoliticaCancelacionDTO]:
         """Retorna todas las políticas de cancelación. Retorna Lista de PoliticaCancelacionDTO ordenadas por ID"""
-        sql = "SELECT * FROM PoliticasCancelacion ORDER BY id ASC"
-        politicas = ejecutar_consulta(sql)
-        
-        if not politicas:
-            return []
+        sql = f"SELECT {_SELECT_POLITICA} FROM PoliticasCancelacion ORDER BY id ASC"
+        politicas = ejecutar_consulta_tuplas(sql)
         
-        return [
-            PoliticaCancelacionDTO(
-                id=p['id'],
-                nombre=p['nombre'],
-                dias_aviso=p['dias_aviso'],
-                porcentaje_reembolso=p['porcentaje_reembolso']
-            )
-            for p in politicas
-        ]
+        return list(map(_a_politica, politicas))
     
     def crear(self, nombre: str, dias_aviso: int, porcentaje_reembolso: float) -> PoliticaCancelacionDTO:
         """Crea una nueva política de cancelación. Retorna PoliticaCancelacionDTO con la política creada"""
@@ -1,12 +1,25 @@
+from datetime import datetime
+
 from src.config.db_connection import (
     ejecutar_actualizacion,
     ejecutar_consulta,
+    ejecutar_consulta_tuplas,
     ejecutar_consulta_uno,
     ejecutar_insercion,
+    ejecutar_lote,
+    ids_generados,
 )
+from src.dao.historico_dao import COLUMNAS_RESERVA, consulta_con_historico
+from src.dto.lotes import ReservaBatch
+from src.dto.mapeo import crear_mapeador
 from src.dto.reserva_dto import ReservaDTO
+from src.utils.tracing import trazar_metodos
+
+_SELECT_RESERVA = ", ".join(COLUMNAS_RESERVA)
+_a_reserva = crear_mapeador(ReservaDTO, COLUMNAS_RESERVA)
 
 
+@trazar_metodos("dao")
 class ReservaDAO():
     #Maneja todas las operaciones de base de datos relacionadas con Reservas.
     
@@ -15,26 +28,19 @@ class ReservaDAO():
         sql = "INSERT INTO Reservas (fecha_reserva, estado, monto_total, numero_personas, usuario_id, paquete_id, destino_id) VALUES (%s,%s,%s,%s,%s,%s,%s)"
         params = (reserva_dto.fecha_reserva, reserva_dto.estado, reserva_dto.monto_total, reserva_dto.numero_personas, reserva_dto.usuario_id, reserva_dto.paquete_id, reserva_dto.destino_id)
         return ejecutar_insercion(sql, params)
+
+    def crear_lote(self, reservas: list[ReservaDTO]) -> list[int]:
+        """Inserta muchas reservas con INSERTs multi-fila. Retorna Lista de IDs creados (mismo orden)"""
+        sql = "INSERT INTO Reservas (fecha_reserva, estado, monto_total, numero_personas, usuario_id, paquete_id, destino_id) VALUES (%s,%s,%s,%s,%s,%s,%s)"
+        filas = [(r.fecha_reserva, r.estado, r.monto_total, r.numero_personas, r.usuario_id, r.paquete_id, r.destino_id) for r in reservas]
+        return ids_generados(ejecutar_lote(sql, filas))
     
-    def obtener_por_id(self, id: int) -> ReservaDTO | None: 
-        """Busca reserva por ID con JOINs a cliente y paquete. Retorna ReservaDTO o None"""
-        sql = "SELECT * FROM Reservas WHERE id=%s"
-        params = (id,)
-        reserva = ejecutar_consulta_uno(sql, params)
+    def obtener_por_id(self, id: int, incluir_historico: bool = False) -> ReservaDTO | None: 
+        """Busca reserva por ID (también en el histórico si se pide). Retorna ReservaDTO o None"""
+        sql, params = consulta_con_historico("Reservas", COLUMNAS_RESERVA, "id=%s", (id,), incluir_historico)
+        filas = ejecutar_consulta_tuplas(sql, params)
         
-        if not reserva:
-            return None
-        
-        return ReservaDTO(
-            id=reserva['id'],
-            fecha_reserva=reserva['fecha_reserva'],
-            estado=reserva['estado'],
-            monto_total=reserva['monto_total'],
-            numero_personas=reserva['numero_personas'],
-            usuario_id=reserva['usuario_id'],
-            paquete_id=reserva.get('paquete_id'),
-            destino_id=reserva.get('destino_id')
-        )
+        return _a_reserva(filas[0]) if filas else None
     
     def actualizar(self, id: int, reserva_dto: ReservaDTO) -> bool: 
         """Actualiza datos de la reserva. Retorna True si se actualizó"""
@@ -43,139 +49,178 @@ class ReservaDAO():
         filas = ejecutar_actualizacion(sql, params)
         return filas > 0
     
-    def cambiar_estado(self, id: int, nuevo_estado: str) -> bool: 
-        """Cambia el estado de la reserva. Retorna True si se actualizó"""
-        sql = "UPDATE Reservas SET estado=%s WHERE id=%s"
-        params = (nuevo_estado, id)
+    def cambiar_estado(self, id: int, nuevo_estado: str, estado_anterior: str | None = None) -> bool: 
+        """Cambia el estado de la reserva; con estado_anterior solo si sigue en ese estado (otro proceso pudo
+        cambiarla después de leerla). Retorna True si se actualizó"""
+        if estado_anterior is None:
+            sql = "UPDATE Reservas SET estado=%s WHERE id=%s"
+            params = (nuevo_estado, id)
+        else:
+            sql = "UPDATE Reservas SET estado=%s WHERE id=%s AND estado=%s"
+            params = (nuevo_estado, id, estado_anterior)
         filas = ejecutar_actualizacion(sql, params)
-        return filas > 0
+        return filas == 1
     
-    def listar_por_cliente(self, cliente_id: int) -> list[ReservaDTO]: 
-        """Retorna reservas de un cliente. Retorna Lista de ReservaDTO"""
-        sql = "SELECT * FROM Reservas WHERE usuario_id=%s ORDER BY id ASC"
-        params = (cliente_id,)
-        reservas = ejecutar_consulta(sql, params)
-        
-        if not reservas:
-            return []
+    def listar_por_cliente(self, cliente_id: int, incluir_historico: bool = False) -> list[ReservaDTO]: 
+        """Retorna reservas de un cliente (incluir_historico suma las archivadas). Retorna Lista de ReservaDTO"""
+        sql, params = consulta_con_historico("Reservas", COLUMNAS_RESERVA, "usuario_id=%s", (cliente_id,), incluir_historico)
+        reservas = ejecutar_consulta_tuplas(sql, params)
         
-        return [
-            ReservaDTO(
-                id=r['id'],
-                fecha_reserva=r['fecha_reserva'],
-                estado=r['estado'],
-                monto_total=r['monto_total'],
-                numero_personas=r['numero_personas'],
-                usuario_id=r['usuario_id'],
-                paquete_id=r.get('paquete_id'),
-                destino_id=r.get('destino_id')
-            )
-            for r in reservas
-        ]
+        return list(map(_a_reserva, reservas))
     
     def listar_por_paquete(self, paquete_id: int) -> list[ReservaDTO]: 
         """Retorna reservas de un paquete. Retorna Lista de ReservaDTO"""
-        sql = "SELECT * FROM Reservas WHERE paquete_id=%s"
+        sql = f"SELECT {_SELECT_RESERVA} FROM Reservas WHERE paquete_id=%s"
         params = (paquete_id,)
-        reservas = ejecutar_consulta(sql, params)
+        reservas = ejecutar_consulta_tuplas(sql, params)
         
-        if not reservas:
-            return []
-        
-        return [
-            ReservaDTO(
-                id=r['id'],
-                fecha_reserva=r['fecha_reserva'],
-                estado=r['estado'],
-                monto_total=r['monto_total'],
-                numero_personas=r['numero_personas'],
-                usuario_id=r['usuario_id'],
-                paquete_id=r.get('paquete_id'),
-                destino_id=r.get('destino_id')
-            )
-            for r in reservas
-        ]
-    
-    def listar_por_estado(self, estado: str) -> list[ReservaDTO]: 
-        """Retorna reservas filtradas por estado. Retorna Lista de ReservaDTO"""
-        sql = "SELECT * FROM Reservas WHERE estado=%s ORDER BY id ASC"
-        params = (estado,)
-        reservas = ejecutar_consulta(sql, params)
-        
-        if not reservas:
-            return []
+        return list(map(_a_reserva, reservas))
+    
+    def listar_por_estado(self, estado: str, incluir_historico: bool = False) -> list[ReservaDTO]: 
+        """Retorna reservas filtradas por estado (incluir_historico suma las archivadas). Retorna Lista de ReservaDTO"""
+        sql, params = consulta_con_historico("Reservas", COLUMNAS_RESERVA, "estado=%s", (estado,), incluir_historico)
+        reservas = ejecutar_consulta_tuplas(sql, params)
         
-        return [
-            ReservaDTO(
-                id=r['id'],
-                fecha_reserva=r['fecha_reserva'],
-                estado=r['estado'],
-                monto_total=r['monto_total'],
-                numero_personas=r['numero_personas'],
-                usuario_id=r['usuario_id'],
-                paquete_id=r.get('paquete_id'),
-                destino_id=r.get('destino_id')
-            )
-            for r in reservas
-        ]
-    
-    def confirmar(self, id: int) -> bool: 
-        """Cambia estado a 'confirmada'. Retorna True si se actualizó"""
-        return self.cambiar_estado(id, 'CONFIRMADA')
-    
-    def marcar_como_pagada(self, id: int) -> bool: 
-        """Cambia estado a 'pagada'. Retorna True si se actualizó"""
-        return self.cambiar_estado(id, 'PAGADA')
-    
-    def cancelar(self, id: int) -> bool: 
-        """Cambia estado a 'cancelada'. Retorna True si se actualizó"""
-        return self.cambiar_estado(id, 'CANCELADA')
-    
-    def completar(self, id: int) -> bool: 
-        """Cambia estado a 'completada'. Retorna True si se actualizó"""
-        return self.cambiar_estado(id, 'COMPLETADA')
+        return list(map(_a_reserva, reservas))
+    
+    def confirmar(self, id: int, estado_anterior: str | None = None) -> bool: 
+        """Cambia estado a 'confirmada' (si sigue en estado_anterior, cuando se indica). Retorna True si se actualizó"""
+        return self.cambiar_estado(id, 'CONFIRMADA', estado_anterior)
+    
+    def marcar_como_pagada(self, id: int, estado_anterior: str | None = None) -> bool: 
+        """Cambia estado a 'pagada' (si sigue en estado_anterior, cuando se indica). Retorna True si se actualizó"""
+        return self.cambiar_estado(id, 'PAGADA', estado_anterior)
+    
+    def cancelar(self, id: int, estado_anterior: str | None = None) -> bool: 
+        """Cambia estado a 'cancelada' (si sigue en estado_anterior, cuando se indica). Retorna True si se actualizó"""
+        return self.cambiar_estado(id, 'CANCELADA', estado_anterior)
+    
+    def completar(self, id: int, estado_anterior: str | None = None) -> bool: 
+        """Cambia estado a 'completada' (si sigue en estado_anterior, cuando se indica). Retorna True si se actualizó"""
+        return self.cambiar_estado(id, 'COMPLETADA', estado_anterior)
     
     def listar_por_destino(self, destino_id: int) -> list[ReservaDTO]: 
         """Retorna reservas de un destino. Retorna Lista de ReservaDTO"""
-        sql = "SELECT * FROM Reservas WHERE destino_id=%s"
+        sql = f"SELECT {_SELECT_RESERVA} FROM Reservas WHERE destino_id=%s"
         params = (destino_id,)
-        reservas = ejecutar_consulta(sql, params)
+        reservas = ejecutar_consulta_tuplas(sql, params)
         
-        if not reservas:
-            return []
+        return list(map(_a_reserva, reservas))
+    
+    def _filtros(self, usuario_id: int | None, estado: str | None) -> tuple[str, tuple]:
+        """Arma el WHERE de los listados paginados. Retorna tupla (sql, params)"""
+        condiciones, params = [], []
+        if usuario_id is not None:
+            condiciones.append("usuario_id=%s")
+            params.append(usuario_id)
+        if estado is not None:
+            condiciones.append("estado=%s")
+            params.append(estado)
+        return (" WHERE " + " AND ".join(condiciones) if condiciones else ""), tuple(params)
+    
+    def listar_pagina(self, limite: int, desplazamiento: int, usuario_id: int | None = None, estado: str | None = None) -> list[ReservaDTO]:
+        """Retorna una página de reservas (opcionalmente de un cliente y/o estado), por ID. Retorna Lista de ReservaDTO"""
+        where, params = self._filtros(usuario_id, estado)
+        sql = f"SELECT {_SELECT_RESERVA} FROM Reservas{where} ORDER BY id ASC LIMIT %s OFFSET %s"
+        reservas = ejecutar_consulta_tuplas(sql, params + (limite, desplazamiento))
         
-        return [
-            ReservaDTO(
-                id=r['id'],
-                fecha_reserva=r['fecha_reserva'],
-                estado=r['estado'],
-                monto_total=r['monto_total'],
-                numero_personas=r['numero_personas'],
-                usuario_id=r['usuario_id'],
-                paquete_id=r.get('paquete_id'),
-                destino_id=r.get('destino_id')
-            )
-            for r in reservas
-        ]
+        return list(map(_a_reserva, reservas))
+    
+    def contar(self, usuario_id: int | None = None, estado: str | None = None) -> int:
+        """Cuenta reservas con los mismos filtros de listar_pagina. Retorna int"""
+        where, params = self._filtros(usuario_id, estado)
+        resultado = ejecutar_consulta_uno(f"SELECT COUNT(*) AS total FROM Reservas{where}", params)
+        return int(resultado['total']) if resultado else 0
+    
+    def listar_lote_por_estado(self, estado: str, despues_de_id: int, limite: int,
+                               creada_antes: datetime | None = None, ids: list[int] | None = None) -> list[ReservaDTO]:
+        """Siguiente lote de reservas en un estado por ID (paginación por clave, estable aunque cambien de estado).
+        Filtros opcionales: fecha_reserva anterior a creada_antes y/o IDs puntuales. Retorna Lista de ReservaDTO"""
+        sql = f"SELECT {_SELECT_RESERVA} FROM Reservas WHERE estado=%s AND id>%s"
+        params = [estado, despues_de_id]
+        if creada_antes is not None:
+            sql += " AND fecha_reserva<%s"
+            params.append(creada_antes)
+        if ids:
+            sql += f" AND id IN ({', '.join(['%s'] * len(ids))})"
+            params.extend(ids)
+        sql += " ORDER BY id ASC LIMIT %s"
+        params.append(limite)
+        reservas = ejecutar_consulta_tuplas(sql, tuple(params))
+        
+        return list(map(_a_reserva, reservas))
+    
+    def lote_columnar(self, despues_de_id: int, limite: int, estados: tuple | None = None) -> ReservaBatch:
+        """Siguiente lote de reservas por ID (opcionalmente de ciertos estados) en columnas, sin un DTO por fila.
+        Retorna ReservaBatch"""
+        sql = f"SELECT {_SELECT_RESERVA} FROM Reservas WHERE id>%s"
+        params = [despues_de_id]
+        if estados:
+            sql += f" AND estado IN ({', '.join(['%s'] * len(estados))})"
+            params.extend(estados)
+        sql += " ORDER BY id ASC LIMIT %s"
+        params.append(limite)
+        return ReservaBatch.desde_filas(ejecutar_consulta_tuplas(sql, tuple(params)), COLUMNAS_RESERVA)
+    
+    # Viajes terminados: paquetes por fecha_fin (la condición sobre fecha_inicio, implícita por el CHECK
+    # fecha_fin > fecha_inicio, permite recorrer idx_fechas por rango) y destinos por fecha_reserva
+    _FINALIZADAS_PAQUETE = ("estado = 'CONFIRMADA' AND paquete_id IN "
+                            "(SELECT id FROM Paquetes WHERE fecha_inicio <= %s AND fecha_fin <= %s)")
+    _FINALIZADAS_DESTINO = "estado = 'CONFIRMADA' AND destino_id IS NOT NULL AND fecha_reserva <= %s"
+    
+    def tope_lote_finalizadas(self, fin_paquete_hasta: datetime, reserva_destino_hasta: datetime,
+                              despues_de_id: int, limite: int) -> int | None:
+        """ID de la última reserva de viaje terminado del siguiente tramo de `limite` reservas. Retorna int o None si no quedan"""
+        sql = f"""
+            SELECT MAX(id) AS tope FROM (
+                SELECT id FROM Reservas
+                WHERE id > %s AND (({self._FINALIZADAS_PAQUETE}) OR ({self._FINALIZADAS_DESTINO}))
+                ORDER BY id ASC LIMIT %s
+            ) tramo
+        """
+        resultado = ejecutar_consulta_uno(sql, (despues_de_id, fin_paquete_hasta, fin_paquete_hasta, reserva_destino_hasta, limite))
+        return resultado['tope'] if resultado else None
+    
+    def completar_finalizadas(self, fin_paquete_hasta: datetime, reserva_destino_hasta: datetime,
+                              despues_de_id: int, hasta_id: int) -> dict:
+        """Pasa a COMPLETADA, por conjuntos, los viajes terminados con ID en (despues_de_id, hasta_id].
+        Retorna dict con filas actualizadas por tipo ('paquete', 'destino')"""
+        rango = "id > %s AND id <= %s"
+        paquetes = ejecutar_actualizacion(
+            f"UPDATE Reservas SET estado = 'COMPLETADA' WHERE {rango} AND {self._FINALIZADAS_PAQUETE}",
+            (despues_de_id, hasta_id, fin_paquete_hasta, fin_paquete_hasta))
+        destinos = ejecutar_actualizacion(
+            f"UPDATE Reservas SET estado = 'COMPLETADA' WHERE {rango} AND {self._FINALIZADAS_DESTINO}",
+            (despues_de_id, hasta_id, reserva_destino_hasta))
+        return {'paquete': paquetes, 'destino': destinos}
+    
+    def contar_finalizadas(self, fin_paquete_hasta: datetime, reserva_destino_hasta: datetime) -> dict:
+        """Cuenta los viajes terminados pendientes de completar. Retorna dict con cantidad por tipo ('paquete', 'destino')"""
+        paquetes = ejecutar_consulta_uno(f"SELECT COUNT(*) AS total FROM Reservas WHERE {self._FINALIZADAS_PAQUETE}",
+                                         (fin_paquete_hasta, fin_paquete_hasta))
+        destinos = ejecutar_consulta_uno(f"SELECT COUNT(*) AS total FROM Reservas WHERE {self._FINALIZADAS_DESTINO}",
+                                         (reserva_destino_hasta,))
+        return {'paquete': int(paquetes['total']) if paquetes else 0, 'destino': int(destinos['total']) if destinos else 0}
+    
+    def resumen_ocupacion(self) -> list[dict]:
+        """Personas y reservas por estado y mes de reserva de cada paquete y destino activo, con su nombre y cupos
+        disponibles (los que no tienen reservas vienen con estado NULL). Retorna Lista de dicts"""
+        agrupado = """
+        SELECT '{tipo}' AS tipo, c.id, c.nombre, c.cupos_disponibles, r.estado,
+               SUBSTR(r.fecha_reserva, 1, 7) AS periodo, COUNT(r.id) AS reservas,
+               COALESCE(SUM(r.numero_personas), 0) AS personas
+        FROM {tabla} c
+        LEFT JOIN Reservas r ON r.{columna} = c.id
+        WHERE c.activo = 1
+        GROUP BY c.id, c.nombre, c.cupos_disponibles, r.estado, SUBSTR(r.fecha_reserva, 1, 7)
+        """
+        sql = (agrupado.format(tipo='paquete', tabla='Paquetes', columna='paquete_id') + " UNION ALL "
+               + agrupado.format(tipo='destino', tabla='Destinos', columna='destino_id'))
+        return ejecutar_consulta(sql)
     
     def listar_todas(self) -> list[ReservaDTO]:
         """Retorna todas las reservas del sistema. Retorna Lista de ReservaDTO"""
-        sql = "SELECT * FROM Reservas ORDER BY id ASC"
-        reservas = ejecutar_consulta(sql)
-        
-        if not reservas:
-            return []
+        sql = f"SELECT {_SELECT_RESERVA} FROM Reservas ORDER BY id ASC"
+        reservas = ejecutar_consulta_tuplas(sql)
         
-        return [
-            ReservaDTO(
-                id=r['id'],
-                fecha_reserva=r['fecha_reserva'],
-                estado=r['estado'],
-                monto_total=r['monto_total'],
-                numero_personas=r['numero_personas'],
-                usuario_id=r['usuario_id'],
-                paquete_id=r.get('paquete_id'),
-                destino_id=r.get('destino_id')
-            )
-            for r in reservas
-        ]
\ No newline at end of file
+        return list(map(_a_reserva, reservas))
\ No newline at end of file
@@ -1,12 +1,33 @@
+from datetime import datetime
+
 from src.config.db_connection import (
     ejecutar_actualizacion,
     ejecutar_consulta,
+    ejecutar_consulta_tuplas,
     ejecutar_consulta_uno,
     ejecutar_insercion,
+    ejecutar_lote,
+    ids_generados,
 )
+from src.dto.mapeo import campos_dto, crear_mapeador
 from src.dto.usuario_dto import UsuarioDTO
+from src.utils.tracing import trazar_metodos
+
+_COLUMNAS_USUARIO = campos_dto(UsuarioDTO)
+_SELECT_USUARIO = ", ".join(_COLUMNAS_USUARIO)
+_a_usuario = crear_mapeador(UsuarioDTO, _COLUMNAS_USUARIO)
 
+# ORDER BY de cada criterio del reporte de clientes (el ID desempata para que la paginación sea estable)
+_ORDEN_REPORTE_CLIENTES = {
+    'gasto': "gasto DESC",
+    'reservas': "reservas DESC",
+    'cancelacion': "tasa_cancelacion DESC",
+    'actividad': "ultima_actividad DESC",
+    'nombre': "u.nombre ASC",
+}
 
+
+@trazar_metodos("dao")
 class UsuarioDAO:
     #Maneja todas las operaciones de base de datos relacionadas con Usuarios.
     def __init__(self):
@@ -25,88 +46,53 @@ class UsuarioDAO:
             )
 
         return ejecutar_insercion(sql,params)
+
+    def crear_lote(self, usuarios: list[UsuarioDTO]) -> list[int]:
+        """Inserta muchos usuarios con INSERTs multi-fila. Retorna Lista de IDs creados (mismo orden)"""
+        sql = "INSERT INTO Usuarios (rut, email, password_hash, nombre, rol, fecha_registro) VALUES (%s,%s,%s,%s,%s,%s)"
+        filas = [(u.rut, u.email, u.password_hash, u.nombre, u.rol, u.fecha_registro) for u in usuarios]
+        return ids_generados(ejecutar_lote(sql, filas))
     
     def obtener_por_id(self, id: int) -> UsuarioDTO | None:
         """Busca usuario por ID. Retorna UsuarioDTO o None"""
-        sql = "SELECT * FROM Usuarios WHERE id=%s"
+        sql = f"SELECT {_SELECT_USUARIO} FROM Usuarios WHERE id=%s"
         params=(id,)
 
-        usuario = ejecutar_consulta_uno(sql, params)
-
-        if usuario:
-            return UsuarioDTO(
-                id=usuario['id'],
-                rut=usuario['rut'],
-                email=usuario['email'],
-                password_hash=usuario['password_hash'],
-                nombre=usuario['nombre'],
-                rol=usuario['rol'],
-                fecha_registro=usuario['fecha_registro']
-            )
+        filas = ejecutar_consulta_tuplas(sql, params)
+
+        if filas:
+            return _a_usuario(filas[0])
 
         return None
     
     def obtener_por_rut(self, rut: str) -> UsuarioDTO | None:
         """Busca usuario por RUT. Retorna UsuarioDTO o None"""
-        sql = "SELECT * FROM Usuarios WHERE rut=%s"
+        sql = f"SELECT {_SELECT_USUARIO} FROM Usuarios WHERE rut=%s"
         params=(rut,)
 
-        usuario = ejecutar_consulta_uno(sql, params)
-
-        if usuario:
-            return UsuarioDTO(
-                id=usuario['id'],
-                rut=usuario['rut'],
-                email=usuario['email'],
-                password_hash=usuario['password_hash'],
-                nombre=usuario['nombre'],
-                rol=usuario['rol'],
-                fecha_registro=usuario['fecha_registro']
-            )
+        filas = ejecutar_consulta_tuplas(sql, params)
+
+        if filas:
+            return _a_usuario(filas[0])
         return None
     
     def obtener_por_email(self, email: str) -> UsuarioDTO | None:
         """Busca usuario por email. Retorna UsuarioDTO o None"""
-        sql = "SELECT * FROM Usuarios WHERE email=%s"
+        sql = f"SELECT {_SELECT_USUARIO} FROM Usuarios WHERE email=%s"
         params=(email,)
 
-        usuario = ejecutar_consulta_uno(sql, params)
-
-        if usuario:
-            return UsuarioDTO(
-                id=usuario['id'],
-                rut=usuario['rut'],
-                email=usuario['email'],
-                password_hash=usuario['password_hash'],
-                nombre=usuario['nombre'],
-                rol=usuario['rol'],
-                fecha_registro=usuario['fecha_registro']
-            )
+        filas = ejecutar_consulta_tuplas(sql, params)
+
+        if filas:
+            return _a_usuario(filas[0])
         return None
     
     def listar_todos(self) -> list[UsuarioDTO]:
         """Lista todos los usuarios (admin). Retorna Lista de UsuarioDTO"""
-        sql = "SELECT * FROM Usuarios"
-        rows = ejecutar_consulta(sql)
-        usuarios = []
-        
-        if not rows:
-            return []
-        
-        for r in rows:
-            usuarios.append(
-                UsuarioDTO(
-                    id=r['id'],
-                    rut=r['rut'],
-                    email=r['email'],
-                    password_hash=r['password_hash'],
-                    nombre=r['nombre'],
-                    rol=r['rol'],
-                    fecha_registro=r['fecha_registro']
-                )
-            )
+        sql = f"SELECT {_SELECT_USUARIO} FROM Usuarios"
+        rows = ejecutar_consulta_tuplas(sql)
 
-        return usuarios
+        return list(map(_a_usuario, rows))
     
     def actualizar(self, usuario_dto: UsuarioDTO) -> bool:
         """Actualiza datos del usuario. Retorna True si se actualizó"""
@@ -127,26 +113,55 @@ class UsuarioDAO:
 
     def listar_por_rol(self, rol:str) -> list[UsuarioDTO]: 
         """Lista usuarios por rol. Retorna Lista de UsuarioDTO"""
-        sql = "SELECT * FROM Usuarios WHERE rol = %s"
+        sql = f"SELECT {_SELECT_USUARIO} FROM Usuarios WHERE rol = %s"
         params = (rol,)
-        usuarios = []
-        rows = ejecutar_consulta(sql,params)                
-        
-        if not rows:
-            return []
+        rows = ejecutar_consulta_tuplas(sql,params)
+
+        return list(map(_a_usuario, rows))
+
+    def contar_por_rol(self, rol: str) -> int:
+        """Cuenta los usuarios de un rol (usa idx_rol). Retorna int"""
+        resultado = ejecutar_consulta_uno("SELECT COUNT(*) AS total FROM Usuarios WHERE rol = %s", (rol,))
+        return int(resultado['total']) if resultado else 0
+
+    def reporte_clientes(self, orden: str, limite: int, desplazamiento: int) -> list[dict]:
+        """Una página de clientes con sus reservas, canceladas, tasa de cancelación, gasto (pagos COMPLETADO) y
+        última actividad (reserva o pago), en una consulta agrupada: Usuarios por idx_rol, sus Reservas por
+        idx_usuario y los pagos de cada reserva por idx_reserva. Retorna Lista de dicts"""
+        sql = f"""
+        SELECT u.id, u.nombre, u.email, u.fecha_registro,
+               COUNT(DISTINCT r.id) AS reservas,
+               COUNT(DISTINCT CASE WHEN r.estado = 'CANCELADA' THEN r.id END) AS canceladas,
+               CASE WHEN COUNT(DISTINCT r.id) = 0 THEN 0
+                    ELSE COUNT(DISTINCT CASE WHEN r.estado = 'CANCELADA' THEN r.id END) * 1.0 / COUNT(DISTINCT r.id)
+               END AS tasa_cancelacion,
+               COALESCE(SUM(p.monto), 0) AS gasto,
+               CASE WHEN MAX(p.fecha_pago) > MAX(r.fecha_reserva) THEN MAX(p.fecha_pago) ELSE MAX(r.fecha_reserva) END AS ultima_actividad
+        FROM Usuarios u
+        LEFT JOIN Reservas r ON r.usuario_id = u.id
+        LEFT JOIN Pagos p ON p.reserva_id = r.id AND p.estado = 'COMPLETADO'
+        WHERE u.rol = 'CLIENTE'
+        GROUP BY u.id, u.nombre, u.email, u.fecha_registro
+        ORDER BY {_ORDEN_REPORTE_CLIENTES[orden]}, u.id ASC
+        LIMIT %s OFFSET %s
+        """
+        filas = ejecutar_consulta(sql, (limite, desplazamiento))
         
-        for r in rows:
-            usuarios.append(UsuarioDTO(
-                id=r['id'],
-                rut=r['rut'],
-                email=r['email'],
-                password_hash=r['password_hash'],
-                nombre=r['nombre'],
-                rol=r['rol'],
-                fecha_registro=r['fecha_registro']
-            ))
-
-        return usuarios
+        return [
+            {
+                'id': f['id'],
+                'nombre': f['nombre'],
+                'email': f['email'],
+                'fecha_registro': f['fecha_registro'],
+                'reservas': int(f['reservas']),
+                'canceladas': int(f['canceladas']),
+                'tasa_cancelacion': round(float(f['tasa_cancelacion']), 4),
+                'gasto': int(f['gasto']),
+                # Los agregados sobre DATETIME llegan como texto en SQLite
+                'ultima_actividad': datetime.fromisoformat(f['ultima_actividad']) if isinstance(f['ultima_actividad'], str) else f['ultima_actividad'],
+            }
+            for f in filas
+        ]
 
     def verificar_email_existe(self, email:str) -> bool: 
         """Valida si el email ya está registrado. Retorna True si existe"""
@@ -1,5 +1,7 @@
 from .actividad_dto import ActividadDTO
 from .destino_dto import DestinoDTO
+from .lotes import PagoBatch, ReservaBatch
+from .mapeo import a_dict, crear_mapeador
 from .pago_dto import PagoDTO
 from .paquete_dto import PaqueteDTO
 from .politica_cancelacion_dto import PoliticaCancelacionDTO
@@ -9,9 +11,13 @@ from .usuario_dto import UsuarioDTO
 __all__ = [
     "ActividadDTO",
     "DestinoDTO",
+    "PagoBatch",
     "PagoDTO",
     "PaqueteDTO",
     "PoliticaCancelacionDTO",
+    "ReservaBatch",
     "ReservaDTO",
     "UsuarioDTO",
+    "a_dict",
+    "crear_mapeador",
 ]
\ No newline at end of file
@@ -1,5 +1,7 @@
 class ActividadDTO:
     """Transfer Object para Actividad. Representa los datos de una actividad turística."""
+    __slots__ = ('id', 'nombre', 'descripcion', 'duracion_horas', 'precio_base', 'destino_id')
+
     def __init__(self, id:int | None, nombre:str, descripcion: str, duracion_horas: int, precio_base: int, destino_id:int):
         self.id=id
         self.nombre=nombre
@@ -1,5 +1,7 @@
 class DestinoDTO:
     """Transfer Object para Destino. Representa los datos de un destino turístico."""
+    __slots__ = ('id', 'nombre', 'descripcion', 'costo_base', 'cupos_disponibles', 'politica_id')
+
     def __init__(self, id:int | None, nombre:str, descripcion:str, costo_base:int, cupos_disponibles:int = 50, politica_id:int = 1):
         self.id=id
         self.nombre=nombre
@@ -0,0 +1,177 @@
+"""Lotes columnares de Reservas y Pagos para reportes y estadísticas.
+
+Un lote guarda una columna compacta por campo en vez de un DTO por fila: IDs, montos y fechas
+en arrays int64 (las fechas como microsegundos desde 1970) y los estados/métodos como códigos
+int8 (índice en la lista de valores de constants). Los DTOs se arman solo al acceder a una
+fila (lote[i] o al iterar), con el mapeador posicional de mapeo.py.
+
+Si NumPy está instalado, columna() entrega cada columna como ndarray sin copiar y las
+agregaciones (suma, contar_por, suma_por) son vectorizadas; sin NumPy hacen lo mismo
+recorriendo los arrays en Python.
+"""
+
+from array import array
+from datetime import datetime, timedelta
+
+try:
+    import numpy as np
+except ImportError:  # Dependencia opcional
+    np = None
+
+from src.dto.mapeo import crear_mapeador
+from src.dto.pago_dto import PagoDTO
+from src.dto.reserva_dto import ReservaDTO
+from src.utils.constants import ESTADOS_PAGO, ESTADOS_RESERVA, METODOS_PAGO
+
+EPOCA = datetime(1970, 1, 1)
+SIN_ID = 0  # FK opcional ausente (paquete_id/destino_id); los IDs reales parten en 1
+_MICROSEGUNDO = timedelta(microseconds=1)
+
+
+def a_microsegundos(fecha) -> int:
+    """Fecha (datetime o texto ISO) como microsegundos desde 1970. Retorna int"""
+    if not isinstance(fecha, datetime):
+        fecha = datetime.fromisoformat(str(fecha))
+    return (fecha - EPOCA) // _MICROSEGUNDO
+
+
+def desde_microsegundos(valor: int) -> datetime:
+    """Inversa de a_microsegundos. Retorna datetime"""
+    return EPOCA + timedelta(microseconds=int(valor))
+
+
+class LoteColumnar:
+    """Base de los lotes. Las subclases declaran DTO, COLUMNAS (nombre, typecode de array) en el orden
+    del SELECT, CATEGORIAS (columna -> valores posibles), FECHAS y OPCIONALES (FKs que pueden ser NULL)."""
+
+    DTO: type = object
+    COLUMNAS: tuple = ()
+    CATEGORIAS: dict = {}
+    FECHAS: tuple = ()
+    OPCIONALES: tuple = ()
+
+    def __init__(self):
+        self._columnas = {nombre: array(tipo) for nombre, tipo in self.COLUMNAS}
+        self._codigos = {nombre: {valor: i for i, valor in enumerate(valores)} for nombre, valores in self.CATEGORIAS.items()}
+        self._mapeador = crear_mapeador(self.DTO, tuple(self._columnas))
+
+    @classmethod
+    def desde_filas(cls, filas, columnas: tuple):
+        """Arma un lote desde filas tupla cuyas posiciones siguen columnas. Retorna el lote"""
+        lote = cls()
+        lote.agregar_filas(filas, columnas)
+        return lote
+
+    def agregar_filas(self, filas, columnas: tuple) -> None:
+        """Agrega filas tupla columna por columna (columnas debe cubrir todos los campos del lote)."""
+        if set(columnas) != set(self._columnas):
+            raise ValueError(f"{type(self).__name__} requiere las columnas {tuple(self._columnas)}")
+        filas = list(filas)
+        if not filas:
+            return
+        for nombre, valores in zip(columnas, zip(*filas)):
+            self._columnas[nombre].extend(map(self._codificador(nombre), valores))
+
+    def extender(self, otro: "LoteColumnar") -> None:
+        """Agrega al final las filas de otro lote del mismo tipo."""
+        for nombre, columna in self._columnas.items():
+            columna.extend(otro._columnas[nombre])
+
+    def _codificador(self, nombre: str):
+        """Conversión de un valor de la base al tipo de su columna. Retorna función"""
+        if nombre in self._codigos:
+            return self._codigos[nombre].__getitem__
+        if nombre in self.FECHAS:
+            return a_microsegundos
+        if nombre in self.OPCIONALES:
+            return lambda valor: SIN_ID if valor is None else int(valor)
+        return int
+
+    def _decodificar(self, nombre: str, valor):
+        """Inversa de _codificador para un valor. Retorna el valor como lo entrega el DTO"""
+        if nombre in self.CATEGORIAS:
+            return self.CATEGORIAS[nombre][valor]
+        if nombre in self.FECHAS:
+            return desde_microsegundos(valor)
+        if nombre in self.OPCIONALES and valor == SIN_ID:
+            return None
+        return valor
+
+    def __len__(self) -> int:
+        return len(self._columnas[self.COLUMNAS[0][0]])
+
+    def __getitem__(self, indice: int):
+        """Vista DTO de una fila (se arma al acceder). Retorna instancia de DTO"""
+        return self._mapeador(tuple(self._decodificar(nombre, columna[indice]) for nombre, columna in self._columnas.items()))
+
+    def __iter__(self):
+        for indice in range(len(self)):
+            yield self[indice]
+
+    def columna(self, nombre: str):
+        """Columna cruda (códigos para las categóricas, microsegundos para fechas). Retorna ndarray sin copia
+        si NumPy está disponible (mientras exista la vista el lote no puede crecer) o el array de la columna"""
+        columna = self._columnas[nombre]
+        return np.frombuffer(columna, dtype=columna.typecode) if np is not None else columna
+
+    def mascara(self, nombre: str, valores) -> list:
+        """Filas cuya columna categórica toma alguno de los valores. Retorna ndarray bool o lista de bool"""
+        codigos = {self._codigos[nombre][valor] for valor in valores}
+        if np is not None:
+            return np.isin(self.columna(nombre), list(codigos))
+        return [codigo in codigos for codigo in self._columnas[nombre]]
+
+    def suma(self, nombre: str, mascara=None) -> int:
+        """Suma de una columna numérica (solo filas de la máscara si se da). Retorna int"""
+        if np is not None:
+            valores = self.columna(nombre)
+            return int(valores[mascara].sum() if mascara is not None else valores.sum())
+        valores = self._columnas[nombre]
+        return sum(v for v, incluir in zip(valores, mascara) if incluir) if mascara is not None else sum(valores)
+
+    def contar_por(self, grupo: str, mascara=None) -> dict:
+        """Cantidad de filas por valor de una columna categórica. Retorna dict valor -> cantidad"""
+        return self._agrupar(grupo, None, mascara)
+
+    def suma_por(self, grupo: str, nombre: str, mascara=None) -> dict:
+        """Suma de una columna numérica por valor de una columna categórica. Retorna dict valor -> suma"""
+        return self._agrupar(grupo, nombre, mascara)
+
+    def _agrupar(self, grupo: str, nombre: str | None, mascara) -> dict:
+        etiquetas = self.CATEGORIAS[grupo]
+        if np is not None:
+            codigos = self.columna(grupo)
+            pesos = self.columna(nombre) if nombre else None
+            if mascara is not None:
+                codigos = codigos[mascara]
+                pesos = pesos[mascara] if pesos is not None else None
+            # bincount con pesos acumula en float64: exacto para sumas bajo 2**53
+            totales = np.bincount(codigos, weights=pesos, minlength=len(etiquetas))
+            return {etiqueta: int(total) for etiqueta, total in zip(etiquetas, totales)}
+        totales = [0] * len(etiquetas)
+        codigos = self._columnas[grupo]
+        pesos = self._columnas[nombre] if nombre else [1] * len(codigos)
+        for i, (codigo, peso) in enumerate(zip(codigos, pesos)):
+            if mascara is None or mascara[i]:
+                totales[codigo] += peso
+        return dict(zip(etiquetas, totales))
+
+
+class ReservaBatch(LoteColumnar):
+    """Lote columnar de reservas."""
+
+    DTO = ReservaDTO
+    COLUMNAS = (('id', 'q'), ('fecha_reserva', 'q'), ('estado', 'b'), ('monto_total', 'q'), ('numero_personas', 'q'),
+                ('usuario_id', 'q'), ('paquete_id', 'q'), ('destino_id', 'q'))
+    CATEGORIAS = {'estado': tuple(ESTADOS_RESERVA)}
+    FECHAS = ('fecha_reserva',)
+    OPCIONALES = ('paquete_id', 'destino_id')
+
+
+class PagoBatch(LoteColumnar):
+    """Lote columnar de pagos."""
+
+    DTO = PagoDTO
+    COLUMNAS = (('id', 'q'), ('monto', 'q'), ('fecha_pago', 'q'), ('metodo', 'b'), ('estado', 'b'), ('reserva_id', 'q'))
+    CATEGORIAS = {'metodo': tuple(METODOS_PAGO), 'estado': tuple(ESTADOS_PAGO)}
+    FECHAS = ('fecha_pago',)
@@ -0,0 +1,44 @@
+"""Mapeo rápido de filas de base de datos a DTOs.
+
+Los DTOs declaran __slots__ (sin __dict__ por instancia). crear_mapeador genera, una vez por
+combinación de DTO y columnas, una función que arma el DTO desde una fila tupla por posición:
+sin diccionario intermedio por fila, sin argumentos por nombre y sin pasar por __init__ (las
+validaciones de __init__ ya las garantizan las restricciones de la tabla).
+
+Uso en un DAO:
+    COLUMNAS_DESTINO = ('id', 'nombre', ...)
+    _a_destino = crear_mapeador(DestinoDTO, COLUMNAS_DESTINO)
+    filas = ejecutar_consulta_tuplas(f"SELECT {', '.join(COLUMNAS_DESTINO)} FROM Destinos")
+    destinos = list(map(_a_destino, filas))
+"""
+
+from collections.abc import Callable
+from functools import lru_cache
+
+
+def campos_dto(clase: type) -> tuple[str, ...]:
+    """Atributos declarados en __slots__ por la clase y sus bases. Retorna tupla de nombres"""
+    campos = []
+    for tipo in reversed(clase.__mro__):
+        slots = tipo.__dict__.get("__slots__", ())
+        campos.extend([slots] if isinstance(slots, str) else slots)
+    return tuple(campos)
+
+
+@lru_cache(maxsize=None)
+def crear_mapeador(clase: type, columnas: tuple[str, ...]) -> Callable[[tuple], object]:
+    """Genera la función fila -> DTO para las columnas dadas (en el orden del SELECT). Retorna función"""
+    desconocidas = set(columnas) - set(campos_dto(clase))
+    if desconocidas:
+        raise ValueError(f"{clase.__name__} no tiene los campos {sorted(desconocidas)}")
+    asignaciones = "".join(f"    dto.{columna} = fila[{posicion}]\n" for posicion, columna in enumerate(columnas))
+    faltantes = "".join(f"    dto.{campo} = None\n" for campo in campos_dto(clase) if campo not in columnas)
+    codigo = f"def mapear_{clase.__name__}(fila):\n    dto = _nuevo(_clase)\n{asignaciones}{faltantes}    return dto\n"
+    espacio = {'_nuevo': object.__new__, '_clase': clase}
+    exec(codigo, espacio)
+    return espacio[f"mapear_{clase.__name__}"]
+
+
+def a_dict(dto) -> dict:
+    """Campos del DTO como diccionario (reemplaza a vars(), que no aplica a clases con __slots__). Retorna dict"""
+    return {campo: getattr(dto, campo) for campo in campos_dto(type(dto))}
@@ -3,6 +3,8 @@ from datetime import datetime
 
 class PagoDTO:
     """Transfer Object para Pago. Representa los datos de un pago."""
+    __slots__ = ('id', 'monto', 'fecha_pago', 'metodo', 'reserva_id', 'estado')
+
     def __init__(self, id:int, monto:int, fecha_pago:datetime, metodo:str, reserva_id:int, estado:str):
         self.id=id
         self.monto=monto
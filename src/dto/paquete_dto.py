@@ -3,6 +3,8 @@ from datetime import datetime
 
 class PaqueteDTO:
     """Transfer Object para Paquete. Representa los datos de un paquete turístico."""
+    __slots__ = ('id', 'nombre', 'descripcion', 'fecha_inicio', 'fecha_fin', 'precio_total', 'cupos_disponibles', 'politica_id')
+
     def __init__(self, id:int | None, nombre:str, fecha_inicio: datetime, fecha_fin:datetime, precio_total:int, cupos_disponibles:int, politica_id: int, descripcion:str | None = None):
         self.id=id
         self.nombre=nombre
@@ -1,5 +1,7 @@
 class PoliticaCancelacionDTO:
     """Transfer Object para Política de Cancelación. Representa las reglas de reembolso."""
+    __slots__ = ('id', 'nombre', 'dias_aviso', 'porcentaje_reembolso')
+
     def __init__(self,id:int, nombre:str, dias_aviso:int, porcentaje_reembolso:int):
         self.id=id
         self.nombre=nombre
@@ -3,6 +3,8 @@ from datetime import datetime
 
 class ReservaDTO:
     """Transfer Object para Reserva. Representa los datos de una reserva."""
+    __slots__ = ('id', 'fecha_reserva', 'estado', 'monto_total', 'numero_personas', 'usuario_id', 'paquete_id', 'destino_id')
+
     def __init__(self, id:int | None, fecha_reserva:datetime, estado: str, monto_total: int, numero_personas: int, usuario_id: int, paquete_id: int | None = None, destino_id: int | None = None):
         self.id=id
         self.fecha_reserva=fecha_reserva
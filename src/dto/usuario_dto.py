@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class UsuarioDTO:
     """Transfer Object para Usuario. Representa los datos de un usuario del sistema."""
     id: int | None
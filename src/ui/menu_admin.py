@@ -14,6 +14,7 @@ from src.dto import UsuarioDTO
 from src.utils import (
     MSG_ERROR_OPCION_INVALIDA,
     OperacionCancelada,
+    ValidacionError,
     leer_opcion,
     limpiar_pantalla,
     pausar,
@@ -21,6 +22,7 @@ from src.utils import (
     validar_opcion,
 )
 from src.utils.utils import (
+    formatear_precio,
     mostrar_tabla_actividades,
     mostrar_tabla_destinos,
     mostrar_tabla_paquetes,
@@ -827,8 +829,9 @@ def menu_admin_reservas():
 
 def menu_admin_reportes():
     """Submenú para reportes administrativos."""
+    from src.business.ocupacion_service import OcupacionService
     from src.business.pago_service import PagoService
-    from src.utils.constants import ESTADOS_RESERVA
+    from src.utils.constants import ESTADOS_RESERVA, ORDENES_REPORTE_CLIENTES
     
     reserva_service = ReservaService()
     usuario_service = UsuarioService()
@@ -840,9 +843,10 @@ def menu_admin_reportes():
         print("1. Ver todas las Reservas")
         print("2. Reporte de Ventas")
         print("3. Reporte de Clientes")
-        print("4. Volver")
+        print("4. Ocupación de Paquetes y Destinos")
+        print("5. Volver")
         opcion = leer_opcion()
-        if not validar_opcion(opcion, 1, 4):
+        if not validar_opcion(opcion, 1, 5):
             print(MSG_ERROR_OPCION_INVALIDA)
             pausar()
             continue
@@ -888,26 +892,54 @@ def menu_admin_reportes():
                 if reporte['pagos']:
                     print("\nDetalle de pagos:")
                     for p in reporte['pagos']:
-                        print(f"  ID: {p.id} | Reserva: {p.reserva_id} | ${p.monto} | {p.metodo_pago} | {p.fecha_pago}")
+                        print(f"  ID: {p.id} | Reserva: {p.reserva_id} | ${p.monto} | {p.metodo} | {p.fecha_pago}")
             except Exception as e:
                 print(f"ERROR: Error: {e}")
             pausar()
         elif opcion == 3:
             print("=== VIAJES AVENTURA: REPORTE DE CLIENTES ===")
             try:
-                todos_usuarios = usuario_service.listar_todos_usuarios()
-                clientes = [u for u in todos_usuarios if u.rol == 'cliente']
-                print(f"\nTotal de clientes registrados: {len(clientes)}")
-                print("\n" + "="*70)
-                for c in clientes:
-                    print(f"ID: {c.id} | {c.nombre}")
-                    print(f"  Email: {c.email}")
-                    print(f"  Registro: {c.fecha_registro}")
-                    print("-" * 70)
+                print("\nOrdenar por:")
+                for i, criterio in enumerate(ORDENES_REPORTE_CLIENTES, 1):
+                    print(f"{i}. {criterio}")
+                eleccion = input("\nSeleccione opción (Enter=gasto): ").strip()
+                if eleccion and not (eleccion.isdigit() and validar_opcion(int(eleccion), 1, len(ORDENES_REPORTE_CLIENTES))):
+                    raise ValidacionError(MSG_ERROR_OPCION_INVALIDA)
+                orden = ORDENES_REPORTE_CLIENTES[int(eleccion) - 1] if eleccion else ORDENES_REPORTE_CLIENTES[0]
+                pagina = 1
+                while True:
+                    reporte = usuario_service.reporte_clientes(orden, pagina)
+                    print(f"\nTotal de clientes registrados: {reporte['total']} (página {pagina} de {max(reporte['paginas'], 1)})")
+                    print("\n" + "="*120)
+                    print(f"{'ID':<5} {'NOMBRE':<25} {'EMAIL':<30} {'RESERVAS':>9} {'CANCEL.':>8} {'GASTO':>14}  ÚLTIMA ACTIVIDAD")
+                    print("="*120)
+                    for c in reporte['elementos']:
+                        actividad = c['ultima_actividad'].strftime('%d/%m/%Y %H:%M') if c['ultima_actividad'] else "-"
+                        print(f"{c['id']:<5} {c['nombre'][:25]:<25} {c['email'][:30]:<30} {c['reservas']:>9} "
+                              f"{c['tasa_cancelacion']:>8.0%} {formatear_precio(c['gasto']):>14}  {actividad}")
+                    print("="*120)
+                    if pagina >= reporte['paginas'] or input("\nEnter = página siguiente, 0 = salir: ").strip() == '0':
+                        break
+                    pagina += 1
             except Exception as e:
                 print(f"ERROR: Error: {e}")
             pausar()
         elif opcion == 4:
+            print("=== VIAJES AVENTURA: OCUPACIÓN ===")
+            try:
+                ocupacion = OcupacionService().reporte_ocupacion()
+                print("\n" + "="*100)
+                print(f"{'TIPO':<9} {'ID':<5} {'NOMBRE':<30} {'OCUPADOS':>9} {'CAPACIDAD':>10} {'CARGA':>8}  POR ESTADO")
+                print("="*100)
+                for fila in ocupacion:
+                    por_estado = ", ".join(f"{estado}: {n}" for estado, n in fila['por_estado'].items()) or "-"
+                    print(f"{fila['tipo']:<9} {fila['id']:<5} {fila['nombre'][:30]:<30} {fila['ocupados']:>9} "
+                          f"{fila['capacidad']:>10} {fila['factor_carga']:>8.1%}  {por_estado}")
+                print("="*100)
+            except Exception as e:
+                print(f"ERROR: Error: {e}")
+            pausar()
+        elif opcion == 5:
             break
 
 
@@ -463,21 +463,12 @@ def realizar_pago_cliente(cliente_id: int):
 
 def ver_mis_pagos(cliente_id: int):
     """Historial de pagos."""
-    reserva_service = ReservaService()
     limpiar_pantalla()
     print("=== HISTORIAL DE PAGOS ===\n")
     
     try:
-        # Obtener todas las reservas del cliente
-        reservas = reserva_service.listar_reservas_cliente(cliente_id)
-        
-        pago_service = PagoService()
-        todos_pagos = []
-        for reserva in reservas:
-            if reserva.id is not None:  # Validar que id no sea None
-                pagos = pago_service.obtener_historial_pagos(reserva.id)
-                if pagos:
-                    todos_pagos.extend(pagos)
+        # Pagos de todas las reservas del cliente, con lo reservado, en una consulta
+        todos_pagos = PagoService().historial_cliente(cliente_id)
         
         if not todos_pagos:
             print("No tienes pagos registrados.")
@@ -1,11 +1,20 @@
 from .constants import (
     # Configuración DB
     DB_CHARSET,
+    DB_ESPERA_MAXIMA_S,
+    DB_ESPERA_REINTENTO_S,
+    DB_MAX_SENTENCIA_BYTES,
     DB_PORT_DEFAULT,
+    DB_REINTENTOS,
+    DB_REPLICA_RETRASO_MAXIMO_S,
+    DB_SEGUNDOS_PING,
+    DB_TAMANO_LOTE,
     DESCRIPCION_MAX_LENGTH,
+    DIAS_ANTIGUEDAD_ARCHIVO,
     DIAS_AVISO_ESTRICTA,
     # Políticas de cancelación
     DIAS_AVISO_FLEXIBLE,
+    DIAS_REFERENCIA_DESTINO,
     # Validación de campos
     EMAIL_MAX_LENGTH,
     ESTADO_PAGO_DEFAULT,
@@ -19,6 +28,8 @@ from .constants import (
     FORMATO_FECHA_CHILENO,
     # Formatos de fecha
     FORMATO_FECHA_ISO,
+    HORAS_EXPIRACION_PENDIENTE,
+    LIMITE_BUSQUEDA_DEFECTO,
     MAX_DURACION_ACTIVIDAD,
     MAX_PERSONAS_RESERVA,
     METODOS_PAGO,
@@ -46,8 +57,14 @@ from .constants import (
     MSG_ERROR_TELEFONO_INVALIDO,
     MSG_ERROR_USUARIO_NO_ENCONTRADO,
     NOMBRE_MAX_LENGTH,
+    ORDENES_BUSQUEDA_PAQUETES,
+    ORDENES_REPORTE_CLIENTES,
+    PAUSA_LOTE_ARCHIVO_S,
     PASSWORD_MIN_LENGTH,
     POLITICAS_CANCELACION,
+    POR_PAGINA_DEFECTO,
+    POR_PAGINA_MAXIMO,
+    RANGOS_PRECIO_BUSQUEDA,
     REEMBOLSO_ESTRICTA,
     REEMBOLSO_FLEXIBLE,
     # Regex
@@ -57,7 +74,12 @@ from .constants import (
     REGEX_TELEFONO_CHILE,
     ROL_USUARIO_DEFAULT,
     ROLES_USUARIO,
+    SEGUNDOS_CACHE_OCUPACION,
+    SEGUNDOS_REFRESCO_INDICE,
     SIMBOLO_MONEDA,
+    TAMANO_LOTE_COLUMNAR,
+    TAMANO_LOTE_PROCESOS,
+    UMBRAL_SIMILITUD_BUSQUEDA,
     # Financieras
     VALOR_IVA,
 )
@@ -73,6 +95,7 @@ from .exceptions import (
 )
 from .utils import (
     OperacionCancelada,
+    calcular_paginacion,
     calcular_precio_con_iva,
     formatear_precio,
     leer_decimal_seguro,
@@ -81,6 +104,7 @@ from .utils import (
     leer_opcion,
     limpiar_pantalla,
     pausar,
+    resultado_paginado,
     sanitizar_numero,
     validar_cancelacion,
     validar_opcion,
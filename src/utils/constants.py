@@ -32,7 +32,7 @@ Uso:
 # ============================================
 # ENUMERACIONES DE BASE DE DATOS
 # ============================================
-ESTADOS_RESERVA = ['PENDIENTE', 'CONFIRMADA', 'CANCELADA', 'PAGADA']
+ESTADOS_RESERVA = ['PENDIENTE', 'CONFIRMADA', 'CANCELADA', 'PAGADA', 'COMPLETADA']
 METODOS_PAGO = ['EFECTIVO', 'TARJETA', 'TRANSFERENCIA']
 ESTADOS_PAGO = ['PENDIENTE', 'COMPLETADO', 'FALLIDO']
 ROLES_USUARIO = ['ADMIN', 'CLIENTE']
@@ -52,6 +52,7 @@ DIAS_AVISO_FLEXIBLE = 7
 DIAS_AVISO_ESTRICTA = 30
 REEMBOLSO_FLEXIBLE = 100  # Porcentaje
 REEMBOLSO_ESTRICTA = 50   # Porcentaje
+DIAS_REFERENCIA_DESTINO = 30  # Los destinos no tienen fecha: se usa fecha_reserva + N días
 
 # ============================================
 # VALIDACIÓN DE CAMPOS (Longitudes máximas)
@@ -70,6 +71,20 @@ MIN_CUPOS_PAQUETE = 0
 MIN_DURACION_ACTIVIDAD = 1   # Horas
 MAX_DURACION_ACTIVIDAD = 24  # Horas
 MIN_MONTO = 0.01
+POR_PAGINA_DEFECTO = 20   # Listados paginados (API)
+POR_PAGINA_MAXIMO = 200
+HORAS_EXPIRACION_PENDIENTE = 48  # Reservas PENDIENTE sin pagar que el proceso nocturno cancela
+TAMANO_LOTE_PROCESOS = 500       # Reservas por transacción en los procesos por lotes (CLI)
+TAMANO_LOTE_COLUMNAR = 10000     # Filas por consulta al armar lotes columnares (reportes y estadísticas)
+DIAS_ANTIGUEDAD_ARCHIVO = 365    # Reservas finalizadas más antiguas que esto pasan al histórico
+PAUSA_LOTE_ARCHIVO_S = 0.05      # Pausa entre lotes de archivado (limita la carga sobre la base)
+LIMITE_BUSQUEDA_DEFECTO = 20     # Resultados de la búsqueda en el catálogo
+UMBRAL_SIMILITUD_BUSQUEDA = 0.75 # Fracción de trigramas de cada palabra que debe coincidir (tolera errores de tipeo)
+SEGUNDOS_REFRESCO_INDICE = 300   # Antigüedad máxima del índice de búsqueda (ve cambios de otros procesos)
+ORDENES_BUSQUEDA_PAQUETES = ('precio', 'precio_desc', 'fecha', 'cupos')  # Criterios de orden de la búsqueda por filtros
+RANGOS_PRECIO_BUSQUEDA = (500000, 1000000, 2000000, 3000000)  # Cortes de la faceta de precio (CLP)
+ORDENES_REPORTE_CLIENTES = ('gasto', 'reservas', 'cancelacion', 'actividad', 'nombre')  # Criterios del reporte de clientes
+SEGUNDOS_CACHE_OCUPACION = 300   # Antigüedad máxima del reporte de ocupación en caché (ve cambios de otros procesos)
 
 # ============================================
 # FORMATOS DE FECHA
@@ -84,6 +99,13 @@ FORMATO_DATETIME_DISPLAY = '%d/%m/%Y %H:%M'
 # ============================================
 DB_CHARSET = 'utf8mb4'
 DB_PORT_DEFAULT = 3306
+DB_TAMANO_LOTE = 1000  # Filas por bloque en escrituras masivas (ejecutar_lote)
+DB_MAX_SENTENCIA_BYTES = 16 * 1024 * 1024  # Tope de una sentencia multi-fila; no superar max_allowed_packet
+DB_SEGUNDOS_PING = 30  # Inactividad tras la cual se verifica la conexión con ping antes de usarla
+DB_REINTENTOS = 3  # Reintentos ante errores transitorios (conexión perdida, deadlock, lock wait timeout)
+DB_ESPERA_REINTENTO_S = 0.1  # Espera base del backoff exponencial entre reintentos (con jitter)
+DB_ESPERA_MAXIMA_S = 2.0  # Tope de la espera entre reintentos
+DB_REPLICA_RETRASO_MAXIMO_S = 5  # Retraso de replicación tolerado: tras escribir, el hilo lee del primario
 
 # ============================================
 # PATRONES DE VALIDACIÓN (REGEX)
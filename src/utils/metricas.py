@@ -0,0 +1,270 @@
+"""Métricas de la aplicación en formato de texto de Prometheus.
+
+Contadores e histogramas en proceso (sin dependencias externas) que los servicios actualizan,
+más un endpoint HTTP liviano (http.server) que los expone en /metrics. Con METRICS_PORT definido,
+main.py levanta el endpoint en un hilo daemon junto al menú. Escucha solo en 127.0.0.1; para que
+Prometheus lo lea desde otra máquina hay que indicar la interfaz con METRICS_HOST (p. ej. 0.0.0.0):
+
+    METRICS_PORT=9108 python main.py
+    curl http://localhost:9108/metrics
+"""
+
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.config.instrumentacion import EventoConsulta, registrar_hook
+
+# Límites por defecto de los histogramas, en segundos (los mismos del cliente oficial de Prometheus)
+LIMITES_DEFECTO = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+TIPO_CONTENIDO = "text/plain; version=0.0.4; charset=utf-8"
+_LE_INF = 'le="+Inf"'
+
+
+def _escapar(valor) -> str:
+    """Escapa un valor de etiqueta según el formato de texto. Retorna string"""
+    return str(valor).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _formatear_etiquetas(nombres: tuple, valores: tuple, extra: str = "") -> str:
+    """Arma el bloque {a="1",b="2"} de una serie. Retorna string (vacío si no hay etiquetas)"""
+    pares = [f'{n}="{_escapar(v)}"' for n, v in zip(nombres, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+def _formatear_numero(valor: float) -> str:
+    """Formatea un número como lo espera Prometheus. Retorna string"""
+    if math.isinf(valor):
+        return "+Inf" if valor > 0 else "-Inf"
+    return repr(float(valor)) if not float(valor).is_integer() else str(int(valor))
+
+
+class Metrica:
+    """Base de las métricas: nombre, ayuda, etiquetas y series por combinación de etiquetas."""
+    tipo = "untyped"
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: tuple = ()):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self._bloqueo = threading.Lock()
+        self._series: dict[tuple, object] = {}
+
+    def _clave(self, etiquetas: dict) -> tuple:
+        """Ordena los valores de etiquetas según la definición. Retorna tupla"""
+        if set(etiquetas) != set(self.etiquetas):
+            raise ValueError(f"{self.nombre} requiere las etiquetas {self.etiquetas}")
+        return tuple(str(etiquetas[e]) for e in self.etiquetas)
+
+    def exponer(self) -> list[str]:
+        """Líneas HELP/TYPE y las series de la métrica. Retorna Lista de strings"""
+        return [f"# HELP {self.nombre} {self.ayuda}", f"# TYPE {self.nombre} {self.tipo}", *self._lineas()]
+
+    def _lineas(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Contador(Metrica):
+    """Valor que solo aumenta (operaciones realizadas, errores...)."""
+    tipo = "counter"
+
+    def inc(self, valor: float = 1, **etiquetas) -> None:
+        """Suma valor a la serie de las etiquetas dadas"""
+        clave = self._clave(etiquetas)
+        with self._bloqueo:
+            self._series[clave] = self._series.get(clave, 0) + valor
+
+    def valor(self, **etiquetas) -> float:
+        """Retorna el valor actual de la serie (0 si no existe)"""
+        with self._bloqueo:
+            return self._series.get(self._clave(etiquetas), 0)
+
+    def _lineas(self) -> list[str]:
+        with self._bloqueo:
+            series = sorted(self._series.items())
+        return [f"{self.nombre}{_formatear_etiquetas(self.etiquetas, c)} {_formatear_numero(v)}" for c, v in series]
+
+
+class Histograma(Metrica):
+    """Distribución de valores (latencias) en buckets acumulados, con suma y cantidad."""
+    tipo = "histogram"
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: tuple = (), limites: tuple = LIMITES_DEFECTO):
+        super().__init__(nombre, ayuda, etiquetas)
+        self.limites = tuple(sorted(limites))
+
+    def observar(self, valor: float, **etiquetas) -> None:
+        """Registra una observación en la serie de las etiquetas dadas"""
+        clave = self._clave(etiquetas)
+        with self._bloqueo:
+            serie = self._series.get(clave)
+            if serie is None:
+                serie = self._series[clave] = {'buckets': [0] * len(self.limites), 'suma': 0.0, 'cantidad': 0}
+            for i, limite in enumerate(self.limites):
+                if valor <= limite:
+                    serie['buckets'][i] += 1
+                    break
+            serie['suma'] += valor
+            serie['cantidad'] += 1
+
+    @contextmanager
+    def medir(self, **etiquetas):
+        """Cronometra el bloque y lo registra como observación (también si lanza excepción)"""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observar(time.perf_counter() - inicio, **etiquetas)
+
+    def cantidad(self, **etiquetas) -> int:
+        """Retorna cuántas observaciones tiene la serie"""
+        with self._bloqueo:
+            serie = self._series.get(self._clave(etiquetas))
+            return serie['cantidad'] if serie else 0
+
+    def _lineas(self) -> list[str]:
+        with self._bloqueo:
+            series = sorted((c, {**s, 'buckets': list(s['buckets'])}) for c, s in self._series.items())
+        lineas = []
+        for clave, serie in series:
+            acumulado = 0
+            for limite, cantidad in zip(self.limites, serie['buckets']):
+                acumulado += cantidad
+                le = f'le="{_formatear_numero(limite)}"'
+                lineas.append(f"{self.nombre}_bucket{_formatear_etiquetas(self.etiquetas, clave, le)} {acumulado}")
+            lineas.append(f"{self.nombre}_bucket{_formatear_etiquetas(self.etiquetas, clave, _LE_INF)} {serie['cantidad']}")
+            lineas.append(f"{self.nombre}_sum{_formatear_etiquetas(self.etiquetas, clave)} {_formatear_numero(serie['suma'])}")
+            lineas.append(f"{self.nombre}_count{_formatear_etiquetas(self.etiquetas, clave)} {serie['cantidad']}")
+        return lineas
+
+
+class MedidorCaches(Metrica):
+    """Aciertos y fallos de las caches registradas, leídos al momento de exponer."""
+    tipo = "counter"
+
+    def __init__(self, nombre: str, ayuda: str):
+        super().__init__(nombre, ayuda, ("cache", "resultado"))
+        self._caches = {}
+
+    def registrar(self, nombre_cache: str, obtener_info) -> None:
+        """Agrega una cache; obtener_info() debe retornar un objeto con .hits y .misses (como cache_info())"""
+        with self._bloqueo:
+            self._caches[nombre_cache] = obtener_info
+
+    def _lineas(self) -> list[str]:
+        with self._bloqueo:
+            caches = sorted(self._caches.items())
+        lineas = []
+        for nombre_cache, obtener_info in caches:
+            info = obtener_info()
+            for resultado, valor in (("acierto", info.hits), ("fallo", info.misses)):
+                lineas.append(f"{self.nombre}{_formatear_etiquetas(self.etiquetas, (nombre_cache, resultado))} {valor}")
+        return lineas
+
+
+class RegistroMetricas:
+    """Conjunto de métricas que se exponen juntas."""
+
+    def __init__(self):
+        self._metricas: dict[str, Metrica] = {}
+
+    def registrar(self, metrica: Metrica) -> Metrica:
+        """Agrega una métrica (nombres únicos). Retorna la misma métrica"""
+        if metrica.nombre in self._metricas:
+            raise ValueError(f"Métrica duplicada: {metrica.nombre}")
+        self._metricas[metrica.nombre] = metrica
+        return metrica
+
+    def exponer(self) -> str:
+        """Retorna todas las métricas en formato de texto de Prometheus"""
+        lineas = []
+        for metrica in self._metricas.values():
+            lineas.extend(metrica.exponer())
+        return "\n".join(lineas) + "\n"
+
+
+registro_metricas = RegistroMetricas()
+
+reservas_creadas = registro_metricas.registrar(
+    Contador("viajes_reservas_creadas_total", "Reservas creadas", ("tipo",)))
+reservas_canceladas = registro_metricas.registrar(
+    Contador("viajes_reservas_canceladas_total", "Reservas canceladas", ("estado_anterior",)))
+reservas_completadas = registro_metricas.registrar(
+    Contador("viajes_reservas_completadas_total", "Reservas completadas por el proceso de viajes terminados", ("tipo",)))
+pagos_procesados = registro_metricas.registrar(
+    Contador("viajes_pagos_procesados_total", "Pagos procesados", ("metodo",)))
+intentos_login = registro_metricas.registrar(
+    Contador("viajes_login_intentos_total", "Intentos de inicio de sesión", ("resultado",)))
+duracion_bcrypt = registro_metricas.registrar(
+    Histograma("viajes_bcrypt_segundos", "Tiempo de hash y verificación de contraseñas con bcrypt", ("operacion",)))
+duracion_consultas = registro_metricas.registrar(
+    Histograma("viajes_db_consulta_segundos", "Latencia de las sentencias SQL por método DAO", ("metodo",)))
+errores_consultas = registro_metricas.registrar(
+    Contador("viajes_db_consulta_errores_total", "Sentencias SQL con error por método DAO", ("metodo",)))
+duracion_peticiones_api = registro_metricas.registrar(
+    Histograma("viajes_api_peticion_segundos", "Latencia de las peticiones HTTP de la API", ("metodo", "ruta", "estado")))
+caches = registro_metricas.registrar(
+    MedidorCaches("viajes_cache_consultas_total", "Consultas a las caches internas por resultado"))
+
+
+def _registrar_consulta(evento: EventoConsulta) -> None:
+    """Hook de instrumentación: latencia y errores de cada sentencia por método DAO"""
+    duracion_consultas.observar(evento.duracion_s, metodo=evento.llamador)
+    if evento.error is not None:
+        errores_consultas.inc(metodo=evento.llamador)
+
+
+def _registrar_caches_sql() -> None:
+    """Registra las caches de SQL existentes (la de SQLite solo si ese backend está cargado)"""
+    from src.config.instrumentacion import huella_sql
+    from src.config.cache_consultas import cache_resultados
+    caches.registrar("huella_sql", huella_sql.cache_info)
+    caches.registrar("resultados_sql", cache_resultados.cache_info)
+    try:
+        from src.config.backends.sqlite_backend import traducir_sql
+    except ImportError:
+        return
+    caches.registrar("traduccion_sqlite", traducir_sql.cache_info)
+
+
+registrar_hook(_registrar_consulta)
+_registrar_caches_sql()
+
+
+class _ManejadorMetricas(BaseHTTPRequestHandler):
+    """Responde GET /metrics con el registro global."""
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        cuerpo = registro_metricas.exponer().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", TIPO_CONTENIDO)
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, format, *args):
+        pass  # Sin log por petición: el menú usa la misma consola
+
+
+def iniciar_servidor_metricas(puerto: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Levanta el endpoint /metrics en un hilo daemon. Retorna el servidor (usar .shutdown() para detenerlo)"""
+    servidor = ThreadingHTTPServer((host, puerto), _ManejadorMetricas)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, name="servidor-metricas", daemon=True).start()
+    return servidor
+
+
+def iniciar_servidor_desde_entorno() -> ThreadingHTTPServer | None:
+    """Levanta el endpoint si METRICS_PORT está definido (en METRICS_HOST, por defecto 127.0.0.1). Retorna el servidor o None"""
+    puerto = os.getenv("METRICS_PORT")
+    if not puerto:
+        return None
+    return iniciar_servidor_metricas(int(puerto), os.getenv("METRICS_HOST", "127.0.0.1"))
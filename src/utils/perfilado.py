@@ -0,0 +1,95 @@
+"""Modo de perfilado de la sesión interactiva (python main.py --profile o VIAJES_PROFILE=1).
+
+Ejecuta la sesión bajo cProfile y, mediante el hook de instrumentación de consultas, acumula
+las sentencias SQL y su tiempo por acción de menú (la función de src/ui más interna de la pila:
+p. ej. menu_cliente.cancelar_reserva). Al salir escribe en el directorio de salida:
+
+    perfil_<fecha>.prof   Estadísticas de cProfile (pstats, snakeviz, gprof2dot)
+    perfil_<fecha>.txt    Tiempo de BD por acción y funciones del proyecto por tiempo acumulado y llamadas
+
+El tiempo acumulado de las funciones de menú incluye la espera de input(), que aparece como
+entrada propia en el reporte.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from datetime import datetime
+
+from src.config.instrumentacion import EventoConsulta, quitar_hook, registrar_hook
+
+SIN_ACCION = "(fuera de los menús)"
+FILTRO_PROYECTO = r"src[\\/]"  # pstats filtra por regex sobre "archivo:línea(función)"
+
+
+def accion_de_menu(profundidad_inicial: int = 2) -> str:
+    """Función de src/ui más interna de la pila actual. Retorna 'modulo.funcion' o SIN_ACCION"""
+    frame = sys._getframe(profundidad_inicial)
+    while frame is not None:
+        modulo = frame.f_globals.get("__name__", "")
+        if modulo.startswith("src.ui."):
+            return f"{modulo.rsplit('.', 1)[-1]}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return SIN_ACCION
+
+
+class SesionPerfilada:
+    """Perfil de cProfile más tiempo de base de datos por acción de menú."""
+
+    def __init__(self, directorio_salida: str = "logs", top: int = 40):
+        self.directorio_salida = directorio_salida
+        self.top = top
+        self.perfil = cProfile.Profile()
+        self.db_por_accion: dict[str, dict] = {}
+        self._bloqueo = threading.Lock()
+        self._inicio = 0.0
+
+    def _registrar_consulta(self, evento: EventoConsulta) -> None:
+        """Hook de instrumentación: suma la consulta a la acción de menú en curso"""
+        accion = accion_de_menu()
+        with self._bloqueo:
+            datos = self.db_por_accion.setdefault(accion, {'consultas': 0, 'tiempo_s': 0.0, 'filas': 0})
+            datos['consultas'] += 1
+            datos['tiempo_s'] += evento.duracion_s
+            datos['filas'] += evento.filas
+
+    def __enter__(self):
+        self._inicio = time.perf_counter()
+        registrar_hook(self._registrar_consulta)
+        self.perfil.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.perfil.disable()
+        quitar_hook(self._registrar_consulta)
+        self.duracion_s = time.perf_counter() - self._inicio
+        return False
+
+    def reporte(self) -> str:
+        """Arma el reporte de texto de la sesión. Retorna string"""
+        salida = io.StringIO()
+        salida.write(f"=== Perfil de sesión ({self.duracion_s:.1f} s) ===\n\n")
+        salida.write("Tiempo de base de datos por acción de menú\n")
+        salida.write(f"{'Acción':<50} {'Consultas':>10} {'Filas':>10} {'Tiempo BD (ms)':>15}\n")
+        for accion, datos in sorted(self.db_por_accion.items(), key=lambda a: a[1]['tiempo_s'], reverse=True):
+            salida.write(f"{accion:<50} {datos['consultas']:>10} {datos['filas']:>10} {datos['tiempo_s'] * 1000:>15.1f}\n")
+
+        estadisticas = pstats.Stats(self.perfil, stream=salida)
+        salida.write(f"\nFunciones del proyecto por tiempo acumulado (top {self.top})\n")
+        estadisticas.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(FILTRO_PROYECTO, self.top)
+        salida.write(f"\nFunciones del proyecto por cantidad de llamadas (top {self.top})\n")
+        estadisticas.sort_stats(pstats.SortKey.CALLS).print_stats(FILTRO_PROYECTO, self.top)
+        return salida.getvalue()
+
+    def guardar(self) -> str:
+        """Escribe el .prof y el reporte de texto. Retorna ruta del reporte"""
+        os.makedirs(self.directorio_salida, exist_ok=True)
+        base = os.path.join(self.directorio_salida, f"perfil_{datetime.now():%Y%m%d_%H%M%S}")
+        self.perfil.dump_stats(f"{base}.prof")
+        with open(f"{base}.txt", "w", encoding="utf-8") as archivo:
+            archivo.write(self.reporte())
+        return f"{base}.txt"
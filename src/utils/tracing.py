@@ -0,0 +1,184 @@
+"""Trazas livianas de las capas UI → servicio → DAO → SQL.
+
+Cada llamada decorada abre un span sobre una pila local al contexto (contextvars, por lo que
+cada hilo tiene la suya). El primer span de la pila es la raíz de la traza: ahí se decide el
+muestreo y, al cerrarse, se escriben todos sus spans. Cada span registra su duración, las
+consultas SQL ejecutadas dentro de él (inclusivas) y su tiempo de base de datos; cada consulta
+aparece además como span hijo de categoría "sql".
+
+Las trazas se escriben en JSONL, un evento por línea en el formato de Chrome Trace Event
+("ph": "X"). Para abrirlas en chrome://tracing, Perfetto o speedscope:
+
+    python -m src.cli trazas convertir logs/trazas.jsonl trazas.json
+
+Variables de entorno:
+    TRACE_MUESTREO   Fracción de trazas raíz que se registran, entre 0 y 1 (por defecto 0: desactivado)
+    TRACE_ARCHIVO    Archivo JSONL de salida (por defecto logs/trazas.jsonl)
+"""
+
+import functools
+import itertools
+import json
+import os
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from src.config.instrumentacion import EventoConsulta, huella_sql, registrar_hook
+
+
+class Span:
+    """Tramo de ejecución con nombre, categoría, tiempos y consultas SQL acumuladas."""
+    __slots__ = ("nombre", "categoria", "padre", "traza", "inicio_ns", "consultas", "tiempo_db_s", "atributos")
+
+    def __init__(self, nombre: str, categoria: str, padre: "Span | None", traza: "Traza", atributos: dict):
+        self.nombre = nombre
+        self.categoria = categoria
+        self.padre = padre
+        self.traza = traza
+        self.inicio_ns = time.perf_counter_ns()
+        self.consultas = 0
+        self.tiempo_db_s = 0.0
+        self.atributos = atributos
+
+
+class Traza:
+    """Eventos de una traza raíz, acumulados hasta que la raíz termina."""
+    __slots__ = ("id", "eventos")
+
+    def __init__(self, id: int):
+        self.id = id
+        self.eventos: list[dict] = []
+
+
+# Marca de "traza no muestreada": los spans hijos se saltan sin costo
+_NO_MUESTREADA = object()
+_span_actual: ContextVar = ContextVar("span_actual", default=None)
+_ids_traza = itertools.count(1)
+_bloqueo_archivo = threading.Lock()
+_configuracion = {
+    'tasa': float(os.getenv("TRACE_MUESTREO", "0")),
+    'archivo': os.getenv("TRACE_ARCHIVO", os.path.join("logs", "trazas.jsonl")),
+}
+
+
+def configurar(tasa: float | None = None, archivo: str | None = None) -> None:
+    """Cambia la tasa de muestreo y/o el archivo de salida en tiempo de ejecución"""
+    if tasa is not None:
+        if not 0 <= tasa <= 1:
+            raise ValueError("La tasa de muestreo debe estar entre 0 y 1")
+        _configuracion['tasa'] = tasa
+    if archivo is not None:
+        _configuracion['archivo'] = archivo
+
+
+def _a_evento(span: Span, fin_ns: int) -> dict:
+    """Convierte un span cerrado al formato Chrome Trace Event. Retorna dict"""
+    return {
+        'name': span.nombre, 'cat': span.categoria, 'ph': 'X',
+        'ts': span.inicio_ns // 1000, 'dur': (fin_ns - span.inicio_ns) // 1000,
+        'pid': os.getpid(), 'tid': threading.get_native_id(),
+        'args': {'traza_id': span.traza.id, 'consultas': span.consultas,
+                 'tiempo_db_ms': round(span.tiempo_db_s * 1000, 3), **span.atributos},
+    }
+
+
+def _escribir(traza: Traza) -> None:
+    """Agrega los eventos de una traza terminada al archivo JSONL"""
+    ruta = _configuracion['archivo']
+    os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+    lineas = "".join(json.dumps(e, ensure_ascii=False, default=str) + "\n" for e in traza.eventos)
+    with _bloqueo_archivo, open(ruta, "a", encoding="utf-8") as archivo:
+        archivo.write(lineas)
+
+
+@contextmanager
+def span(nombre: str, categoria: str = "app", **atributos):
+    """Abre un span hijo del actual (o una traza raíz, sujeta a muestreo). Retorna el Span o None si no se registra"""
+    padre = _span_actual.get()
+    if padre is _NO_MUESTREADA or (padre is None and random.random() >= _configuracion['tasa']):
+        if padre is None:  # Raíz descartada: los hijos no deben volver a sortear
+            token = _span_actual.set(_NO_MUESTREADA)
+            try:
+                yield None
+            finally:
+                _span_actual.reset(token)
+        else:
+            yield None
+        return
+    traza = padre.traza if padre else Traza(next(_ids_traza))
+    actual = Span(nombre, categoria, padre, traza, atributos)
+    token = _span_actual.set(actual)
+    try:
+        yield actual
+    except BaseException as e:
+        actual.atributos['error'] = type(e).__name__
+        raise
+    finally:
+        _span_actual.reset(token)
+        traza.eventos.append(_a_evento(actual, time.perf_counter_ns()))
+        if padre is None:
+            _escribir(traza)
+
+
+def trazar(nombre: str | None = None, categoria: str = "app"):
+    """Decorador que ejecuta la función dentro de un span (por defecto con su __qualname__)"""
+    def decorador(funcion):
+        nombre_span = nombre or funcion.__qualname__
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if _span_actual.get() is None and not _configuracion['tasa']:
+                return funcion(*args, **kwargs)  # Trazas desactivadas: sin costo extra
+            atributos = {}
+            if _span_actual.get() is None:  # Raíz: se anota la función de la UI que originó la acción
+                origen = sys._getframe(1)
+                atributos['origen'] = f"{origen.f_globals.get('__name__')}.{origen.f_code.co_name}"
+            with span(nombre_span, categoria, **atributos):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+def trazar_metodos(categoria: str):
+    """Decorador de clase: traza todos los métodos públicos (los de servicios y DAOs)"""
+    def decorador(clase):
+        for nombre, atributo in list(vars(clase).items()):
+            if not nombre.startswith("_") and callable(atributo):
+                setattr(clase, nombre, trazar(f"{clase.__name__}.{nombre}", categoria)(atributo))
+        return clase
+    return decorador
+
+
+def _registrar_consulta(evento: EventoConsulta) -> None:
+    """Hook de instrumentación: suma la consulta a los spans abiertos y la agrega como span hijo"""
+    actual = _span_actual.get()
+    if actual is None or actual is _NO_MUESTREADA:
+        return
+    fin_ns = time.perf_counter_ns()
+    consulta = Span(huella_sql(evento.sql)[:120], "sql", actual, actual.traza, {'filas': evento.filas})
+    consulta.inicio_ns = fin_ns - int(evento.duracion_s * 1e9)
+    consulta.consultas, consulta.tiempo_db_s = 1, evento.duracion_s
+    if evento.error is not None:
+        consulta.atributos['error'] = type(evento.error).__name__
+    actual.traza.eventos.append(_a_evento(consulta, fin_ns))
+    span_abierto = actual
+    while span_abierto is not None:
+        span_abierto.consultas += 1
+        span_abierto.tiempo_db_s += evento.duracion_s
+        span_abierto = span_abierto.padre
+
+
+registrar_hook(_registrar_consulta)
+
+
+def convertir_a_chrome(origen: str, destino: str) -> int:
+    """Convierte un JSONL de trazas al JSON {"traceEvents": [...]} de los visores. Retorna cantidad de eventos"""
+    with open(origen, encoding="utf-8") as archivo:
+        eventos = [json.loads(linea) for linea in archivo if linea.strip()]
+    with open(destino, "w", encoding="utf-8") as archivo:
+        json.dump({'traceEvents': eventos, 'displayTimeUnit': 'ms'}, archivo, ensure_ascii=False)
+    return len(eventos)
@@ -2,6 +2,10 @@ import math
 import os
 import re
 
+from src.utils.constants import POR_PAGINA_DEFECTO, POR_PAGINA_MAXIMO
+from src.utils.exceptions import ValidacionError
+from src.utils.tracing import trazar
+
 
 class OperacionCancelada(Exception):
     """Excepción lanzada cuando el usuario cancela una operación. Retorna Exception"""
@@ -73,6 +77,26 @@ def calcular_precio_con_iva(precio_base: int | float, iva: float = 0.19) -> int:
     return math.ceil(precio_base * (1 + iva))
 
 
+def calcular_paginacion(pagina: int = 1, por_pagina: int = POR_PAGINA_DEFECTO) -> tuple[int, int]:
+    """Valida la página pedida (desde 1). Retorna tupla (limite, desplazamiento) para LIMIT/OFFSET"""
+    if pagina < 1:
+        raise ValidacionError("La página debe ser mayor o igual a 1")
+    if not 1 <= por_pagina <= POR_PAGINA_MAXIMO:
+        raise ValidacionError(f"Los elementos por página deben estar entre 1 y {POR_PAGINA_MAXIMO}")
+    return por_pagina, (pagina - 1) * por_pagina
+
+
+def resultado_paginado(elementos: list, total: int, pagina: int, por_pagina: int) -> dict:
+    """Empaqueta una página de resultados. Retorna dict con elementos, pagina, por_pagina, total y paginas"""
+    return {
+        'elementos': elementos,
+        'pagina': pagina,
+        'por_pagina': por_pagina,
+        'total': total,
+        'paginas': math.ceil(total / por_pagina) if total else 0,
+    }
+
+
 def formatear_precio(precio: int | float, con_iva: bool = False) -> str:
     """Formatea un precio en formato chileno con símbolo $. Retorna String formateado como "$1.234.567"""
     if con_iva:
@@ -127,6 +151,7 @@ def pausar():
     """Espera input del usuario antes de continuar. Retorna None"""
     input("Presione Enter para continuar...")
 
+@trazar(categoria="ui")
 def mostrar_tabla_paquetes(paquetes: list, con_iva: bool = False) -> None:
     """Muestra lista de paquetes en formato tabla.  Retorna None si no hay paquetes."""
     from src.business.paquete_service import PaqueteService
@@ -188,6 +213,7 @@ def mostrar_tabla_paquetes(paquetes: list, con_iva: bool = False) -> None:
     print("="*145 + "\n")
 
 
+@trazar(categoria="ui")
 def mostrar_tabla_destinos(destinos: list, con_iva: bool = False) -> None:
     """Muestra lista de destinos en formato tabla con politica de cancelacion. Retorna None si no hay destinos."""
     if not destinos:
@@ -220,6 +246,7 @@ def mostrar_tabla_destinos(destinos: list, con_iva: bool = False) -> None:
         print("* Precios incluyen IVA (19%)")
     print("="*85 + "\n")
 
+@trazar(categoria="ui")
 def mostrar_tabla_actividades(actividades: list, con_iva: bool = False) -> None:
     """Muestra lista de actividades en formato tabla. Retorna None si no hay actividades."""
     if not actividades:
@@ -256,6 +283,7 @@ def mostrar_tabla_actividades(actividades: list, con_iva: bool = False) -> None:
         print("* Precios incluyen IVA (19%)")
     print("="*130 + "\n")
 
+@trazar(categoria="ui")
 def mostrar_tabla_reservas(reservas: list, mostrar_cliente: bool = True) -> None:
     """Muestra lista de reservas en formato tabla. Retorna None si no hay reservas."""
     from src.dao.destino_dao import DestinoDAO
@@ -317,49 +345,24 @@ def mostrar_tabla_reservas(reservas: list, mostrar_cliente: bool = True) -> None
     
     print("="*ancho_total + "\n")
 
-def mostrar_tabla_pagos(pagos: list) -> None:
-    """Muestra lista de pagos en formato tabla. Retorna None si no hay pagos."""
-    from src.dao.destino_dao import DestinoDAO
-    from src.dao.paquete_dao import PaqueteDAO
-    from src.dao.reserva_dao import ReservaDAO
-    
+@trazar(categoria="ui")
+def mostrar_tabla_pagos(pagos: list[dict]) -> None:
+    """Muestra en formato tabla los pagos de PagoService.historial_cliente (ya traen tipo y nombre de lo reservado). Retorna None si no hay pagos."""
     if not pagos:
         print("No hay pagos para mostrar.")
         return
     
-    reserva_dao = ReservaDAO()
-    paquete_dao = PaqueteDAO()
-    destino_dao = DestinoDAO()
-    
     # Encabezado
     print("\n" + "="*120)
     print(f"{'ID':<5} {'RES.ID':<8} {'TIPO':<10} {'NOMBRE':<25} {'MONTO':<15} {'MÉTODO':<15} {'ESTADO':<12} {'FECHA':<18}")
     print("="*120)
     
     for p in pagos:
-        monto = f"${int(p.monto):,}".replace(",", ".")
-        fecha = str(p.fecha_pago)[:16] if p.fecha_pago else "N/A"
-        
-        # Obtener información de la reserva
-        reserva = reserva_dao.obtener_por_id(p.reserva_id)
-        if reserva:
-            if reserva.paquete_id:
-                paquete = paquete_dao.obtener_por_id(reserva.paquete_id)
-                reserva_tipo = "Paquete"
-                reserva_nombre = paquete.nombre if paquete else 'N/A'
-            elif reserva.destino_id:
-                destino = destino_dao.obtener_por_id(reserva.destino_id)
-                reserva_tipo = "Destino"
-                reserva_nombre = destino.nombre if destino else 'N/A'
-            else:
-                reserva_tipo = "N/A"
-                reserva_nombre = "N/A"
-        else:
-            reserva_tipo = "N/A"
-            reserva_nombre = "N/A"
-        
+        monto = f"${int(p['monto']):,}".replace(",", ".")
+        fecha = str(p['fecha_pago'])[:16] if p['fecha_pago'] else "N/A"
+        reserva_nombre = p['nombre'] or "N/A"
         reserva_nombre = (reserva_nombre[:22] + "...") if len(reserva_nombre) > 25 else reserva_nombre
-        print(f"{p.id:<5} {p.reserva_id:<8} {reserva_tipo:<10} {reserva_nombre:<25} {monto:<15} {p.metodo:<15} {p.estado:<12} {fecha:<18}")
+        print(f"{p['id']:<5} {p['reserva_id']:<8} {p['tipo']:<10} {reserva_nombre:<25} {monto:<15} {p['metodo']:<15} {p['estado']:<12} {fecha:<18}")
     
     print("="*120 + "\n")
 
@@ -1,7 +1,23 @@
+import json
+import os
+import sqlite3
+import tempfile
 import unittest
+from datetime import datetime
 from unittest.mock import MagicMock, patch
 from unittest.mock import MagicMock, patch
 from src.business.auth_service import AuthService
+from src.business.catalogo_service import CatalogoService
+from src.business.paquete_service import PaqueteService
+from src.config.db_connection import (
+    cerrar_conexion,
+    ejecutar_consulta,
+    ejecutar_consulta_uno,
+    ejecutar_lote,
+    ids_generados,
+)
+from src.dao import CatalogoDAO, DestinoDAO, ReservaDAO
+from src.dto import ReservaDTO, a_dict, crear_mapeador
 from src.utils.exceptions import ValidacionError
 from src.utils.validators import validar_rut
 
@@ -53,6 +69,570 @@ class TestAuthManager(unittest.TestCase):
         self.assertFalse(validar_rut("invalid"))
         self.assertFalse(validar_rut(""))
 
+class TestCatalogoService(unittest.TestCase):
+    def test_importar_reporta_diferencias(self):
+        dao = MagicMock()
+        dao.listar_destinos.return_value = [
+            {'id': 1, 'nombre': 'Paris', 'descripcion': 'Luz', 'costo_base': 100, 'cupos_disponibles': 5, 'politica_id': 1, 'activo': 1}
+        ]
+        dao.listar_actividades.return_value = []
+        dao.listar_paquetes.return_value = [
+            {'id': 1, 'nombre': 'Europa', 'descripcion': None, 'fecha_inicio': datetime(2030, 1, 1),
+             'fecha_fin': datetime(2030, 1, 5), 'precio_total': 500, 'cupos_disponibles': 3, 'politica_id': 1, 'activo': 1}
+        ]
+        dao.listar_paquete_destinos.return_value = [
+            {'paquete_id': 1, 'destino_id': 1, 'orden_visita': 1},
+            {'paquete_id': 1, 'destino_id': 3, 'orden_visita': 2},
+        ]
+        dao.listar_paquete_actividades.return_value = []
+
+        catalogo = {
+            'destinos': [
+                {'id': 1, 'nombre': 'París', 'descripcion': 'Luz', 'costo_base': 100, 'cupos_disponibles': 5, 'politica_id': 1},
+                {'id': 2, 'nombre': 'Roma', 'descripcion': 'Coliseo', 'costo_base': 90, 'cupos_disponibles': 5, 'politica_id': 1},
+            ],
+            'paquetes': [
+                {'id': 1, 'nombre': 'Europa', 'descripcion': None, 'fecha_inicio': '2030-01-01 00:00:00',
+                 'fecha_fin': '2030-01-05', 'precio_total': 500, 'cupos_disponibles': 3, 'politica_id': 1, 'destinos': [2, 1]}
+            ],
+        }
+        ruta = os.path.join(tempfile.mkdtemp(), 'catalogo.json')
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            json.dump(catalogo, archivo)
+
+        with patch('src.business.catalogo_service.transaccion'):
+            resumen = CatalogoService(dao).importar(ruta)
+
+        self.assertEqual(resumen['destinos']['creados'], [2])
+        self.assertEqual(resumen['destinos']['actualizados'], [1])
+        self.assertEqual(resumen['paquetes']['sin_cambios'], 1)
+        self.assertEqual(resumen['paquete_destino']['eliminadas'], 1)
+        dao.upsert_paquete_destinos.assert_called_once_with([(1, 2, 1), (1, 1, 2)])
+        dao.eliminar_paquete_destinos.assert_called_once_with([(1, 3)])
+
+class TestBackendSQLite(unittest.TestCase):
+    """Ejecuta el SQL real de los DAOs sobre SQLite en memoria (esquema de init_db.sql)."""
+
+    def setUp(self):
+        entorno = patch.dict(os.environ, {'DB_BACKEND': 'sqlite', 'DB_SQLITE_RUTA': ':memory:'})
+        entorno.start()
+        self.addCleanup(entorno.stop)
+        self.addCleanup(cerrar_conexion)  # Al cerrar la última conexión la base en memoria se descarta
+
+    def test_lote_por_bloques_con_rangos_de_ids(self):
+        filas = [(f"Destino {i}", "Descripción", 1000, 10, 1) for i in range(5)]
+        sql = "INSERT INTO Destinos (nombre, descripcion, costo_base, cupos_disponibles, politica_id) VALUES (%s, %s, %s, %s, %s)"
+        resultado = ejecutar_lote(sql, filas, chunk_size=2)
+
+        self.assertEqual(resultado['filas_afectadas'], 5)
+        self.assertEqual(resultado['rangos_ids'], [(5, 6), (7, 8), (9, 9)])  # init_db.sql ya trae 4 destinos
+        self.assertEqual(ids_generados(resultado), [5, 6, 7, 8, 9])
+
+    def test_dao_y_upsert_sobre_sqlite(self):
+        reserva = ReservaDAO().obtener_por_id(1)
+        self.assertEqual(reserva.estado, 'CONFIRMADA')
+        self.assertIsInstance(reserva.fecha_reserva, datetime)
+
+        CatalogoDAO().upsert_destinos([{'id': 1, 'nombre': 'París', 'descripcion': 'Luz', 'costo_base': 900000,
+                                        'cupos_disponibles': 40, 'politica_id': 1, 'activo': 1}])
+        self.assertEqual(DestinoDAO().obtener_por_id(1).nombre, 'París')
+
+        with self.assertRaises(sqlite3.IntegrityError):  # ENUM traducido a CHECK
+            ReservaDAO().cambiar_estado(1, 'INVENTADO')
+
+    def test_busqueda_catalogo_sin_tildes_e_incremental(self):
+        from src.business.busqueda_service import BusquedaService
+        from src.business.destino_service import DestinoService
+        busqueda = BusquedaService()
+        busqueda.invalidar()  # El índice es del proceso; cada test tiene su propia base en memoria
+        self.assertEqual(busqueda.buscar('PARÍS')[0], {'tipo': 'destino', 'id': 1, 'nombre': 'Paris', 'puntaje': 2.5})
+        self.assertEqual([r['nombre'] for r in busqueda.buscar('aventura asia')], ['Aventura Asiatica'])
+        self.assertEqual(busqueda.buscar('pariss', tipos=('destino',))[0]['id'], 1)  # Error de tipeo
+
+        servicio = DestinoService()
+        nuevo = servicio.crear_destino('Reikiavik', 'Islandia', 'Auroras boreales y géiseres', 900000)
+        self.assertEqual([d.id for d in servicio.buscar_destinos_por_nombre('GEISER')], [nuevo.id])
+        servicio.eliminar_destino(nuevo.id)
+        self.assertEqual(servicio.buscar_destinos_por_nombre('geiser'), [])
+
+    def test_busqueda_paquetes_por_filtros_con_facetas(self):
+        servicio = PaqueteService()
+        resultado = servicio.buscar_paquetes(fecha_desde='2025-06-01', fecha_hasta='2025-08-31', destino_id=2)
+        self.assertEqual([p.id for p in resultado['elementos']], [2, 1])  # Más barato primero
+        facetas = resultado['facetas']
+        # Cada faceta ignora su propio filtro: Aventura Asiatica (Tokio) cuenta en destinos pero no en políticas
+        self.assertEqual({f['nombre']: f['cantidad'] for f in facetas['destinos']}, {'Paris': 1, 'Roma': 2, 'Barcelona': 2, 'Tokio': 1})
+        self.assertEqual([(f['nombre'], f['cantidad']) for f in facetas['politicas']], [('Flexible', 1), ('Estricta', 1)])
+        self.assertEqual([f['cantidad'] for f in facetas['precios']], [0, 0, 1, 1, 0])
+
+        con_iva = servicio.buscar_paquetes(precio_max=2300000, con_iva=True, orden='fecha')
+        self.assertEqual([p.id for p in con_iva['elementos']], [4, 2, 5])  # 1.890.000 + IVA = 2.249.100
+        self.assertEqual(servicio.buscar_paquetes(cupos_minimos=26)['total'], 1)
+        with self.assertRaises(ValidacionError):
+            servicio.buscar_paquetes(fecha_desde='01-06-2025')
+
+    def test_indice_disponibilidad_por_fechas_y_cupos(self):
+        from src.business.reserva_service import ReservaService
+        servicio = PaqueteService()
+        servicio.disponibilidad.invalidar()  # Índice compartido por el proceso
+        self.assertEqual([p.id for p in servicio.listar_paquetes_en_fechas('2025-06-10', '2025-07-10')], [1, 2])
+        self.assertEqual([p.id for p in servicio.listar_paquetes_en_fechas('2025-06-10', '2025-07-10', 16)], [1])
+
+        ReservaService().crear_reserva_paquete(1, 1, 5)  # Quedan 15 cupos
+        self.assertEqual(servicio.listar_paquetes_en_fechas('2025-06-10', '2025-07-10', 16), [])
+
+        nuevo = servicio.crear_paquete('Nieve en Bariloche', 'Ski y chocolate', datetime(2027, 7, 1), datetime(2027, 7, 20), 900000, 10, 1)
+        self.assertEqual([p.id for p in servicio.listar_paquetes_en_fechas('2027-07-19', '2027-08-01')], [nuevo.id])
+        servicio.eliminar_paquete(nuevo.id)
+        self.assertEqual(servicio.listar_paquetes_en_fechas('2027-07-19', '2027-08-01'), [])
+
+    def test_ocupacion_incremental_igual_a_recalculada(self):
+        from src.business.ocupacion_service import OcupacionService
+        from src.business.pago_service import PagoService
+        from src.business.reserva_service import ReservaService
+        ocupacion = OcupacionService()
+        ocupacion.invalidar()  # Caché compartida por el proceso
+        europa = next(f for f in ocupacion.reporte_ocupacion('paquete') if f['id'] == 1)
+        self.assertEqual((europa['ocupados'], europa['capacidad'], europa['factor_carga']), (2, 22, 0.0909))
+
+        reservas = ReservaService()
+        PagoService().procesar_pago(reservas.crear_reserva_paquete(1, 1, 3), 'TARJETA')
+        reservas.crear_reserva_destino(1, 2, 4)
+        reservas.expirar_reservas_pendientes(horas=0)  # Cancela las PENDIENTE y devuelve sus cupos
+        incremental = ocupacion.reporte_ocupacion()
+
+        ocupacion.invalidar()
+        self.assertEqual(incremental, ocupacion.reporte_ocupacion())
+        europa = next(f for f in incremental if f['tipo'] == 'paquete' and f['id'] == 1)
+        self.assertEqual((europa['ocupados'], europa['capacidad'], europa['por_estado']['PAGADA']), (5, 22, 3))
+
+    def test_reporte_clientes_agrupado_y_paginado(self):
+        from src.business.usuario_service import UsuarioService
+        servicio = UsuarioService()
+        primera = servicio.reporte_clientes('gasto', pagina=1, por_pagina=2)
+        self.assertEqual((primera['total'], primera['paginas']), (3, 2))  # Solo rol CLIENTE
+        self.assertEqual([(c['nombre'], c['gasto']) for c in primera['elementos']], [('Juan Perez', 5670000), ('Maria Gonzalez', 4900000)])
+        juan = primera['elementos'][0]
+        self.assertEqual((juan['reservas'], juan['canceladas'], juan['tasa_cancelacion']), (2, 1, 0.5))
+        self.assertIsInstance(juan['ultima_actividad'], datetime)
+
+        segunda = servicio.reporte_clientes('gasto', pagina=2, por_pagina=2)
+        self.assertEqual([c['nombre'] for c in segunda['elementos']], ['Ana Martinez'])
+        self.assertEqual(sum(c['gasto'] for c in primera['elementos'] + segunda['elementos']), 12530000)
+        with self.assertRaises(ValidacionError):
+            servicio.reporte_clientes('email')
+
+    def test_historial_pagos_cliente_en_una_consulta(self):
+        from src.business.pago_service import PagoService
+        from src.config.instrumentacion import RegistroConsultas, quitar_hook, registrar_hook
+        registro = RegistroConsultas()
+        registrar_hook(registro)
+        try:
+            pagos = PagoService().historial_cliente(3)
+        finally:
+            quitar_hook(registro)
+        self.assertEqual(sum(f['ejecuciones'] for f in registro.estadisticas()), 1)
+        self.assertEqual([(p['id'], p['reserva_id'], p['tipo'], p['nombre']) for p in pagos],
+                         [(3, 3, 'Paquete', 'Tour Mediterraneo'), (2, 3, 'Paquete', 'Tour Mediterraneo')])  # Más reciente primero
+        self.assertEqual(PagoService().historial_cliente(1), [])
+
+    def test_cache_resultados_invalida_por_tabla(self):
+        from src.config.cache_consultas import cache_resultados
+        from src.config.db_connection import ejecutar_actualizacion, ejecutar_insercion
+        from src.config.instrumentacion import RegistroConsultas, quitar_hook, registrar_hook
+        from src.dao import PaqueteDAO
+        dao = PaqueteDAO()
+        registro = RegistroConsultas()
+        registrar_hook(registro)
+        cache_resultados.activar()
+        try:
+            destinos = dao.listar_destinos_paquete(1)
+            destinos[0]['nombre'] = 'Modificado'  # El llamador recibe una copia
+            self.assertEqual(dao.listar_destinos_paquete(1)[0]['nombre'], 'Paris')
+            self.assertEqual(sum(f['ejecuciones'] for f in registro.estadisticas()), 1)
+
+            ejecutar_insercion("INSERT INTO Pagos (reserva_id, monto, metodo, estado) VALUES (%s, %s, %s, %s)",
+                               (1, 1000, 'TARJETA', 'PENDIENTE'))  # Otra tabla: la entrada sigue vigente
+            dao.listar_destinos_paquete(1)
+            ejecutar_actualizacion("UPDATE Destinos SET nombre=%s WHERE id=%s", ('París', 1))
+            self.assertEqual(dao.listar_destinos_paquete(1)[0]['nombre'], 'París')
+        finally:
+            cache_resultados.desactivar()
+            quitar_hook(registro)
+        lecturas = [f['ejecuciones'] for f in registro.estadisticas() if f['huella'].startswith('SELECT')]
+        self.assertEqual(lecturas, [2])
+
+    def test_reconexion_y_reintento_ante_errores_transitorios(self):
+        from src.config.db_connection import ejecutar_insercion, obtener_backend_activo, obtener_conexion
+        from src.utils import DB_ESPERA_REINTENTO_S
+        backend = obtener_backend_activo()
+        conexion = obtener_conexion()
+        with patch.object(backend, 'verificar', return_value=False), patch('src.config.db_connection.DB_SEGUNDOS_PING', -1):
+            self.assertIsNot(obtener_conexion(), conexion)  # Ping fallido al tomarla: se abre otra
+
+        traducir, fallos = backend.traducir, []
+
+        def traducir_con_fallo(query):
+            if fallos:
+                raise fallos.pop()
+            return traducir(query)
+
+        with patch.object(backend, 'traducir', side_effect=traducir_con_fallo), \
+                patch.object(backend, 'es_conexion_perdida', return_value=True), \
+                patch.object(backend, 'es_reintentable', side_effect=lambda error, idempotente: idempotente), \
+                patch('src.config.db_connection.time.sleep') as espera:
+            conexion = obtener_conexion()
+            fallos.append(sqlite3.OperationalError("server has gone away"))
+            self.assertEqual(ejecutar_consulta_uno("SELECT COUNT(*) AS total FROM Reservas")['total'], 6)
+            self.assertIsNot(obtener_conexion(), conexion)
+            self.assertEqual(espera.call_count, 1)
+            self.assertLessEqual(espera.call_args[0][0], DB_ESPERA_REINTENTO_S)
+
+            fallos.append(sqlite3.OperationalError("lost connection during query"))  # Escritura: no se reintenta
+            with self.assertRaises(sqlite3.OperationalError):
+                ejecutar_insercion("INSERT INTO Pagos (reserva_id, monto, metodo, estado) VALUES (%s, %s, %s, %s)",
+                                   (1, 1000, 'TARJETA', 'PENDIENTE'))
+            self.assertEqual(espera.call_count, 1)
+
+    def test_lecturas_a_replica_salvo_transaccion_o_escritura_propia(self):
+        from src.config.db_connection import ejecutar_actualizacion, lecturas_del_primario, transaccion
+        sql = "SELECT nombre FROM Destinos WHERE id = %s"
+        with tempfile.TemporaryDirectory() as carpeta:
+            entorno = patch.dict(os.environ, {'DB_REPLICA_SQLITE_RUTA': os.path.join(carpeta, 'replica.db')})
+            entorno.start()
+            cerrar_conexion()
+            try:
+                with patch('src.config.db_connection.DB_REPLICA_RETRASO_MAXIMO_S', 0):
+                    ejecutar_actualizacion("UPDATE Destinos SET nombre=%s WHERE id=%s", ('París', 1))  # Solo en el primario
+                    self.assertEqual(ejecutar_consulta_uno(sql, (1,))['nombre'], 'Paris')
+                    with lecturas_del_primario():
+                        self.assertEqual(ejecutar_consulta_uno(sql, (1,))['nombre'], 'París')
+                    with transaccion():
+                        self.assertEqual(ejecutar_consulta_uno(sql, (1,))['nombre'], 'París')
+                # Dentro de DB_REPLICA_RETRASO_MAXIMO_S tras su escritura el hilo lee del primario
+                self.assertEqual(ejecutar_consulta_uno(sql, (1,))['nombre'], 'París')
+            finally:
+                cerrar_conexion()
+                entorno.stop()
+
+    def test_validaciones_de_escritura_leen_del_primario(self):
+        from src.business.pago_service import PagoService
+        from src.business.reserva_service import ReservaService
+        from src.config.db_connection import lecturas_del_primario
+        with tempfile.TemporaryDirectory() as carpeta:
+            entorno = patch.dict(os.environ, {'DB_REPLICA_SQLITE_RUTA': os.path.join(carpeta, 'replica.db')})
+            entorno.start()
+            cerrar_conexion()
+            try:
+                # Sin ventana de lectura propia: la réplica (sin las escrituras del primario) quedaría atrasada
+                with patch('src.config.db_connection.DB_REPLICA_RETRASO_MAXIMO_S', 0):
+                    ReservaService().cancelar_reserva(3)
+                    with self.assertRaises(ValidacionError):
+                        ReservaService().cancelar_reserva(3)
+                    with lecturas_del_primario():
+                        cupos = ejecutar_consulta_uno("SELECT cupos_disponibles FROM Paquetes WHERE id = 2")
+                    self.assertEqual(cupos['cupos_disponibles'], 18)  # 15 + las 3 personas de la reserva, una sola vez
+                    PagoService().procesar_pago(1, 'TARJETA')
+                    with self.assertRaises(ValidacionError):
+                        PagoService().procesar_pago(1, 'TARJETA')
+            finally:
+                cerrar_conexion()
+                entorno.stop()
+
+    def test_dtos_compactos_con_mapeo_por_posicion(self):
+        reservas = ReservaDAO().listar_todas()
+        self.assertEqual([r.id for r in reservas], [1, 2, 3, 4, 5, 6])
+        self.assertFalse(hasattr(reservas[0], '__dict__'))
+        self.assertEqual(a_dict(reservas[1])['destino_id'], 1)
+        self.assertIsNone(reservas[1].paquete_id)
+
+        mapeador = crear_mapeador(ReservaDTO, ('estado', 'id'))
+        self.assertIs(mapeador, crear_mapeador(ReservaDTO, ('estado', 'id')))  # Generado una sola vez
+        parcial = mapeador(('PAGADA', 9))
+        self.assertEqual((parcial.id, parcial.estado, parcial.monto_total), (9, 'PAGADA', None))
+        with self.assertRaises(ValueError):
+            crear_mapeador(ReservaDTO, ('id', 'inexistente'))
+
+    def test_generador_zipf_respeta_fks(self):
+        from benchmarks.generador import ConfiguracionGenerador, GeneradorDatos, contar_reservas
+        configuracion = ConfiguracionGenerador(semilla=3, destinos=5, paquetes=20, fecha_referencia=datetime(2026, 1, 1))
+        generador = GeneradorDatos(configuracion)
+        generador.generar_usuarios(20)
+        generador.generar_catalogo()
+        generador.completar_reservas(1000)
+
+        self.assertEqual(contar_reservas(), 1000)
+        por_paquete = ejecutar_consulta("SELECT paquete_id, COUNT(*) AS total FROM Reservas WHERE paquete_id > 5 GROUP BY paquete_id ORDER BY total DESC")
+        promedio = sum(f['total'] for f in por_paquete) / len(por_paquete)
+        self.assertGreater(por_paquete[0]['total'], 3 * promedio)  # Popularidad Zipf
+        huerfanos = ejecutar_consulta_uno("SELECT COUNT(*) AS total FROM Pagos p LEFT JOIN Reservas r ON r.id = p.reserva_id WHERE r.id IS NULL")
+        self.assertEqual(huerfanos['total'], 0)
+
+    def test_instrumentacion_agrupa_por_huella_y_llamador(self):
+        from src.config.instrumentacion import LogConsultasLentas, huella_sql, registrar_hook, quitar_hook, registro_consultas
+        self.assertEqual(huella_sql("SELECT *  FROM Reservas\n WHERE id IN (%s, %s, 3) AND estado = 'PAGADA'"),
+                         "SELECT * FROM Reservas WHERE id IN (...) AND estado = ?")
+        registro_consultas.reiniciar()
+        dao = ReservaDAO()
+        for i in (1, 2, 3):
+            dao.obtener_por_id(i)
+        with tempfile.TemporaryDirectory() as directorio, patch.dict(os.environ, {'DB_LOG_CONSULTAS_LENTAS': os.path.join(directorio, 'lentas.log')}):
+            from src.config.instrumentacion import logger_consultas_lentas
+            lento = LogConsultasLentas(umbral_ms=0)
+            registrar_hook(lento)
+            try:
+                ejecutar_consulta_uno("SELECT nombre FROM Usuarios WHERE email = %s", ('secreto@correo.cl',))
+            finally:
+                quitar_hook(lento)
+                for manejador in list(logger_consultas_lentas.handlers):
+                    manejador.close()
+                    logger_consultas_lentas.removeHandler(manejador)
+            with open(os.path.join(directorio, 'lentas.log'), encoding='utf-8') as archivo:
+                log = archivo.read()
+        self.assertIn("<str>", log)
+        self.assertNotIn("secreto", log)
+
+        por_reserva = [e for e in registro_consultas.estadisticas() if e['llamadores'].get('ReservaDAO.obtener_por_id')]
+        self.assertEqual(len(por_reserva), 1)  # Las 3 lecturas comparten huella
+        self.assertEqual(por_reserva[0]['ejecuciones'], 3)
+        self.assertEqual(por_reserva[0]['filas_total'], 3)
+
+    def test_trazas_servicio_dao_sql(self):
+        from src.business.reserva_service import ReservaService
+        from src.utils import tracing
+        with tempfile.TemporaryDirectory() as directorio:
+            archivo = os.path.join(directorio, 'trazas.jsonl')
+            tracing.configurar(tasa=1, archivo=archivo)
+            self.addCleanup(tracing.configurar, tasa=0)
+            ReservaService().obtener_reserva(1)
+            with open(archivo, encoding='utf-8') as lineas:
+                eventos = {e['cat']: e for e in map(json.loads, lineas)}
+        self.assertEqual(eventos['dao']['name'], 'ReservaDAO.obtener_por_id')
+        self.assertEqual(eventos['servicio']['args']['consultas'], 1)  # Incluye la consulta del DAO hijo
+        self.assertEqual(eventos['sql']['args']['traza_id'], eventos['servicio']['args']['traza_id'])
+        self.assertGreaterEqual(eventos['servicio']['dur'], eventos['dao']['dur'])
+
+    def test_servicios_async_en_paralelo(self):
+        import asyncio
+        from src.business.servicios_async import CatalogoServiceAsync, PagoServiceAsync, ReservaServiceAsync
+        from src.config.db_async import cerrar_pool_async
+        self.addCleanup(cerrar_pool_async)  # Cada hilo del pool tiene su conexión a la base en memoria
+
+        async def escenario():
+            reservas = ReservaServiceAsync()
+            reserva_id = await reservas.crear_reserva_destino(2, 1, 1)
+            cancelacion = await reservas.cancelar_reserva(reserva_id)
+            detalles = await asyncio.gather(*(CatalogoServiceAsync().obtener_detalle_paquete(1) for _ in range(8)))
+            reporte = await PagoServiceAsync().generar_reporte_ventas('2000-01-01', '2030-12-31')
+            return reserva_id, cancelacion, detalles, reporte
+
+        reserva_id, cancelacion, detalles, reporte = asyncio.run(escenario())
+        self.assertEqual(reporte['por_metodo']['TARJETA'], 4900000)  # Mismo reporte que PagoService
+        self.assertEqual([p.id for p in reporte['pagos']], [1, 2, 3, 4])
+        self.assertTrue(cancelacion['cancelada'])
+        self.assertEqual(ReservaDAO().obtener_por_id(reserva_id).estado, 'CANCELADA')
+        self.assertTrue(all(d['paquete'].id == 1 and d['destinos'] for d in detalles))
+
+    def test_sesion_perfilada(self):
+        from src.utils.perfilado import SIN_ACCION, SesionPerfilada
+        with tempfile.TemporaryDirectory() as directorio:
+            with SesionPerfilada(directorio) as sesion:
+                ReservaDAO().obtener_por_id(1)
+            reporte = sesion.guardar()
+            self.assertTrue(os.path.exists(reporte.replace('.txt', '.prof')))
+        self.assertEqual(sesion.db_por_accion[SIN_ACCION]['consultas'], 1)
+        self.assertIn("reserva_dao.py", sesion.reporte())
+
+    def test_procesos_por_lotes_de_reservas(self):
+        from src.business.reserva_service import ReservaService
+        servicio = ReservaService()
+        simulacion = servicio.completar_reservas_finalizadas(datetime(2025, 6, 1), dry_run=True)
+        self.assertEqual(simulacion['por_tipo'], {'paquete': 1, 'destino': 0})  # Paquete 4 termina el 2025-05-18
+        self.assertEqual(ReservaDAO().obtener_por_id(5).estado, 'CONFIRMADA')
+
+        completadas = servicio.completar_reservas_finalizadas(tamano_lote=1)
+        self.assertEqual((completadas['completadas'], completadas['lotes']), (2, 2))
+        self.assertEqual(servicio.completar_reservas_finalizadas()['lotes'], 0)  # Idempotente
+        expiradas = servicio.expirar_reservas_pendientes(horas=0)
+        self.assertEqual([r['id'] for r in expiradas['reservas']], [2, 6])
+        self.assertEqual([r.estado for r in ReservaDAO().listar_todas()],
+                         ['COMPLETADA', 'CANCELADA', 'PAGADA', 'CANCELADA', 'COMPLETADA', 'CANCELADA'])
+
+    def test_expiracion_no_cancela_reservas_pagadas_tras_listarlas(self):
+        from src.business.reserva_service import ReservaService
+        reserva = ReservaDAO().obtener_por_id(6)
+        sql_cupos = ("SELECT cupos_disponibles FROM Paquetes WHERE id = %s" if reserva.paquete_id
+                     else "SELECT cupos_disponibles FROM Destinos WHERE id = %s")
+        origen_id = reserva.paquete_id or reserva.destino_id
+        cupos = ejecutar_consulta_uno(sql_cupos, (origen_id,))['cupos_disponibles']
+        listar = ReservaDAO.listar_lote_por_estado
+
+        def listar_y_pagar(dao, *args, **kwargs):
+            lote = listar(dao, *args, **kwargs)
+            ReservaDAO().marcar_como_pagada(6)  # Se paga entre el listado y el lote
+            return lote
+
+        with patch.object(ReservaDAO, 'listar_lote_por_estado', listar_y_pagar):
+            expiradas = ReservaService().expirar_reservas_pendientes(horas=0)
+        self.assertEqual([(r['id'], r['error'] is None) for r in expiradas['reservas']], [(2, True), (6, False)])
+        self.assertEqual((expiradas['procesadas'], expiradas['fallidas']), (1, 1))
+        self.assertEqual(ReservaDAO().obtener_por_id(6).estado, 'PAGADA')
+        self.assertEqual(ejecutar_consulta_uno(sql_cupos, (origen_id,))['cupos_disponibles'], cupos)  # Sin devolver cupos
+
+    def test_lote_revertido_no_toca_cache_ni_metricas(self):
+        from src.business.ocupacion_service import OcupacionService
+        from src.business.reserva_service import ReservaService
+        from src.utils.metricas import reservas_canceladas
+        servicio = ReservaService()
+        reserva_id = servicio.crear_reserva_paquete(2, 4, 2)  # Tras las PENDIENTE 2 y 6 (destinos) en el mismo lote
+        ocupacion = OcupacionService()
+        ocupacion.invalidar()
+        reporte = ocupacion.reporte_ocupacion()
+        metricas = reservas_canceladas.exponer()
+        with patch.object(servicio.paquete_dao, 'aumentar_cupo', side_effect=RuntimeError("falla")):
+            with self.assertRaises(RuntimeError):
+                servicio.expirar_reservas_pendientes(horas=0)
+        self.assertEqual([ReservaDAO().obtener_por_id(i).estado for i in (2, 6, reserva_id)], ['PENDIENTE'] * 3)
+        self.assertEqual(ocupacion.reporte_ocupacion(), reporte)
+        self.assertEqual(reservas_canceladas.exponer(), metricas)
+
+    def test_lotes_columnares_para_reportes(self):
+        from src.business.pago_service import PagoService
+        from src.business.reserva_service import ReservaService
+        reporte = PagoService().generar_reporte_ventas('2000-01-01', '2030-12-31')
+        self.assertEqual(reporte['total'], PagoService().pago_dao.obtener_total_por_periodo('2000-01-01', '2030-12-31'))
+        self.assertEqual(reporte['por_metodo']['TARJETA'], 4900000)
+        self.assertEqual([p.id for p in reporte['pagos']], [1, 2, 3, 4])  # Vistas PagoDTO armadas al iterar
+
+        servicio = ReservaService()
+        reservas = servicio.lote_reservas(tamano_lote=4)  # Dos tramos por clave
+        self.assertEqual(len(reservas), 6)
+        self.assertIsNone(reservas[1].paquete_id)
+        self.assertEqual(reservas[0].fecha_reserva, ReservaDAO().obtener_por_id(1).fecha_reserva)
+        estadisticas = servicio.estadisticas_reservas()
+        self.assertEqual(estadisticas['por_estado']['CONFIRMADA'], 2)
+        self.assertEqual(estadisticas['monto_por_estado']['PAGADA'], 5670000)
+
+        pronostico = servicio.pronosticar_reembolsos(datetime(2025, 1, 1))
+        self.assertEqual(pronostico['reservas'], 5)  # Sin la CANCELADA
+        self.assertEqual(pronostico['por_estado']['CONFIRMADA']['reembolso'], 6860000)
+
+    def test_archivado_historico(self):
+        from src.business.historico_service import HistoricoService
+        from src.dao import PagoDAO
+        ReservaDAO().completar(1)
+        estadisticas = HistoricoService().archivar(datetime(2026, 1, 1), tamano_lote=1, pausa_s=0)
+        self.assertEqual((estadisticas['reservas'], estadisticas['pagos']), (2, 1))  # Reservas 1 (con su pago) y 4
+
+        self.assertIsNone(ReservaDAO().obtener_por_id(1))
+        self.assertEqual(ReservaDAO().obtener_por_id(1, incluir_historico=True).estado, 'COMPLETADA')
+        self.assertEqual([r.id for r in ReservaDAO().listar_por_estado('CANCELADA', incluir_historico=True)], [4])
+        total_activo = PagoDAO().obtener_total_por_periodo('2025-01-01', '2025-12-31')
+        self.assertEqual(PagoDAO().obtener_total_por_periodo('2025-01-01', '2025-12-31', incluir_historico=True),
+                         total_activo + 4900000)
+
+    def test_api_http_paginada_y_gzip(self):
+        import gzip
+        import threading
+        import urllib.request
+        from urllib.error import HTTPError
+        from src.api import crear_servidor
+        servidor = crear_servidor(puerto=0, workers=2)
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        self.addCleanup(servidor.server_close)
+        self.addCleanup(servidor.shutdown)
+        base = f"http://127.0.0.1:{servidor.server_address[1]}"
+
+        def llamar(ruta, datos=None, token=None, cabeceras=None):
+            peticion = urllib.request.Request(base + ruta, json.dumps(datos).encode() if datos else None, cabeceras or {})
+            peticion.add_header('Content-Type', 'application/json')
+            if token:
+                peticion.add_header('Authorization', f'Bearer {token}')
+            with urllib.request.urlopen(peticion) as respuesta:
+                cuerpo = respuesta.read()
+                if respuesta.headers.get('Content-Encoding') == 'gzip':
+                    cuerpo = gzip.decompress(cuerpo)
+                return respuesta.headers, json.loads(cuerpo)
+
+        _, sesion = llamar('/api/auth/login', {'email': 'maria.gonzalez@email.com', 'password': 'Cliente123'})
+        self.assertNotIn('password_hash', sesion['usuario'])
+        _, reservas = llamar('/api/reservas?por_pagina=1', token=sesion['token'])
+        self.assertEqual(len(reservas['elementos']), min(1, reservas['total']))
+        self.assertTrue(all(r['usuario_id'] == sesion['usuario']['id'] for r in reservas['elementos']))
+
+        with self.assertRaises(HTTPError) as error:
+            llamar('/api/reportes/ventas?desde=2020-01-01&hasta=2030-01-01', token=sesion['token'])
+        self.assertEqual(error.exception.code, 403)
+
+        cabeceras, paquete = llamar('/api/paquetes/1', cabeceras={'Accept-Encoding': 'gzip'})
+        self.assertEqual(cabeceras['Content-Encoding'], 'gzip')
+        self.assertEqual(paquete['paquete']['id'], 1)
+
+        with self.assertRaises(HTTPError) as error:  # Las métricas solo se sirven en METRICS_PORT
+            llamar('/metrics')
+        self.assertEqual(error.exception.code, 404)
+
+        import http.client
+
+        def enviar_largo(ruta, largo):
+            conexion = http.client.HTTPConnection('127.0.0.1', servidor.server_address[1], timeout=5)
+            self.addCleanup(conexion.close)
+            conexion.putrequest('POST', ruta)
+            conexion.putheader('Content-Length', largo)
+            conexion.endheaders()
+            return conexion.getresponse().status
+
+        self.assertEqual(enviar_largo('/api/auth/login', '-1'), 400)
+        self.assertEqual(enviar_largo('/api/auth/login', 'abc'), 400)
+        self.assertEqual(enviar_largo('/api/reservas', '1000'), 401)  # Sin token no se espera el cuerpo
+
+class TestBenchmarks(unittest.TestCase):
+    def test_medir_y_comparar(self):
+        from benchmarks.__main__ import comparar_resultados
+        from benchmarks.medicion import medir, percentil
+
+        self.assertEqual(percentil([1, 2, 3, 4], 50), 2)
+        medida = medir(lambda x: 1 / x, [1, 2, 0, 4], concurrencia=2)
+        self.assertEqual(medida['operaciones'], 3)
+        self.assertEqual(medida['errores'], 1)
+        self.assertNotIn('p99_ms', medida)  # Con pocas muestras sería solo la máxima
+        self.assertIn('p99_ms', medir(abs, list(range(100))))
+
+        base = {'resultados': [{'escenario': 'e', 'tamano': 10, 'concurrencia': 1, 'p99_ms': 10.0, 'throughput_ops_s': 100.0}]}
+        nuevo = {'resultados': [{'escenario': 'e', 'tamano': 10, 'concurrencia': 1, 'p99_ms': 12.0, 'throughput_ops_s': 95.0}]}
+        self.assertFalse(comparar_resultados(base, nuevo, umbral=0.25)[0]['regresion'])
+        self.assertTrue(comparar_resultados(base, nuevo, umbral=0.1)[0]['regresion'])
+        del nuevo['resultados'][0]['p99_ms']  # Sin p99 se compara solo el throughput
+        self.assertIsNone(comparar_resultados(base, nuevo, umbral=0.1)[0]['cambio_p99'])
+        self.assertFalse(comparar_resultados(base, nuevo, umbral=0.1)[0]['regresion'])
+
+class TestMetricas(unittest.TestCase):
+    @patch('src.business.auth_service.UsuarioDAO')
+    def test_endpoint_prometheus(self, mock_dao_class):
+        from urllib.request import urlopen
+        from src.utils.metricas import Histograma, iniciar_servidor_metricas, intentos_login
+
+        mock_dao_class.return_value.obtener_por_email.return_value = None
+        fallos = intentos_login.valor(resultado="fallo")
+        with self.assertRaises(Exception):
+            AuthService().login("nadie@correo.cl", "x")
+        self.assertEqual(intentos_login.valor(resultado="fallo"), fallos + 1)
+
+        histograma = Histograma("prueba_segundos", "Prueba", ("op",), limites=(0.1, 1))
+        for valor in (0.05, 0.5, 5):
+            histograma.observar(valor, op='a"b')
+        lineas = histograma.exponer()
+        self.assertIn('prueba_segundos_bucket{op="a\\"b",le="1"} 2', lineas)
+        self.assertIn('prueba_segundos_bucket{op="a\\"b",le="+Inf"} 3', lineas)
+
+        servidor = iniciar_servidor_metricas(0, "127.0.0.1")
+        self.addCleanup(servidor.server_close)
+        self.addCleanup(servidor.shutdown)
+        with urlopen(f"http://127.0.0.1:{servidor.server_port}/metrics") as respuesta:
+            cuerpo = respuesta.read().decode("utf-8")
+        self.assertIn("# TYPE viajes_login_intentos_total counter", cuerpo)
+        self.assertIn('viajes_login_intentos_total{resultado="fallo"}', cuerpo)
+
 class TestPricing(unittest.TestCase):
     def test_integer_pricing(self):
         # Verify that we can handle integer prices